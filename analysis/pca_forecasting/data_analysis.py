@@ -7,40 +7,116 @@ Especialista: Analyst Agent - Government Procurement Intelligence
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
 import json
+import sys
+
+from seasonal_forecast import quarterly_panel, forecast_panel, quarter_label, interval_z
+from monte_carlo import SimulationResult, simulate_procurement
+
+# Contract store compartilhado (src/)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+from contract_store import ContractStore, get_contract_store, reais
+
+class ContractAggregates:
+    """Agregados incrementais de contratos por órgão × categoria × mês
+
+    Cada chamada a update() agrega só os contratos novos e soma aos
+    agregados existentes; a propensão por órgão é derivada desses totais.
+    """
+
+    KEYS = ['orgao', 'categoria', 'mes']
+
+    def __init__(self):
+        self.mensal = pd.DataFrame(
+            {'contratos': pd.Series(dtype='int64'), 'valor': pd.Series(dtype='float64')},
+            index=pd.MultiIndex.from_tuples([], names=self.KEYS)
+        )
+        self.ultima_contratacao = pd.Series(dtype='datetime64[ns]', name='ultima_contratacao')
+
+    def update(self, df: pd.DataFrame) -> 'ContractAggregates':
+        """Incorpora um lote de contratos (colunas orgao, categoria, data, valor)"""
+        if df.empty:
+            return self
+
+        datas = pd.to_datetime(df['data'])
+        lote = df.assign(data=datas, mes=datas.dt.to_period('M'))
+
+        novos = lote.groupby(self.KEYS, sort=False).agg(contratos=('valor', 'size'), valor=('valor', 'sum'))
+        index = self.mensal.index.append(novos.index.difference(self.mensal.index, sort=False))
+        self.mensal = self.mensal.reindex(index, fill_value=0).add(novos.reindex(index, fill_value=0))
+        self.mensal['contratos'] = self.mensal['contratos'].astype('int64')
+
+        ultima = lote.groupby('orgao', sort=False)['data'].max()
+        orgaos = self.ultima_contratacao.index.append(ultima.index.difference(self.ultima_contratacao.index, sort=False))
+        self.ultima_contratacao = pd.concat(
+            [self.ultima_contratacao.reindex(orgaos), ultima.reindex(orgaos)], axis=1
+        ).max(axis=1).rename('ultima_contratacao')
+        return self
+
+    def by_orgao(self) -> pd.DataFrame:
+        """Totais por órgão (mesmas colunas base de PCARaderAnalyzer.propensity_table)"""
+        mensal = self.mensal.reset_index()
+        aggregated = mensal.groupby('orgao', sort=False).agg(
+            contratos_count=('contratos', 'sum'),
+            valor_total=('valor', 'sum'),
+            diversidade=('categoria', 'nunique'),
+            categorias=('categoria', 'unique')
+        )
+        aggregated['ultima_contratacao'] = self.ultima_contratacao.reindex(aggregated.index)
+        return aggregated[['contratos_count', 'valor_total', 'diversidade', 'ultima_contratacao', 'categorias']]
 
 class PCARaderAnalyzer:
+    # Primeiro trimestre projetado (janela de 12 meses: Q3 2024 - Q2 2025); com
+    # histórico que já alcance esse trimestre, projeta a partir do seguinte
+    PROJECTION_START = '2024Q3'
+    INTERVAL_COVERAGE = 0.8
+
+    # Categoria no contract store → série das projeções
+    CATEGORIAS_RADAR = {'EdTech geral': 'EdTech', 'Idiomas': 'Idiomas'}
+
     def __init__(self):
         self.base_data = {
             'edtech_total': 13_830_000,  # R$ 13,83M
             'idiomas_total': 9_690_000,  # R$ 9,69M
             'total_invested': 23_520_000  # R$ 23,52M
         }
-
-    def load_radar_data(self) -> Dict:
-        """Carrega e processa dados dos arquivos radar"""
-
-        # Dados dos contratos identificados (Jan-Abr 2023)
-        contratos = [
-            # EdTech
-            {'orgao': 'Ministério da Educação', 'uasg': '153001', 'valor': 2_300_000, 'data': '2023-01-01', 'categoria': 'EdTech', 'fornecedor': 'Geekie Educação LTDA'},
-            {'orgao': 'FNDE', 'uasg': '153005', 'valor': 1_850_000, 'data': '2023-01-02', 'categoria': 'EdTech', 'fornecedor': 'Escola Digital S.A.'},
-            {'orgao': 'CAPES', 'uasg': '154001', 'valor': 980_000, 'data': '2023-01-03', 'categoria': 'EdTech', 'fornecedor': 'Arbo Educação LTDA'},
-            {'orgao': 'Ministério da Educação', 'uasg': '153001', 'valor': 3_200_000, 'data': '2023-02-04', 'categoria': 'EdTech', 'fornecedor': 'Khan Academy Brasil LTDA'},
-            {'orgao': 'ENAP', 'uasg': '389001', 'valor': 1_200_000, 'data': '2023-03-09', 'categoria': 'EdTech', 'fornecedor': 'Descomplica Educação S.A.'},
-            {'orgao': 'Ministério da Educação', 'uasg': '153001', 'valor': 4_100_000, 'data': '2023-04-11', 'categoria': 'EdTech', 'fornecedor': 'Eleva Educação S.A.'},
-
-            # Idiomas
-            {'orgao': 'ENAP', 'uasg': '389001', 'valor': 1_500_000, 'data': '2023-02-05', 'categoria': 'Idiomas', 'fornecedor': 'Cultura Inglesa'},
-            {'orgao': 'Ministério das Relações Exteriores', 'uasg': '210001', 'valor': 2_100_000, 'data': '2023-02-06', 'categoria': 'Idiomas', 'fornecedor': 'CCAA Sistema de Ensino S.A.'},
-            {'orgao': 'Ministério da Defesa', 'uasg': '160001', 'valor': 890_000, 'data': '2023-03-07', 'categoria': 'Idiomas', 'fornecedor': 'Wizard by Pearson LTDA'},
-            {'orgao': 'Ministério da Justiça e Segurança Pública', 'uasg': '130001', 'valor': 1_750_000, 'data': '2023-03-08', 'categoria': 'Idiomas', 'fornecedor': 'Rosetta Stone Brasil LTDA'},
-            {'orgao': 'Ministério das Relações Exteriores', 'uasg': '210001', 'valor': 2_800_000, 'data': '2023-04-10', 'categoria': 'Idiomas', 'fornecedor': 'EF Education First Brasil LTDA'},
-            {'orgao': 'MDIC', 'uasg': '120001', 'valor': 650_000, 'data': '2023-04-12', 'categoria': 'Idiomas', 'fornecedor': 'Babbel for Business Brasil LTDA'}
-        ]
-
-        return pd.DataFrame(contratos)
+        self.aggregates = ContractAggregates()
+        # Projeções mantidas pelo modo incremental (refresh_projections)
+        self.pca_projections: Optional[Dict] = None
+        self.orgao_projections: Optional[Dict[str, pd.DataFrame]] = None
+
+    def load_radar_data(self, store: Optional[ContractStore] = None) -> pd.DataFrame:
+        """Carrega os contratos dos radares do contract store
+
+        Valores em Reais (float) a partir dos centavos; a categoria
+        'EdTech geral' do radar é tratada como 'EdTech' nas projeções.
+        """
+        store = store or get_contract_store()
+        df = store.load(columns=['orgao', 'uasg', 'valor_centavos', 'data', 'categoria', 'fornecedor'],
+                        categorias=list(self.CATEGORIAS_RADAR), categorical=False)
+        return pd.DataFrame({
+            'orgao': df['orgao'],
+            'uasg': df['uasg'],
+            'valor': reais(df),
+            'data': df['data'],
+            'categoria': df['categoria'].map(self.CATEGORIAS_RADAR),
+            'fornecedor': df['fornecedor']
+        })
+
+    def projection_start(self, df: pd.DataFrame) -> pd.Period:
+        """Primeiro trimestre projetado: PROJECTION_START ou o trimestre após o último contrato
+
+        ``df`` são contratos (coluna ``data``) ou agregados mensais (``mes``).
+        """
+        inicio = pd.Period(self.PROJECTION_START, freq='Q')
+        if 'data' in df.columns:
+            ultimo = pd.to_datetime(df['data']).max()
+            ultimo = ultimo.to_period('Q') if pd.notna(ultimo) else None
+        else:
+            ultimo = df['mes'].max().asfreq('Q') if len(df) else None
+        return max(inicio, ultimo + 1) if ultimo is not None else inicio
 
     def analyze_temporal_patterns(self, df: pd.DataFrame) -> Dict:
         """Analisa padrões temporais e sazonalidade"""
@@ -65,118 +141,186 @@ class PCARaderAnalyzer:
             'idiomas_crescimento_mensal': df[df['categoria'] == 'Idiomas'].groupby('mes')['valor'].sum().pct_change().mean()
         }
 
+        # Painel até o trimestre anterior à projeção: trimestres sem contratos entram como zero
+        inicio = self.projection_start(df)
         return {
             'trimestre_analysis': trimestre_analysis,
             'mes_analysis': mes_analysis,
-            'patterns': patterns
+            'patterns': patterns,
+            'quarterly_panel': quarterly_panel(df, 'categoria', end=inicio - 1),
+            'projection_start': inicio
         }
 
     def calculate_propensity_metrics(self, df: pd.DataFrame) -> Dict:
         """Calcula métricas de propensão por órgão"""
-
-        # Métricas base por órgão
-        orgao_metrics = df.groupby('orgao').agg({
-            'valor': ['sum', 'count', 'mean'],
-            'categoria': lambda x: len(x.unique())  # Diversidade de categorias
-        }).round(0)
-
-        # Scoring de propensão
-        propensity_scores = {}
-
-        for orgao in df['orgao'].unique():
-            orgao_data = df[df['orgao'] == orgao]
-
-            # Critérios de scoring
-            freq_compras = len(orgao_data)  # Frequência (40%)
-            valor_medio = orgao_data['valor'].mean()  # Valor médio (30%)
-            valor_total = orgao_data['valor'].sum()  # Volume total (20%)
-            diversidade = len(orgao_data['categoria'].unique())  # Diversidade (10%)
-
-            # Normalização (0-100)
-            freq_score = min(freq_compras * 25, 100)  # Max 4 contratos = 100
-            valor_score = min(valor_medio / 50_000, 100)  # Max R$ 5M = 100
-            volume_score = min(valor_total / 100_000, 100)  # Max R$ 10M = 100
-            div_score = diversidade * 50  # Max 2 categorias = 100
-
-            # Score ponderado
-            final_score = (
-                freq_score * 0.4 +
-                valor_score * 0.3 +
-                volume_score * 0.2 +
-                div_score * 0.1
-            )
-
-            propensity_scores[orgao] = {
-                'score_final': round(final_score, 1),
-                'freq_score': freq_score,
-                'valor_score': valor_score,
-                'volume_score': volume_score,
-                'div_score': div_score,
-                'contratos_count': freq_compras,
-                'valor_total': valor_total,
-                'valor_medio': valor_medio
-            }
-
+        return self.propensity_dict(self.propensity_table(df))
+
+    def propensity_table(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Métricas de propensão por órgão em uma única agregação (groupby)
+
+        Uma linha por órgão, na ordem de primeira ocorrência, com os agregados
+        (contratos_count, valor_total, valor_medio, diversidade,
+        ultima_contratacao, categorias) e os componentes do score como colunas.
+        ``self.aggregates`` passa a refletir ``df``, então append_contracts
+        continua a partir deste lote.
+        """
+        self.aggregates = ContractAggregates().update(df)
+        return self._score_propensity(self.aggregates.by_orgao())
+
+    def _score_propensity(self, aggregated: pd.DataFrame) -> pd.DataFrame:
+        """Adiciona valor_medio e os componentes do score (colunas vetorizadas)"""
+        table = aggregated.copy()
+        table['valor_medio'] = table['valor_total'] / table['contratos_count']
+
+        # Normalização (0-100)
+        table['freq_score'] = np.minimum(table['contratos_count'] * 25, 100)  # Max 4 contratos = 100
+        table['valor_score'] = np.minimum(table['valor_medio'] / 50_000, 100)  # Max R$ 5M = 100
+        table['volume_score'] = np.minimum(table['valor_total'] / 100_000, 100)  # Max R$ 10M = 100
+        table['div_score'] = table['diversidade'] * 50  # Max 2 categorias = 100
+
+        # Score ponderado: frequência 40%, valor médio 30%, volume 20%, diversidade 10%
+        table['score_final'] = (
+            table['freq_score'] * 0.4 +
+            table['valor_score'] * 0.3 +
+            table['volume_score'] * 0.2 +
+            table['div_score'] * 0.1
+        ).round(1)
+
+        return table
+
+    @staticmethod
+    def propensity_dict(table: pd.DataFrame) -> Dict:
+        """Converte a tabela de propensão para o formato {orgao: métricas}"""
+        columns = ['score_final', 'freq_score', 'valor_score', 'volume_score', 'div_score',
+                   'contratos_count', 'valor_total', 'valor_medio', 'ultima_contratacao', 'categorias']
+        propensity_scores = table[columns].to_dict('index')
+        for metrics in propensity_scores.values():
+            metrics['categorias'] = list(metrics['categorias'])
         return propensity_scores
 
-    def project_pca_12_months(self, temporal_data: Dict) -> Dict:
-        """Projeta valores PCA para próximos 12 meses"""
-
-        patterns = temporal_data['patterns']
-
-        # Taxa de crescimento baseada em dados históricos
-        edtech_growth = 0.35  # 35% a.a. (conservador para mercado EdTech)
-        idiomas_growth = 0.25  # 25% a.a. (expansão internacional)
-
-        # Projeção trimestral baseada em sazonalidade
-        baseline_quarterly = {
-            'Q3_2024': {
-                'edtech': self.base_data['edtech_total'] * 0.25 * (1 + edtech_growth),
-                'idiomas': self.base_data['idiomas_total'] * 0.20 * (1 + idiomas_growth),
-            },
-            'Q4_2024': {
-                'edtech': self.base_data['edtech_total'] * 0.30 * (1 + edtech_growth),
-                'idiomas': self.base_data['idiomas_total'] * 0.35 * (1 + idiomas_growth),
-            },
-            'Q1_2025': {
-                'edtech': self.base_data['edtech_total'] * 0.35 * (1 + edtech_growth),
-                'idiomas': self.base_data['idiomas_total'] * 0.30 * (1 + idiomas_growth),
-            },
-            'Q2_2025': {
-                'edtech': self.base_data['edtech_total'] * 0.10 * (1 + edtech_growth),
-                'idiomas': self.base_data['idiomas_total'] * 0.15 * (1 + idiomas_growth),
-            }
-        }
+    def append_contracts(self, df: pd.DataFrame) -> Dict:
+        """Modo incremental: incorpora novos contratos e devolve a propensão atualizada
+
+        Apenas os contratos novos são agregados; o histórico já visto vive em
+        ``self.aggregates``, então propensão, ranking e projeções
+        (refresh_projections) se atualizam sem reprocessar os contratos anteriores.
+        """
+        self.aggregates.update(df)
+        self.refresh_projections()
+        return self.propensity_dict(self._score_propensity(self.aggregates.by_orgao()))
+
+    def refresh_projections(self, coverage: float = INTERVAL_COVERAGE):
+        """Reprojeta categorias e órgãos a partir de ``self.aggregates.mensal``
+
+        Atualiza ``self.pca_projections`` e ``self.orgao_projections`` (mesmo
+        formato de project_pca_12_months / project_orgaos_12_months).
+        """
+        mensal = self.aggregates.mensal.reset_index()
+        if mensal.empty:
+            return
+        inicio = self.projection_start(mensal)
+        temporal_data = {'quarterly_panel': quarterly_panel(mensal, 'categoria', end=inicio - 1),
+                         'projection_start': inicio}
+        self.pca_projections = self.project_pca_12_months(temporal_data, coverage)
+        self.orgao_projections = self.project_orgaos_12_months(mensal, coverage)
+
+    def project_pca_12_months(self, temporal_data: Dict, coverage: float = INTERVAL_COVERAGE) -> Dict:
+        """Projeta valores PCA para próximos 12 meses
+
+        Holt-Winters aditivo ajustado sobre o painel trimestral por categoria
+        de analyze_temporal_patterns (todas as categorias em uma chamada).
+        Cada trimestre traz a projeção pontual e o intervalo de previsão.
+        """
+        panel = temporal_data['quarterly_panel']
+        forecast = forecast_panel(panel, temporal_data['projection_start'], coverage=coverage)
+        mean, std = forecast['mean'], forecast['std']
+        z = interval_z(coverage)
 
-        # Cálculo dos totais projetados
         projections = {}
-        for quarter, values in baseline_quarterly.items():
-            total = values['edtech'] + values['idiomas']
-            projections[quarter] = {
-                'edtech': round(values['edtech']),
-                'idiomas': round(values['idiomas']),
-                'total': round(total)
+        for periodo in mean.columns:
+            edtech = mean[periodo].get('EdTech', 0.0)
+            idiomas = mean[periodo].get('Idiomas', 0.0)
+            total = edtech + idiomas
+            # Séries independentes: variâncias somam
+            total_std = float(np.sqrt((std[periodo] ** 2).sum()))
+
+            projections[quarter_label(periodo)] = {
+                'edtech': round(edtech),
+                'idiomas': round(idiomas),
+                'total': round(total),
+                'intervalo': {
+                    'edtech': self._interval(forecast, 'EdTech', periodo),
+                    'idiomas': self._interval(forecast, 'Idiomas', periodo),
+                    'total': [round(max(total - z * total_std, 0)), round(total + z * total_std)]
+                }
             }
 
         # Total anual projetado
         total_anual = sum([q['total'] for q in projections.values()])
 
+        # Crescimento: projeção anual vs. histórico anualizado de cada categoria
+        historico_anual = panel.mean(axis=1) * 4
+        projetado_anual = mean.sum(axis=1)
+        crescimento = (projetado_anual / historico_anual - 1).replace([np.inf, -np.inf], np.nan).fillna(0.0)
+
         return {
             'projections_quarterly': projections,
             'total_anual_projetado': total_anual,
-            'crescimento_edtech': f"{edtech_growth*100:.1f}%",
-            'crescimento_idiomas': f"{idiomas_growth*100:.1f}%"
+            'crescimento_edtech': f"{crescimento.get('EdTech', 0.0)*100:.1f}%",
+            'crescimento_idiomas': f"{crescimento.get('Idiomas', 0.0)*100:.1f}%",
+            'cobertura_intervalo': coverage
+        }
+
+    @staticmethod
+    def _interval(forecast: Dict[str, pd.DataFrame], serie: str, periodo: pd.Period) -> List[int]:
+        if serie not in forecast['mean'].index:
+            return [0, 0]
+        return [round(forecast['lower'].at[serie, periodo]), round(forecast['upper'].at[serie, periodo])]
+
+    def project_orgaos_12_months(self, df: pd.DataFrame, coverage: float = INTERVAL_COVERAGE) -> Dict[str, pd.DataFrame]:
+        """Projeção trimestral por órgão, todas as séries em um único ajuste em lote
+
+        Retorna DataFrames órgão × trimestre ('mean', 'std', 'lower', 'upper').
+        Com agregados incrementais, use ``self.aggregates.mensal.reset_index()``.
+        """
+        inicio = self.projection_start(df)
+        forecast = forecast_panel(quarterly_panel(df, 'orgao', end=inicio - 1), inicio, coverage=coverage)
+        return {
+            name: frame.rename(columns=quarter_label)
+            for name, frame in forecast.items()
         }
 
-    def generate_top20_prospects(self, propensity_scores: Dict, df: pd.DataFrame) -> List[Dict]:
+    def simulate_prediction_bands(self, df: pd.DataFrame, n_simulations: int = 100_000,
+                                  seed: Optional[int] = 42, temporal_data: Optional[Dict] = None,
+                                  orgao_forecast: Optional[Dict[str, pd.DataFrame]] = None) -> SimulationResult:
+        """Bandas P10/P50/P90 por trimestre e por órgão via Monte Carlo
+
+        As bandas por trimestre sorteiam as mesmas previsões por categoria de
+        project_pca_12_months (``temporal_data``, por padrão
+        analyze_temporal_patterns(df)); as bandas de 12 meses por órgão, as de
+        project_orgaos_12_months (``orgao_forecast``). Média e desvio-padrão
+        vêm da previsão, então cada banda contém a projeção impressa.
+        """
+        if temporal_data is None:
+            temporal_data = self.analyze_temporal_patterns(df.copy())
+        if orgao_forecast is None:
+            orgao_forecast = self.project_orgaos_12_months(df)
+        categorias = forecast_panel(temporal_data['quarterly_panel'], temporal_data['projection_start'])
+        categorias = {name: frame.rename(columns=quarter_label) for name, frame in categorias.items()}
+
+        seed_categorias, seed_orgaos = np.random.SeedSequence(seed).spawn(2)
+        trimestres = simulate_procurement(categorias['mean'], categorias['std'], n_simulations, seed_categorias)
+        orgaos = simulate_procurement(orgao_forecast['mean'], orgao_forecast['std'], n_simulations, seed_orgaos)
+        return SimulationResult(por_trimestre=trimestres.por_trimestre, por_orgao=orgaos.por_orgao,
+                                n_simulations=n_simulations, seed=seed)
+
+    def generate_top20_prospects(self, propensity_scores: Dict, df: Optional[pd.DataFrame] = None) -> List[Dict]:
         """Gera ranking top 20 prospects com justificativas"""
 
         # Órgãos já ativos (com histórico)
+        # Última contratação e categorias já vêm agregadas na propensão (sem filtrar df por órgão)
         active_prospects = []
         for orgao, metrics in propensity_scores.items():
-            orgao_data = df[df['orgao'] == orgao]
-            last_contract = orgao_data['data'].max()
-
             active_prospects.append({
                 'orgao': orgao,
                 'ranking': 0,  # Será calculado
@@ -184,9 +328,9 @@ class PCARaderAnalyzer:
                 'contratos_historicos': metrics['contratos_count'],
                 'valor_total_historico': metrics['valor_total'],
                 'valor_medio': metrics['valor_medio'],
-                'ultima_contratacao': last_contract,
-                'categorias': list(orgao_data['categoria'].unique()),
-                'justificativa': self._build_justification(orgao, metrics, orgao_data),
+                'ultima_contratacao': metrics['ultima_contratacao'],
+                'categorias': metrics['categorias'],
+                'justificativa': self._build_justification(orgao, metrics),
                 'probabilidade_contratacao': self._calculate_probability(metrics),
                 'valor_projetado_anual': self._project_annual_value(metrics)
             })
@@ -235,7 +379,7 @@ class PCARaderAnalyzer:
 
         return all_prospects[:20]
 
-    def _build_justification(self, orgao: str, metrics: Dict, orgao_data: pd.DataFrame) -> str:
+    def _build_justification(self, orgao: str, metrics: Dict) -> str:
         """Constrói justificativa para cada prospect"""
 
         contratos = metrics['contratos_count']
@@ -290,6 +434,7 @@ def main():
     # 4. Projeções PCA
     print("📈 Projetando PCA 12 meses...")
     pca_projections = analyzer.project_pca_12_months(temporal_data)
+    orgao_projections = analyzer.project_orgaos_12_months(df)
 
     # 5. Top 20 prospects
     print("🏆 Gerando ranking top 20...")
@@ -300,6 +445,7 @@ def main():
         'temporal_analysis': temporal_data,
         'propensity_scores': propensity_scores,
         'pca_projections': pca_projections,
+        'orgao_projections': orgao_projections,
         'top20_prospects': top20_prospects
     }
 
@@ -4,16 +4,19 @@ Análise Detalhada do Ranking Top 20 Prospects
 Expandindo justificativas quantitativas e metodologia de scoring
 """
 
-from data_analysis import PCARaderAnalyzer
+from stage_cache import get_cached_analysis
 import pandas as pd
 import json
+from pathlib import Path
+
+REPORT_PATH = Path(__file__).resolve().parent / 'analise_detalhada_ranking.md'
 
 def generate_detailed_ranking_analysis():
     """Gera análise detalhada do ranking com justificativas quantitativas completas"""
 
-    analyzer = PCARaderAnalyzer()
-    df = analyzer.load_radar_data()
-    propensity_scores = analyzer.calculate_propensity_metrics(df)
+    analysis = get_cached_analysis()
+    df = analysis.df
+    propensity_scores = analysis.propensity_scores()
 
     # Detalhamento completo do ranking
     ranking_analysis = {
@@ -108,15 +111,13 @@ def get_quantitative_justifications(propensity_scores, df):
     justifications = {}
 
     for org, metrics in propensity_scores.items():
-        org_data = df[df['orgao'] == org]
-
-        # Cálculos específicos
-        contratos_por_trimestre = len(org_data) / 1.33  # 4 meses base
+        # Cálculos específicos (contagem e categorias já agregadas na propensão)
+        contratos_por_trimestre = metrics['contratos_count'] / 1.33  # 4 meses base
         ticket_medio = metrics['valor_medio']
         crescimento_projetado = ticket_medio * 1.5  # Projeção conservadora
 
         # Análise de padrões
-        categorias = list(org_data['categoria'].unique())
+        categorias = metrics['categorias']
         modalidades = []  # Modalidade não está no dataset simplificado
 
         justifications[org] = {
@@ -387,7 +388,7 @@ if __name__ == "__main__":
     print(detailed_report)
 
     # Salvar análise detalhada
-    with open('/home/danielfugisawa/pesquisa_prospect_gov/analysis/pca_forecasting/analise_detalhada_ranking.md', 'w', encoding='utf-8') as f:
+    with open(REPORT_PATH, 'w', encoding='utf-8') as f:
         f.write(detailed_report)
 
     print("\n✅ Análise detalhada salva em: analise_detalhada_ranking.md")
\ No newline at end of file
@@ -4,21 +4,22 @@ Gerador de Relatório - Previsões PCA e Ranking Top 20 Prospects
 Specialist: Government Procurement Intelligence Analyst
 """
 
-from data_analysis import PCARaderAnalyzer
+from stage_cache import get_cached_analysis
 import json
 from datetime import datetime
+from pathlib import Path
+
+REPORT_PATH = Path(__file__).resolve().parent / 'relatorio_pca_prospects.md'
 
 def generate_comprehensive_report():
     """Gera relatório executivo completo"""
 
-    analyzer = PCARaderAnalyzer()
-
-    # Executar análise
-    df = analyzer.load_radar_data()
-    temporal_data = analyzer.analyze_temporal_patterns(df)
-    propensity_scores = analyzer.calculate_propensity_metrics(df)
-    pca_projections = analyzer.project_pca_12_months(temporal_data)
-    top20_prospects = analyzer.generate_top20_prospects(propensity_scores, df)
+    # Executar análise (estágios reaproveitados do cache quando os dados não mudaram)
+    analysis = get_cached_analysis()
+    temporal_data = analysis.temporal_data()
+    pca_projections = analysis.pca_projections()
+    top20_prospects = analysis.top20_prospects()
+    bands = analysis.prediction_bands()
 
     # Gerar relatório
     report = f"""
@@ -51,11 +52,14 @@ def generate_comprehensive_report():
 ### 📅 Ciclo Orçamentário Projetado:
 {_format_quarterly_projections(pca_projections['projections_quarterly'])}
 
+### 🎲 Bandas de Previsão (Monte Carlo, {bands.n_simulations:,} simulações):
+{_format_prediction_bands(bands.por_trimestre)}
+
 ---
 
 ## 🏆 TOP 20 PROSPECTS - RANKING POR PROPENSÃO
 
-{_format_top20_ranking(top20_prospects)}
+{_format_top20_ranking(top20_prospects, bands.por_orgao)}
 
 ---
 
@@ -144,9 +148,20 @@ def _format_quarterly_projections(projections):
 - Idiomas: R$ {values['idiomas']:,.0f}
 - **Total**: R$ {values['total']:,.0f}
 """
+        if 'intervalo' in values:
+            low, high = values['intervalo']['total']
+            output += f"- Intervalo de previsão: R$ {low:,.0f} - R$ {high:,.0f}\n"
     return output
 
-def _format_top20_ranking(prospects):
+def _format_prediction_bands(por_trimestre):
+    """Formatar bandas P10/P50/P90 por trimestre, ao lado da projeção pontual"""
+    output = "\n| Trimestre | Projeção | P10 | P50 | P90 |\n|---|---|---|---|---|\n"
+    for quarter, row in por_trimestre.iterrows():
+        output += (f"| {quarter} | R$ {row['previsao']:,.0f} | R$ {row['p10']:,.0f} | "
+                   f"R$ {row['p50']:,.0f} | R$ {row['p90']:,.0f} |\n")
+    return output
+
+def _format_top20_ranking(prospects, bands=None):
     """Formatar ranking top 20"""
     output = ""
 
@@ -162,6 +177,9 @@ def _format_top20_ranking(prospects):
 - **Projeção Anual**: R$ {prospect['valor_projetado_anual']/1_000_000:.1f}M
 - **Justificativa**: {prospect['justificativa']}
 """
+            if bands is not None and prospect['orgao'] in bands.index:
+                band = bands.loc[prospect['orgao']]
+                output += f"- **Previsão sazonal 12 meses**: R$ {band['previsao']/1_000_000:.1f}M (P10/P50/P90: R$ {band['p10']/1_000_000:.1f}M / R$ {band['p50']/1_000_000:.1f}M / R$ {band['p90']/1_000_000:.1f}M)\n"
         else:
             # Órgão potencial
             output += f"""
@@ -174,16 +192,18 @@ def _format_top20_ranking(prospects):
 
     return output
 
+def _format_quarters(quarterly, categoria):
+    """Uma linha por trimestre projetado ('Q3_2024' → 'Q3 2024')"""
+    return '\n'.join(f"- **{label.replace('_', ' ')}**: R$ {values[categoria]:,.0f}"
+                     for label, values in quarterly.items())
+
 def _format_edtech_projections(projections):
     """Formatar projeções EdTech"""
     quarterly = projections['projections_quarterly']
     total_edtech = sum([q['edtech'] for q in quarterly.values()])
 
     return f"""
-- **Q3 2024**: R$ {quarterly['Q3_2024']['edtech']:,.0f}
-- **Q4 2024**: R$ {quarterly['Q4_2024']['edtech']:,.0f}
-- **Q1 2025**: R$ {quarterly['Q1_2025']['edtech']:,.0f}
-- **Q2 2025**: R$ {quarterly['Q2_2025']['edtech']:,.0f}
+{_format_quarters(quarterly, 'edtech')}
 - **TOTAL ANUAL**: R$ {total_edtech:,.0f}
 """
 
@@ -193,10 +213,7 @@ def _format_idiomas_projections(projections):
     total_idiomas = sum([q['idiomas'] for q in quarterly.values()])
 
     return f"""
-- **Q3 2024**: R$ {quarterly['Q3_2024']['idiomas']:,.0f}
-- **Q4 2024**: R$ {quarterly['Q4_2024']['idiomas']:,.0f}
-- **Q1 2025**: R$ {quarterly['Q1_2025']['idiomas']:,.0f}
-- **Q2 2025**: R$ {quarterly['Q2_2025']['idiomas']:,.0f}
+{_format_quarters(quarterly, 'idiomas')}
 - **TOTAL ANUAL**: R$ {total_idiomas:,.0f}
 """
 
@@ -205,7 +222,7 @@ if __name__ == "__main__":
     print(report)
 
     # Salvar arquivo
-    with open('/home/danielfugisawa/pesquisa_prospect_gov/analysis/pca_forecasting/relatorio_pca_prospects.md', 'w', encoding='utf-8') as f:
+    with open(REPORT_PATH, 'w', encoding='utf-8') as f:
         f.write(report)
 
-    print(f"\n✅ Relatório salvo em: /home/danielfugisawa/pesquisa_prospect_gov/analysis/pca_forecasting/relatorio_pca_prospects.md")
\ No newline at end of file
+    print(f"\n✅ Relatório salvo em: {REPORT_PATH}")
\ No newline at end of file
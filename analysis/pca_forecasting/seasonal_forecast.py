@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Motor de Previsão Sazonal para Projeções PCA
+Holt-Winters aditivo (ou sazonal ingênuo) vetorizado em NumPy.
+
+Todas as séries (categorias, órgãos) são ajustadas de uma vez: a recursão
+percorre o tempo, e cada passo atualiza o vetor de estados de todas as séries.
+Os intervalos de previsão usam a variância h-passos do modelo ETS(A,A,A).
+"""
+
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+TRIMESTRES_POR_ANO = 4
+
+
+@dataclass
+class ForecastResult:
+    """Previsões (n_series × horizon) com desvio padrão e intervalo"""
+    mean: np.ndarray
+    std: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    coverage: float
+
+
+def quarterly_panel(df: pd.DataFrame, by: Union[str, List[str]], value: str = 'valor',
+                    end: Optional[Union[str, pd.Period]] = None) -> pd.DataFrame:
+    """Painel série × trimestre (zeros onde não houve contratação)
+
+    ``df`` deve ter a coluna ``data`` (contratos) ou ``mes`` (Period mensal,
+    como em ContractAggregates.mensal). O painel vai do primeiro trimestre
+    observado até o último (ou ``end``: use o trimestre anterior ao início da
+    projeção para que os trimestres sem contratos até lá entrem como zero).
+    """
+    if 'data' in df.columns:
+        trimestre = pd.to_datetime(df['data']).dt.to_period('Q')
+    else:
+        trimestre = df['mes'].dt.asfreq('Q')
+
+    panel = df.assign(trimestre=trimestre).pivot_table(
+        index=by, columns='trimestre', values=value, aggfunc='sum', fill_value=0, sort=False
+    )
+    ultimo = pd.Period(end, freq='Q') if end is not None else panel.columns.max()
+    trimestres = pd.period_range(panel.columns.min(), ultimo, freq='Q')
+    return panel.reindex(columns=trimestres, fill_value=0).astype(float)
+
+
+class SeasonalForecaster:
+    """Holt-Winters aditivo ou sazonal ingênuo para muitas séries ao mesmo tempo
+
+    Séries com menos de uma estação completa não têm componente sazonal
+    estimável: a previsão é o nível (média) e o desvio padrão vem da
+    dispersão histórica da própria série.
+    """
+
+    METHODS = ('holt_winters', 'seasonal_naive')
+
+    def __init__(self, season_length: int = TRIMESTRES_POR_ANO, method: str = 'holt_winters',
+                 alpha: float = 0.3, beta: float = 0.05, gamma: float = 0.2):
+        if method not in self.METHODS:
+            raise ValueError(f"Método desconhecido: {method}")
+        self.season_length = season_length
+        self.method = method
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+
+    def fit(self, panel: Union[np.ndarray, pd.DataFrame]) -> 'SeasonalForecaster':
+        """Ajusta todas as linhas do painel (n_series × T, sem NaN)"""
+        y = np.asarray(panel, dtype=float)
+        if y.ndim != 2 or y.shape[1] == 0:
+            raise ValueError("Painel deve ser 2D com ao menos um período")
+
+        self.history = y
+        n, t_total = y.shape
+        m = self.season_length
+
+        if self.method == 'seasonal_naive':
+            self._fit_seasonal_naive(y)
+            return self
+
+        if t_total < m:
+            # Sem uma estação completa: nível = média, sem tendência nem sazonalidade
+            self.level, self.trend, self.season = y.mean(axis=1), np.zeros(n), np.zeros((n, m))
+            self.sigma = y.std(axis=1)
+            return self
+
+        # Estados iniciais a partir da primeira estação
+        level = y[:, :m].mean(axis=1)
+        trend = np.zeros(n)
+        if t_total >= 2 * m:
+            trend = (y[:, m:2 * m].mean(axis=1) - y[:, :m].mean(axis=1)) / m
+        season = y[:, :m] - level[:, None]
+
+        errors = np.empty_like(y)
+        for t in range(t_total):
+            s = t % m
+            errors[:, t] = y[:, t] - (level + trend + season[:, s])
+            new_level = self.alpha * (y[:, t] - season[:, s]) + (1 - self.alpha) * (level + trend)
+            trend = self.beta * (new_level - level) + (1 - self.beta) * trend
+            season[:, s] = self.gamma * (y[:, t] - new_level) + (1 - self.gamma) * season[:, s]
+            level = new_level
+
+        self.level, self.trend, self.season = level, trend, season
+        self.sigma = self._residual_sigma(errors[:, m:], y)
+        return self
+
+    def _fit_seasonal_naive(self, y: np.ndarray):
+        m = self.season_length
+        if y.shape[1] >= m:
+            self.last_season = y[:, -m:]
+            self.sigma = self._residual_sigma(y[:, m:] - y[:, :-m], y)
+        else:
+            # Sem uma estação completa: repete a média
+            self.last_season = np.repeat(y.mean(axis=1, keepdims=True), m, axis=1)
+            self.sigma = y.std(axis=1)
+
+    @staticmethod
+    def _residual_sigma(residuals: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Desvio padrão dos erros; dispersão da série quando há poucos resíduos"""
+        if residuals.shape[1] >= 2:
+            return np.sqrt(np.mean(residuals ** 2, axis=1))
+        return y.std(axis=1)
+
+    def forecast(self, horizon: int, coverage: float = 0.8) -> ForecastResult:
+        """Previsões h = 1..horizon com intervalo de cobertura ``coverage``"""
+        m = self.season_length
+        t_total = self.history.shape[1]
+        h = np.arange(1, horizon + 1)
+        k = (h - 1) // m
+
+        if self.method == 'seasonal_naive':
+            mean = self.last_season[:, (h - 1) % m]
+            variance_factor = k + 1.0
+        else:
+            mean = self.level[:, None] + h * self.trend[:, None] + self.season[:, (t_total + h - 1) % m]
+            a, b, g = self.alpha, self.beta, self.gamma
+            variance_factor = (
+                1 + (h - 1) * (a ** 2 + a * b * h + b ** 2 * h * (2 * h - 1) / 6)
+                + k * g * (2 * a + g + b * m * (k + 1))
+            )
+
+        std = self.sigma[:, None] * np.sqrt(variance_factor)[None, :]
+        z = interval_z(coverage)
+
+        # Valores contratados não são negativos
+        mean = np.maximum(mean, 0)
+        return ForecastResult(
+            mean=mean,
+            std=std,
+            lower=np.maximum(mean - z * std, 0),
+            upper=mean + z * std,
+            coverage=coverage
+        )
+
+
+def forecast_panel(panel: pd.DataFrame, start: Union[str, pd.Period], periods: int = TRIMESTRES_POR_ANO,
+                   coverage: float = 0.8, **forecaster_kwargs) -> Dict[str, pd.DataFrame]:
+    """Prevê ``periods`` trimestres a partir de ``start`` para todas as séries do painel
+
+    Retorna DataFrames (séries × trimestres) 'mean', 'std', 'lower' e 'upper'.
+    """
+    start = pd.Period(start, freq='Q')
+    ultimo = panel.columns.max()
+    offset = (start - ultimo).n
+    if offset < 1:
+        raise ValueError(f"Início da projeção ({start}) deve ser posterior ao histórico ({ultimo})")
+
+    result = SeasonalForecaster(**forecaster_kwargs).fit(panel.to_numpy()).forecast(offset + periods - 1, coverage)
+    trimestres = pd.period_range(start, periods=periods, freq='Q')
+    janela = slice(offset - 1, offset - 1 + periods)
+
+    return {
+        name: pd.DataFrame(getattr(result, name)[:, janela], index=panel.index, columns=trimestres)
+        for name in ('mean', 'std', 'lower', 'upper')
+    }
+
+
+def quarter_label(period: pd.Period) -> str:
+    """Rótulo usado nos relatórios (2024Q3 → 'Q3_2024')"""
+    return f"Q{period.quarter}_{period.year}"
+
+
+def interval_z(coverage: float) -> float:
+    """Quantil normal para um intervalo central de cobertura ``coverage``"""
+    if not 0 < coverage < 1:
+        raise ValueError("coverage deve estar entre 0 e 1")
+    return NormalDist().inv_cdf(0.5 + coverage / 2)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Cache de Estágios do Pipeline PCA
+Resultados intermediários (padrões temporais, propensão, projeções, bandas)
+persistidos em disco e indexados por hash do conteúdo.
+
+A chave de cada estágio combina o hash dos contratos de entrada (ou do
+arquivo do contract store, que só é carregado se algum estágio precisar
+ser calculado), os parâmetros do estágio e o código-fonte dos módulos de
+análise: mudar o texto de um relatório reaproveita tudo; mudar dados,
+parâmetros ou modelo recalcula. Os arquivos são pickles do pandas/NumPy, que preservam dtypes
+(Int64, Period, datetime) sem depender de pyarrow.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from data_analysis import PCARaderAnalyzer
+from contract_store import ContractStore, file_digest, get_contract_store
+
+# Incrementar quando o formato dos arquivos mudar
+CACHE_VERSION = 1
+
+MODULE_DIR = Path(__file__).parent
+DEFAULT_CACHE_DIR = MODULE_DIR / ".stage_cache"
+
+# Código cujas mudanças invalidam os estágios
+SOURCE_FILES = ('data_analysis.py', 'seasonal_forecast.py', 'monte_carlo.py', 'stage_cache.py')
+
+
+def fingerprint(*parts: Any) -> str:
+    """Hash SHA-256 estável de DataFrames, Series, arquivos e parâmetros JSON"""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            frame = part.to_frame() if isinstance(part, pd.Series) else part
+            digest.update(repr([(str(c), str(t)) for c, t in frame.dtypes.items()]).encode())
+            digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+        elif isinstance(part, Path):
+            digest.update(part.name.encode())
+            digest.update(part.read_bytes())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+        # Separador: evita colisões entre concatenações diferentes
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def source_fingerprint(files: Iterable[str] = SOURCE_FILES) -> str:
+    """Hash do código-fonte dos módulos de análise"""
+    return fingerprint(*[MODULE_DIR / name for name in files])
+
+
+class StageCache:
+    """Cache em disco de resultados de estágios, um arquivo por (estágio, chave)"""
+
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, stage: str, key: str) -> Path:
+        return self.cache_dir / f"{stage}-{key[:32]}.pkl"
+
+    def get_or_compute(self, stage: str, key: str, compute: Callable[[], Any]) -> Any:
+        """Carrega o estágio do disco ou calcula e persiste"""
+        if not self.enabled:
+            return compute()
+
+        path = self.path(stage, key)
+        if path.exists():
+            try:
+                with open(path, 'rb') as f:
+                    value = pickle.load(f)
+                self.hits += 1
+                return value
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+                # Arquivo corrompido ou de uma versão incompatível: recalcula
+                pass
+
+        self.misses += 1
+        value = compute()
+        self._write(path, value)
+        return value
+
+    def _write(self, path: Path, value: Any):
+        """Escrita atômica: arquivo temporário no mesmo diretório + rename"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def clear(self) -> int:
+        """Remove todos os arquivos do cache; retorna quantos foram apagados"""
+        if not self.cache_dir.exists():
+            return 0
+        removed = 0
+        for path in self.cache_dir.glob('*.pkl'):
+            path.unlink()
+            removed += 1
+        return removed
+
+
+class CachedAnalysis:
+    """Estágios do PCARaderAnalyzer compartilhados pelos relatórios
+
+    Cada estágio é calculado no máximo uma vez por processo (memória) e uma
+    vez por combinação dados + parâmetros + código (disco). generate_report
+    e detailed_ranking_analysis usam a mesma instância de cache, então
+    gerar os dois relatórios não repete nenhum cálculo.
+    """
+
+    def __init__(self, analyzer: Optional[PCARaderAnalyzer] = None, cache: Optional[StageCache] = None,
+                 df: Optional[pd.DataFrame] = None, store: Optional[ContractStore] = None):
+        self.analyzer = analyzer or PCARaderAnalyzer()
+        self.cache = cache or StageCache()
+        self._memo: Dict[str, Any] = {}
+        self._df: Optional[pd.DataFrame] = None
+        if df is not None:
+            self._df = self._normalize(df)
+            self._base_key = fingerprint(self._df, source_fingerprint())
+        else:
+            # Sem DataFrame: a chave vem do arquivo do store e os contratos só
+            # são carregados quando algum estágio não está em cache
+            self.store = store or get_contract_store()
+            self._base_key = fingerprint(file_digest(self.store.path), source_fingerprint())
+
+    @staticmethod
+    def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+        # Datas normalizadas uma vez para todos os estágios
+        return df.assign(data=pd.to_datetime(df['data']))
+
+    @property
+    def df(self) -> pd.DataFrame:
+        if self._df is None:
+            self._df = self._normalize(self.analyzer.load_radar_data(self.store))
+        return self._df
+
+    def _stage(self, stage: str, params: Dict, compute: Callable[[], Any]) -> Any:
+        key = fingerprint(self._base_key, stage, params)
+        if key not in self._memo:
+            self._memo[key] = self.cache.get_or_compute(stage, key, compute)
+        return self._memo[key]
+
+    def temporal_data(self) -> Dict:
+        return self._stage('temporal', {}, lambda: self.analyzer.analyze_temporal_patterns(self.df.copy()))
+
+    def propensity_table(self) -> pd.DataFrame:
+        return self._stage('propensity', {}, lambda: self.analyzer.propensity_table(self.df))
+
+    def propensity_scores(self) -> Dict:
+        return self.analyzer.propensity_dict(self.propensity_table())
+
+    def projection_start(self) -> str:
+        """Início da projeção do estágio temporal (sem carregar os contratos se estiver em cache)"""
+        return str(self.temporal_data()['projection_start'])
+
+    def pca_projections(self, coverage: float = PCARaderAnalyzer.INTERVAL_COVERAGE) -> Dict:
+        params = {'start': self.projection_start(), 'coverage': coverage}
+        return self._stage('pca_projections', params,
+                           lambda: self.analyzer.project_pca_12_months(self.temporal_data(), coverage))
+
+    def orgao_projections(self, coverage: float = PCARaderAnalyzer.INTERVAL_COVERAGE) -> Dict[str, pd.DataFrame]:
+        params = {'start': self.projection_start(), 'coverage': coverage}
+        return self._stage('orgao_projections', params,
+                           lambda: self.analyzer.project_orgaos_12_months(self.df, coverage))
+
+    def top20_prospects(self) -> List[Dict]:
+        return self._stage('top20', {}, lambda: self.analyzer.generate_top20_prospects(self.propensity_scores()))
+
+    def prediction_bands(self, n_simulations: int = 100_000, seed: Optional[int] = 42):
+        # Sorteia as previsões dos estágios temporal e orgao_projections (mesmas projeções, sem reajuste)
+        params = {'start': self.projection_start(), 'n_simulations': n_simulations, 'seed': seed}
+        return self._stage('prediction_bands', params,
+                           lambda: self.analyzer.simulate_prediction_bands(
+                               self.df, n_simulations, seed, temporal_data=self.temporal_data(),
+                               orgao_forecast=self.orgao_projections()))
+
+
+_shared_analysis: Dict[str, CachedAnalysis] = {}
+
+
+def get_cached_analysis(cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR, enabled: bool = True) -> CachedAnalysis:
+    """Instância compartilhada por processo (relatórios gerados em sequência)"""
+    key = f"{Path(cache_dir).resolve()}:{enabled}"
+    if key not in _shared_analysis:
+        _shared_analysis[key] = CachedAnalysis(cache=StageCache(cache_dir, enabled))
+    return _shared_analysis[key]
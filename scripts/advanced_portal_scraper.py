@@ -4,22 +4,55 @@ Advanced Portal da Transparência EdTech/Idiomas Contract Scraper
 RADAR EDTECH/IDIOMAS project - Extract REAL education technology contracts
 """
 
+import argparse
+import asyncio
 import requests
 import csv
-import time
 import json
+import math
 import re
 from datetime import datetime
-from urllib.parse import quote, urljoin
-from bs4 import BeautifulSoup
+from urllib.parse import parse_qs, quote, urljoin, urlsplit
 import logging
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from record_linkage import link_records
+from dedup_index import DedupIndex, SCRAPER_KEY_COLUMNS, DEFAULT_SCRAPER_INDEX, key_hashes
+from async_fetcher import AsyncFetcher
+from contract_extraction import candidate_texts, extract_fields
+from http_cache import DEFAULT_HTTP_CACHE, HttpCache, cached_get
+from scrape_journal import DEFAULT_SCRAPE_JOURNAL, ScrapeJournal
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Provenance label recorded in the dedup index
+SOURCE_NAME = 'advanced_portal_scraper'
+
+# Politeness limit per host (the sequential sweep slept 3 s between requests)
+REQUESTS_PER_SECOND = 1 / 3
+MAX_CONCURRENCY = 4
+SEARCH_YEARS = [2023, 2024]
+
+# Pagination: results per page and a safety cap of pages per keyword/year
+PAGE_SIZE = 15
+MAX_PAGES = 50
+
+# "Exibindo 1 a 15 de 1.234 registros", "1.234 resultados encontrados"
+RESULT_COUNT_PATTERNS = [
+    re.compile(r'\bde\s+([\d.]+)\s+(?:registros|resultados|contratos)', re.I),
+    re.compile(r'([\d.]+)\s+(?:registros|resultados|contratos)\s+encontrad', re.I),
+    re.compile(r'total(?:\s+de)?\s*(?:registros|resultados)?\s*:\s*([\d.]+)', re.I),
+]
+
 class RealPortalTransparenciaExtractor:
-    def __init__(self):
+    def __init__(self, dedup_index_path=None, http_cache=None, journal_path=None):
         self.base_url = "https://portaldatransparencia.gov.br"
         self.session = requests.Session()
         # Set user agent to avoid blocking
@@ -55,24 +88,37 @@ class RealPortalTransparenciaExtractor:
         self.all_keywords = self.edtech_keywords + self.language_keywords
         self.results = []
 
-    def fetch_contract_page(self, keyword, year=2024, page=1):
-        """Fetch contract search results page"""
-        search_url = f"{self.base_url}/contratos/consulta"
-
+        # Optional persistent index: later runs only keep contracts not seen before
+        self.dedup_index_path = dedup_index_path
+        # Keys of the new contracts, registered in the index once they are saved
+        self.pending_keys = None
+        # Optional HttpCache: revalidated responses, raw HTML archive, offline replay
+        self.http_cache = http_cache
+        # Optional checkpoint journal: completed pages survive crashes and restarts
+        self.journal_path = journal_path
+        self.journal = None
+
+    def search_request(self, keyword, year=2024, page=1):
+        """URL and query parameters of a contract search results page"""
         params = {
             'buscar': keyword,
             'dataInicial': f'{year}-01-01',
             'dataFinal': f'{year}-12-31',
             'pagina': page,
-            'tamanhoPagina': 15
+            'tamanhoPagina': PAGE_SIZE
         }
+        return f"{self.base_url}/contratos/consulta", params
+
+    def fetch_contract_page(self, keyword, year=2024, page=1):
+        """Fetch contract search results page"""
+        search_url, params = self.search_request(keyword, year, page)
 
         try:
-            response = self.session.get(search_url, params=params, timeout=30)
-            if response.status_code == 200:
-                return response.text
+            status, text = cached_get(self.session, self.http_cache, search_url, params)
+            if status == 200:
+                return text
             else:
-                logger.warning(f"HTTP {response.status_code} for keyword: {keyword}")
+                logger.warning(f"HTTP {status} for keyword: {keyword}")
                 return None
         except Exception as e:
             logger.error(f"Error fetching {keyword}: {e}")
@@ -83,32 +129,14 @@ class RealPortalTransparenciaExtractor:
         if not html_content:
             return []
 
-        soup = BeautifulSoup(html_content, 'html.parser')
         contracts = []
+        # Single lxml pass over the page (see src/contract_extraction.py)
+        candidates = candidate_texts(html_content)
+        logger.info(f"Found {len(candidates)} potential contract elements for '{keyword}'")
 
-        # Look for contract result containers
-        # This searches for various possible HTML structures
-        contract_elements = (
-            soup.find_all('div', class_=re.compile(r'.*resultado.*|.*contrato.*|.*item.*', re.I)) +
-            soup.find_all('tr', class_=re.compile(r'.*resultado.*|.*linha.*|.*item.*', re.I)) +
-            soup.find_all('article') +
-            soup.find_all('div', {'id': re.compile(r'.*resultado.*|.*contrato.*', re.I)})
-        )
-
-        # Also check for tables with contract data
-        tables = soup.find_all('table')
-        for table in tables:
-            rows = table.find_all('tr')[1:]  # Skip header
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 4:  # Minimum expected columns
-                    contract_elements.append(row)
-
-        logger.info(f"Found {len(contract_elements)} potential contract elements for '{keyword}'")
-
-        for element in contract_elements[:10]:  # Limit to first 10 results
+        for text in candidates:
             try:
-                contract_data = self.extract_contract_details(element, keyword)
+                contract_data = self.extract_contract_details(text, keyword)
                 if contract_data and self.is_valid_contract(contract_data):
                     contracts.append(contract_data)
             except Exception as e:
@@ -123,62 +151,34 @@ class RealPortalTransparenciaExtractor:
 
         return contracts
 
-    def extract_contract_details(self, element, keyword):
-        """Extract individual contract details from HTML element"""
+    def parse_result_count(self, html_content):
+        """Total number of results announced on a search page (None if not found)"""
+        if not html_content:
+            return None
+        text = re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', ' ', html_content))
+        for pattern in RESULT_COUNT_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return int(match.group(1).replace('.', ''))
+        return None
+
+    def page_count(self, total):
+        """Pages to fetch for a search, from the result count on its first page"""
+        if total is None:
+            # Unknown total: keep paginating until a page brings nothing new
+            return MAX_PAGES
+        return max(1, min(MAX_PAGES, math.ceil(total / PAGE_SIZE)))
+
+    def extract_contract_details(self, text, keyword):
+        """Extract individual contract details from a candidate element's text"""
         try:
-            text = element.get_text(strip=True)
-
-            # Look for specific patterns in the text
             contract = {
                 'keyword_found': keyword,
                 'categoria': self.classify_contract(keyword),
                 'link': f"{self.base_url}/contratos/consulta?buscar={quote(keyword)}"
             }
-
-            # Try to extract CNPJ
-            cnpj_match = re.search(r'(\d{2}\.?\d{3}\.?\d{3}/?\d{4}-?\d{2})', text)
-            if cnpj_match:
-                contract['cnpj'] = cnpj_match.group(1)
-            else:
-                contract['cnpj'] = 'CNPJ não informado'
-
-            # Try to extract monetary values
-            value_patterns = [
-                r'R\$\s?([\d.,]+)',
-                r'(\d+[.,]\d+[.,]\d+)',
-                r'valor.*?([\d.,]+)'
-            ]
-
-            for pattern in value_patterns:
-                value_match = re.search(pattern, text, re.I)
-                if value_match:
-                    contract['valor'] = f"R$ {value_match.group(1)}"
-                    break
-            else:
-                contract['valor'] = 'Valor não informado'
-
-            # Extract company name (look for patterns)
-            company_patterns = [
-                r'([\w\s]+LTDA\.?)',
-                r'([\w\s]+S\.?A\.?)',
-                r'([\w\s]+EIRELI)',
-                r'([A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-            ]
-
-            for pattern in company_patterns:
-                company_match = re.search(pattern, text)
-                if company_match and len(company_match.group(1)) > 5:
-                    contract['fornecedor'] = company_match.group(1).strip()
-                    break
-            else:
-                contract['fornecedor'] = 'Fornecedor não identificado'
-
-            # Extract description/object
-            if len(text) > 50:
-                # Take a meaningful portion of text as description
-                clean_text = re.sub(r'\s+', ' ', text)
-                contract['objeto'] = clean_text[:240] + '...' if len(clean_text) > 240 else clean_text
-            else:
+            contract.update(extract_fields(text))
+            if contract['objeto'] is None:
                 contract['objeto'] = f'Contratação relacionada a {keyword}'
 
             # Set other required fields with defaults
@@ -234,33 +234,169 @@ class RealPortalTransparenciaExtractor:
             return 'EdTech geral'
 
     def search_all_contracts(self):
-        """Search for all EdTech and language contracts"""
+        """Search for all EdTech and language contracts
+
+        Every keyword/year search is paginated: the first page gives the
+        result count, the remaining pages are fetched concurrently (rate-
+        limited per host) and parsed as they arrive. Pagination stops early
+        at a page holding only contracts already known. Results are kept in
+        query and page order.
+
+        With a journal_path, every completed page is journaled as it is
+        parsed; a restarted sweep skips journaled pages and searches, and the
+        results are assembled from the journal.
+        """
         logger.info("Starting comprehensive contract search...")
+        queries = self.search_queries()
+        if self.journal_path:
+            self.journal = ScrapeJournal(self.journal_path, config={'page_size': PAGE_SIZE})
+            if self.journal.pages_done:
+                logger.info(f"Resuming sweep: {self.journal.queries_done} searches and "
+                            f"{self.journal.pages_done} pages already in {self.journal_path}")
+        try:
+            asyncio.run(self._search_all_async(queries))
+        finally:
+            if self.journal is not None:
+                self.journal.close()
+        if self.journal is not None:
+            self.results = self.journal.contracts(queries)
+
+        # Remove duplicates
+        unique_contracts = self.deduplicate_contracts()
+        self.results = self.drop_known_contracts(unique_contracts)
 
-        for year in [2023, 2024]:
-            logger.info(f"Processing year: {year}")
+        logger.info(f"Total unique contracts found: {len(self.results)}")
+        return self.results
 
-            for keyword in self.all_keywords:
-                logger.info(f"Searching for: '{keyword}' in {year}")
+    def fetcher_headers(self):
+        """Session headers for the async fetcher (aiohttp negotiates encoding and keep-alive)"""
+        return {key: value for key, value in self.session.headers.items()
+                if key not in ('Accept-Encoding', 'Connection')}
 
-                try:
-                    html_content = self.fetch_contract_page(keyword, year)
-                    if html_content:
-                        contracts = self.parse_contract_list(html_content, keyword)
-                        self.results.extend(contracts)
-                        logger.info(f"Found {len(contracts)} contracts for '{keyword}'")
+    def search_queries(self):
+        return [(keyword, year) for year in SEARCH_YEARS for keyword in self.all_keywords]
 
-                    time.sleep(3)  # Respectful delay
+    async def _search_all_async(self, queries):
+        # Read-only here: contracts are registered once saved (register_saved_contracts)
+        index = DedupIndex(self.dedup_index_path, key_columns=SCRAPER_KEY_COLUMNS) if self.dedup_index_path else None
 
-                except Exception as e:
-                    logger.error(f"Error processing keyword '{keyword}': {e}")
-                    continue
+        try:
+            async with AsyncFetcher(headers=self.fetcher_headers(), max_concurrency=MAX_CONCURRENCY,
+                                    rate_per_host=REQUESTS_PER_SECOND, cache=self.http_cache) as fetcher:
+                found = await asyncio.gather(
+                    *(self.search_keyword_pages(fetcher, keyword, year, index) for keyword, year in queries),
+                    return_exceptions=True
+                )
+        finally:
+            if index is not None:
+                index.close()
+
+        for (keyword, year), contracts in zip(queries, found):
+            if isinstance(contracts, Exception):
+                logger.error(f"Error processing keyword '{keyword}' for year {year}: {contracts}")
+                continue
+            self.results.extend(contracts)
 
-        # Remove duplicates
-        unique_contracts = self.deduplicate_contracts()
-        self.results = unique_contracts
+    async def search_keyword_pages(self, fetcher, keyword, year, index=None):
+        """All result pages of one keyword/year search
 
-        logger.info(f"Total unique contracts found: {len(self.results)}")
+        Pages after the first are requested in windows of MAX_CONCURRENCY and
+        parsed as each response arrives. Pagination stops at the first page
+        (in page order) that fails or has no contract unseen in this search
+        or in the persistent dedup index.
+        """
+        if self.journal is not None and self.journal.is_done(keyword, year):
+            return self.journal.query_contracts(keyword, year)
+
+        seen = set()
+        first = await self.fetch_search_page(fetcher, keyword, year, 1)
+        if first is None:
+            return []
+
+        contracts, total = first
+        pages = [1]
+        last_page = self.page_count(total)
+        stopped = not self.new_contracts(contracts, seen, index)
+
+        page = 2
+        while not stopped and page <= last_page:
+            window = list(range(page, min(page + MAX_CONCURRENCY, last_page + 1)))
+            parsed = await asyncio.gather(*(self.fetch_search_page(fetcher, keyword, year, p) for p in window))
+
+            for p, result in zip(window, parsed):
+                if result is None:
+                    # Not journaled as done: a restart retries from this page
+                    logger.warning(f"Page {p} failed for keyword: {keyword} ({year}); stopping pagination")
+                    return contracts
+                if not self.new_contracts(result[0], seen, index):
+                    logger.info(f"Page {p} for '{keyword}' in {year} has only known contracts; stopping")
+                    stopped = True
+                    break
+                contracts.extend(result[0])
+                pages.append(p)
+            page += len(window)
+
+        if self.journal is not None:
+            self.journal.record_query(keyword, year, pages)
+        logger.info(f"Found {len(contracts)} contracts for '{keyword}' in {year} ({len(pages)} pages)")
+        return contracts
+
+    async def fetch_search_page(self, fetcher, keyword, year, page):
+        """(contracts, result count) of one results page, or None if it failed
+
+        Pages already in the journal are not fetched again; fetched pages are
+        journaled as soon as they are parsed.
+        """
+        if self.journal is not None:
+            done = self.journal.page(keyword, year, page)
+            if done is not None:
+                contracts, total = done
+                return list(contracts), total
+
+        result = await fetcher.fetch(*self.search_request(keyword, year, page))
+        if not result.ok:
+            problem = f"HTTP {result.status}" if result.status else result.error
+            logger.warning(f"{problem} for keyword: {keyword} ({year}), page {page}")
+            return None
+
+        contracts = self.parse_contract_list(result.text, keyword)
+        total = self.parse_result_count(result.text) if page == 1 else None
+        if self.journal is not None:
+            self.journal.record_page(keyword, year, page, contracts, total)
+        return contracts, total
+
+    def new_contracts(self, contracts, seen, index=None):
+        """Number of contracts on a page not in ``seen`` nor in the dedup index; updates ``seen``"""
+        if not contracts:
+            return 0
+        df = pd.DataFrame(contracts)
+        hashes = key_hashes(df, SCRAPER_KEY_COLUMNS)
+        known = index.contains(df) if index is not None else [False] * len(df)
+        new = {h for h, k in zip(hashes.tolist(), known) if h not in seen and not k}
+        seen.update(hashes.tolist())
+        return len(new)
+
+    def replay_archive(self):
+        """Re-parse every archived search page without touching the portal
+
+        Each snapshot is parsed with the current parser; the keyword comes
+        from the ``buscar`` parameter of the archived URL.
+        """
+        if self.http_cache is None:
+            raise ValueError("replay_archive needs an http_cache")
+
+        search_url, _ = self.search_request('')
+        pages = 0
+        for url, fetched_at, html in self.http_cache.iter_archive(search_url):
+            keyword = parse_qs(urlsplit(url).query).get('buscar', [''])[0]
+            try:
+                self.results.extend(self.parse_contract_list(html, keyword))
+                pages += 1
+            except Exception as e:
+                logger.error(f"Error parsing archived page {url} ({fetched_at}): {e}")
+
+        self.results = self.deduplicate_contracts()
+        logger.info(f"Replayed {pages} archived pages: {len(self.results)} unique contracts")
         return self.results
 
     def deduplicate_contracts(self):
@@ -282,7 +418,43 @@ class RealPortalTransparenciaExtractor:
                 seen.add(key)
                 unique_contracts.append(contract)
 
-        return unique_contracts
+        if len(unique_contracts) < 2:
+            return unique_contracts
+
+        # Near-duplicates (reworded objeto, differently formatted valor) keep one canonical record
+        linkage = link_records(pd.DataFrame(unique_contracts))
+        canonical = linkage.records['is_canonical'].to_numpy()
+        merged = len(unique_contracts) - linkage.n_clusters
+        if merged:
+            logger.info(f"Record linkage merged {merged} near-duplicate contracts")
+
+        return [contract for contract, keep in zip(unique_contracts, canonical) if keep]
+
+    def drop_known_contracts(self, contracts):
+        """Keep only contracts not seen in earlier runs (persistent dedup index)
+
+        Read-only: the kept contracts are registered by register_saved_contracts
+        after they are written, so a failed save does not lose them.
+        """
+        if not self.dedup_index_path or not contracts:
+            return contracts
+
+        with DedupIndex(self.dedup_index_path, key_columns=SCRAPER_KEY_COLUMNS) as index:
+            new = index.unknown_mask(pd.DataFrame(contracts))
+
+        logger.info(f"Dedup index: {int(new.sum())} new contracts, {len(contracts) - int(new.sum())} seen in earlier runs")
+        kept = [contract for contract, keep in zip(contracts, new) if keep]
+        # Snapshot of the keys as scraped: saving may shorten or fill in fields
+        self.pending_keys = pd.DataFrame(kept, columns=list(SCRAPER_KEY_COLUMNS)) if kept else None
+        return kept
+
+    def register_saved_contracts(self):
+        """Record the contracts kept by drop_known_contracts in the dedup index"""
+        if self.pending_keys is None:
+            return
+        with DedupIndex(self.dedup_index_path, key_columns=SCRAPER_KEY_COLUMNS) as index:
+            index.register(self.pending_keys, source=SOURCE_NAME)
+        self.pending_keys = None
 
     def save_results(self, filename="results/contratos_edtech_idiomas_final.csv"):
         """Save extracted contracts to CSV"""
@@ -302,9 +474,13 @@ class RealPortalTransparenciaExtractor:
         import os
         os.makedirs(os.path.dirname(filename), exist_ok=True)
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        # With the dedup index each run only holds new contracts: append to the history
+        append = bool(self.dedup_index_path) and os.path.exists(filename)
+
+        with open(filename, 'a' if append else 'w', newline='', encoding='utf-8') as csvfile:
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+            if not append:
+                writer.writeheader()
 
             for contract in self.results:
                 # Ensure all required fields exist
@@ -315,6 +491,8 @@ class RealPortalTransparenciaExtractor:
                 writer.writerow(contract)
 
         logger.info(f"Results saved to: {filename}")
+        # Only now that the file holds them are the new contracts marked as seen
+        self.register_saved_contracts()
         return filename
 
     def generate_summary(self):
@@ -347,14 +525,34 @@ e detalhes específicos consultando os links fornecidos.
 
 def main():
     """Main execution function"""
-    extractor = RealPortalTransparenciaExtractor()
+    parser = argparse.ArgumentParser(description="Extract EdTech and language contracts from the Portal da Transparência")
+    parser.add_argument("--cache-dir", default=DEFAULT_HTTP_CACHE, help="HTTP response cache directory")
+    parser.add_argument("--offline", action="store_true", help="Serve pages only from the HTTP cache")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached pages (responses are still stored)")
+    parser.add_argument("--replay", action="store_true",
+                        help="Re-parse all archived search pages instead of searching")
+    parser.add_argument("--journal", default=DEFAULT_SCRAPE_JOURNAL,
+                        help="Checkpoint journal; an interrupted sweep resumes from it")
+    parser.add_argument("--fresh", action="store_true", help="Discard the journal of an interrupted sweep")
+    args = parser.parse_args()
+
+    if args.fresh:
+        Path(args.journal).unlink(missing_ok=True)
+
+    mode = 'offline' if args.offline or args.replay else 'refresh' if args.refresh else 'default'
+    http_cache = HttpCache(args.cache_dir, mode=mode)
+    extractor = RealPortalTransparenciaExtractor(dedup_index_path=DEFAULT_SCRAPER_INDEX, http_cache=http_cache,
+                                                 journal_path=args.journal)
 
     # Extract contracts
-    contracts = extractor.search_all_contracts()
+    contracts = extractor.replay_archive() if args.replay else extractor.search_all_contracts()
 
     if contracts:
         # Save results
         csv_file = extractor.save_results()
+        if csv_file and extractor.journal is not None:
+            # Sweep saved: the next run starts a new one
+            extractor.journal.discard()
 
         # Print summary
         print(extractor.generate_summary())
@@ -9,25 +9,21 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
-import re
 from collections import Counter
+from pathlib import Path
+import sys
+
+# Parsers compartilhados de valores/datas (src/parsers_br.py)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from parsers_br import parse_brl, parse_datas
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RADAR_IDIOMAS = PROJECT_ROOT / "outputs" / "radar_idiomas.csv"
 
 # Configuração de estilo para gráficos
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
-def clean_valor(valor_str):
-    """Converte string de valor para float"""
-    if pd.isna(valor_str):
-        return 0
-    # Remove R$, pontos e converte vírgula para ponto
-    valor_clean = re.sub(r'R\$\s*', '', str(valor_str))
-    valor_clean = valor_clean.replace('.', '').replace(',', '.')
-    try:
-        return float(valor_clean)
-    except:
-        return 0
-
 def calcular_hhi(fornecedores):
     """Calcula o Índice Herfindahl-Hirschman (concentração de mercado)"""
     contagens = Counter(fornecedores)
@@ -271,11 +267,11 @@ def projecoes_2025(df):
 def main():
     """Função principal da análise"""
     # Carregar dados
-    df = pd.read_csv('/home/danielfugisawa/pesquisa_prospect_gov/outputs/radar_idiomas.csv')
+    df = pd.read_csv(RADAR_IDIOMAS)
 
     # Limpeza e preparação dos dados
-    df['valor_numerico'] = df['valor'].apply(clean_valor)
-    df['data'] = pd.to_datetime(df['data'])
+    df['valor_numerico'] = parse_brl(df['valor'], fill_value=0)
+    df['data'] = parse_datas(df['data'])
 
     print("ANÁLISE PERFIL DOS CONTRATOS VENCEDORES - IDIOMAS")
     print("Radar de Contratos Governamentais 2023")
@@ -8,45 +8,53 @@ import pandas as pd
 import numpy as np
 import json
 from datetime import datetime
-import re
+from pathlib import Path
+import sys
+
+# Parsers e índice de órgãos compartilhados (src/)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from contract_store import get_contract_store, reais
+from orgao_index import get_orgao_index, MINISTERIO
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ANALYSIS_DIR = PROJECT_ROOT / "analysis"
 
 class SubstituteAnalyzer:
     def __init__(self):
         self.edtech_data = None
         self.idiomas_data = None
         self.merged_data = None
+        self.orgaos = get_orgao_index()
+        self.idiomas_rollup = None
+        self._mission_scores = {}
 
-    def load_data(self):
-        """Carrega dados dos radares EdTech e Idiomas"""
+    def load_data(self, store=None):
+        """Carrega dados dos radares EdTech e Idiomas do contract store"""
         print("🔄 Carregando dados...")
+        store = store or get_contract_store()
 
         # Carregar dados EdTech
         try:
-            self.edtech_data = pd.read_csv('/home/danielfugisawa/pesquisa_prospect_gov/outputs/radar_edtech.csv')
+            self.edtech_data = store.load(categorias=['EdTech geral'])
             print(f"✅ EdTech data: {len(self.edtech_data)} registros")
         except Exception as e:
             print(f"❌ Erro ao carregar dados EdTech: {e}")
 
         # Carregar dados Idiomas
         try:
-            self.idiomas_data = pd.read_csv('/home/danielfugisawa/pesquisa_prospect_gov/outputs/radar_idiomas.csv')
+            self.idiomas_data = store.load(categorias=['Idiomas'])
             print(f"✅ Idiomas data: {len(self.idiomas_data)} registros")
         except Exception as e:
             print(f"❌ Erro ao carregar dados Idiomas: {e}")
 
-    def clean_currency(self, value):
-        """Limpa valores monetários"""
-        if pd.isna(value):
-            return 0
-        if isinstance(value, str):
-            # Remove R$, pontos e vírgulas, converte para float
-            clean_value = re.sub(r'[R$\s\.]', '', value)
-            clean_value = clean_value.replace(',', '.')
-            try:
-                return float(clean_value)
-            except:
-                return 0
-        return float(value)
+        # ID canônico do órgão (UASG/aliases) para os joins entre radares
+        for df in (self.edtech_data, self.idiomas_data):
+            if df is not None:
+                df['orgao_id'] = self.orgaos.keys(df['orgao'], df.get('uasg'))
+
+        # Contratos de idiomas por ministério/autarquia, calculados uma vez
+        if self.idiomas_data is not None:
+            self.idiomas_rollup = self.orgaos.rollup(self.idiomas_data.assign(contratos=1), ['contratos'])
 
     def analyze_edtech_patterns(self):
         """Analisa padrões de compra de EAD genérico"""
@@ -58,15 +66,16 @@ class SubstituteAnalyzer:
             return
 
         # Limpar valores monetários
-        self.edtech_data['valor_numerico'] = self.edtech_data['valor'].apply(self.clean_currency)
+        self.edtech_data['valor_numerico'] = reais(self.edtech_data).fillna(0)
 
         # Análise por órgão
-        orgao_stats = self.edtech_data.groupby('orgao').agg({
+        orgao_stats = self.edtech_data.groupby('orgao_id').agg({
             'valor_numerico': ['sum', 'count', 'mean'],
             'fornecedor': 'nunique'
         }).round(2)
 
         orgao_stats.columns = ['Total_Gasto', 'Num_Contratos', 'Media_Contrato', 'Num_Fornecedores']
+        orgao_stats.index = pd.Index(self.orgaos.names(orgao_stats.index), name='orgao')
         orgao_stats = orgao_stats.sort_values('Total_Gasto', ascending=False)
 
         print("\n🏛️ TOP ÓRGÃOS EM EAD GENÉRICO:")
@@ -87,16 +96,16 @@ class SubstituteAnalyzer:
             print("❌ Dados incompletos")
             return
 
-        # Órgãos com EAD
-        edtech_orgaos = set(self.edtech_data['orgao'].unique())
+        # Órgãos com EAD (por ID canônico, não pelo nome exibido)
+        edtech_orgaos = set(self.edtech_data['orgao_id'].unique())
         print(f"📚 Órgãos com EAD genérico: {len(edtech_orgaos)}")
 
         # Órgãos com idiomas
-        idiomas_orgaos = set(self.idiomas_data['orgao'].unique())
+        idiomas_orgaos = set(self.idiomas_data['orgao_id'].unique())
         print(f"🗣️ Órgãos com soluções de idiomas: {len(idiomas_orgaos)}")
 
         # GAP: tem EAD mas não tem idiomas
-        gap_orgaos = edtech_orgaos - idiomas_orgaos
+        gap_orgaos = set(self.orgaos.names(pd.Index(list(edtech_orgaos - idiomas_orgaos))))
         print(f"🎯 ÓRGÃOS COM GAP (EAD sim, idiomas não): {len(gap_orgaos)}")
 
         print("\n📋 LISTA DE ÓRGÃOS COM GAP:")
@@ -106,8 +115,17 @@ class SubstituteAnalyzer:
         return gap_orgaos
 
     def calculate_mission_need_score(self, orgao):
-        """Calcula score de necessidade missional de idiomas (0-5)"""
+        """Calcula score de necessidade missional de idiomas (0-5)
+
+        Calculado uma vez por órgão canônico, sobre o nome canônico, de modo
+        que aliases e siglas ("MRE", "Itamaraty") recebem o mesmo score.
+        """
+        chave = self.orgaos.key(orgao)
+        if chave not in self._mission_scores:
+            self._mission_scores[chave] = self._mission_need_from_name(self.orgaos.canonical_name(orgao))
+        return self._mission_scores[chave]
 
+    def _mission_need_from_name(self, orgao):
         # Mapeamento de necessidades por tipo de órgão
         high_need_keywords = [
             'relações exteriores', 'exterior', 'relações internacionais',
@@ -221,6 +239,11 @@ class SubstituteAnalyzer:
 
         # Converter para DataFrame e ordenar por score
         substitute_df = pd.DataFrame(substitute_candidates)
+        if not substitute_df.empty and self.idiomas_rollup is not None:
+            # Idiomas já contratados no mesmo ministério facilitam a adesão (roll-up da hierarquia)
+            substitute_df['contratos_idiomas_ministerio'] = self.orgaos.rollup_values(
+                self.orgaos.keys(substitute_df['orgao']), self.idiomas_rollup, 'contratos', MINISTERIO
+            ).astype(int)
         substitute_df = substitute_df.sort_values('score_total', ascending=False)
 
         return substitute_df
@@ -292,15 +315,15 @@ class SubstituteAnalyzer:
         print("=" * 25)
 
         # Salvar tabela principal
-        substitute_df.to_csv('/home/danielfugisawa/pesquisa_prospect_gov/analysis/mapa_substitutos_edtech_idiomas.csv', index=False)
+        substitute_df.to_csv(ANALYSIS_DIR / 'mapa_substitutos_edtech_idiomas.csv', index=False)
         print("✅ Tabela principal salva")
 
         # Salvar matriz de timeline
-        timeline_matrix.to_csv('/home/danielfugisawa/pesquisa_prospect_gov/analysis/matriz_migracao_timeline.csv')
+        timeline_matrix.to_csv(ANALYSIS_DIR / 'matriz_migracao_timeline.csv')
         print("✅ Matriz de migração salva")
 
         # Salvar value propositions
-        with open('/home/danielfugisawa/pesquisa_prospect_gov/analysis/value_propositions.json', 'w', encoding='utf-8') as f:
+        with open(ANALYSIS_DIR / 'value_propositions.json', 'w', encoding='utf-8') as f:
             json.dump(value_props, f, ensure_ascii=False, indent=2)
         print("✅ Value propositions salvas")
 
@@ -380,7 +403,7 @@ class SubstituteAnalyzer:
 *Análise gerada automaticamente baseada em dados de contratos públicos 2023*
 """
 
-        with open('/home/danielfugisawa/pesquisa_prospect_gov/analysis/relatorio_executivo_substitutos.md', 'w', encoding='utf-8') as f:
+        with open(ANALYSIS_DIR / 'relatorio_executivo_substitutos.md', 'w', encoding='utf-8') as f:
             f.write(report)
 
         print("✅ Relatório executivo criado")
@@ -411,7 +434,7 @@ def main():
         analyzer.save_results(substitute_df, timeline_matrix, value_props)
 
         print("\n✅ ANÁLISE CONCLUÍDA COM SUCESSO!")
-        print("📁 Resultados salvos em /home/danielfugisawa/pesquisa_prospect_gov/analysis/")
+        print(f"📁 Resultados salvos em {ANALYSIS_DIR}/")
 
     else:
         print("❌ Nenhum candidato identificado ou erro na análise")
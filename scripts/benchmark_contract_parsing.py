@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Contract page parsing benchmark
+Pages parsed per second by the previous BeautifulSoup/html.parser extraction
+(four find_all passes + table walk, regexes given as strings per element)
+and by the single-pass lxml engine in src/contract_extraction.py.
+
+Pages come from the scrapers' HTTP cache archive; with an empty archive (or
+--synthetic N) synthetic search pages are generated instead.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from contract_extraction import candidate_texts, extract_fields
+from http_cache import DEFAULT_HTTP_CACHE, HttpCache
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def legacy_extract(html_content):
+    """Extraction as parse_contract_list/extract_contract_details did it before the lxml engine"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    elements = (
+        soup.find_all('div', class_=re.compile(r'.*resultado.*|.*contrato.*|.*item.*', re.I)) +
+        soup.find_all('tr', class_=re.compile(r'.*resultado.*|.*linha.*|.*item.*', re.I)) +
+        soup.find_all('article') +
+        soup.find_all('div', {'id': re.compile(r'.*resultado.*|.*contrato.*', re.I)})
+    )
+    for table in soup.find_all('table'):
+        for row in table.find_all('tr')[1:]:
+            if len(row.find_all(['td', 'th'])) >= 4:
+                elements.append(row)
+
+    contracts = []
+    for element in elements:
+        text = element.get_text(strip=True)
+        contract = {}
+        cnpj_match = re.search(r'(\d{2}\.?\d{3}\.?\d{3}/?\d{4}-?\d{2})', text)
+        contract['cnpj'] = cnpj_match.group(1) if cnpj_match else 'CNPJ não informado'
+        for pattern in [r'R\$\s?([\d.,]+)', r'(\d+[.,]\d+[.,]\d+)', r'valor.*?([\d.,]+)']:
+            value_match = re.search(pattern, text, re.I)
+            if value_match:
+                contract['valor'] = f"R$ {value_match.group(1)}"
+                break
+        for pattern in [r'([\w\s]+LTDA\.?)', r'([\w\s]+S\.?A\.?)', r'([\w\s]+EIRELI)',
+                        r'([A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)']:
+            company_match = re.search(pattern, text)
+            if company_match and len(company_match.group(1)) > 5:
+                contract['fornecedor'] = company_match.group(1).strip()
+                break
+        if len(text) > 50:
+            contract['objeto'] = re.sub(r'\s+', ' ', text)[:240]
+        contracts.append(contract)
+    return contracts
+
+
+def fast_extract(html_content):
+    return [extract_fields(text) for text in candidate_texts(html_content)]
+
+
+def synthetic_pages(n_pages, rows_per_page=15, seed=0):
+    """Search result pages shaped like the Portal's (navigation, result table, footer)"""
+    rng = random.Random(seed)
+    objetos = ['Plataforma de ensino a distância', 'Curso de língua inglesa para servidores',
+               'Licença de software educacional', 'Ambiente virtual de aprendizagem']
+    pages = []
+    for p in range(n_pages):
+        nav = ''.join(f'<li class="menu-item"><a href="/secao/{i}">Seção {i}</a></li>' for i in range(40))
+        rows = ''.join(
+            f'<tr class="linha-resultado"><td>{rng.randint(10, 99)}.{rng.randint(100, 999)}.{rng.randint(100, 999)}'
+            f'/0001-{rng.randint(10, 99)}</td><td>Empresa {p}-{r} Educacional LTDA</td>'
+            f'<td>R$ {rng.randint(1, 999)}.{rng.randint(100, 999)},00</td>'
+            f'<td>{rng.choice(objetos)} - processo {p}/{r}</td><td>Ministério da Educação</td></tr>'
+            for r in range(rows_per_page)
+        )
+        pages.append(
+            f'<html><head><script>var dados = {{}};</script><style>td {{ padding: 2px }}</style></head>'
+            f'<body><ul class="menu">{nav}</ul><div id="resultado-busca"><p>Exibindo 1 a {rows_per_page} '
+            f'de {rows_per_page * 20} registros</p><table><thead><tr><th>CNPJ</th><th>Fornecedor</th>'
+            f'<th>Valor</th><th>Objeto</th><th>Órgão</th></tr></thead><tbody>{rows}</tbody></table></div>'
+            f'<footer>{"<p>Portal da Transparência</p>" * 20}</footer></body></html>'
+        )
+    return pages
+
+
+def pages_per_second(extract, pages, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages:
+            extract(html)
+        best = min(best, time.perf_counter() - start)
+    return len(pages) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark contract page extraction (before/after)")
+    parser.add_argument("--cache-dir", default=str(PROJECT_ROOT / DEFAULT_HTTP_CACHE),
+                        help="HTTP cache with the archived search pages")
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic pages instead of the archive")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    pages = []
+    if not args.synthetic and Path(args.cache_dir).exists():
+        with HttpCache(args.cache_dir, mode='offline') as cache:
+            pages = [html for _, _, html in cache.iter_archive()]
+    source = f"{len(pages)} archived pages"
+    if not pages:
+        pages = synthetic_pages(args.synthetic or 200)
+        source = f"{len(pages)} synthetic pages"
+
+    legacy_counts = [len(legacy_extract(html)) for html in pages]
+    fast_counts = [len(fast_extract(html)) for html in pages]
+    print(f"Pages: {source}")
+    print(f"Candidates: legacy {sum(legacy_counts)}, lxml {sum(fast_counts)} "
+          "(legacy counts rows matched by both class and table walk twice)")
+
+    before = pages_per_second(legacy_extract, pages, args.repeat)
+    after = pages_per_second(fast_extract, pages, args.repeat)
+    print(f"Before (BeautifulSoup html.parser): {before:8.1f} pages/s")
+    print(f"After  (lxml single pass):          {after:8.1f} pages/s")
+    print(f"Speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
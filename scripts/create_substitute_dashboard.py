@@ -10,9 +10,13 @@ import seaborn as sns
 import numpy as np
 import json
 from datetime import datetime
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ANALYSIS_DIR = PROJECT_ROOT / "analysis"
+
 # Configurar estilo
 plt.style.use('default')
 sns.set_palette("husl")
@@ -25,9 +29,9 @@ class SubstituteDashboard:
     def load_data(self):
         """Carrega dados da análise"""
         try:
-            self.substitute_data = pd.read_csv('/home/danielfugisawa/pesquisa_prospect_gov/analysis/mapa_substitutos_edtech_idiomas.csv')
+            self.substitute_data = pd.read_csv(ANALYSIS_DIR / 'mapa_substitutos_edtech_idiomas.csv')
 
-            with open('/home/danielfugisawa/pesquisa_prospect_gov/analysis/financial_projections.json', 'r') as f:
+            with open(ANALYSIS_DIR / 'financial_projections.json', 'r') as f:
                 self.financial_data = json.load(f)
 
             print("✅ Dados carregados com sucesso")
@@ -101,7 +105,7 @@ class SubstituteDashboard:
 
         plt.colorbar(scatter, ax=ax4, label='Score Total')
         plt.tight_layout()
-        plt.savefig('/home/danielfugisawa/pesquisa_prospect_gov/analysis/substitute_opportunities_overview.png',
+        plt.savefig(ANALYSIS_DIR / 'substitute_opportunities_overview.png',
                    dpi=300, bbox_inches='tight')
         plt.close()
 
@@ -147,7 +151,7 @@ class SubstituteDashboard:
                         xytext=(0,10), ha='center', fontweight='bold')
 
         plt.tight_layout()
-        plt.savefig('/home/danielfugisawa/pesquisa_prospect_gov/analysis/financial_projections.png',
+        plt.savefig(ANALYSIS_DIR / 'financial_projections.png',
                    dpi=300, bbox_inches='tight')
         plt.close()
 
@@ -200,7 +204,7 @@ class SubstituteDashboard:
         ax.grid(True, alpha=0.3)
 
         plt.tight_layout()
-        plt.savefig('/home/danielfugisawa/pesquisa_prospect_gov/analysis/strategy_matrix.png',
+        plt.savefig(ANALYSIS_DIR / 'strategy_matrix.png',
                    dpi=300, bbox_inches='tight')
         plt.close()
 
@@ -296,7 +300,7 @@ class SubstituteDashboard:
             ax4.text(bar.get_x() + bar.get_width()/2., height + 20000,
                     f'R$ {value:,.0f}', ha='center', va='bottom', fontweight='bold', fontsize=9)
 
-        plt.savefig('/home/danielfugisawa/pesquisa_prospect_gov/analysis/executive_dashboard.png',
+        plt.savefig(ANALYSIS_DIR / 'executive_dashboard.png',
                    dpi=300, bbox_inches='tight')
         plt.close()
 
@@ -479,7 +483,7 @@ class SubstituteDashboard:
 *Gerado em {datetime.now().strftime('%Y-%m-%d %H:%M')}*
 """
 
-        with open('/home/danielfugisawa/pesquisa_prospect_gov/analysis/RELATORIO_FINAL_SUBSTITUTOS.md', 'w', encoding='utf-8') as f:
+        with open(ANALYSIS_DIR / 'RELATORIO_FINAL_SUBSTITUTOS.md', 'w', encoding='utf-8') as f:
             f.write(report)
 
 def main():
@@ -5,127 +5,238 @@ Processes and deduplicates collected EdTech and language learning contracts
 """
 
 import pandas as pd
+import numpy as np
+import argparse
 import re
 from datetime import datetime
 import os
 import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from parsers_br import format_cnpj, parse_datas
+from record_linkage import link_records
+from dedup_index import DedupIndex
+
+# Columns that identify a contract for deduplication
+DEDUP_COLUMNS = ['cnpj', 'objeto', 'data']
+
+# Category value → output file
+CATEGORY_OUTPUTS = {
+    'EdTech geral': 'radar_edtech.csv',
+    'Idiomas': 'radar_idiomas.csv',
+}
+
+DEFAULT_CHUNKSIZE = 100_000
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Columns of the persistent dedup index key (same key as deduplicate_data)
+INDEX_KEY_COLUMNS = ('cnpj', 'objeto', 'data')
 
 def normalize_cnpj(cnpj):
-    """Normalize CNPJ to XX.XXX.XXX/XXXX-XX format"""
-    if pd.isna(cnpj) or cnpj == "CNPJ não informado":
-        return cnpj
-
-    # Remove all non-numeric characters
-    clean_cnpj = re.sub(r'[^\d]', '', str(cnpj))
-
-    # Check if we have 14 digits
-    if len(clean_cnpj) == 14:
-        # Format as XX.XXX.XXX/XXXX-XX
-        formatted = f"{clean_cnpj[:2]}.{clean_cnpj[2:5]}.{clean_cnpj[5:8]}/{clean_cnpj[8:12]}-{clean_cnpj[12:14]}"
-        return formatted
-    else:
-        return cnpj  # Return original if not 14 digits
+    """Normalize a CNPJ column to XX.XXX.XXX/XXXX-XX format
+
+    Values without exactly 14 digits (including "CNPJ não informado") are kept as is.
+    """
+    return format_cnpj(cnpj, keep_invalid=True)
 
 def normalize_date(date_str):
-    """Normalize date to YYYY-MM-DD format"""
-    if pd.isna(date_str):
-        return date_str
+    """Normalize a date column to YYYY-MM-DD format
 
-    try:
-        # Try parsing as YYYY-MM-DD first
-        parsed_date = pd.to_datetime(date_str, format='%Y-%m-%d')
-        return parsed_date.strftime('%Y-%m-%d')
-    except:
-        try:
-            # Try other common formats
-            parsed_date = pd.to_datetime(date_str)
-            return parsed_date.strftime('%Y-%m-%d')
-        except:
-            return date_str  # Return original if parsing fails
+    One strict YYYY-MM-DD pass, then an inferred-format pass only on the
+    rows that failed; values that still cannot be parsed are kept as is.
+    """
+    parsed = parse_datas(date_str, formats=('%Y-%m-%d',))
+    return parsed.dt.strftime('%Y-%m-%d').where(parsed.notna(), date_str)
 
 def normalize_currency(value_str):
-    """Normalize currency values to consistent format"""
-    if pd.isna(value_str) or value_str == "Valor não informado":
-        return value_str
-
-    # Keep the R$ prefix but ensure consistent formatting
-    if isinstance(value_str, str):
-        # Remove extra spaces and normalize
-        normalized = re.sub(r'\s+', ' ', value_str.strip())
-        # Ensure R$ format
-        if not normalized.startswith('R$'):
-            normalized = f"R$ {normalized}"
+    """Normalize a currency column to a consistent "R$ ..." format"""
+    # Only text values are touched; numbers, NaN and the sentinel are kept
+    is_text = value_str.map(lambda value: isinstance(value, str), na_action='ignore').fillna(False).astype(bool)
+    is_text &= value_str != "Valor não informado"
+
+    normalized = value_str.astype(object)
+    if not is_text.any():
         return normalized
 
-    return value_str
+    text = value_str[is_text].str.strip().str.replace(r'\s+', ' ', regex=True)
+    # Ensure R$ format
+    normalized[is_text] = text.where(text.str.startswith('R$'), 'R$ ' + text)
+    return normalized
 
 def trim_description(description, max_length=240):
-    """Trim description to max_length characters"""
-    if pd.isna(description):
-        return description
-
-    description = str(description).strip()
-    if len(description) <= max_length:
-        return description
+    """Trim a description column to max_length characters"""
+    present = description.notna()
+    text = description[present].astype(str).str.strip()
 
     # Trim and add ellipsis
-    return description[:max_length-3] + "..."
-
-def is_potential_substitute(row):
-    """Identify potential substitutes (generic e-learning with language potential)"""
-    if pd.isna(row['objeto']) or pd.isna(row['categoria']):
-        return False
-
-    objeto_lower = str(row['objeto']).lower()
-    categoria = str(row['categoria']).lower()
-
-    # Look for generic e-learning platforms that could include language learning
-    generic_elearning_keywords = [
-        'plataforma de ensino',
-        'plataforma educacional',
-        'software educacional',
-        'ensino adaptativo',
-        'aprendizagem personalizada',
-        'conteúdo educacional digital',
-        'sistema integrado',
-        'gestão educacional'
-    ]
-
-    language_potential_keywords = [
-        'multilíngue',
-        'internacional',
-        'capacitação',
-        'treinamento',
-        'adaptativo',
-        'personalizado'
-    ]
-
-    # Check if it's EdTech geral with potential for language learning
-    if categoria == 'edtech geral':
-        has_generic = any(keyword in objeto_lower for keyword in generic_elearning_keywords)
-        has_potential = any(keyword in objeto_lower for keyword in language_potential_keywords)
-        return has_generic and has_potential
-
-    return False
+    text = text.where(text.str.len() <= max_length, text.str[:max_length - 3] + "...")
+
+    trimmed = description.astype(object)
+    trimmed[present] = text
+    return trimmed
+
+# Generic e-learning platforms that could include language learning
+GENERIC_ELEARNING_KEYWORDS = [
+    'plataforma de ensino',
+    'plataforma educacional',
+    'software educacional',
+    'ensino adaptativo',
+    'aprendizagem personalizada',
+    'conteúdo educacional digital',
+    'sistema integrado',
+    'gestão educacional'
+]
+
+LANGUAGE_POTENTIAL_KEYWORDS = [
+    'multilíngue',
+    'internacional',
+    'capacitação',
+    'treinamento',
+    'adaptativo',
+    'personalizado'
+]
+
+_GENERIC_ELEARNING_PATTERN = re.compile('|'.join(map(re.escape, GENERIC_ELEARNING_KEYWORDS)))
+_LANGUAGE_POTENTIAL_PATTERN = re.compile('|'.join(map(re.escape, LANGUAGE_POTENTIAL_KEYWORDS)))
+
+def is_potential_substitute(df):
+    """Identify potential substitutes (generic e-learning with language potential)
+
+    Only 'EdTech geral' contracts whose objeto mentions a generic e-learning
+    platform and a language-learning hint qualify. Returns a boolean column.
+    """
+    present = df['objeto'].notna() & df['categoria'].notna()
+    objeto_lower = df['objeto'].astype(str).str.lower()
+    categoria = df['categoria'].astype(str).str.lower()
+
+    has_generic = objeto_lower.str.contains(_GENERIC_ELEARNING_PATTERN, na=False)
+    has_potential = objeto_lower.str.contains(_LANGUAGE_POTENTIAL_PATTERN, na=False)
+
+    return (present & (categoria == 'edtech geral') & has_generic & has_potential).astype(bool)
+
+def dedup_hashes(df):
+    """64-bit hash of the CNPJ + objeto + data key for each row"""
+    return pd.util.hash_pandas_object(df[DEDUP_COLUMNS].astype(str), index=False).to_numpy()
+
+class SeenKeys:
+    """Set of 64-bit dedup key hashes kept as sorted uint64 runs
+
+    Uses 8 bytes per contract instead of a Python string per key, so the
+    seen set of a multi-GB dump fits in memory. It can be saved to .npy and
+    reloaded to dedupe a later dump against what was already processed.
+
+    Each chunk's new hashes become a sorted run; runs are merged LSM-style
+    (the newest two while the older is at most twice the newer), so every
+    hash is merged O(log n) times and there are only O(log n) runs to search.
+    Re-sorting one array per chunk would cost O(n) per chunk, O(n²) in total.
+    """
+
+    def __init__(self, hashes=None):
+        self.runs = [np.unique(np.asarray(hashes, dtype=np.uint64))] if hashes is not None else []
+
+    @property
+    def hashes(self):
+        """All seen hashes as one sorted array (compacts the runs)"""
+        while len(self.runs) > 1:
+            self._merge_last()
+        return self.runs[0] if self.runs else np.empty(0, dtype=np.uint64)
+
+    def __len__(self):
+        return sum(len(run) for run in self.runs)
+
+    def __contains__(self, key):
+        return bool(self._seen(np.array([key], dtype=np.uint64))[0])
+
+    def _seen(self, hashes):
+        # Sorted needles: searchsorted walks each run forward instead of jumping around it
+        order = np.argsort(hashes, kind='stable')
+        needles = hashes[order]
+        seen = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            positions = np.searchsorted(run, needles)
+            inside = positions < len(run)
+            seen[inside] |= run[positions[inside]] == needles[inside]
+        result = np.empty_like(seen)
+        result[order] = seen
+        return result
+
+    def _merge_last(self):
+        newer = self.runs.pop()
+        older = self.runs.pop()
+        # Two sorted runs: the stable sort (timsort) merges them in linear time
+        self.runs.append(np.sort(np.concatenate([older, newer]), kind='stable'))
+
+    def filter_new(self, hashes):
+        """Mask of first occurrences not seen before; marks them as seen"""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        first = ~pd.Series(hashes).duplicated(keep='first').to_numpy()
+        new = first & ~self._seen(hashes)
+
+        if new.any():
+            self.runs.append(np.sort(hashes[new]))
+            while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+                self._merge_last()
+        return new
+
+    def save(self, path):
+        np.save(path, self.hashes)
+
+    @classmethod
+    def load(cls, path):
+        seen = cls()
+        if os.path.exists(path):
+            seen.runs = [np.load(path)]
+        return seen
 
 def deduplicate_data(df):
     """Deduplicate by CNPJ + objeto + data combination"""
-    # Create deduplication key
-    df['dedup_key'] = df['cnpj'].astype(str) + '|' + df['objeto'].astype(str) + '|' + df['data'].astype(str)
-
     # Keep first occurrence of each unique combination
     before_count = len(df)
-    df_deduped = df.drop_duplicates(subset=['dedup_key'], keep='first')
+    df_deduped = df[SeenKeys().filter_new(dedup_hashes(df))]
     after_count = len(df_deduped)
 
     print(f"Deduplication: {before_count} records → {after_count} records ({before_count - after_count} duplicates removed)")
 
-    # Remove the temporary dedup key
-    df_deduped = df_deduped.drop('dedup_key', axis=1)
-
     return df_deduped
 
-def process_contracts_data(input_file, output_dir):
+def filter_incomplete(df):
+    """Remove rows with N/A status or missing critical data"""
+    return df[
+        (df['status'] != 'N/A') &
+        (df['cnpj'] != 'CNPJ não informado') &
+        (df['fornecedor'] != 'Fornecedor não identificado') &
+        (df['valor'] != 'Valor não informado')
+    ].copy()
+
+def normalize_frame(df_clean):
+    """Normalize the fields of a filtered frame (whole file or one chunk)"""
+    # Trim whitespace from all string columns
+    string_columns = df_clean.select_dtypes(include=['object', 'string']).columns
+    for col in string_columns:
+        df_clean[col] = df_clean[col].astype(str).str.strip()
+
+    # Normalize specific fields
+    df_clean['cnpj'] = normalize_cnpj(df_clean['cnpj'])
+    df_clean['data'] = normalize_date(df_clean['data'])
+    df_clean['valor'] = normalize_currency(df_clean['valor'])
+    df_clean['objeto'] = trim_description(df_clean['objeto'], 240)
+
+    # Add potential substitute marker
+    df_clean['potential_substitute'] = is_potential_substitute(df_clean)
+
+    return df_clean
+
+def link_near_duplicates(df):
+    """Collapse near-duplicate contracts (same CNPJ root/órgão/month, similar objeto) to one canonical row"""
+    result = link_records(df)
+    print(f"Record linkage: {len(df)} records → {result.n_clusters} clusters "
+          f"({len(df) - result.n_clusters} near-duplicates merged, {result.n_candidates} candidate pairs)")
+    return result.canonical
+
+def process_contracts_data(input_file, output_dir, fuzzy=False):
     """Main processing function"""
     print(f"Reading data from: {input_file}")
 
@@ -142,35 +253,19 @@ def process_contracts_data(input_file, output_dir):
     initial_count = len(df)
 
     # Filter out rows with N/A status or missing critical data
-    df_clean = df[
-        (df['status'] != 'N/A') &
-        (df['cnpj'] != 'CNPJ não informado') &
-        (df['fornecedor'] != 'Fornecedor não identificado') &
-        (df['valor'] != 'Valor não informado')
-    ].copy()
+    df_clean = filter_incomplete(df)
 
     print(f"Removed {initial_count - len(df_clean)} incomplete records")
 
     # Normalize data fields
     print("Normalizing data fields...")
-
-    # Trim whitespace from all string columns
-    string_columns = df_clean.select_dtypes(include=['object']).columns
-    for col in string_columns:
-        df_clean[col] = df_clean[col].astype(str).str.strip()
-
-    # Normalize specific fields
-    df_clean['cnpj'] = df_clean['cnpj'].apply(normalize_cnpj)
-    df_clean['data'] = df_clean['data'].apply(normalize_date)
-    df_clean['valor'] = df_clean['valor'].apply(normalize_currency)
-    df_clean['objeto'] = df_clean['objeto'].apply(lambda x: trim_description(x, 240))
-
-    # Add potential substitute marker
-    df_clean['potential_substitute'] = df_clean.apply(is_potential_substitute, axis=1)
+    df_clean = normalize_frame(df_clean)
 
     # Deduplicate data
     print("Deduplicating records...")
     df_deduped = deduplicate_data(df_clean)
+    if fuzzy:
+        df_deduped = link_near_duplicates(df_deduped)
 
     # Split into EdTech and Idiomas
     print("Splitting into categories...")
@@ -217,14 +312,152 @@ def process_contracts_data(input_file, output_dir):
 
     return True
 
+def append_category_outputs(df, output_dir):
+    """Append EdTech/Idiomas rows to their outputs (header only for new files)"""
+    written = {}
+    for categoria, name in CATEGORY_OUTPUTS.items():
+        path = os.path.join(output_dir, name)
+        part = df[df['categoria'] == categoria]
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        part.to_csv(path, mode='w' if new_file else 'a', header=new_file, index=False)
+        written[categoria] = len(part)
+    return written
+
+def process_contracts_incremental(input_file, output_dir, index_path, source=None):
+    """Merge a new scrape batch into the outputs without reprocessing history
+
+    Contracts are checked against the persistent DedupIndex (SQLite + Bloom
+    filter); only unseen ones are appended to radar_edtech/radar_idiomas and,
+    once the append succeeded, registered with their source and first-seen
+    timestamp.
+    """
+    source = source or os.path.basename(input_file)
+    print(f"Merging batch from: {input_file} (index: {index_path})")
+
+    try:
+        df = pd.read_csv(input_file, dtype=str)
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return False
+
+    df_clean = normalize_frame(filter_incomplete(df))
+    print(f"Removed {len(df) - len(df_clean)} incomplete records")
+
+    with DedupIndex(index_path, key_columns=INDEX_KEY_COLUMNS) as index:
+        df_new = index.filter_new(df_clean)
+        written = append_category_outputs(df_new, output_dir)
+        index.register(df_new, source=source)
+        indexed = len(index)
+
+    print(f"\n=== INCREMENTAL SUMMARY ===")
+    print(f"Batch records: {len(df)}")
+    print(f"Already known (or repeated in batch): {len(df_clean) - len(df_new)}")
+    print(f"New EdTech geral contracts: {written['EdTech geral']}")
+    print(f"New Idiomas contracts: {written['Idiomas']}")
+    print(f"Contracts in index: {indexed}")
+
+    return True
+
+def process_contracts_streaming(input_file, output_dir, chunksize=DEFAULT_CHUNKSIZE, seen_path=None):
+    """Streaming processing for large dumps, in bounded memory
+
+    Reads the CSV in chunks; each chunk is filtered, normalized, deduplicated
+    against the 64-bit hashes of all previous chunks (SeenKeys) and appended
+    to the EdTech/Idiomas outputs. Only the seen-hash array grows with the
+    input. Rows keep input order (no global sort by data/valor). With
+    ``seen_path`` the hashes are loaded before and saved after the run, so a
+    later dump skips contracts already written; when the file already
+    exists, existing outputs are appended to (like append_category_outputs)
+    instead of being overwritten.
+    """
+    print(f"Streaming data from: {input_file} (chunks of {chunksize})")
+
+    resume = bool(seen_path) and os.path.exists(seen_path)
+    seen = SeenKeys.load(seen_path) if seen_path else SeenKeys()
+    outputs = {categoria: os.path.join(output_dir, name) for categoria, name in CATEGORY_OUTPUTS.items()}
+    written = {categoria: 0 for categoria in outputs}
+    # Files that already have a header: appended to, never truncated
+    started = {categoria: resume and os.path.exists(path) and os.path.getsize(path) > 0
+               for categoria, path in outputs.items()}
+    totals = {'read': 0, 'incomplete': 0, 'duplicates': 0, 'potential_substitutes': 0, 'missing_links': 0}
+
+    # Every column as text: dtypes stay identical across chunks
+    try:
+        reader = pd.read_csv(input_file, chunksize=chunksize, dtype=str)
+        for chunk in reader:
+            totals['read'] += len(chunk)
+
+            df_clean = filter_incomplete(chunk)
+            totals['incomplete'] += len(chunk) - len(df_clean)
+            df_clean = normalize_frame(df_clean)
+
+            new = seen.filter_new(dedup_hashes(df_clean))
+            totals['duplicates'] += int((~new).sum())
+            df_deduped = df_clean[new]
+
+            totals['missing_links'] += int((df_deduped['link'].isna() | (df_deduped['link'] == '')).sum())
+
+            for categoria, path in outputs.items():
+                part = df_deduped[df_deduped['categoria'] == categoria]
+                # Header only on the first write of each file
+                part.to_csv(path, mode='a' if started[categoria] else 'w',
+                            header=not started[categoria], index=False)
+                started[categoria] = True
+                written[categoria] += len(part)
+                if categoria == 'EdTech geral':
+                    totals['potential_substitutes'] += int(part['potential_substitute'].sum())
+    except Exception as e:
+        print(f"Error processing file: {e}")
+        return False
+
+    if seen_path:
+        seen.save(seen_path)
+
+    print(f"\n=== STREAMING SUMMARY ===")
+    print(f"Records read: {totals['read']}")
+    print(f"Removed {totals['incomplete']} incomplete records")
+    print(f"Duplicates removed: {totals['duplicates']}")
+    print(f"EdTech geral contracts: {written['EdTech geral']} → {outputs['EdTech geral']}")
+    print(f"Idiomas contracts: {written['Idiomas']} → {outputs['Idiomas']}")
+    print(f"Potential substitutes identified: {totals['potential_substitutes']}")
+    print(f"Records missing source links: {totals['missing_links']}")
+
+    return True
+
 if __name__ == "__main__":
-    input_file = "/home/danielfugisawa/pesquisa_prospect_gov/results/contratos_edtech_idiomas_FINAL_RADAR.csv"
-    output_dir = "/home/danielfugisawa/pesquisa_prospect_gov/outputs"
+    parser = argparse.ArgumentParser(description="Deduplicate and normalize RADAR contracts")
+    parser.add_argument("--input", type=str,
+                        default=str(PROJECT_ROOT / "results" / "contratos_edtech_idiomas_FINAL_RADAR.csv"),
+                        help="Input contracts CSV")
+    parser.add_argument("--output-dir", type=str,
+                        default=str(PROJECT_ROOT / "outputs"),
+                        help="Directory for radar_edtech.csv / radar_idiomas.csv")
+    parser.add_argument("--stream", action="store_true",
+                        help="Process the input in chunks (bounded memory, input order)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help="Rows per chunk in streaming mode")
+    parser.add_argument("--seen-keys", type=str, default=None,
+                        help="Streaming mode: .npy file of dedup hashes to load and update")
+    parser.add_argument("--index", type=str, default=None,
+                        help="SQLite dedup index: append only contracts not seen in earlier batches")
+    parser.add_argument("--source", type=str, default=None,
+                        help="Provenance label recorded in the index (default: input file name)")
+    parser.add_argument("--fuzzy", action="store_true",
+                        help="Also merge near-duplicates across sources (record linkage, whole-file mode)")
+    args = parser.parse_args()
+
+    input_file = args.input
+    output_dir = args.output_dir
 
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
 
-    success = process_contracts_data(input_file, output_dir)
+    if args.index:
+        success = process_contracts_incremental(input_file, output_dir, args.index, args.source)
+    elif args.stream:
+        success = process_contracts_streaming(input_file, output_dir, args.chunksize, args.seen_keys)
+    else:
+        success = process_contracts_data(input_file, output_dir, fuzzy=args.fuzzy)
 
     if success:
         print("\n✅ Data processing completed successfully!")
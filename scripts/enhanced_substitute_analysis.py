@@ -8,6 +8,10 @@ import pandas as pd
 import numpy as np
 import json
 from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ANALYSIS_DIR = PROJECT_ROOT / "analysis"
 
 class EnhancedSubstituteAnalyzer:
     def __init__(self):
@@ -16,7 +20,7 @@ class EnhancedSubstituteAnalyzer:
     def load_substitute_data(self):
         """Carrega dados da análise de substitutos"""
         try:
-            self.substitute_data = pd.read_csv('/home/danielfugisawa/pesquisa_prospect_gov/analysis/mapa_substitutos_edtech_idiomas.csv')
+            self.substitute_data = pd.read_csv(ANALYSIS_DIR / 'mapa_substitutos_edtech_idiomas.csv')
             print(f"✅ Dados de substitutos carregados: {len(self.substitute_data)} órgãos")
             return True
         except Exception as e:
@@ -344,23 +348,23 @@ class EnhancedSubstituteAnalyzer:
         print("=" * 30)
 
         # Salvar perfis de universidades
-        with open('/home/danielfugisawa/pesquisa_prospect_gov/analysis/university_profiles.json', 'w', encoding='utf-8') as f:
+        with open(ANALYSIS_DIR / 'university_profiles.json', 'w', encoding='utf-8') as f:
             json.dump(university_profiles, f, ensure_ascii=False, indent=2)
 
         # Salvar estratégias comerciais
-        with open('/home/danielfugisawa/pesquisa_prospect_gov/analysis/commercial_strategies.json', 'w', encoding='utf-8') as f:
+        with open(ANALYSIS_DIR / 'commercial_strategies.json', 'w', encoding='utf-8') as f:
             json.dump(strategies, f, ensure_ascii=False, indent=2)
 
         # Salvar plano de riscos
-        with open('/home/danielfugisawa/pesquisa_prospect_gov/analysis/risk_mitigation.json', 'w', encoding='utf-8') as f:
+        with open(ANALYSIS_DIR / 'risk_mitigation.json', 'w', encoding='utf-8') as f:
             json.dump(risks, f, ensure_ascii=False, indent=2)
 
         # Salvar roadmap
-        with open('/home/danielfugisawa/pesquisa_prospect_gov/analysis/implementation_roadmap.json', 'w', encoding='utf-8') as f:
+        with open(ANALYSIS_DIR / 'implementation_roadmap.json', 'w', encoding='utf-8') as f:
             json.dump(roadmap, f, ensure_ascii=False, indent=2)
 
         # Salvar projeções financeiras
-        with open('/home/danielfugisawa/pesquisa_prospect_gov/analysis/financial_projections.json', 'w', encoding='utf-8') as f:
+        with open(ANALYSIS_DIR / 'financial_projections.json', 'w', encoding='utf-8') as f:
             json.dump(financial_projections, f, ensure_ascii=False, indent=2)
 
         # Criar relatório executivo expandido
@@ -461,7 +465,7 @@ Com base nos sucessos de 2025:
 *Análise estratégica - {datetime.now().strftime('%Y-%m-%d')}*
 """
 
-        with open('/home/danielfugisawa/pesquisa_prospect_gov/analysis/executive_summary_expanded.md', 'w', encoding='utf-8') as f:
+        with open(ANALYSIS_DIR / 'executive_summary_expanded.md', 'w', encoding='utf-8') as f:
             f.write(summary)
 
 def main():
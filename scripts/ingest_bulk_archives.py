@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Portal da Transparência bulk archive ingestion
+Streams the monthly open-data ZIPs (contracts as Latin-1 CSV) into the
+contract store, keeping only EdTech and language contracts.
+
+The classification uses the scrapers' edtech_keywords/language_keywords,
+so bulk and scraped contracts fall into the same categories.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from bulk_ingest import CHUNK_ROWS, KeywordClassifier, find_archives, ingest_archive
+from contract_store import DEFAULT_STORE_PATH, ContractStore
+
+from advanced_portal_scraper import RealPortalTransparenciaExtractor
+from portal_transparencia_scraper import PortalTransparenciaExtractor
+
+
+def scraper_classifier():
+    """KeywordClassifier with the keywords of both Portal scrapers"""
+    edtech, languages = [], []
+    for extractor in (PortalTransparenciaExtractor(), RealPortalTransparenciaExtractor()):
+        edtech.extend(k for k in extractor.edtech_keywords if k not in edtech)
+        languages.extend(k for k in extractor.language_keywords if k not in languages)
+    return KeywordClassifier(edtech, languages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest Portal da Transparência bulk ZIP archives")
+    parser.add_argument("archives", nargs="+", help="ZIP files or directories containing them")
+    parser.add_argument("--store", default=str(DEFAULT_STORE_PATH), help="Contract store SQLite file")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="CSV rows per chunk")
+    parser.add_argument("--member", default="*.csv", help="Glob of the ZIP members to read")
+    parser.add_argument("--force", action="store_true", help="Reingest archives even if unchanged")
+    args = parser.parse_args()
+
+    classifier = scraper_classifier()
+    with ContractStore(args.store) as store:
+        for archive in find_archives(args.archives):
+            stats = {}
+            start = time.perf_counter()
+            rows = ingest_archive(store, archive, classifier, force=args.force,
+                                  chunksize=args.chunk_rows, member_pattern=args.member, stats=stats)
+            if rows is None:
+                print(f"📦 {archive.name}: unchanged")
+                continue
+            print(f"📦 {archive.name}: {stats.get('lidos', 0)} rows read, {rows} EdTech/Idiomas contracts "
+                  f"({time.perf_counter() - start:.1f}s)")
+        print(store.partitions().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,20 +4,40 @@ Portal da Transparência EdTech/Idiomas Contract Scraper
 RADAR EDTECH/IDIOMAS project - Extract education technology contracts
 """
 
+import argparse
+import asyncio
 import requests
 import csv
-import time
 import json
 from datetime import datetime
 from urllib.parse import quote
 import logging
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from dedup_index import DedupIndex, SCRAPER_KEY_COLUMNS, DEFAULT_SCRAPER_INDEX
+from async_fetcher import AsyncFetcher
+from http_cache import DEFAULT_HTTP_CACHE, HttpCache, cached_get
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Provenance label recorded in the dedup index
+SOURCE_NAME = 'portal_transparencia_scraper'
+
+# Politeness limit per host (the sequential sweep slept 2 s between requests)
+REQUESTS_PER_SECOND = 1 / 2
+MAX_CONCURRENCY = 4
+SEARCH_YEARS = [2023, 2024]
+
 class PortalTransparenciaExtractor:
-    def __init__(self):
+    def __init__(self, dedup_index_path=None, http_cache=None):
         self.base_url = "https://portaldatransparencia.gov.br"
         self.session = requests.Session()
         # Set user agent to avoid blocking
@@ -62,25 +82,34 @@ class PortalTransparenciaExtractor:
         self.all_keywords = self.edtech_keywords + self.language_keywords
         self.results = []
 
-    def search_contracts_by_keyword(self, keyword, year=2024):
-        """Search contracts by keyword for a specific year"""
-        logger.info(f"Searching for keyword: '{keyword}' in year {year}")
+        # Optional persistent index: later runs only keep contracts not seen before
+        self.dedup_index_path = dedup_index_path
+        # Keys of the new contracts, registered in the index once they are saved
+        self.pending_keys = None
+        # Optional HttpCache: revalidated responses, raw HTML archive, offline replay
+        self.http_cache = http_cache
 
-        # Try different search endpoints
-        search_urls = [
+    def search_urls(self, keyword, year=2024):
+        """Search endpoints to try, in order"""
+        return [
             f"{self.base_url}/contratos/consulta?buscar={quote(keyword)}&dataInicial={year}-01-01&dataFinal={year}-12-31",
             f"{self.base_url}/contratos/consulta?texto={quote(keyword)}&ano={year}",
             f"{self.base_url}/contratos?q={quote(keyword)}&ano={year}"
         ]
 
-        for url in search_urls:
+    def search_contracts_by_keyword(self, keyword, year=2024):
+        """Search contracts by keyword for a specific year"""
+        logger.info(f"Searching for keyword: '{keyword}' in year {year}")
+
+        # Try different search endpoints
+        for url in self.search_urls(keyword, year):
             try:
-                response = self.session.get(url, timeout=30)
-                if response.status_code == 200:
+                status, text = cached_get(self.session, self.http_cache, url)
+                if status == 200:
                     logger.info(f"Success with URL: {url}")
-                    return self.parse_contract_results(response.text, keyword)
+                    return self.parse_contract_results(text, keyword)
                 else:
-                    logger.warning(f"Failed with status {response.status_code} for URL: {url}")
+                    logger.warning(f"Failed with status {status} for URL: {url}")
             except Exception as e:
                 logger.error(f"Error accessing {url}: {e}")
                 continue
@@ -121,21 +150,46 @@ class PortalTransparenciaExtractor:
         else:
             return 'EdTech geral'
 
-    def extract_all_contracts(self):
-        """Extract all EdTech and language contracts for 2023-2024"""
-        logger.info("Starting contract extraction...")
+    def fetcher_headers(self):
+        """Session headers for the async fetcher (aiohttp negotiates encoding and keep-alive)"""
+        return {key: value for key, value in self.session.headers.items()
+                if key not in ('Accept-Encoding', 'Connection')}
+
+    async def search_contracts_by_keyword_async(self, fetcher, keyword, year=2024):
+        """Async variant of search_contracts_by_keyword on a shared AsyncFetcher"""
+        for url in self.search_urls(keyword, year):
+            result = await fetcher.fetch(url)
+            if result.ok:
+                logger.info(f"Success with URL: {url}")
+                return self.parse_contract_results(result.text, keyword)
+            problem = f"status {result.status}" if result.status else result.error
+            logger.warning(f"Failed with {problem} for URL: {url}")
+
+        return []
 
-        for year in [2023, 2024]:
-            logger.info(f"Processing year: {year}")
+    async def _extract_all_async(self):
+        queries = [(keyword, year) for year in SEARCH_YEARS for keyword in self.all_keywords]
+        async with AsyncFetcher(headers=self.fetcher_headers(), max_concurrency=MAX_CONCURRENCY,
+                                rate_per_host=REQUESTS_PER_SECOND, cache=self.http_cache) as fetcher:
+            found = await asyncio.gather(
+                *(self.search_contracts_by_keyword_async(fetcher, keyword, year) for keyword, year in queries),
+                return_exceptions=True
+            )
+
+        # Results in query order, as in the sequential sweep
+        for (keyword, year), contracts in zip(queries, found):
+            if isinstance(contracts, Exception):
+                logger.error(f"Error processing keyword '{keyword}' for year {year}: {contracts}")
+                continue
+            self.results.extend(contracts)
 
-            for keyword in self.all_keywords:
-                try:
-                    contracts = self.search_contracts_by_keyword(keyword, year)
-                    self.results.extend(contracts)
-                    time.sleep(2)  # Respectful delay
-                except Exception as e:
-                    logger.error(f"Error processing keyword '{keyword}' for year {year}: {e}")
-                    continue
+    def extract_all_contracts(self):
+        """Extract all EdTech and language contracts for 2023-2024
+
+        Keyword × year searches run concurrently, rate-limited per host.
+        """
+        logger.info("Starting contract extraction...")
+        asyncio.run(self._extract_all_async())
 
         # Remove duplicates based on CNPJ and object
         unique_contracts = []
@@ -147,11 +201,37 @@ class PortalTransparenciaExtractor:
                 seen.add(key)
                 unique_contracts.append(contract)
 
-        self.results = unique_contracts
+        self.results = self.drop_known_contracts(unique_contracts)
         logger.info(f"Found {len(self.results)} unique contracts")
 
         return self.results
 
+    def drop_known_contracts(self, contracts):
+        """Keep only contracts not seen in earlier runs (persistent dedup index)
+
+        Read-only: the kept contracts are registered by register_saved_contracts
+        after they are written, so a failed save does not lose them.
+        """
+        if not self.dedup_index_path or not contracts:
+            return contracts
+
+        with DedupIndex(self.dedup_index_path, key_columns=SCRAPER_KEY_COLUMNS) as index:
+            new = index.unknown_mask(pd.DataFrame(contracts))
+
+        logger.info(f"Dedup index: {int(new.sum())} new contracts, {len(contracts) - int(new.sum())} seen in earlier runs")
+        kept = [contract for contract, keep in zip(contracts, new) if keep]
+        # Snapshot of the keys as scraped: saving may shorten or fill in fields
+        self.pending_keys = pd.DataFrame(kept, columns=list(SCRAPER_KEY_COLUMNS)) if kept else None
+        return kept
+
+    def register_saved_contracts(self):
+        """Record the contracts kept by drop_known_contracts in the dedup index"""
+        if self.pending_keys is None:
+            return
+        with DedupIndex(self.dedup_index_path, key_columns=SCRAPER_KEY_COLUMNS) as index:
+            index.register(self.pending_keys, source=SOURCE_NAME)
+        self.pending_keys = None
+
     def save_to_csv(self, filename="data/edtech_idiomas_contratos.csv"):
         """Save results to CSV file"""
         logger.info(f"Saving {len(self.results)} contracts to {filename}")
@@ -161,9 +241,13 @@ class PortalTransparenciaExtractor:
             'valor', 'fornecedor', 'cnpj', 'categoria', 'link', 'keyword_found'
         ]
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        # With the dedup index each run only holds new contracts: append to the history
+        append = bool(self.dedup_index_path) and os.path.exists(filename)
+
+        with open(filename, 'a' if append else 'w', newline='', encoding='utf-8') as csvfile:
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+            if not append:
+                writer.writeheader()
 
             for contract in self.results:
                 # Summarize long descriptions to ≤240 chars
@@ -173,11 +257,21 @@ class PortalTransparenciaExtractor:
                 writer.writerow(contract)
 
         logger.info(f"CSV file saved: {filename}")
+        # Only now that the file holds them are the new contracts marked as seen
+        self.register_saved_contracts()
         return filename
 
 def main():
     """Main execution function"""
-    extractor = PortalTransparenciaExtractor()
+    parser = argparse.ArgumentParser(description="Extract EdTech and language contracts from the Portal da Transparência")
+    parser.add_argument("--cache-dir", default=DEFAULT_HTTP_CACHE, help="HTTP response cache directory")
+    parser.add_argument("--offline", action="store_true", help="Serve pages only from the HTTP cache")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached pages (responses are still stored)")
+    args = parser.parse_args()
+
+    mode = 'offline' if args.offline else 'refresh' if args.refresh else 'default'
+    http_cache = HttpCache(args.cache_dir, mode=mode)
+    extractor = PortalTransparenciaExtractor(dedup_index_path=DEFAULT_SCRAPER_INDEX, http_cache=http_cache)
 
     # Extract contracts
     contracts = extractor.extract_all_contracts()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+RADAR Pipeline Runner
+Runs scrape → dedup → analyze → report as a DAG of stages with declared
+inputs and outputs, skipping stages whose inputs did not change. Local
+modules the scripts import (src/, analysis/pca_forecasting/) are found
+automatically and count as inputs.
+
+Scraper stages hit the Portal da Transparência and only run when named
+explicitly (e.g. ``run_pipeline.py scrape_advanced merge_research``).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from pipeline_dag import BLOCKED, FAILED, Pipeline, Stage
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+RADAR_INPUT = 'results/contratos_edtech_idiomas_FINAL_RADAR.csv'
+RADAR_EDTECH = 'outputs/radar_edtech.csv'
+RADAR_IDIOMAS = 'outputs/radar_idiomas.csv'
+SUBSTITUTE_MAP = 'analysis/mapa_substitutos_edtech_idiomas.csv'
+FINANCIAL_PROJECTIONS = 'analysis/financial_projections.json'
+LOG_DIR = 'outputs/pipeline_logs'
+
+STAGES = (
+    # Scrape (on demand: network access)
+    Stage('scrape_portal', 'scripts/portal_transparencia_scraper.py',
+          outputs=('data/edtech_idiomas_contratos.csv',),
+          stdout=f'{LOG_DIR}/scrape_portal.log', on_demand=True),
+    Stage('scrape_advanced', 'scripts/advanced_portal_scraper.py',
+          outputs=('results/contratos_edtech_idiomas_final.csv',),
+          stdout=f'{LOG_DIR}/scrape_advanced.log', on_demand=True),
+    Stage('merge_research', 'scripts/manual_edtech_research.py',
+          inputs=('results/contratos_edtech_idiomas_final.csv',),
+          outputs=(RADAR_INPUT, 'results/RADAR_EDTECH_RELATORIO.txt'),
+          stdout=f'{LOG_DIR}/merge_research.log', on_demand=True),
+
+    # Dedup
+    Stage('dedup', 'scripts/data_deduplication.py',
+          args=('--input', RADAR_INPUT, '--output-dir', 'outputs'),
+          inputs=(RADAR_INPUT,),
+          outputs=(RADAR_EDTECH, RADAR_IDIOMAS),
+          stdout=f'{LOG_DIR}/dedup.log'),
+
+    # Analyze
+    Stage('idiomas_profile', 'scripts/analise_contratos_idiomas.py',
+          inputs=(RADAR_IDIOMAS,),
+          stdout=f'{LOG_DIR}/idiomas_profile.log'),
+    Stage('prospect_scoring', 'src/prospect_scoring_idiomas.py',
+          inputs=(RADAR_IDIOMAS,),
+          stdout=f'{LOG_DIR}/prospect_scoring.log'),
+    Stage('substitutes', 'scripts/analyze_substitutes.py',
+          inputs=(RADAR_EDTECH, RADAR_IDIOMAS),
+          outputs=(SUBSTITUTE_MAP, 'analysis/matriz_migracao_timeline.csv',
+                   'analysis/value_propositions.json', 'analysis/relatorio_executivo_substitutos.md'),
+          stdout=f'{LOG_DIR}/substitutes.log'),
+    Stage('enhanced_substitutes', 'scripts/enhanced_substitute_analysis.py',
+          inputs=(SUBSTITUTE_MAP,),
+          outputs=('analysis/university_profiles.json', 'analysis/commercial_strategies.json',
+                   'analysis/risk_mitigation.json', 'analysis/implementation_roadmap.json',
+                   FINANCIAL_PROJECTIONS, 'analysis/executive_summary_expanded.md'),
+          stdout=f'{LOG_DIR}/enhanced_substitutes.log'),
+
+    # Report
+    Stage('substitute_dashboard', 'scripts/create_substitute_dashboard.py',
+          inputs=(SUBSTITUTE_MAP, FINANCIAL_PROJECTIONS),
+          outputs=('analysis/substitute_opportunities_overview.png', 'analysis/financial_projections.png',
+                   'analysis/strategy_matrix.png', 'analysis/executive_dashboard.png',
+                   'analysis/RELATORIO_FINAL_SUBSTITUTOS.md'),
+          stdout=f'{LOG_DIR}/substitute_dashboard.log'),
+    Stage('pca_report', 'analysis/pca_forecasting/generate_report.py',
+          inputs=(RADAR_EDTECH, RADAR_IDIOMAS),
+          outputs=('analysis/pca_forecasting/relatorio_pca_prospects.md',),
+          stdout=f'{LOG_DIR}/pca_report.log'),
+    Stage('pca_ranking', 'analysis/pca_forecasting/detailed_ranking_analysis.py',
+          inputs=(RADAR_EDTECH, RADAR_IDIOMAS),
+          outputs=('analysis/pca_forecasting/analise_detalhada_ranking.md',),
+          stdout=f'{LOG_DIR}/pca_ranking.log'),
+)
+
+
+# Where the stage scripts import shared modules from (besides their own directory)
+MODULE_DIRS = ('src',)
+
+
+def build_pipeline(state_path=None) -> Pipeline:
+    return Pipeline(STAGES, PROJECT_ROOT, state_path, module_dirs=MODULE_DIRS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the RADAR pipeline incrementally")
+    parser.add_argument("targets", nargs="*",
+                        help="Stages to run (with their upstream stages); default: all but scrapers")
+    parser.add_argument("--force", action="store_true", help="Rerun selected stages even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="Only list the stages that would run")
+    parser.add_argument("--jobs", type=int, default=None, help="Maximum stages running in parallel")
+    parser.add_argument("--state", type=str, default=None, help="Pipeline state file (JSON)")
+    args = parser.parse_args()
+
+    pipeline = build_pipeline(args.state)
+    targets = args.targets or None
+
+    if args.dry_run:
+        plan = pipeline.plan(targets, force=args.force)
+        for name in pipeline.select(targets):
+            print(f"{'RUN ' if name in plan else 'skip'} {name:22s} {plan.get(name, 'up to date')}")
+        return
+
+    results = pipeline.run(targets, force=args.force, max_workers=args.jobs)
+    for result in results.values():
+        timing = f"{result.seconds:6.1f}s" if result.returncode is not None else " " * 7
+        print(f"{result.status:8s} {timing} {result.name:22s} {result.reason}")
+
+    if any(result.status in (FAILED, BLOCKED) for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,27 +6,24 @@ Análise quantitativa com métricas específicas
 
 import pandas as pd
 import numpy as np
-import re
+import sys
+from pathlib import Path
 from datetime import datetime
 
-def clean_valor(valor_str):
-    """Converte string de valor para float"""
-    if pd.isna(valor_str):
-        return 0
-    valor_clean = re.sub(r'R\$\s*', '', str(valor_str))
-    valor_clean = valor_clean.replace('.', '').replace(',', '.')
-    try:
-        return float(valor_clean)
-    except:
-        return 0
+# Parsers compartilhados de valores/datas (src/parsers_br.py)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from parsers_br import parse_brl, parse_datas
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RADAR_IDIOMAS = PROJECT_ROOT / "outputs" / "radar_idiomas.csv"
 
 def criar_tabelas_comparativas():
     """Cria tabelas comparativas estruturadas"""
 
     # Carregar e preparar dados
-    df = pd.read_csv('/home/danielfugisawa/pesquisa_prospect_gov/outputs/radar_idiomas.csv')
-    df['valor_numerico'] = df['valor'].apply(clean_valor)
-    df['data'] = pd.to_datetime(df['data'])
+    df = pd.read_csv(RADAR_IDIOMAS)
+    df['valor_numerico'] = parse_brl(df['valor'], fill_value=0)
+    df['data'] = parse_datas(df['data'])
 
     print("="*100)
     print(" TABELAS COMPARATIVAS ESTRUTURADAS - CONTRATOS DE IDIOMAS")
@@ -10,33 +10,32 @@ from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-import re
+from typing import Optional
+
+from contract_store import ContractStore, get_contract_store, reais
 
 class RadarAnalysis:
     """Análise dos dados radar para identificação de padrões estratégicos"""
 
-    def __init__(self, edtech_file: str, idiomas_file: str):
+    def __init__(self, store: Optional[ContractStore] = None):
         """
-        Inicializa análise com arquivos de dados
+        Inicializa análise com os contratos do contract store
 
         Args:
-            edtech_file: Caminho para radar_edtech.csv
-            idiomas_file: Caminho para radar_idiomas.csv
+            store: Store de contratos (padrão: get_contract_store(), sincronizado com os radares)
         """
-        self.edtech_df = pd.read_csv(edtech_file)
-        self.idiomas_df = pd.read_csv(idiomas_file)
+        store = store or get_contract_store()
+        self.edtech_df = store.load(categorias=['EdTech geral'])
+        self.idiomas_df = store.load(categorias=['Idiomas'])
         self.combined_df = None
         self._prepare_data()
 
     def _prepare_data(self):
         """Prepara e limpa os dados para análise"""
-        # Converte valores monetários para float
+        # Valores em centavos e datas já vêm tipados do store
         for df in [self.edtech_df, self.idiomas_df]:
-            df['valor_numerico'] = df['valor'].str.replace('R$', '').str.replace('.', '').str.replace(',', '.').str.strip()
-            df['valor_numerico'] = pd.to_numeric(df['valor_numerico'], errors='coerce')
-
-            # Converte datas
-            df['data'] = pd.to_datetime(df['data'], format='%Y-%m-%d')
+            df['valor_numerico'] = reais(df)
+            df['potential_substitute'] = df['potential_substitute'].fillna(False)
 
             # Adiciona colunas derivadas
             df['mes_ano'] = df['data'].dt.to_period('M')
@@ -320,12 +319,8 @@ def main():
     print("🔍 INICIANDO ANÁLISE RADAR - EDTECH & IDIOMAS")
     print("=" * 60)
 
-    # Caminhos dos arquivos
-    edtech_file = "/home/danielfugisawa/pesquisa_prospect_gov/outputs/radar_edtech.csv"
-    idiomas_file = "/home/danielfugisawa/pesquisa_prospect_gov/outputs/radar_idiomas.csv"
-
-    # Inicializa análise
-    analyzer = RadarAnalysis(edtech_file, idiomas_file)
+    # Inicializa análise (contratos do contract store)
+    analyzer = RadarAnalysis()
 
     # Executa todas as análises
     temporal_summary, quarterly_analysis = analyzer.analyze_temporal_trends()
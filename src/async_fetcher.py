@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+ASYNC FETCHER - Requisições concorrentes com limite de taxa por host
+Camada de busca dos coletores do Portal da Transparência.
+
+As varreduras anos × palavras-chave faziam uma requisição por vez com
+time.sleep entre elas: quase todo o tempo era espera. Aqui:
+
+- uma sessão aiohttp com pool de conexões e concorrência limitada;
+- um token bucket por host (GCRA) mantém o intervalo de cortesia entre
+  requisições ao mesmo host, mas a latência de uma se sobrepõe às outras
+  e ao parsing;
+- 429/503 com Retry-After pausam o host inteiro pelo tempo pedido;
+- falhas transitórias (5xx, timeout, conexão) são repetidas com backoff
+  exponencial com jitter ("full jitter");
+- com um HttpCache, respostas são guardadas e revalidadas (304), e no modo
+  offline nada vai à rede.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from http_cache import CacheMiss, HttpCache
+
+# Status que valem nova tentativa
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+Request = Tuple[str, Optional[Mapping]]
+
+
+class TokenBucket:
+    """Token bucket (GCRA) com ``rate`` requisições/s e rajada de ``capacity``
+
+    ``reserve()`` reserva a próxima vaga e devolve quanto esperar; como o
+    loop de eventos é single-thread, a reserva é atômica sem lock.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate deve ser positivo")
+        self.interval = 1.0 / rate
+        self.tolerance = (max(capacity, 1) - 1) * self.interval
+        self.clock = clock
+        self._tat = clock()  # instante teórico de chegada da próxima requisição
+        self.paused_until = 0.0
+
+    def reserve(self) -> float:
+        """Reserva uma vaga; retorna os segundos de espera até ela"""
+        agora = self.clock()
+        tat = max(self._tat, agora, self.paused_until + self.tolerance)
+        self._tat = tat + self.interval
+        return max(0.0, tat - self.tolerance - agora)
+
+    def pause_until(self, instante: float):
+        """Nenhuma vaga antes de ``instante`` (Retry-After do servidor)"""
+        self.paused_until = max(self.paused_until, instante)
+
+    async def acquire(self):
+        await asyncio.sleep(self.reserve())
+        # Pausas pedidas depois da reserva também valem
+        while (espera := self.paused_until - self.clock()) > 0:
+            await asyncio.sleep(espera)
+
+
+def parse_retry_after(valor: Optional[str], agora: Optional[datetime] = None) -> Optional[float]:
+    """Segundos pedidos no Retry-After (inteiro ou data HTTP); None se ausente/inválido"""
+    if not valor:
+        return None
+    valor = valor.strip()
+    if valor.isdigit():
+        return float(valor)
+    try:
+        data = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    agora = agora or datetime.now(timezone.utc)
+    return max(0.0, (data - agora).total_seconds())
+
+
+def backoff_delay(tentativa: int, base: float = 1.0, maximo: float = 30.0,
+                  rng: Optional[random.Random] = None) -> float:
+    """Backoff exponencial com full jitter: uniforme em [0, min(maximo, base·2^tentativa)]"""
+    rng = rng or random
+    return rng.uniform(0, min(maximo, base * 2 ** tentativa))
+
+
+@dataclass
+class FetchResult:
+    url: str
+    params: Optional[Mapping] = None
+    status: Optional[int] = None
+    text: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    attempts: int = 0
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+
+class AsyncFetcher:
+    """Sessão aiohttp compartilhada com concorrência limitada e token bucket por host
+
+    Uso::
+
+        async with AsyncFetcher(rate_per_host=0.5) as fetcher:
+            async for indice, resultado in fetcher.stream(requisicoes):
+                ...
+    """
+
+    def __init__(self, headers: Optional[Mapping[str, str]] = None, max_concurrency: int = 8,
+                 rate_per_host: float = 1.0, burst: int = 1, max_retries: int = 4,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0, timeout: float = 30.0,
+                 seed: Optional[int] = None, cache: Optional[HttpCache] = None):
+        self.headers = dict(headers or {})
+        self.max_concurrency = max_concurrency
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.rng = random.Random(seed)
+        self.cache = cache
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> 'AsyncFetcher':
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        self.session = aiohttp.ClientSession(headers=self.headers, timeout=self.timeout, connector=connector)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+        self.session = None
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate_per_host, self.burst)
+        return self.buckets[host]
+
+    async def fetch(self, url: str, params: Optional[Mapping] = None) -> FetchResult:
+        """GET com limite de taxa, Retry-After e backoff; erros viram FetchResult.error"""
+        resultado = FetchResult(url, params)
+        entry, condicionais = None, {}
+        if self.cache is not None:
+            try:
+                entry, condicionais = self.cache.cached(url, params)
+            except CacheMiss as e:
+                resultado.error = f"CacheMiss: {e}"
+                return resultado
+            if entry is not None and (self.cache.offline or self.cache.is_fresh(entry)):
+                return self._from_cache(resultado, entry)
+
+        bucket = self.bucket(url)
+
+        for tentativa in range(self.max_retries + 1):
+            resultado.attempts = tentativa + 1
+            await bucket.acquire()
+            espera = None
+            try:
+                async with self._semaphore:
+                    async with self.session.get(url, params=params, headers=condicionais) as response:
+                        if response.status == 304 and entry is not None:
+                            return self._from_cache(resultado, self.cache.revalidated(entry, url, params))
+                        resultado.status = response.status
+                        resultado.headers = dict(response.headers)
+                        resultado.error = None
+                        if response.status == 200 and self.cache is not None:
+                            body = await response.read()
+                            stored = self.cache.store(url, params, 200, body, response.headers, response.get_encoding())
+                            resultado.text = stored.text
+                        else:
+                            resultado.text = await response.text()
+                        if response.status not in RETRY_STATUSES:
+                            return resultado
+                        espera = parse_retry_after(response.headers.get('Retry-After'))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                resultado.status, resultado.text = None, None
+                resultado.error = f"{type(e).__name__}: {e}"
+
+            if tentativa == self.max_retries:
+                break
+            if espera is not None:
+                # O servidor disse quando voltar: pausa o host para todas as requisições
+                bucket.pause_until(bucket.clock() + espera)
+            else:
+                await asyncio.sleep(backoff_delay(tentativa, self.backoff_base, self.backoff_max, self.rng))
+
+        return resultado
+
+    @staticmethod
+    def _from_cache(resultado: FetchResult, entry) -> FetchResult:
+        resultado.status = entry.status
+        resultado.text = entry.text
+        resultado.headers = dict(entry.headers)
+        resultado.error = None
+        resultado.from_cache = True
+        return resultado
+
+    async def stream(self, requests: Iterable[Request]) -> AsyncIterator[Tuple[int, FetchResult]]:
+        """(índice, resultado) na ordem em que as respostas chegam"""
+        async def indexada(indice: int, url: str, params: Optional[Mapping]):
+            return indice, await self.fetch(url, params)
+
+        tarefas = [asyncio.ensure_future(indexada(i, url, params)) for i, (url, params) in enumerate(requests)]
+        try:
+            for proxima in asyncio.as_completed(tarefas):
+                yield await proxima
+        finally:
+            for tarefa in tarefas:
+                tarefa.cancel()
+
+    async def fetch_all(self, requests: Iterable[Request]) -> List[FetchResult]:
+        """Resultados na ordem das requisições"""
+        requests = list(requests)
+        resultados: List[Optional[FetchResult]] = [None] * len(requests)
+        async for indice, resultado in self.stream(requests):
+            resultados[indice] = resultado
+        return resultados
+
+
+def fetch_all(requests: Iterable[Request], **kwargs) -> List[FetchResult]:
+    """Atalho síncrono: abre um AsyncFetcher, busca tudo e fecha"""
+    async def executar():
+        async with AsyncFetcher(**kwargs) as fetcher:
+            return await fetcher.fetch_all(requests)
+    return asyncio.run(executar())
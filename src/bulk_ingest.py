@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+BULK INGEST - Arquivos ZIP de download em lote do Portal da Transparência
+Alternativa à raspagem das páginas de busca: os dados abertos mensais trazem
+todos os contratos, com órgão, valor e fornecedor em colunas próprias.
+
+- Os ZIPs são lidos membro a membro via zipfile, sem extrair nada em disco;
+- cada CSV (Latin-1, separador ';') é lido em lotes de CHUNK_ROWS linhas,
+  só com as colunas usadas, então a memória não cresce com o arquivo;
+- a classificação EdTech/Idiomas é uma regex com fronteira de palavra por
+  categoria aplicada à coluna Objeto do lote inteiro (Idiomas tem
+  precedência, como no classify_contract dos coletores);
+- os contratos classificados vão para o contract store, com o ZIP como fonte:
+  reingerir o mesmo arquivo substitui suas linhas, e um ZIP sem mudanças é
+  pulado pelo digest.
+"""
+
+import fnmatch
+import logging
+import re
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from contract_store import ContractStore, file_digest
+
+logger = logging.getLogger(__name__)
+
+# Formato dos CSVs dos dados abertos
+CSV_ENCODING = 'latin-1'
+CSV_SEPARATOR = ';'
+CHUNK_ROWS = 50_000
+
+# Coluna do store → nomes possíveis no CSV, em ordem de preferência
+BULK_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'objeto': ('Objeto', 'Objeto do Contrato'),
+    'orgao': ('Nome Órgão', 'Nome Órgão Superior', 'Nome UG'),
+    'uasg': ('Código UG', 'Código UASG'),
+    'modalidade': ('Modalidade Compra', 'Modalidade Licitação'),
+    'data': ('Data Assinatura Contrato', 'Data Início Vigência', 'Data Publicação DOU'),
+    'valor': ('Valor Final Compra', 'Valor Inicial Compra', 'Valor Contrato'),
+    'fornecedor': ('Nome Contratado', 'Nome Fornecedor'),
+    'cnpj': ('Código Contratado', 'CNPJ Contratado', 'CPF/CNPJ Contratado'),
+}
+
+CATEGORIA_EDTECH = 'EdTech geral'
+CATEGORIA_IDIOMAS = 'Idiomas'
+
+
+def keyword_pattern(keywords: Sequence[str]) -> re.Pattern:
+    """Regex que casa qualquer palavra-chave como palavra inteira, sem diferenciar maiúsculas
+
+    Fronteira de palavra evita que siglas curtas (EAD, AVA) casem dentro de
+    outras palavras ("avaliação", "leads").
+    """
+    alternativas = '|'.join(re.escape(k) for k in sorted(set(keywords), key=len, reverse=True))
+    return re.compile(rf'\b({alternativas})\b', re.I)
+
+
+class KeywordClassifier:
+    """Classificação vetorizada de objetos de contrato em EdTech geral / Idiomas"""
+
+    def __init__(self, edtech_keywords: Sequence[str], language_keywords: Sequence[str]):
+        if not edtech_keywords or not language_keywords:
+            raise ValueError("São necessárias palavras-chave de EdTech e de idiomas")
+        self.edtech = keyword_pattern(edtech_keywords)
+        self.idiomas = keyword_pattern(language_keywords)
+        # Forma canônica (como nos coletores) de cada palavra-chave casada
+        self.canonical = {k.lower(): k for k in list(edtech_keywords) + list(language_keywords)}
+
+    def _keyword(self, objetos: pd.Series, padrao: re.Pattern) -> pd.Series:
+        casada = objetos.str.extract(padrao, expand=False)
+        return casada.str.lower().map(self.canonical)
+
+    def classify(self, objetos: pd.Series) -> pd.DataFrame:
+        """categoria e keyword_found por linha; nulos onde nenhuma palavra-chave casa"""
+        objetos = objetos.astype('string').fillna('')
+        idiomas = self._keyword(objetos, self.idiomas)
+        edtech = self._keyword(objetos[idiomas.isna()], self.edtech)
+        keyword = idiomas.combine_first(edtech).reindex(objetos.index)
+
+        categoria = np.select([idiomas.notna(), keyword.notna()], [CATEGORIA_IDIOMAS, CATEGORIA_EDTECH], default=None)
+        return pd.DataFrame({'categoria': categoria, 'keyword_found': keyword.astype(object).where(keyword.notna(), None)},
+                            index=objetos.index)
+
+
+def _resolve_columns(header: Sequence[str]) -> Dict[str, str]:
+    """Nome no CSV → coluna do store, com a primeira alternativa presente no cabeçalho"""
+    presentes = set(header)
+    mapa = {}
+    for coluna, nomes in BULK_COLUMNS.items():
+        for nome in nomes:
+            if nome in presentes:
+                mapa[nome] = coluna
+                break
+    return mapa
+
+
+def _read_csv(stream, **kwargs):
+    return pd.read_csv(stream, sep=CSV_SEPARATOR, encoding=CSV_ENCODING, dtype=str, **kwargs)
+
+
+def iter_archive_chunks(path: Union[str, Path], chunksize: int = CHUNK_ROWS,
+                        member_pattern: str = '*.csv') -> Iterator[Tuple[str, pd.DataFrame]]:
+    """(membro, lote) de cada CSV de contratos do ZIP, já com as colunas do store
+
+    Membros sem coluna de objeto (itens, aditivos...) são pulados.
+    """
+    with zipfile.ZipFile(path) as arquivo:
+        for membro in arquivo.infolist():
+            if membro.is_dir() or not fnmatch.fnmatch(membro.filename.lower(), member_pattern.lower()):
+                continue
+            with arquivo.open(membro) as stream:
+                mapa = _resolve_columns(_read_csv(stream, nrows=0).columns)
+            if 'objeto' not in mapa.values():
+                logger.info(f"{path}:{membro.filename}: sem coluna de objeto, ignorado")
+                continue
+
+            with arquivo.open(membro) as stream:
+                for lote in _read_csv(stream, usecols=list(mapa), chunksize=chunksize):
+                    yield membro.filename, lote.rename(columns=mapa)
+
+
+def iter_matches(path: Union[str, Path], classifier: KeywordClassifier, chunksize: int = CHUNK_ROWS,
+                 member_pattern: str = '*.csv', stats: Optional[Dict[str, int]] = None) -> Iterator[pd.DataFrame]:
+    """Lotes só com os contratos classificados como EdTech geral ou Idiomas"""
+    for _, lote in iter_archive_chunks(path, chunksize, member_pattern):
+        classes = classifier.classify(lote['objeto'])
+        encontrados = classes['categoria'].notna()
+        if stats is not None:
+            stats['lidos'] = stats.get('lidos', 0) + len(lote)
+            stats['classificados'] = stats.get('classificados', 0) + int(encontrados.sum())
+        if encontrados.any():
+            yield pd.concat([lote[encontrados], classes[encontrados]], axis=1)
+
+
+def ingest_archive(store: ContractStore, path: Union[str, Path], classifier: KeywordClassifier,
+                   force: bool = False, chunksize: int = CHUNK_ROWS, member_pattern: str = '*.csv',
+                   stats: Optional[Dict[str, int]] = None) -> Optional[int]:
+    """Ingere os contratos classificados de um ZIP; None se o arquivo não mudou"""
+    path = Path(path)
+    digest = file_digest(path)
+    if not force and store.source_digest(str(path)) == digest:
+        return None
+    return store.write_chunks(iter_matches(path, classifier, chunksize, member_pattern, stats), str(path), digest)
+
+
+def find_archives(paths: Sequence[Union[str, Path]]) -> List[Path]:
+    """ZIPs passados diretamente ou contidos nos diretórios, em ordem de nome"""
+    arquivos = []
+    for path in map(Path, paths):
+        arquivos.extend(sorted(path.glob('*.zip')) if path.is_dir() else [path])
+    return arquivos
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+CONTRACT EXTRACTION - Extração de contratos de páginas de busca do Portal
+Motor de parsing usado pelo advanced_portal_scraper (e pelo replay do arquivo HTML).
+
+- Árvore lxml (libxml2) em vez do html.parser puro Python do BeautifulSoup;
+- uma única travessia da árvore produz os candidatos (divs/linhas com classe
+  de resultado, <article>, divs com id de resultado e linhas de tabela com 4+
+  células fora do cabeçalho), em ordem de documento e sem repetições;
+- regex de CNPJ, valor e fornecedor compiladas uma vez no módulo.
+
+Os critérios são os mesmos das quatro buscas find_all + varredura de tabelas
+que o coletor fazia; só a ordem (documento) e as duplicatas mudam.
+"""
+
+import re
+from typing import Dict, Iterator, List
+
+import lxml.html
+from lxml import etree
+
+# Atributos que marcam um candidato, por tag
+CLASSE_DIV = re.compile(r'resultado|contrato|item', re.I)
+CLASSE_TR = re.compile(r'resultado|linha|item', re.I)
+ID_DIV = re.compile(r'resultado|contrato', re.I)
+
+# Mínimo de células para uma linha de tabela ser um contrato
+MIN_CELULAS = 4
+
+# Campos extraídos do texto do candidato
+PADRAO_CNPJ = re.compile(r'(\d{2}\.?\d{3}\.?\d{3}/?\d{4}-?\d{2})')
+PADROES_VALOR = (
+    re.compile(r'R\$\s?([\d.,]+)'),
+    re.compile(r'(\d+[.,]\d+[.,]\d+)'),
+    re.compile(r'valor.*?([\d.,]+)', re.I),
+)
+PADROES_FORNECEDOR = (
+    re.compile(r'([\w\s]+LTDA\.?)'),
+    re.compile(r'([\w\s]+S\.?A\.?)'),
+    re.compile(r'([\w\s]+EIRELI)'),
+    re.compile(r'([A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'),
+)
+ESPACOS = re.compile(r'\s+')
+
+# Conteúdo que não é texto visível (o get_text do BeautifulSoup também o ignora)
+_PARSER = lxml.html.HTMLParser(remove_comments=True, remove_pis=True)
+_TAGS_INVISIVEIS = ('script', 'style', 'template')
+
+
+def parse_html(html_content: str) -> etree._Element:
+    """Árvore lxml da página, sem scripts, estilos e comentários"""
+    raiz = lxml.html.document_fromstring(html_content, parser=_PARSER)
+    etree.strip_elements(raiz, *_TAGS_INVISIVEIS, with_tail=False)
+    return raiz
+
+
+def element_text(elemento: etree._Element) -> str:
+    """Texto do elemento com cada trecho aparado (como get_text(strip=True))"""
+    return ''.join(trecho.strip() for trecho in elemento.itertext())
+
+
+def _is_candidate(elemento: etree._Element, tabelas_iniciadas: set) -> bool:
+    tag = elemento.tag
+    if tag == 'article':
+        return True
+    if tag == 'div':
+        return bool(CLASSE_DIV.search(elemento.get('class', '')) or ID_DIV.search(elemento.get('id', '')))
+    if tag != 'tr':
+        return False
+
+    candidato = bool(CLASSE_TR.search(elemento.get('class', '')))
+    # A primeira linha de cada tabela é o cabeçalho; as demais com 4+ células contam
+    fora_do_cabecalho = False
+    for tabela in elemento.iterancestors('table'):
+        if tabela in tabelas_iniciadas:
+            fora_do_cabecalho = True
+        else:
+            tabelas_iniciadas.add(tabela)
+    if fora_do_cabecalho and not candidato:
+        candidato = sum(1 for _ in elemento.iter('td', 'th')) >= MIN_CELULAS
+    return candidato
+
+
+def iter_candidates(raiz: etree._Element) -> Iterator[etree._Element]:
+    """Elementos candidatos a contrato, numa única travessia em ordem de documento"""
+    tabelas_iniciadas = set()
+    for elemento in raiz.iter('div', 'tr', 'article'):
+        if _is_candidate(elemento, tabelas_iniciadas):
+            yield elemento
+
+
+def candidate_texts(html_content: str) -> List[str]:
+    """Textos dos candidatos a contrato de uma página de busca"""
+    if not html_content:
+        return []
+    try:
+        raiz = parse_html(html_content)
+    except (etree.ParserError, ValueError):
+        return []
+    return [element_text(elemento) for elemento in iter_candidates(raiz)]
+
+
+def extract_fields(texto: str) -> Dict[str, str]:
+    """CNPJ, valor, fornecedor e objeto do texto de um candidato"""
+    campos = {}
+
+    cnpj = PADRAO_CNPJ.search(texto)
+    campos['cnpj'] = cnpj.group(1) if cnpj else 'CNPJ não informado'
+
+    for padrao in PADROES_VALOR:
+        valor = padrao.search(texto)
+        if valor:
+            campos['valor'] = f"R$ {valor.group(1)}"
+            break
+    else:
+        campos['valor'] = 'Valor não informado'
+
+    for padrao in PADROES_FORNECEDOR:
+        fornecedor = padrao.search(texto)
+        if fornecedor and len(fornecedor.group(1)) > 5:
+            campos['fornecedor'] = fornecedor.group(1).strip()
+            break
+    else:
+        campos['fornecedor'] = 'Fornecedor não identificado'
+
+    if len(texto) > 50:
+        limpo = ESPACOS.sub(' ', texto)
+        campos['objeto'] = limpo[:240] + '...' if len(limpo) > 240 else limpo
+    else:
+        campos['objeto'] = None
+
+    return campos
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+CONTRACT STORE - Base canônica e tipada de contratos
+Substitui os CSVs espalhados (outputs/radar_*.csv) como fonte das análises.
+
+Os contratos ficam numa tabela SQLite particionada por (ano, categoria):
+o índice composto faz a leitura de uma categoria ou de um ano tocar só as
+linhas da partição. As colunas já saem tipadas, sem reprocessar textos:
+
+- valor_centavos: inteiro (Int64), sem aritmética de ponto flutuante
+- data: datetime64 (gravada como ISO no banco)
+- orgao, modalidade, fornecedor, categoria: category
+- potential_substitute: boolean
+
+Cada CSV ingerido é uma fonte: reingerir a mesma fonte substitui suas
+linhas, e get_contract_store() reingere só as fontes cujo conteúdo mudou.
+"""
+
+import argparse
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from parsers_br import parse_brl_centavos, parse_datas
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_STORE_PATH = PROJECT_ROOT / 'data' / 'contratos.sqlite'
+
+# Radares publicados pelo data_deduplication (uma categoria por arquivo)
+DEFAULT_SOURCES = (
+    PROJECT_ROOT / 'outputs' / 'radar_edtech.csv',
+    PROJECT_ROOT / 'outputs' / 'radar_idiomas.csv',
+)
+
+# Esquema: coluna → tipo SQLite
+SCHEMA = {
+    'ano': 'INTEGER',
+    'categoria': 'TEXT',
+    'orgao': 'TEXT',
+    'uasg': 'INTEGER',
+    'modalidade': 'TEXT',
+    'objeto': 'TEXT',
+    'data': 'TEXT',
+    'valor_centavos': 'INTEGER',
+    'fornecedor': 'TEXT',
+    'cnpj': 'TEXT',
+    'keyword_found': 'TEXT',
+    'link': 'TEXT',
+    'status': 'TEXT',
+    'potential_substitute': 'INTEGER',
+}
+COLUMNS = tuple(SCHEMA)
+
+CATEGORICAL_COLUMNS = ('categoria', 'orgao', 'modalidade', 'fornecedor')
+
+# Operadores aceitos nos filtros (coluna, operador, valor)
+_OPERADORES = {'==': '=', '!=': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>=',
+               'in': 'IN', 'not in': 'NOT IN'}
+
+Filtro = Tuple[str, str, object]
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            digest.update(bloco)
+    return digest.hexdigest()
+
+
+def _as_bool(series: pd.Series) -> pd.Series:
+    """True/False vindos do CSV como bool ou como texto; o resto vira <NA>"""
+    texto = series.astype('string').str.strip().str.lower()
+    return texto.map({'true': True, 'false': False}).astype('boolean')
+
+
+def normalize_contracts(df: pd.DataFrame) -> pd.DataFrame:
+    """Converte contratos no formato dos radares para as colunas do esquema
+
+    ``valor`` ("R$ 1.234,56") vira ``valor_centavos``; ``data`` é
+    convertida uma única vez e dela sai o ``ano`` da partição. Colunas
+    ausentes ficam nulas.
+    """
+    if 'valor_centavos' in df.columns:
+        centavos = df['valor_centavos'].astype('Int64')
+    elif 'valor' in df.columns:
+        centavos = parse_brl_centavos(df['valor'])
+    else:
+        centavos = pd.Series(pd.NA, index=df.index, dtype='Int64')
+
+    datas = parse_datas(df['data']) if 'data' in df.columns else pd.Series(pd.NaT, index=df.index)
+    vazio = pd.Series(None, index=df.index, dtype=object)
+
+    normalizado = pd.DataFrame({
+        'ano': datas.dt.year.astype('Int64'),
+        'categoria': df.get('categoria', vazio),
+        'orgao': df.get('orgao', vazio),
+        'uasg': pd.to_numeric(df.get('uasg', vazio), errors='coerce').astype('Int64'),
+        'modalidade': df.get('modalidade', vazio),
+        'objeto': df.get('objeto', vazio),
+        'data': datas.dt.strftime('%Y-%m-%d'),
+        'valor_centavos': centavos,
+        'fornecedor': df.get('fornecedor', vazio),
+        'cnpj': df.get('cnpj', vazio),
+        'keyword_found': df.get('keyword_found', vazio),
+        'link': df.get('link', vazio),
+        'status': df.get('status', vazio),
+        'potential_substitute': _as_bool(df.get('potential_substitute', vazio)),
+    }, index=df.index)
+    return normalizado[list(COLUMNS)]
+
+
+class ContractStore:
+    """Tabela SQLite de contratos particionada por (ano, categoria)"""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self._init_database()
+
+    def _init_database(self):
+        colunas = ',\n'.join(f"{nome} {tipo}" for nome, tipo in SCHEMA.items())
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS contratos (
+                id INTEGER PRIMARY KEY,
+                fonte TEXT NOT NULL,
+                {colunas}
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_contratos_particao ON contratos (ano, categoria)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_contratos_fonte ON contratos (fonte)")
+        cursor.execute("CREATE TABLE IF NOT EXISTS fontes (fonte TEXT PRIMARY KEY, digest TEXT NOT NULL)")
+        self.conn.commit()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM contratos").fetchone()[0]
+
+    def write(self, df: pd.DataFrame, fonte: str, digest: str = '') -> int:
+        """Grava os contratos da fonte, substituindo o que ela tinha gravado"""
+        return self.write_chunks([df], fonte, digest)
+
+    def write_chunks(self, chunks: Iterable[pd.DataFrame], fonte: str, digest: str = '') -> int:
+        """Como write(), a partir de lotes consumidos um a um (memória constante)
+
+        Tudo numa transação: se a leitura dos lotes falhar no meio, a fonte
+        fica como estava.
+        """
+        marcadores = ', '.join('?' * (len(COLUMNS) + 1))
+        total = 0
+        with self.conn:
+            self.conn.execute("DELETE FROM contratos WHERE fonte = ?", (fonte,))
+            for chunk in chunks:
+                normalizado = normalize_contracts(chunk).astype(object)
+                linhas = normalizado.where(normalizado.notna(), None).itertuples(index=False, name=None)
+                self.conn.executemany(
+                    f"INSERT INTO contratos (fonte, {', '.join(COLUMNS)}) VALUES ({marcadores})",
+                    ((fonte, *linha) for linha in linhas)
+                )
+                total += len(normalizado)
+            self.conn.execute("INSERT OR REPLACE INTO fontes VALUES (?, ?)", (fonte, digest))
+        return total
+
+    def source_digest(self, fonte: str) -> Optional[str]:
+        """Digest gravado na última ingestão da fonte (None se nunca ingerida)"""
+        gravado = self.conn.execute("SELECT digest FROM fontes WHERE fonte = ?", (fonte,)).fetchone()
+        return gravado[0] if gravado is not None else None
+
+    def ingest_csv(self, path: Union[str, Path], force: bool = False) -> Optional[int]:
+        """Ingere um CSV de contratos; None se o arquivo não mudou desde a última ingestão"""
+        path = Path(path)
+        digest = file_digest(path)
+        if not force and self.source_digest(str(path)) == digest:
+            return None
+        return self.write(pd.read_csv(path, dtype=str), str(path), digest)
+
+    def sync(self, sources: Iterable[Union[str, Path]] = DEFAULT_SOURCES) -> Dict[str, int]:
+        """Reingere as fontes existentes que mudaram; retorna linhas gravadas por fonte"""
+        gravadas = {}
+        for source in sources:
+            if Path(source).exists():
+                linhas = self.ingest_csv(source)
+                if linhas is not None:
+                    gravadas[str(source)] = linhas
+        return gravadas
+
+    def partitions(self) -> pd.DataFrame:
+        """Número de contratos por partição (ano, categoria)"""
+        return pd.read_sql_query(
+            "SELECT ano, categoria, COUNT(*) AS contratos FROM contratos GROUP BY ano, categoria ORDER BY ano, categoria",
+            self.conn
+        )
+
+    def load(self, columns: Optional[Sequence[str]] = None, categorias: Optional[Sequence[str]] = None,
+             anos: Optional[Sequence[int]] = None, filters: Sequence[Filtro] = (),
+             categorical: bool = True) -> pd.DataFrame:
+        """Carrega contratos tipados
+
+        ``columns`` projeta só as colunas pedidas; ``categorias`` e ``anos``
+        selecionam partições e ``filters`` são predicados (coluna, operador,
+        valor) com operadores ==, !=, <, <=, >, >=, in e not in, todos
+        avaliados no SQLite. Datas nos filtros podem ser texto ISO ou datetime.
+        A ordem das linhas é a de ingestão.
+        """
+        colunas = list(columns) if columns is not None else list(COLUMNS)
+        predicados = list(filters)
+        if categorias is not None:
+            predicados.append(('categoria', 'in', list(categorias)))
+        if anos is not None:
+            predicados.append(('ano', 'in', [int(ano) for ano in anos]))
+
+        for coluna in colunas + [coluna for coluna, _, _ in predicados]:
+            if coluna not in SCHEMA:
+                raise ValueError(f"Coluna desconhecida no contract store: {coluna}")
+
+        where, params = self._where(predicados)
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(colunas)} FROM contratos{where} ORDER BY id", self.conn, params=params
+        )
+        return self._typed(df, categorical)
+
+    @staticmethod
+    def _where(predicados: List[Filtro]) -> Tuple[str, list]:
+        clausulas, params = [], []
+        for coluna, operador, valor in predicados:
+            if operador not in _OPERADORES:
+                raise ValueError(f"Operador não suportado: {operador}")
+            sql = _OPERADORES[operador]
+            if sql in ('IN', 'NOT IN'):
+                valores = [_sql_value(coluna, v) for v in valor]
+                if not valores:
+                    clausulas.append('0' if sql == 'IN' else '1')
+                    continue
+                clausulas.append(f"{coluna} {sql} ({', '.join('?' * len(valores))})")
+                params.extend(valores)
+            else:
+                clausulas.append(f"{coluna} {sql} ?")
+                params.append(_sql_value(coluna, valor))
+        return (' WHERE ' + ' AND '.join(clausulas) if clausulas else ''), params
+
+    @staticmethod
+    def _typed(df: pd.DataFrame, categorical: bool) -> pd.DataFrame:
+        tipos = {
+            'ano': 'Int64',
+            'uasg': 'Int64',
+            'valor_centavos': 'Int64',
+            'potential_substitute': 'boolean',
+        }
+        df = df.astype({coluna: tipo for coluna, tipo in tipos.items() if coluna in df.columns})
+        if 'data' in df.columns:
+            df['data'] = pd.to_datetime(df['data'], format='%Y-%m-%d')
+        if categorical:
+            for coluna in df.columns.intersection(CATEGORICAL_COLUMNS):
+                df[coluna] = df[coluna].astype('category')
+        return df
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> 'ContractStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _sql_value(coluna: str, valor):
+    """Valor de filtro no formato gravado (datas ISO, inteiros nativos)"""
+    if coluna == 'data':
+        return pd.Timestamp(valor).strftime('%Y-%m-%d')
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+
+def reais(df: pd.DataFrame) -> pd.Series:
+    """Valor em Reais (float, NaN quando ausente) a partir de valor_centavos"""
+    return df['valor_centavos'].astype(float) / 100
+
+
+_stores: Dict[str, ContractStore] = {}
+
+
+def get_contract_store(path: Union[str, Path] = DEFAULT_STORE_PATH,
+                       sources: Iterable[Union[str, Path]] = DEFAULT_SOURCES) -> ContractStore:
+    """Instância compartilhada por processo, sincronizada com as fontes na abertura"""
+    key = str(Path(path).resolve())
+    if key not in _stores:
+        store = ContractStore(path)
+        store.sync(sources)
+        _stores[key] = store
+    return _stores[key]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingere CSVs de contratos no contract store")
+    parser.add_argument('sources', nargs='*', default=[str(p) for p in DEFAULT_SOURCES],
+                        help="CSVs de contratos (padrão: radares em outputs/)")
+    parser.add_argument('--store', default=str(DEFAULT_STORE_PATH), help="Arquivo SQLite do store")
+    parser.add_argument('--force', action='store_true', help="Reingere mesmo sem mudanças")
+    args = parser.parse_args()
+
+    with ContractStore(args.store) as store:
+        for source in args.sources:
+            linhas = store.ingest_csv(source, force=args.force)
+            status = "sem mudanças" if linhas is None else f"{linhas} contratos"
+            print(f"📥 {source}: {status}")
+        print(store.partitions().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,9 @@ from datetime import datetime, timedelta
 import json
 import re
 from collections import defaultdict
+from typing import Optional
+
+from contract_store import ContractStore, get_contract_store, reais
 
 class DataAnalystSwarm:
     def __init__(self):
@@ -17,16 +20,17 @@ class DataAnalystSwarm:
         self.idiomas_data = None
         self.combined_data = None
 
-    def load_datasets(self):
-        """Load and clean both datasets"""
+    def load_datasets(self, store: Optional[ContractStore] = None):
+        """Load both datasets from the contract store and clean them"""
         print("🔄 Loading datasets...")
+        store = store or get_contract_store()
 
         # Load EdTech data
-        self.edtech_data = pd.read_csv('/home/danielfugisawa/pesquisa_prospect_gov/outputs/radar_edtech.csv')
+        self.edtech_data = store.load(categorias=['EdTech geral'])
         print(f"✅ EdTech dataset loaded: {len(self.edtech_data)} records")
 
         # Load Languages data
-        self.idiomas_data = pd.read_csv('/home/danielfugisawa/pesquisa_prospect_gov/outputs/radar_idiomas.csv')
+        self.idiomas_data = store.load(categorias=['Idiomas'])
         print(f"✅ Languages dataset loaded: {len(self.idiomas_data)} records")
 
         # Combine datasets
@@ -37,20 +41,15 @@ class DataAnalystSwarm:
 
     def _clean_data(self):
         """Clean and standardize data"""
-        # Convert valor to numeric
+        # Store columns are already typed (centavos, datetime, boolean)
         for df in [self.edtech_data, self.idiomas_data, self.combined_data]:
-            # Clean valor column - remove R$, commas, convert to float
-            df['valor_limpo'] = df['valor'].str.replace('R$ ', '').str.replace(',', '').str.replace('.', '').astype(float) / 100
-
-            # Convert date
-            df['data'] = pd.to_datetime(df['data'])
+            df['valor_limpo'] = reais(df)
 
-            # Add year and quarter
-            df['ano'] = df['data'].dt.year
+            # Add quarter (ano comes from the store partition)
             df['trimestre'] = df['data'].dt.quarter
 
-            # Clean potential_substitute
-            df['potential_substitute'] = df['potential_substitute'].map({'True': True, 'False': False})
+            # Missing flags count as not substitutable
+            df['potential_substitute'] = df['potential_substitute'].fillna(False)
 
     def analyze_contract_profiles(self):
         """1. PERFIL CONTRATOS VENCEDORES - Analysis by modality"""
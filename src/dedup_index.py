@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+ÍNDICE DE DEDUPLICAÇÃO PERSISTENTE - SQLite + Bloom filter
+Contratos já vistos em execuções anteriores, com procedência.
+
+Cada contrato vira um hash de 64 bits da sua chave normalizada (CNPJ só
+dígitos, objeto sem acento/caixa/pontuação, data ISO, valor em centavos).
+Os hashes ficam numa tabela SQLite com a fonte e o instante da primeira
+ocorrência; um lote novo é verificado com um JOIN contra uma tabela
+temporária, em tempo proporcional ao lote e não ao histórico.
+
+O Bloom filter opcional (arquivo .bloom.npy ao lado do banco) responde
+"nunca visto" sem consultar o SQLite; só os positivos vão ao banco.
+"""
+
+import math
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from orgao_index import normalize_name
+from parsers_br import cnpj_digitos, parse_brl_centavos, parse_datas
+
+# Chave padrão: a mesma de data_deduplication.deduplicate_data
+DEFAULT_KEY_COLUMNS = ('cnpj', 'objeto', 'data')
+
+# Chave dos coletores: sem a data, que eles preenchem com o dia da extração quando falta
+SCRAPER_KEY_COLUMNS = ('cnpj', 'objeto', 'valor')
+
+# Índice compartilhado pelos coletores (relativo à raiz do projeto)
+DEFAULT_SCRAPER_INDEX = 'data/scraped_contracts_index.sqlite'
+
+# Lote máximo de linhas por INSERT na tabela temporária
+_LOTE_SQL = 50_000
+
+
+def _normalize_column(nome: str, valores: pd.Series) -> pd.Series:
+    """Forma normalizada (texto) de uma coluna da chave"""
+    texto = valores.astype('string').str.strip()
+    if nome == 'cnpj':
+        return cnpj_digitos(valores).fillna(texto.str.lower())
+    if nome == 'data':
+        datas = parse_datas(valores)
+        return datas.dt.strftime('%Y-%m-%d').astype('string').fillna(texto)
+    if nome == 'valor':
+        return parse_brl_centavos(valores).astype('string').fillna(texto)
+    # Textos livres (objeto, fornecedor...): normalizados uma vez por valor distinto
+    distintos = pd.unique(texto.dropna())
+    return texto.map({valor: normalize_name(valor) for valor in distintos}).astype('string')
+
+
+def key_hashes(df: pd.DataFrame, key_columns: Sequence[str] = DEFAULT_KEY_COLUMNS) -> np.ndarray:
+    """Hash de 64 bits (int64, como no SQLite) da chave normalizada de cada linha"""
+    normalizado = pd.DataFrame({
+        coluna: _normalize_column(coluna, df[coluna]).fillna('').to_numpy(dtype=object)
+        for coluna in key_columns
+    })
+    return pd.util.hash_pandas_object(normalizado, index=False).to_numpy().view(np.int64)
+
+
+class BloomFilter:
+    """Bloom filter em array NumPy; k posições por double hashing do hash de 64 bits"""
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        capacity = max(int(capacity), 1)
+        self.size = max(64, int(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        valores = np.asarray(hashes).view(np.uint64)
+        h1 = valores & np.uint64(0xFFFFFFFF)
+        h2 = (valores >> np.uint64(32)) | np.uint64(1)
+        i = np.arange(self.num_hashes, dtype=np.uint64)
+        return ((h1[:, None] + i * h2[:, None]) % np.uint64(self.size)).astype(np.int64)
+
+    def add(self, hashes: np.ndarray):
+        posicoes = self._positions(hashes).ravel()
+        np.bitwise_or.at(self.bits, posicoes >> 3, (1 << (posicoes & 7)).astype(np.uint8))
+
+    def might_contain(self, hashes: np.ndarray) -> np.ndarray:
+        posicoes = self._positions(hashes)
+        return ((self.bits[posicoes >> 3] >> (posicoes & 7)) & 1).all(axis=1).astype(bool)
+
+
+class DedupIndex:
+    """Índice persistente de contratos vistos, com fonte e data da primeira ocorrência
+
+    O conjunto de colunas da chave é gravado no banco: abrir o mesmo
+    arquivo com outra chave é um erro, pois os hashes não seriam comparáveis.
+    """
+
+    def __init__(self, path: Union[str, Path], key_columns: Sequence[str] = DEFAULT_KEY_COLUMNS,
+                 bloom: bool = True, bloom_capacity: int = 1_000_000, false_positive_rate: float = 0.01):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.key_columns = tuple(key_columns)
+        self.conn = sqlite3.connect(self.path)
+        self._init_database()
+
+        self.bloom: Optional[BloomFilter] = None
+        self._bloom_path = self.path.with_name(self.path.name + '.bloom.npy')
+        if bloom:
+            self._load_bloom(bloom_capacity, false_positive_rate)
+
+    def _init_database(self):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS dedup_keys (
+                hash INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                first_seen TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE TABLE IF NOT EXISTS dedup_meta (name TEXT PRIMARY KEY, value TEXT)")
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS batch_keys (pos INTEGER PRIMARY KEY, hash INTEGER NOT NULL)")
+
+        chave = ','.join(self.key_columns)
+        cursor.execute("INSERT OR IGNORE INTO dedup_meta VALUES ('key_columns', ?)", (chave,))
+        gravada = cursor.execute("SELECT value FROM dedup_meta WHERE name = 'key_columns'").fetchone()[0]
+        if gravada != chave:
+            self.conn.close()
+            raise ValueError(f"Índice {self.path} usa a chave ({gravada}), não ({chave})")
+        self.conn.commit()
+
+    def _load_bloom(self, capacity: int, false_positive_rate: float):
+        """Carrega o Bloom filter salvo ou o reconstrói a partir da tabela"""
+        total = len(self)
+        self.bloom = BloomFilter(max(capacity, 2 * total), false_positive_rate)
+
+        gravado = self.conn.execute("SELECT value FROM dedup_meta WHERE name = 'bloom'").fetchone()
+        assinatura = f"{self.bloom.size}:{self.bloom.num_hashes}:{total}"
+        if gravado is not None and gravado[0] == assinatura and self._bloom_path.exists():
+            self.bloom.bits = np.load(self._bloom_path)
+            return
+
+        cursor = self.conn.execute("SELECT hash FROM dedup_keys")
+        while True:
+            linhas = cursor.fetchmany(_LOTE_SQL)
+            if not linhas:
+                break
+            self.bloom.add(np.array(linhas, dtype=np.int64).ravel())
+
+    def _save_bloom(self):
+        if self.bloom is None:
+            return
+        np.save(self._bloom_path, self.bloom.bits)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO dedup_meta VALUES ('bloom', ?)",
+            (f"{self.bloom.size}:{self.bloom.num_hashes}:{len(self)}",)
+        )
+        self.conn.commit()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM dedup_keys").fetchone()[0]
+
+    def _lookup(self, hashes: np.ndarray, columns: str = 'k.hash') -> pd.DataFrame:
+        """Linhas do índice para os hashes do lote (JOIN com a tabela temporária)"""
+        cursor = self.conn.cursor()
+        cursor.execute("DELETE FROM batch_keys")
+        for inicio in range(0, len(hashes), _LOTE_SQL):
+            parte = hashes[inicio:inicio + _LOTE_SQL]
+            cursor.executemany(
+                "INSERT INTO batch_keys VALUES (?, ?)",
+                zip(range(inicio, inicio + len(parte)), parte.tolist())
+            )
+        linhas = cursor.execute(
+            f"SELECT b.pos, {columns} FROM batch_keys b JOIN dedup_keys k ON k.hash = b.hash"
+        ).fetchall()
+        cursor.execute("DELETE FROM batch_keys")
+        nomes = ['pos'] + [coluna.strip().split('.')[-1] for coluna in columns.split(',')]
+        return pd.DataFrame(linhas, columns=nomes)
+
+    def contains(self, df: pd.DataFrame) -> np.ndarray:
+        """True para as linhas cuja chave já está no índice"""
+        return self._seen(key_hashes(df, self.key_columns))
+
+    def _seen(self, hashes: np.ndarray) -> np.ndarray:
+        vistos = np.zeros(len(hashes), dtype=bool)
+
+        candidatos = np.arange(len(hashes))
+        if self.bloom is not None:
+            candidatos = candidatos[self.bloom.might_contain(hashes)]
+        if len(candidatos):
+            encontrados = self._lookup(hashes[candidatos])['pos'].to_numpy(dtype=np.int64)
+            vistos[candidatos[encontrados]] = True
+        return vistos
+
+    def unknown_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """True para as linhas novas (primeira ocorrência), sem registrar nada
+
+        Duplicatas dentro do próprio lote contam só na primeira linha.
+        """
+        return self._unknown(key_hashes(df, self.key_columns))
+
+    def _unknown(self, hashes: np.ndarray) -> np.ndarray:
+        return ~self._seen(hashes) & ~pd.Series(hashes).duplicated(keep='first').to_numpy()
+
+    def register(self, df: pd.DataFrame, source: str, timestamp: Optional[datetime] = None) -> np.ndarray:
+        """Registra o lote; retorna True para as linhas novas (como unknown_mask)
+
+        Chame depois de gravar as linhas: registrar antes faz com que uma
+        gravação que falhe descarte esses contratos na próxima execução.
+        """
+        hashes = key_hashes(df, self.key_columns)
+        novos = self._unknown(hashes)
+
+        if novos.any():
+            instante = (timestamp or datetime.now()).isoformat(timespec='seconds')
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO dedup_keys VALUES (?, ?, ?)",
+                ((h, source, instante) for h in hashes[novos].tolist())
+            )
+            self.conn.commit()
+            if self.bloom is not None:
+                self.bloom.add(hashes[novos])
+        return novos
+
+    def filter_new(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Linhas ainda não vistas (somente leitura; registre-as com register() após gravá-las)"""
+        return df[self.unknown_mask(df)]
+
+    def provenance(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fonte e instante da primeira ocorrência de cada linha (NaN se nunca vista)"""
+        hashes = key_hashes(df, self.key_columns)
+        encontrados = self._lookup(hashes, 'k.source, k.first_seen').set_index('pos')
+        return encontrados.reindex(np.arange(len(df))).set_axis(df.index)
+
+    def close(self):
+        self._save_bloom()
+        self.conn.close()
+
+    def __enter__(self) -> 'DedupIndex':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+HTTP CACHE - Respostas dos coletores em disco, com revalidação e arquivo histórico
+Evita rebaixar páginas de busca idênticas e permite reprocessar HTML antigo.
+
+- Chave: URL normalizada (esquema/host em minúsculas, parâmetros ordenados,
+  sem fragmento), então a mesma busca com parâmetros em outra ordem reaproveita
+  a entrada.
+- Corpo: gzip endereçado pelo SHA-256 do conteúdo (objects/ab/abcd….gz);
+  páginas idênticas em URLs diferentes ocupam um único arquivo.
+- Revalidação: requisições seguintes mandam If-None-Match/If-Modified-Since;
+  um 304 reaproveita o corpo guardado.
+- Arquivo: cada conteúdo novo de uma URL vira um snapshot; iter_archive()
+  devolve o HTML histórico para reaplicar parsers sem acessar o portal.
+- Modo offline: só responde do cache (replay e testes sem rede).
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Mapping, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Cache compartilhado pelos coletores (relativo à raiz do projeto)
+DEFAULT_HTTP_CACHE = 'data/http_cache'
+
+MODES = ('default', 'offline', 'refresh')
+
+
+def normalize_url(url: str, params: Optional[Mapping] = None) -> str:
+    """URL canônica: esquema/host em minúsculas, query ordenada, sem fragmento"""
+    partes = urlsplit(url)
+    query = parse_qsl(partes.query, keep_blank_values=True)
+    if params:
+        query += [(str(chave), str(valor)) for chave, valor in params.items()]
+    return urlunsplit((
+        partes.scheme.lower(), partes.netloc.lower(), partes.path or '/',
+        urlencode(sorted(query)), ''
+    ))
+
+
+def cache_key(url: str, params: Optional[Mapping] = None) -> str:
+    return hashlib.sha256(normalize_url(url, params).encode()).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status: int
+    body: bytes
+    encoding: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    fetched_at: str = ''
+    validated_at: str = ''
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or 'utf-8', errors='replace')
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('Last-Modified')
+
+
+class CacheMiss(LookupError):
+    """URL ausente do cache no modo offline"""
+
+
+class HttpCache:
+    """Índice SQLite + objetos gzip endereçados por conteúdo
+
+    ``mode``: 'default' (revalida entradas guardadas), 'offline' (só cache)
+    ou 'refresh' (ignora o cache na leitura, mas grava as respostas).
+    Entradas validadas há menos de ``max_age`` segundos são servidas sem
+    acessar a rede.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_HTTP_CACHE, mode: str = 'default',
+                 max_age: Optional[float] = None):
+        if mode not in MODES:
+            raise ValueError(f"Modo de cache inválido: {mode} (use {', '.join(MODES)})")
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / 'objects'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        self.max_age = max_age
+        self.conn = sqlite3.connect(self.cache_dir / 'index.sqlite')
+        self._init_database()
+
+    @property
+    def offline(self) -> bool:
+        return self.mode == 'offline'
+
+    def _init_database(self):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                encoding TEXT,
+                headers TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                validated_at TEXT NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                key TEXT NOT NULL,
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                PRIMARY KEY (key, content_hash)
+            )
+        """)
+        self.conn.commit()
+
+    # --- Objetos ------------------------------------------------------------
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self.objects_dir / content_hash[:2] / f"{content_hash}.gz"
+
+    def _write_object(self, body: bytes) -> str:
+        content_hash = hashlib.sha256(body).hexdigest()
+        path = self._object_path(content_hash)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(gzip.compress(body))
+                os.replace(tmp, path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        return content_hash
+
+    def _read_object(self, content_hash: str) -> Optional[bytes]:
+        try:
+            return gzip.decompress(self._object_path(content_hash).read_bytes())
+        except (OSError, EOFError):
+            return None
+
+    # --- Consulta e gravação ------------------------------------------------
+
+    def lookup(self, url: str, params: Optional[Mapping] = None) -> Optional[CachedResponse]:
+        """Resposta guardada para a URL (None se ausente ou com objeto corrompido)"""
+        linha = self.conn.execute(
+            "SELECT url, status, content_hash, encoding, headers, fetched_at, validated_at "
+            "FROM responses WHERE key = ?", (cache_key(url, params),)
+        ).fetchone()
+        if linha is None:
+            return None
+        body = self._read_object(linha[2])
+        if body is None:
+            return None
+        return CachedResponse(url=linha[0], status=linha[1], body=body, encoding=linha[3],
+                              headers=json.loads(linha[4]), fetched_at=linha[5], validated_at=linha[6])
+
+    def is_fresh(self, entry: CachedResponse, now: Optional[datetime] = None) -> bool:
+        if self.max_age is None:
+            return False
+        idade = ((now or datetime.now()) - datetime.fromisoformat(entry.validated_at)).total_seconds()
+        return idade <= self.max_age
+
+    def cached(self, url: str, params: Optional[Mapping] = None) -> Tuple[Optional[CachedResponse], Dict[str, str]]:
+        """Entrada utilizável e cabeçalhos condicionais para a requisição
+
+        Offline: a entrada (ou CacheMiss). Refresh: nada. Default: a entrada
+        e If-None-Match/If-Modified-Since para revalidá-la.
+        """
+        if self.mode == 'refresh':
+            return None, {}
+        entry = self.lookup(url, params)
+        if self.offline and entry is None:
+            raise CacheMiss(normalize_url(url, params))
+        if entry is None:
+            return None, {}
+
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return entry, headers
+
+    def store(self, url: str, params: Optional[Mapping], status: int, body: bytes,
+              headers: Mapping[str, str], encoding: Optional[str] = None) -> CachedResponse:
+        """Grava uma resposta 200 e registra o snapshot se o conteúdo mudou"""
+        agora = datetime.now().isoformat(timespec='seconds')
+        key = cache_key(url, params)
+        normalizada = normalize_url(url, params)
+        content_hash = self._write_object(body)
+        # headers de requests/aiohttp não diferenciam maiúsculas no get()
+        cabecalhos = {nome: headers.get(nome) for nome in ('ETag', 'Last-Modified', 'Content-Type') if headers.get(nome)}
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, normalizada, status, content_hash, encoding, json.dumps(cabecalhos), agora, agora)
+            )
+            self.conn.execute(
+                "INSERT OR IGNORE INTO snapshots VALUES (?, ?, ?, ?)", (key, normalizada, content_hash, agora)
+            )
+        return CachedResponse(normalizada, status, body, encoding, cabecalhos, agora, agora)
+
+    def revalidated(self, entry: CachedResponse, url: str, params: Optional[Mapping] = None) -> CachedResponse:
+        """Servidor respondeu 304: a entrada continua válida"""
+        agora = datetime.now().isoformat(timespec='seconds')
+        with self.conn:
+            self.conn.execute("UPDATE responses SET validated_at = ? WHERE key = ?", (agora, cache_key(url, params)))
+        entry.validated_at = agora
+        return entry
+
+    def iter_archive(self, url_prefix: str = '') -> Iterator[Tuple[str, str, str]]:
+        """(url, fetched_at, html) de todos os snapshots, do mais antigo ao mais novo
+
+        ``url_prefix`` filtra pela URL normalizada (ex.: a página de busca).
+        """
+        linhas = self.conn.execute(
+            "SELECT s.url, s.fetched_at, s.content_hash, r.encoding FROM snapshots s "
+            "LEFT JOIN responses r ON r.key = s.key "
+            "WHERE substr(s.url, 1, ?) = ? ORDER BY s.fetched_at, s.rowid",
+            (len(url_prefix), url_prefix)
+        ).fetchall()
+        for url, fetched_at, content_hash, encoding in linhas:
+            body = self._read_object(content_hash)
+            if body is not None:
+                yield url, fetched_at, body.decode(encoding or 'utf-8', errors='replace')
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> 'HttpCache':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def cached_get(session, cache: Optional[HttpCache], url: str, params: Optional[Mapping] = None,
+               timeout: float = 30) -> Tuple[Optional[int], Optional[str]]:
+    """GET síncrono (requests.Session) através do cache; retorna (status, texto)
+
+    Um 304 devolve o corpo guardado com status 200. No modo offline uma URL
+    fora do cache levanta CacheMiss.
+    """
+    if cache is None:
+        response = session.get(url, params=params, timeout=timeout)
+        return response.status_code, response.text
+
+    entry, headers = cache.cached(url, params)
+    if cache.offline or (entry is not None and cache.is_fresh(entry)):
+        return entry.status, entry.text
+
+    response = session.get(url, params=params, headers=headers, timeout=timeout)
+    if response.status_code == 304 and entry is not None:
+        return 200, cache.revalidated(entry, url, params).text
+    if response.status_code == 200:
+        stored = cache.store(url, params, 200, response.content, response.headers, response.encoding)
+        return 200, stored.text
+    return response.status_code, response.text
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+ÍNDICE CANÔNICO DE ÓRGÃOS - UASG, aliases e hierarquia
+Resolve nomes inconsistentes dos CSVs de contratos para um ID estável de órgão.
+
+Ordem de resolução: código UASG (estável entre coletores) → nome normalizado
+(sem acento, caixa ou pontuação) → partes de nomes no formato "SIGLA - Nome".
+Os joins com as tabelas de perfil são feitos por ID via dicionários, e as
+roll-ups usam uma tabela de ancestrais pré-computada
+(ministério → autarquia → unidade).
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+# Níveis da hierarquia. Órgãos superiores fora do Executivo (TCU, STF) ficam no nível ministério.
+MINISTERIO = 'ministerio'
+AUTARQUIA = 'autarquia'
+UNIDADE = 'unidade'
+NIVEIS = (MINISTERIO, AUTARQUIA, UNIDADE)
+
+
+@dataclass(frozen=True)
+class Orgao:
+    """Entrada do catálogo de órgãos"""
+    id: str
+    nome: str
+    nivel: str
+    pai: Optional[str] = None
+    uasgs: Tuple[int, ...] = ()
+    aliases: Tuple[str, ...] = ()
+
+
+# Catálogo federal usado pelos radares (nome canônico = nome usado nos CSVs e perfis)
+ORGAOS = (
+    Orgao('mec', 'Ministério da Educação', MINISTERIO, uasgs=(153001,), aliases=('MEC',)),
+    Orgao('capes', 'CAPES - Coordenação de Aperfeiçoamento de Pessoal de Nível Superior', AUTARQUIA, 'mec',
+          uasgs=(154001,)),
+    Orgao('fnde', 'FNDE - Fundo Nacional de Desenvolvimento da Educação', AUTARQUIA, 'mec', uasgs=(153005,)),
+    Orgao('mre', 'Ministério das Relações Exteriores', MINISTERIO, uasgs=(210001,), aliases=('MRE', 'Itamaraty')),
+    Orgao('md', 'Ministério da Defesa', MINISTERIO, uasgs=(160001,), aliases=('MD',)),
+    Orgao('mjsp', 'Ministério da Justiça e Segurança Pública', MINISTERIO, uasgs=(130001,),
+          aliases=('MJSP', 'Ministério da Justiça')),
+    Orgao('pf', 'Polícia Federal', UNIDADE, 'mjsp', uasgs=(130002,),
+          aliases=('PF', 'DPF', 'Departamento de Polícia Federal')),
+    Orgao('mdic', 'Ministério do Desenvolvimento, Indústria e Comércio Exterior', MINISTERIO, uasgs=(120001,),
+          aliases=('MDIC', 'Ministério do Desenvolvimento, Indústria, Comércio e Serviços')),
+    Orgao('mgi', 'Ministério da Gestão e da Inovação em Serviços Públicos', MINISTERIO, aliases=('MGI',)),
+    Orgao('enap', 'ENAP - Escola Nacional de Administração Pública', AUTARQUIA, 'mgi', uasgs=(389001,)),
+    Orgao('tcu', 'Tribunal de Contas da União', MINISTERIO, uasgs=(40001,), aliases=('TCU',)),
+    Orgao('stf', 'Supremo Tribunal Federal', MINISTERIO, uasgs=(10001,), aliases=('STF',)),
+    Orgao('bcb', 'Banco Central do Brasil', AUTARQUIA, uasgs=(245001,), aliases=('BCB', 'BACEN', 'Banco Central')),
+    Orgao('mcom', 'Ministério das Comunicações', MINISTERIO, uasgs=(250001,), aliases=('MCOM',)),
+    Orgao('mcti', 'Ministério da Ciência, Tecnologia e Inovações', MINISTERIO, uasgs=(240001,),
+          aliases=('MCTI', 'Ministério da Ciência, Tecnologia e Inovação')),
+    Orgao('cnpq', 'CNPq - Conselho Nacional de Desenvolvimento Científico e Tecnológico', AUTARQUIA, 'mcti',
+          uasgs=(240002,)),
+    Orgao('mapa', 'Ministério da Agricultura, Pecuária e Abastecimento', MINISTERIO, uasgs=(220001,),
+          aliases=('MAPA', 'Ministério da Agricultura e Pecuária')),
+    Orgao('embrapa', 'Embrapa - Empresa Brasileira de Pesquisa Agropecuária', AUTARQUIA, 'mapa', uasgs=(220002,)),
+    Orgao('mtur', 'Ministério do Turismo', MINISTERIO, uasgs=(330001,), aliases=('MTur',)),
+    Orgao('mma', 'Ministério do Meio Ambiente e Mudança do Clima', MINISTERIO,
+          aliases=('MMA', 'Ministério do Meio Ambiente')),
+    Orgao('ibama', 'IBAMA - Instituto Brasileiro do Meio Ambiente', AUTARQUIA, 'mma', uasgs=(440001,),
+          aliases=('Instituto Brasileiro do Meio Ambiente e dos Recursos Naturais Renováveis',)),
+    Orgao('mf', 'Ministério da Fazenda', MINISTERIO, aliases=('MF',)),
+    Orgao('rfb', 'Receita Federal do Brasil', UNIDADE, 'mf', uasgs=(170001,),
+          aliases=('RFB', 'Receita Federal', 'Secretaria Especial da Receita Federal do Brasil')),
+    Orgao('ms', 'Ministério da Saúde', MINISTERIO, aliases=('MS',)),
+    Orgao('anvisa', 'ANVISA - Agência Nacional de Vigilância Sanitária', AUTARQUIA, 'ms', uasgs=(260001,)),
+)
+
+_NAO_ALFANUMERICO = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_name(nome: str) -> str:
+    """Nome sem acentos, caixa e pontuação ("Ministério da  Educação" → "ministerio da educacao")"""
+    sem_acento = unicodedata.normalize('NFKD', str(nome)).encode('ascii', 'ignore').decode('ascii')
+    return _NAO_ALFANUMERICO.sub(' ', sem_acento.lower()).strip()
+
+
+def _name_variants(nome: str) -> List[str]:
+    """Nome completo e, para "SIGLA - Nome", cada uma das partes"""
+    partes = [parte.strip() for parte in str(nome).split(' - ')]
+    return [nome] + partes if len(partes) > 1 else [nome]
+
+
+class OrgaoIndex:
+    """Índice de órgãos: UASG/aliases/nomes normalizados → ID canônico"""
+
+    def __init__(self, orgaos: Iterable[Orgao] = ORGAOS):
+        self.orgaos: Dict[str, Orgao] = {orgao.id: orgao for orgao in orgaos}
+        self._por_uasg: Dict[int, str] = {}
+        self._por_nome: Dict[str, str] = {}
+
+        for orgao in self.orgaos.values():
+            if orgao.pai is not None and orgao.pai not in self.orgaos:
+                raise ValueError(f"Órgão pai desconhecido para {orgao.id}: {orgao.pai}")
+            for uasg in orgao.uasgs:
+                self._por_uasg[int(uasg)] = orgao.id
+            for nome in (orgao.nome,) + orgao.aliases:
+                for variante in _name_variants(nome):
+                    self._por_nome.setdefault(normalize_name(variante), orgao.id)
+
+        # Cadeia de ancestrais (o próprio órgão primeiro) pré-computada para as roll-ups
+        self._ancestrais: Dict[str, Tuple[str, ...]] = {
+            orgao_id: self._build_ancestors(orgao_id) for orgao_id in self.orgaos
+        }
+        self.hierarquia = pd.DataFrame(
+            [
+                (orgao_id, ancestral, self.orgaos[ancestral].nivel)
+                for orgao_id, cadeia in self._ancestrais.items()
+                for ancestral in cadeia
+            ],
+            columns=['orgao_id', 'ancestral_id', 'nivel']
+        )
+        # Ancestral de cada órgão por nível (ministério/autarquia), para ler as roll-ups por ID
+        self._ancestral_por_nivel: Dict[str, Dict[str, str]] = {
+            nivel: dict(zip(grupo['orgao_id'], grupo['ancestral_id']))
+            for nivel, grupo in self.hierarquia.groupby('nivel', sort=False)
+        }
+
+    def _build_ancestors(self, orgao_id: str) -> Tuple[str, ...]:
+        cadeia = [orgao_id]
+        while self.orgaos[cadeia[-1]].pai is not None:
+            pai = self.orgaos[cadeia[-1]].pai
+            if pai in cadeia:
+                raise ValueError(f"Ciclo na hierarquia de órgãos: {cadeia + [pai]}")
+            cadeia.append(pai)
+        return tuple(cadeia)
+
+    # --- Resolução escalar -------------------------------------------------
+
+    def resolve(self, nome: Optional[str] = None, uasg: Union[int, str, None] = None) -> Optional[str]:
+        """ID canônico pelo UASG ou pelo nome; None quando não reconhecido"""
+        try:
+            orgao_id = self._por_uasg.get(int(float(uasg)))
+        except (TypeError, ValueError):
+            orgao_id = None
+        if orgao_id is not None:
+            return orgao_id
+
+        if nome is None or pd.isna(nome):
+            return None
+        for variante in _name_variants(nome):
+            orgao_id = self._por_nome.get(normalize_name(variante))
+            if orgao_id is not None:
+                return orgao_id
+        return None
+
+    def key(self, nome: str, uasg: Union[int, str, None] = None) -> str:
+        """ID canônico, ou o próprio nome quando o órgão não está no catálogo"""
+        return self.resolve(nome, uasg) or nome
+
+    def canonical_name(self, nome: str, uasg: Union[int, str, None] = None) -> str:
+        """Nome de exibição canônico (o próprio nome quando não reconhecido)"""
+        orgao_id = self.resolve(nome, uasg)
+        return self.orgaos[orgao_id].nome if orgao_id is not None else nome
+
+    def ancestors(self, orgao_id: str) -> Tuple[str, ...]:
+        """IDs do órgão e de seus superiores, do mais específico ao ministério"""
+        return self._ancestrais.get(orgao_id, (orgao_id,))
+
+    def ministry(self, orgao_id: str) -> str:
+        """ID do órgão raiz da hierarquia"""
+        return self.ancestors(orgao_id)[-1]
+
+    # --- Resolução vetorizada ---------------------------------------------
+
+    def resolve_series(self, nomes: pd.Series, uasgs: Optional[pd.Series] = None) -> pd.Series:
+        """IDs canônicos para colunas inteiras (<NA> quando não reconhecido)
+
+        Cada nome distinto é normalizado uma única vez; o join é por dicionário.
+        """
+        ids = pd.Series(pd.NA, index=nomes.index, dtype=object)
+
+        if uasgs is not None:
+            codigos = pd.to_numeric(uasgs, errors='coerce').astype('Int64')
+            ids = codigos.map(self._por_uasg).astype(object)
+
+        pendentes = ids.isna() & nomes.notna()
+        if pendentes.any():
+            distintos = pd.unique(nomes[pendentes])
+            por_nome = {nome: self.resolve(nome) for nome in distintos}
+            ids[pendentes] = nomes[pendentes].map(por_nome)
+
+        return ids.where(ids.notna(), pd.NA)
+
+    def keys(self, nomes: pd.Series, uasgs: Optional[pd.Series] = None) -> pd.Series:
+        """IDs canônicos, com o nome original para órgãos fora do catálogo"""
+        return self.resolve_series(nomes, uasgs).fillna(nomes)
+
+    def names(self, chaves: Union[pd.Series, pd.Index]) -> Union[pd.Series, pd.Index]:
+        """Nomes de exibição para chaves retornadas por keys()"""
+        return chaves.map(lambda chave: self.orgaos[chave].nome if chave in self.orgaos else chave)
+
+    # --- Roll-ups -----------------------------------------------------------
+
+    def rollup(self, df: pd.DataFrame, valores: List[str], id_col: str = 'orgao_id',
+               agg: Union[str, Dict[str, str]] = 'sum', nivel: Optional[str] = None) -> pd.DataFrame:
+        """Agrega ``valores`` em cada nível da hierarquia
+
+        Cada linha conta para o próprio órgão e para todos os seus superiores
+        (join com a tabela de ancestrais pré-computada). Linhas cujo ID não
+        está no catálogo são ignoradas. Retorna um DataFrame indexado por
+        ``ancestral_id`` com a coluna ``nivel``.
+        """
+        hierarquia = self.hierarquia
+        if nivel is not None:
+            hierarquia = hierarquia[hierarquia['nivel'] == nivel]
+
+        agregado = (
+            df[[id_col] + valores]
+            .merge(hierarquia, left_on=id_col, right_on='orgao_id', how='inner')
+            .groupby(['ancestral_id', 'nivel'], sort=False)[valores]
+            .agg(agg)
+            .reset_index('nivel')
+        )
+        agregado['nome'] = self.names(agregado.index)
+        return agregado
+
+    def ancestor_ids(self, ids: pd.Series, nivel: str) -> pd.Series:
+        """ID do ancestral de cada órgão no ``nivel`` (<NA> fora do catálogo ou sem esse nível)"""
+        ancestrais = ids.map(self._ancestral_por_nivel.get(nivel, {})).astype(object)
+        return ancestrais.where(ancestrais.notna(), pd.NA)
+
+    def rollup_values(self, ids: pd.Series, rollup: pd.DataFrame, coluna: str, nivel: str,
+                      fill_value=0) -> pd.Series:
+        """Valor de ``coluna`` da roll-up no ``nivel`` de cada órgão de ``ids``
+
+        ``rollup`` é a saída de rollup(), calculada uma vez para todos os
+        níveis; aqui só há lookups por dicionário.
+        """
+        por_ancestral = rollup.loc[rollup['nivel'] == nivel, coluna]
+        return self.ancestor_ids(ids, nivel).map(por_ancestral).fillna(fill_value)
+
+
+@lru_cache(maxsize=1)
+def get_orgao_index() -> OrgaoIndex:
+    """Índice padrão (catálogo ORGAOS), construído uma vez por processo"""
+    return OrgaoIndex()
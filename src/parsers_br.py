@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+PARSERS BR - Valores em Reais, datas e CNPJ
+Conversões vetorizadas (Series inteira) compartilhadas pelos scripts de análise.
+
+- "R$ 1.234,56" → centavos inteiros (Int64), sem aritmética de ponto flutuante
+- datas em uma passada de pd.to_datetime, com fallback apenas nas falhas
+- CNPJ: extração de dígitos, formatação XX.XXX.XXX/XXXX-XX e validação dos DVs
+
+Sentinelas dos coletores ("Valor não informado", "CNPJ não informado", "N/A"...)
+e textos fora do padrão viram <NA>/NaT em vez de zero.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from typing import Iterable, Optional, Tuple
+
+# Textos usados pelos coletores para campos ausentes
+SENTINELAS = frozenset({
+    '',
+    'N/A',
+    'nan',
+    'None',
+    'Não informado',
+    'Valor não informado',
+    'CNPJ não informado',
+    'Data não informada',
+    'Fornecedor não identificado',
+})
+
+# Formatos de data tentados em ordem antes do fallback inferido
+FORMATOS_DATA = ('%Y-%m-%d', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S')
+
+# Valores em Reais: \s* (-)? \s* (R$)? \s* (-)? inteiro (,dd)? \s*, com o inteiro
+# com ou sem separador de milhar ("1.234.567" ou "1234567") e até 2 casas decimais.
+# Reconhecidos por um autômato que avança uma coluna de caracteres por vez sobre
+# todos os textos do lote (códigos UCS-4 do NumPy), sem laço Python por valor.
+(_C_FIM, _C_ESPACO, _C_MENOS, _C_R, _C_CIFRAO, _C_DIGITO, _C_PONTO, _C_VIRGULA, _C_OUTRO) = range(9)
+(_INICIO, _SINAL, _R, _CIFRAO, _SINAL_VALOR, _INTEIRO, _FRACAO, _ESPACO_FINAL, _FIM, _INVALIDO) = range(10)
+
+# Classe de cada código de caractere; o último índice vale para todos os códigos acima
+_CLASSES = np.array([_C_ESPACO if re.match(r'\s', chr(c)) else _C_OUTRO for c in range(0x3002)], dtype=np.int8)
+_CLASSES[-1] = _C_OUTRO
+_CLASSES[0] = _C_FIM  # preenchimento dos textos mais curtos do lote
+_CLASSES[ord('-')], _CLASSES[ord('R')], _CLASSES[ord('$')] = _C_MENOS, _C_R, _C_CIFRAO
+_CLASSES[ord('0'):ord('9') + 1] = _C_DIGITO
+_CLASSES[ord('.')], _CLASSES[ord(',')] = _C_PONTO, _C_VIRGULA
+
+
+def _transicoes() -> np.ndarray:
+    tabela = np.full((_INVALIDO + 1, _C_OUTRO + 1), _INVALIDO, dtype=np.int8)
+    for estado in (_INICIO, _SINAL, _CIFRAO):
+        tabela[estado, [_C_ESPACO, _C_DIGITO]] = [estado, _INTEIRO]
+    tabela[_INICIO, [_C_MENOS, _C_R]] = [_SINAL, _R]
+    tabela[_SINAL, [_C_MENOS, _C_R]] = [_SINAL_VALOR, _R]
+    tabela[_R, _C_CIFRAO] = _CIFRAO
+    tabela[_CIFRAO, _C_MENOS] = _SINAL_VALOR
+    tabela[_SINAL_VALOR, _C_DIGITO] = _INTEIRO
+    tabela[_INTEIRO, [_C_FIM, _C_ESPACO, _C_DIGITO, _C_PONTO, _C_VIRGULA]] = [_FIM, _ESPACO_FINAL, _INTEIRO, _INTEIRO, _FRACAO]
+    tabela[_FRACAO, [_C_FIM, _C_ESPACO, _C_DIGITO]] = [_FIM, _ESPACO_FINAL, _FRACAO]
+    tabela[_ESPACO_FINAL, [_C_FIM, _C_ESPACO]] = [_FIM, _ESPACO_FINAL]
+    tabela[_FIM, _C_FIM] = _FIM
+    return tabela
+
+
+_TRANSICOES = _transicoes()
+
+# Textos convertidos por vez (limita a matriz de códigos na memória)
+_LOTE_TEXTOS = 100_000
+
+# infer_dtype de colunas object que o acessor .str aceita (textos, possivelmente misturados)
+_TIPOS_COM_TEXTO = frozenset({'string', 'mixed', 'mixed-integer'})
+
+# Pesos dos dígitos verificadores do CNPJ
+_PESOS_DV1 = np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+_PESOS_DV2 = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+
+
+def mascara_sentinela(series: pd.Series) -> pd.Series:
+    """True onde o valor é nulo ou um texto sentinela de campo ausente"""
+    texto = series.astype('string').str.strip()
+    return texto.isna() | texto.isin(SENTINELAS)
+
+
+def _codigos_para_centavos(codigos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Centavos (int64) de uma matriz textos × caracteres (uint32) e a máscara dos inválidos"""
+    n = len(codigos)
+    classes = _CLASSES[np.minimum(codigos, len(_CLASSES) - 1)]
+    estado = np.full(n, _INICIO, dtype=np.int8)
+    negativo = np.zeros(n, dtype=bool)
+    pontuado = np.zeros(n, dtype=bool)
+    grupo = np.zeros(n, dtype=np.int8)  # dígitos desde o último ponto (ou desde o início), até 4
+    casas = np.zeros(n, dtype=np.int8)
+    inteiro = np.zeros(n, dtype=np.int64)
+    fracao = np.zeros(n, dtype=np.int64)
+
+    fim = np.full(n, _C_FIM, dtype=np.int8)
+    for coluna in range(codigos.shape[1] + 1):
+        classe = classes[:, coluna] if coluna < codigos.shape[1] else fim
+        digito = classe == _C_DIGITO
+        no_inteiro, na_fracao = estado == _INTEIRO, estado == _FRACAO
+        valor = codigos[:, coluna].astype(np.int64) - ord('0') if coluna < codigos.shape[1] else 0
+
+        # Regras de agrupamento do inteiro: "1.234.567" (grupos de 3 após o ponto) ou só dígitos
+        ponto = no_inteiro & (classe == _C_PONTO)
+        saida_inteiro = no_inteiro & ~digito & ~ponto
+        invalido = (
+            (no_inteiro & digito & pontuado & (grupo == 3))
+            | (ponto & np.where(pontuado, grupo != 3, grupo > 3))
+            | (saida_inteiro & pontuado & (grupo != 3))
+            | (na_fracao & digito & (casas == 2))
+            | (na_fracao & ~digito & (casas == 0))
+        )
+
+        negativo |= classe == _C_MENOS
+        pontuado |= ponto
+        grupo = np.where(ponto, 0, np.minimum(grupo + digito, 4)).astype(np.int8)
+        inteiro = np.where(digito & ~na_fracao, inteiro * 10 + valor, inteiro)
+        fracao = np.where(na_fracao & digito, fracao * 10 + valor, fracao)
+        casas += na_fracao & digito
+
+        estado = _TRANSICOES[estado, classe]
+        estado[invalido] = _INVALIDO
+
+    centavos = inteiro * 100 + np.where(casas == 1, fracao * 10, fracao)
+    return np.where(negativo, -centavos, centavos), estado != _FIM
+
+
+def _textos_para_centavos(textos: np.ndarray) -> pd.array:
+    """Centavos (Int64) de um array de textos em Reais; <NA> para textos fora do padrão"""
+    centavos = np.zeros(len(textos), dtype=np.int64)
+    invalidos = np.ones(len(textos), dtype=bool)
+    for inicio in range(0, len(textos), _LOTE_TEXTOS):
+        lote = np.asarray(textos[inicio:inicio + _LOTE_TEXTOS], dtype=str)
+        codigos = lote.view(np.uint32).reshape(len(lote), -1)
+        fatia = slice(inicio, inicio + len(lote))
+        centavos[fatia], invalidos[fatia] = _codigos_para_centavos(codigos)
+    return pd.arrays.IntegerArray(centavos, invalidos)
+
+
+def parse_brl_centavos(series: pd.Series) -> pd.Series:
+    """Converte valores em Reais para centavos inteiros (dtype Int64)
+
+    Aceita "R$ 1.234,56", "1234,5", "-R$ 10,00" e números já convertidos
+    (em Reais). Sentinelas e textos fora do padrão viram <NA>.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return (series.astype(float) * 100).round().astype('Int64')
+
+    # Trabalha por posição para não depender de um índice único
+    valores = series.reset_index(drop=True)
+    centavos = pd.Series(pd.NA, index=valores.index, dtype='Int64')
+
+    # Colunas object podem misturar textos e números (ex.: CSVs concatenados);
+    # o tipo vem de infer_dtype (uma passada em C) e, se misturado, do .str
+    # (que devolve nulo para o que não é texto)
+    if valores.dtype != object:
+        e_texto = valores.notna()
+    elif pd.api.types.infer_dtype(valores, skipna=True) in _TIPOS_COM_TEXTO:
+        e_texto = valores.str.len().notna()
+    else:
+        e_texto = pd.Series(False, index=valores.index)
+    numericos = valores.notna() & ~e_texto
+    if numericos.any():
+        centavos[numericos] = parse_brl_centavos(pd.to_numeric(valores[numericos], errors='coerce'))
+
+    # Autômato vetorizado: mais barato que deduplicar os textos (factorize) antes
+    centavos[e_texto] = _textos_para_centavos(valores[e_texto].to_numpy(dtype=object))
+
+    return centavos.set_axis(series.index)
+
+
+def parse_brl(series: pd.Series, fill_value: Optional[float] = None) -> pd.Series:
+    """Converte valores em Reais para float (Reais)
+
+    Com ``fill_value`` os valores ausentes/inválidos são preenchidos
+    (ex.: 0 para reproduzir o antigo clean_valor); caso contrário ficam NaN.
+    """
+    reais = parse_brl_centavos(series).astype(float) / 100
+    if fill_value is not None:
+        reais = reais.fillna(fill_value)
+    return reais
+
+
+def parse_datas(series: pd.Series, formats: Iterable[str] = FORMATOS_DATA,
+                dayfirst: bool = False) -> pd.Series:
+    """Converte datas em uma passada por formato, reprocessando só as falhas
+
+    Cada formato é aplicado apenas às linhas que os anteriores não resolveram;
+    o que sobrar passa por um último pd.to_datetime com formato inferido.
+    Sentinelas e datas inválidas viram NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    texto = series.astype('string').str.strip().reset_index(drop=True)
+    pendentes = ~mascara_sentinela(texto)
+    datas = pd.Series(pd.NaT, index=texto.index, dtype='datetime64[ns]')
+
+    for fmt in formats:
+        if not pendentes.any():
+            break
+        convertidas = pd.to_datetime(texto[pendentes], format=fmt, errors='coerce').dropna()
+        datas[convertidas.index] = convertidas
+        pendentes[convertidas.index] = False
+    else:
+        if pendentes.any():
+            datas[pendentes] = pd.to_datetime(texto[pendentes], format='mixed', dayfirst=dayfirst, errors='coerce')
+
+    return datas.set_axis(series.index)
+
+
+def cnpj_digitos(series: pd.Series) -> pd.Series:
+    """Apenas os dígitos do CNPJ; <NA> para sentinelas e quem não tem 14 dígitos"""
+    digitos = series.astype('string').str.replace(r'\D', '', regex=True)
+    return digitos.where(digitos.str.len() == 14)
+
+
+def format_cnpj(series: pd.Series, keep_invalid: bool = True) -> pd.Series:
+    """Formata CNPJs como XX.XXX.XXX/XXXX-XX
+
+    Valores sem 14 dígitos são mantidos como estão (``keep_invalid``) ou viram <NA>.
+    """
+    digitos = cnpj_digitos(series)
+    formatado = digitos.str.replace(r'^(\d{2})(\d{3})(\d{3})(\d{4})(\d{2})$', r'\1.\2.\3/\4-\5', regex=True)
+    if keep_invalid:
+        return formatado.where(digitos.notna(), series)
+    return formatado
+
+
+def validate_cnpj(series: pd.Series) -> pd.Series:
+    """True onde o CNPJ tem 14 dígitos e dígitos verificadores corretos"""
+    digitos = cnpj_digitos(series)
+    validos = pd.Series(False, index=series.index)
+    presentes = digitos.notna()
+    if not presentes.any():
+        return validos
+
+    bytes_digitos = ''.join(digitos[presentes].tolist()).encode('ascii')
+    matriz = np.frombuffer(bytes_digitos, dtype=np.uint8).reshape(-1, 14).astype(np.int64) - ord('0')
+
+    resto1 = matriz[:, :12] @ _PESOS_DV1 % 11
+    dv1 = np.where(resto1 < 2, 0, 11 - resto1)
+    resto2 = matriz[:, :13] @ _PESOS_DV2 % 11
+    dv2 = np.where(resto2 < 2, 0, 11 - resto2)
+
+    # Sequências repetidas (00.000.000/0000-00, 11.111...) passam no cálculo mas são inválidas
+    repetidos = (matriz == matriz[:, :1]).all(axis=1)
+
+    validos[presentes] = (matriz[:, 12] == dv1) & (matriz[:, 13] == dv2) & ~repetidos
+    return validos
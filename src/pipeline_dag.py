@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+PIPELINE DAG - Execução incremental dos scripts do radar
+Coleta → deduplicação → análises → relatórios como estágios com entradas e
+saídas declaradas.
+
+- Dependências vêm dos arquivos: um estágio depende de quem produz suas entradas.
+- A chave de cada estágio é o hash do comando, do código do script, dos
+  módulos locais que ele importa (direta ou indiretamente) e do conteúdo
+  das entradas; estágios com chave igual à da última execução e saídas
+  intactas são pulados.
+- Corte antecipado: um estágio que roda mas produz saídas idênticas não
+  invalida os seguintes (mudar uma linha de Idiomas não refaz a análise EdTech).
+- Estágios independentes rodam em paralelo (um subprocesso por estágio).
+"""
+
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+RAN = 'ran'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+BLOCKED = 'blocked'
+
+_BLOCO_HASH = 1 << 20
+
+
+@dataclass(frozen=True)
+class Stage:
+    """Um script do pipeline e os arquivos que ele lê e escreve
+
+    Caminhos relativos são resolvidos a partir do diretório do pipeline.
+    ``stdout`` grava a saída do script num arquivo (que conta como saída).
+    Estágios ``on_demand`` (ex.: coletores, que acessam o portal) só rodam
+    quando pedidos explicitamente; nos demais casos suas saídas são tratadas
+    como fontes.
+    """
+    name: str
+    script: str
+    args: Tuple[str, ...] = ()
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    stdout: Optional[str] = None
+    on_demand: bool = False
+
+    @property
+    def produces(self) -> Tuple[str, ...]:
+        return self.outputs + ((self.stdout,) if self.stdout else ())
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str
+    reason: str = ''
+    seconds: float = 0.0
+    returncode: Optional[int] = None
+
+
+class Pipeline:
+    """DAG de estágios com estado persistido em JSON (chave e hash das saídas)"""
+
+    def __init__(self, stages: Iterable[Stage], root: Union[str, Path], state_path: Union[str, Path, None] = None,
+                 python: str = sys.executable, module_dirs: Iterable[str] = ()):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Estágio duplicado: {stage.name}")
+            self.stages[stage.name] = stage
+        self.root = Path(root)
+        self.state_path = Path(state_path) if state_path else self.root / '.pipeline_state.json'
+        self.python = python
+        # Diretórios (além do próprio diretório de cada arquivo) onde os scripts buscam módulos locais
+        self.module_dirs = tuple(module_dirs)
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._imports: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+
+        self.producer: Dict[str, str] = {}
+        for stage in self.stages.values():
+            for path in stage.produces:
+                if path in self.producer:
+                    raise ValueError(f"{path} é produzido por {self.producer[path]} e {stage.name}")
+                self.producer[path] = stage.name
+
+        self.upstream: Dict[str, Set[str]] = {
+            name: {self.producer[p] for p in stage.inputs if p in self.producer}
+            for name, stage in self.stages.items()
+        }
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Ordem topológica estável (ordem de declaração entre independentes)"""
+        pendentes = {name: set(deps) for name, deps in self.upstream.items()}
+        ordem: List[str] = []
+        while pendentes:
+            prontos = [name for name, deps in pendentes.items() if not deps]
+            if not prontos:
+                raise ValueError(f"Ciclo entre os estágios: {', '.join(sorted(pendentes))}")
+            for name in prontos:
+                ordem.append(name)
+                del pendentes[name]
+            for deps in pendentes.values():
+                deps.difference_update(prontos)
+        return ordem
+
+    # --- Fingerprints -------------------------------------------------------
+
+    def _path(self, path: str) -> Path:
+        return self.root / path
+
+    def file_digest(self, path: str) -> Optional[str]:
+        """SHA-256 do conteúdo (memorizado por tamanho + mtime); None se não existe"""
+        caminho = self._path(path)
+        try:
+            info = caminho.stat()
+        except FileNotFoundError:
+            return None
+        memo = (str(caminho), info.st_size, info.st_mtime_ns)
+        if memo not in self._digests:
+            digest = hashlib.sha256()
+            with open(caminho, 'rb') as f:
+                for bloco in iter(lambda: f.read(_BLOCO_HASH), b''):
+                    digest.update(bloco)
+            self._digests[memo] = digest.hexdigest()
+        return self._digests[memo]
+
+    def _local_imports(self, path: str) -> Tuple[str, ...]:
+        """Módulos locais importados por ``path`` (memorizado pelo hash do arquivo)
+
+        Cada nome importado é procurado como ``<nome>.py`` no diretório do
+        arquivo e depois em ``module_dirs``; bibliotecas instaladas não são
+        encontradas e ficam de fora.
+        """
+        conteudo = self.file_digest(path)
+        if conteudo is None or not path.endswith('.py'):
+            return ()
+        memo = (path, conteudo)
+        if memo not in self._imports:
+            try:
+                arvore = ast.parse(self._path(path).read_bytes(), filename=path)
+            except SyntaxError:
+                # O script falha ao rodar; a chave continua cobrindo o próprio arquivo
+                arvore = ast.Module(body=[], type_ignores=[])
+            nomes: List[str] = []
+            for no in ast.walk(arvore):
+                if isinstance(no, ast.Import):
+                    nomes.extend(alias.name.split('.')[0] for alias in no.names)
+                elif isinstance(no, ast.ImportFrom) and no.level == 0 and no.module:
+                    nomes.append(no.module.split('.')[0])
+
+            diretorios = (Path(path).parent.as_posix(),) + self.module_dirs
+            encontrados: List[str] = []
+            for nome in dict.fromkeys(nomes):
+                for diretorio in diretorios:
+                    candidato = (Path(diretorio) / f"{nome}.py").as_posix()
+                    if self._path(candidato).is_file():
+                        encontrados.append(candidato)
+                        break
+            self._imports[memo] = tuple(encontrados)
+        return self._imports[memo]
+
+    def module_dependencies(self, script: str) -> Tuple[str, ...]:
+        """Módulos locais dos quais o script depende, direta ou indiretamente (ordenados)"""
+        vistos: Set[str] = set()
+        pilha = [script]
+        while pilha:
+            for modulo in self._local_imports(pilha.pop()):
+                if modulo != script and modulo not in vistos:
+                    vistos.add(modulo)
+                    pilha.append(modulo)
+        return tuple(sorted(vistos))
+
+    def stage_key(self, stage: Stage) -> Optional[str]:
+        """Hash de comando + código (script e módulos importados) + entradas; None se falta alguma entrada"""
+        digest = hashlib.sha256(json.dumps([stage.script, list(stage.args)]).encode())
+        modulos = tuple(m for m in self.module_dependencies(stage.script) if m not in stage.inputs)
+        for path in (stage.script,) + modulos + stage.inputs:
+            conteudo = self.file_digest(path)
+            if conteudo is None:
+                return None
+            digest.update(f"{path}\x00{conteudo}\x00".encode())
+        return digest.hexdigest()
+
+    def _output_digests(self, stage: Stage) -> Dict[str, Optional[str]]:
+        return {path: self.file_digest(path) for path in stage.produces}
+
+    def _load_state(self) -> Dict:
+        if not self.state_path.exists():
+            return {}
+        try:
+            return json.loads(self.state_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: Dict):
+        """Escrita atômica: arquivo temporário no mesmo diretório + rename"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.state_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.state_path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _stale_reason(self, stage: Stage, key: str, state: Dict) -> Optional[str]:
+        """Motivo para rodar o estágio, ou None se está atualizado"""
+        anterior = state.get(stage.name)
+        if anterior is None:
+            return 'nunca executado'
+        if anterior.get('key') != key:
+            return 'entradas ou código mudaram'
+        if anterior.get('outputs') != self._output_digests(stage):
+            return 'saídas ausentes ou alteradas'
+        return None
+
+    # --- Seleção e execução -------------------------------------------------
+
+    def select(self, targets: Optional[Iterable[str]] = None) -> List[str]:
+        """Estágios a considerar, em ordem topológica
+
+        Sem alvos: todos exceto os ``on_demand``. Com alvos: os alvos e seus
+        ancestrais não ``on_demand``.
+        """
+        if targets is None:
+            return [name for name in self.order if not self.stages[name].on_demand]
+
+        alvos = set(targets)
+        desconhecidos = alvos - set(self.stages)
+        if desconhecidos:
+            raise ValueError(f"Estágios desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+        selecionados = set(alvos)
+        pilha = list(alvos)
+        while pilha:
+            for dep in self.upstream[pilha.pop()]:
+                if dep not in selecionados and not self.stages[dep].on_demand:
+                    selecionados.add(dep)
+                    pilha.append(dep)
+        return [name for name in self.order if name in selecionados]
+
+    def plan(self, targets: Optional[Iterable[str]] = None, force: bool = False) -> Dict[str, str]:
+        """Simulação: estágios que rodariam e por quê
+
+        Sem executar não há como saber se uma saída mudaria, então tudo que
+        depende de um estágio a rodar é considerado desatualizado.
+        """
+        state = self._load_state()
+        plano: Dict[str, str] = {}
+        for name in self.select(targets):
+            stage = self.stages[name]
+            if force:
+                plano[name] = 'forçado'
+            elif any(dep in plano for dep in self.upstream[name]):
+                plano[name] = 'estágio anterior vai rodar'
+            else:
+                key = self.stage_key(stage)
+                motivo = 'entrada ausente' if key is None else self._stale_reason(stage, key, state)
+                if motivo:
+                    plano[name] = motivo
+        return plano
+
+    def _execute(self, stage: Stage) -> Tuple[int, float]:
+        comando = [self.python, str(self._path(stage.script)), *stage.args]
+        inicio = time.perf_counter()
+        if stage.stdout:
+            destino = self._path(stage.stdout)
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            with open(destino, 'w', encoding='utf-8') as saida:
+                processo = subprocess.run(comando, cwd=self.root, stdout=saida, stderr=subprocess.STDOUT)
+        else:
+            processo = subprocess.run(comando, cwd=self.root)
+        return processo.returncode, time.perf_counter() - inicio
+
+    def run(self, targets: Optional[Iterable[str]] = None, force: bool = False,
+            max_workers: Optional[int] = None) -> Dict[str, StageResult]:
+        """Executa os estágios desatualizados, em paralelo quando independentes
+
+        Um estágio com falha bloqueia só os que dependem dele; o estado é
+        salvo a cada estágio concluído, então uma nova execução retoma daí.
+        """
+        selecionados = self.select(targets)
+        state = self._load_state()
+        results: Dict[str, StageResult] = {}
+        pendentes = list(selecionados)
+        em_execucao: Dict[Future, Tuple[str, str]] = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as pool:
+            while pendentes or em_execucao:
+                for name in list(pendentes):
+                    deps = self.upstream[name] & set(selecionados)
+                    if not deps <= set(results):
+                        continue
+                    pendentes.remove(name)
+                    stage = self.stages[name]
+
+                    falhas = [dep for dep in deps if results[dep].status in (FAILED, BLOCKED)]
+                    if falhas:
+                        results[name] = StageResult(name, BLOCKED, f"depende de {', '.join(sorted(falhas))}")
+                        continue
+
+                    key = self.stage_key(stage)
+                    if key is None:
+                        faltando = [p for p in stage.inputs + (stage.script,) if self.file_digest(p) is None]
+                        results[name] = StageResult(name, FAILED, f"entrada ausente: {', '.join(faltando)}")
+                        continue
+
+                    motivo = 'forçado' if force else self._stale_reason(stage, key, state)
+                    if motivo is None:
+                        results[name] = StageResult(name, SKIPPED, 'atualizado')
+                        continue
+
+                    em_execucao[pool.submit(self._execute, stage)] = (name, motivo)
+
+                if not em_execucao:
+                    continue
+
+                concluidos, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+                for future in concluidos:
+                    name, motivo = em_execucao.pop(future)
+                    stage = self.stages[name]
+                    returncode, segundos = future.result()
+                    if returncode != 0:
+                        results[name] = StageResult(name, FAILED, motivo, segundos, returncode)
+                        state.pop(name, None)
+                    else:
+                        # A chave é recalculada: entradas lidas são as do instante da execução
+                        state[name] = {'key': self.stage_key(stage), 'outputs': self._output_digests(stage)}
+                        results[name] = StageResult(name, RAN, motivo, segundos, returncode)
+                    self._save_state(state)
+
+        return results
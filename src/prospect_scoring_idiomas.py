@@ -13,10 +13,42 @@ Critérios de Scoring (peso 1-5):
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import json
 
+from contract_store import ContractStore, get_contract_store, reais
+from parsers_br import parse_brl
+from orgao_index import get_orgao_index, MINISTERIO, AUTARQUIA
+
 class ProspectScoringIdiomas:
+    # Órgãos com maior probabilidade de ter PCA estruturado
+    ORGAOS_PCA_ALTA = [
+        'Ministério da Educação',
+        'Ministério das Relações Exteriores',
+        'Ministério da Defesa',
+        'Banco Central do Brasil',
+        'Receita Federal do Brasil',
+        'CAPES - Coordenação de Aperfeiçoamento de Pessoal de Nível Superior'
+    ]
+
+    ORGAOS_PCA_MEDIA = [
+        'Ministério da Justiça e Segurança Pública',
+        'Ministério da Ciência, Tecnologia e Inovações',
+        'ENAP - Escola Nacional de Administração Pública',
+        'Tribunal de Contas da União'
+    ]
+
+    # Tabelas de pontuação por perfil (compartilhadas pelo cálculo escalar e vetorizado)
+    MODERNIZACAO_SCORES = {'muito_alta': 4.5, 'alta': 3.5, 'media': 2.5, 'baixa': 1.5}
+    CAPACIDADE_SCORES = {'muito_alta': 5.0, 'alta': 4.0, 'media': 3.0, 'baixa': 2.0}
+    NECESSIDADE_SCORES = {'critica': 5.0, 'alta': 4.0, 'media': 3.0, 'baixa': 2.0}
+    VALOR_ESTIMADO_PERFIL = {
+        'muito_alta': 2500000,  # R$ 2.5M
+        'alta': 1500000,        # R$ 1.5M
+        'media': 800000,        # R$ 800K
+        'baixa': 400000         # R$ 400K
+    }
+
     def __init__(self):
         self.orgaos_historico = {}
         self.scoring_weights = {
@@ -173,61 +205,93 @@ class ProspectScoringIdiomas:
             }
         }
 
-    def load_historical_data(self, file_path: str) -> pd.DataFrame:
-        """Carrega dados históricos de contratos"""
-        try:
-            df = pd.read_csv(file_path)
-            return df
-        except FileNotFoundError:
-            print(f"Arquivo {file_path} não encontrado")
-            return pd.DataFrame()
-
-    def analyze_historical_patterns(self, df: pd.DataFrame) -> Dict:
-        """Analisa padrões dos contratos históricos"""
+        # Perfis e listas de PCA indexados pelo ID canônico do órgão (joins por hash, não por nome)
+        self.orgaos = get_orgao_index()
+        self.perfis = {
+            self.orgaos.key(nome, perfil['uasg']): perfil for nome, perfil in self.estrutura_gov.items()
+        }
+        self.pca_alta_ids = {self.orgaos.key(nome) for nome in self.ORGAOS_PCA_ALTA}
+        self.pca_media_ids = {self.orgaos.key(nome) for nome in self.ORGAOS_PCA_MEDIA}
+
+    def load_historical_data(self, store: Optional[ContractStore] = None) -> pd.DataFrame:
+        """Carrega contratos históricos de idiomas do contract store (só as colunas usadas)"""
+        store = store or get_contract_store()
+        return store.load(columns=['orgao', 'uasg', 'valor_centavos', 'data', 'modalidade', 'categoria'],
+                          categorias=['Idiomas'])
+
+    def aggregate_historical_patterns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Agrega contratos de idiomas por órgão em uma única passada (groupby)
+
+        Retorna um DataFrame indexado por órgão, na ordem de primeira ocorrência,
+        com orgao_id, total_contratos, valor_total, valor_medio, ultimo_contrato e
+        modalidades. Nomes divergentes do mesmo órgão (mesma UASG ou alias) são
+        agrupados sob o ID canônico e exibidos com o nome canônico.
+        """
+        columns = ['orgao_id', 'total_contratos', 'valor_total', 'valor_medio', 'ultimo_contrato', 'modalidades']
         if df.empty:
-            return {}
+            return pd.DataFrame(columns=columns)
 
         # Filtrar apenas contratos de idiomas
-        df_idiomas = df[df['categoria'] == 'Idiomas'].copy()
+        colunas = df.columns.intersection(['orgao', 'uasg', 'valor', 'valor_centavos', 'data', 'modalidade'])
+        df_idiomas = df.loc[df['categoria'] == 'Idiomas', colunas]
 
         if df_idiomas.empty:
-            return {}
-
-        # Converter valores para numérico
-        df_idiomas['valor_numerico'] = df_idiomas['valor'].str.replace(
-            r'[R$\.\s]', '', regex=True
-        ).str.replace(',', '.').astype(float)
-
-        patterns = {}
-        for orgao in df_idiomas['orgao'].unique():
-            orgao_data = df_idiomas[df_idiomas['orgao'] == orgao]
-            patterns[orgao] = {
-                'total_contratos': len(orgao_data),
-                'valor_total': orgao_data['valor_numerico'].sum(),
-                'valor_medio': orgao_data['valor_numerico'].mean(),
-                'ultimo_contrato': orgao_data['data'].max(),
-                'modalidades': orgao_data['modalidade'].unique().tolist()
-            }
+            return pd.DataFrame(columns=columns)
+
+        # Centavos tipados do contract store ou texto em Reais (valores não informados viram NaN)
+        if 'valor_centavos' in df_idiomas.columns:
+            valor_numerico = reais(df_idiomas)
+        else:
+            valor_numerico = parse_brl(df_idiomas['valor'])
+        orgao_id = self.orgaos.keys(df_idiomas['orgao'].astype(object), df_idiomas.get('uasg'))
+
+        aggregated = (
+            df_idiomas.assign(valor_numerico=valor_numerico, orgao_id=orgao_id)
+            .groupby('orgao_id', sort=False)
+            .agg(
+                total_contratos=('orgao_id', 'size'),
+                valor_total=('valor_numerico', 'sum'),
+                valor_medio=('valor_numerico', 'mean'),
+                ultimo_contrato=('data', 'max'),
+                modalidades=('modalidade', 'unique')
+            )
+            .reset_index()
+        )
+        aggregated.index = pd.Index(self.orgaos.names(aggregated['orgao_id']), name='orgao')
+        return aggregated
+
+    def analyze_historical_patterns(self, df: pd.DataFrame) -> Dict:
+        """Analisa padrões dos contratos históricos"""
+        aggregated = self.aggregate_historical_patterns(df)
+
+        patterns = aggregated.to_dict('index')
+        for pattern in patterns.values():
+            pattern['modalidades'] = list(pattern['modalidades'])
 
         return patterns
 
+    def get_profile(self, orgao: str) -> Dict:
+        """Perfil do órgão (via ID canônico); {} quando não há perfil"""
+        return self.perfis.get(self.orgaos.key(orgao), {})
+
+    def get_history(self, orgao: str, patterns: Dict):
+        """Padrões históricos do órgão, aceitando aliases do nome canônico"""
+        if orgao in patterns:
+            return patterns[orgao]
+        return patterns.get(self.orgaos.canonical_name(orgao))
+
     def calculate_frequency_score(self, orgao: str, patterns: Dict) -> float:
         """Score de frequência de compras digitais (1-5)"""
-        if orgao not in patterns:
+        historico = self.get_history(orgao, patterns)
+        if historico is None:
             # Baseado no perfil do órgão
-            profile = self.estrutura_gov.get(orgao, {})
+            profile = self.get_profile(orgao)
             modernizacao = profile.get('modernizacao_digital', 'baixa')
 
-            score_map = {
-                'muito_alta': 4.5,
-                'alta': 3.5,
-                'media': 2.5,
-                'baixa': 1.5
-            }
-            return score_map.get(modernizacao, 2.0)
+            return self.MODERNIZACAO_SCORES.get(modernizacao, 2.0)
 
         # Com histórico real
-        total_contratos = patterns[orgao]['total_contratos']
+        total_contratos = historico['total_contratos']
         if total_contratos >= 3:
             return 5.0
         elif total_contratos == 2:
@@ -239,20 +303,15 @@ class ProspectScoringIdiomas:
 
     def calculate_budget_score(self, orgao: str, patterns: Dict) -> float:
         """Score de capacidade orçamentária (1-5)"""
-        if orgao not in patterns:
-            profile = self.estrutura_gov.get(orgao, {})
+        historico = self.get_history(orgao, patterns)
+        if historico is None:
+            profile = self.get_profile(orgao)
             capacidade = profile.get('capacidade_orcamentaria', 'baixa')
 
-            score_map = {
-                'muito_alta': 5.0,
-                'alta': 4.0,
-                'media': 3.0,
-                'baixa': 2.0
-            }
-            return score_map.get(capacidade, 2.0)
+            return self.CAPACIDADE_SCORES.get(capacidade, 2.0)
 
         # Com histórico real
-        valor_medio = patterns[orgao]['valor_medio']
+        valor_medio = historico['valor_medio']
         if valor_medio >= 2000000:  # R$ 2M+
             return 5.0
         elif valor_medio >= 1000000:  # R$ 1M+
@@ -264,44 +323,21 @@ class ProspectScoringIdiomas:
 
     def calculate_pca_score(self, orgao: str) -> float:
         """Score de presença de PCA (1-5)"""
-        # Órgãos com maior probabilidade de ter PCA estruturado
-        orgaos_pca_alta = [
-            'Ministério da Educação',
-            'Ministério das Relações Exteriores',
-            'Ministério da Defesa',
-            'Banco Central do Brasil',
-            'Receita Federal do Brasil',
-            'CAPES - Coordenação de Aperfeiçoamento de Pessoal de Nível Superior'
-        ]
-
-        orgaos_pca_media = [
-            'Ministério da Justiça e Segurança Pública',
-            'Ministério da Ciência, Tecnologia e Inovações',
-            'ENAP - Escola Nacional de Administração Pública',
-            'Tribunal de Contas da União'
-        ]
-
-        if orgao in orgaos_pca_alta:
+        orgao_id = self.orgaos.key(orgao)
+        if orgao_id in self.pca_alta_ids:
             return 5.0
-        elif orgao in orgaos_pca_media:
+        elif orgao_id in self.pca_media_ids:
             return 3.5
         else:
             return 2.5
 
     def calculate_language_adherence_score(self, orgao: str) -> float:
         """Score de aderência a idiomas (1-5)"""
-        profile = self.estrutura_gov.get(orgao, {})
+        profile = self.get_profile(orgao)
         necessidade = profile.get('necessidade_idiomas', 'baixa')
         missao_internacional = profile.get('missao_internacional', False)
 
-        score_map = {
-            'critica': 5.0,
-            'alta': 4.0,
-            'media': 3.0,
-            'baixa': 2.0
-        }
-
-        base_score = score_map.get(necessidade, 2.0)
+        base_score = self.NECESSIDADE_SCORES.get(necessidade, 2.0)
 
         # Bonus para missão internacional
         if missao_internacional:
@@ -328,35 +364,29 @@ class ProspectScoringIdiomas:
 
     def estimate_contract_value(self, orgao: str, patterns: Dict) -> float:
         """Estima valor potencial do contrato"""
-        if orgao in patterns:
+        historico = self.get_history(orgao, patterns)
+        if historico is not None:
             # Baseado no histórico real
-            base_value = patterns[orgao]['valor_medio']
+            base_value = historico['valor_medio']
             # Crescimento esperado de 15-30%
             return base_value * 1.25
 
         # Estimativa baseada no perfil
-        profile = self.estrutura_gov.get(orgao, {})
+        profile = self.get_profile(orgao)
         capacidade = profile.get('capacidade_orcamentaria', 'baixa')
 
-        estimates = {
-            'muito_alta': 2500000,  # R$ 2.5M
-            'alta': 1500000,        # R$ 1.5M
-            'media': 800000,        # R$ 800K
-            'baixa': 400000         # R$ 400K
-        }
-
-        return estimates.get(capacidade, 500000)
+        return self.VALOR_ESTIMADO_PERFIL.get(capacidade, 500000)
 
     def calculate_conversion_probability(self, score: float, orgao: str, patterns: Dict) -> float:
         """Calcula probabilidade de conversão (%)"""
         base_probability = (score / 100) * 70  # Base: até 70%
 
         # Bonus por histórico
-        if orgao in patterns:
+        if self.get_history(orgao, patterns) is not None:
             base_probability += 15
 
         # Bonus por necessidade crítica
-        profile = self.estrutura_gov.get(orgao, {})
+        profile = self.get_profile(orgao)
         if profile.get('necessidade_idiomas') == 'critica':
             base_probability += 10
 
@@ -364,11 +394,11 @@ class ProspectScoringIdiomas:
 
     def determine_timeline(self, orgao: str, patterns: Dict) -> str:
         """Determina timeline de oportunidade"""
-        if orgao in patterns:
+        if self.get_history(orgao, patterns) is not None:
             # Órgãos com histórico - ciclo mais rápido
             return "Q1-Q2 2025"
 
-        profile = self.estrutura_gov.get(orgao, {})
+        profile = self.get_profile(orgao)
         modernizacao = profile.get('modernizacao_digital', 'baixa')
 
         if modernizacao in ['muito_alta', 'alta']:
@@ -376,14 +406,22 @@ class ProspectScoringIdiomas:
         else:
             return "Q3-Q4 2025"
 
-    def generate_justification(self, orgao: str, score: float, patterns: Dict) -> str:
-        """Gera justificativa para o scoring"""
-        profile = self.estrutura_gov.get(orgao, {})
+    def generate_justification(self, orgao: str, score: float, patterns: Dict,
+                               contratos_ministerio: int = 0) -> str:
+        """Gera justificativa para o scoring
+
+        ``contratos_ministerio`` vem da roll-up do histórico (score_all_orgaos)
+        e só é citado quando o próprio órgão não tem contratos.
+        """
+        profile = self.get_profile(orgao)
+        historico = self.get_history(orgao, patterns)
 
         factors = []
 
-        if orgao in patterns:
-            factors.append(f"histórico de {patterns[orgao]['total_contratos']} contrato(s)")
+        if historico is not None:
+            factors.append(f"histórico de {historico['total_contratos']} contrato(s)")
+        elif contratos_ministerio > 0:
+            factors.append(f"{contratos_ministerio} contrato(s) de idiomas no ministério")
 
         necessidade = profile.get('necessidade_idiomas', 'baixa')
         if necessidade in ['critica', 'alta']:
@@ -398,47 +436,120 @@ class ProspectScoringIdiomas:
 
         return f"Score {score:.1f}: {', '.join(factors[:3])}"
 
-    def generate_top20_prospects(self, file_path: str) -> List[Dict]:
-        """Gera ranking Top 20 prospects"""
-        df = self.load_historical_data(file_path)
-        patterns = self.analyze_historical_patterns(df)
+    def score_all_orgaos(self, patterns: pd.DataFrame) -> pd.DataFrame:
+        """Calcula todos os scores como colunas vetorizadas
+
+        O universo de órgãos é a estrutura governamental mais todo órgão com
+        histórico em ``patterns`` (saída de aggregate_historical_patterns).
+        Perfis, histórico e listas de PCA são unidos pelo ID canônico; o
+        resultado é indexado pelo nome canônico. Mesmas regras dos métodos
+        calculate_* escalares. ``contratos_ministerio``/``contratos_autarquia``
+        somam o histórico de todo o ministério/autarquia do órgão.
+        """
+        perfil = pd.DataFrame.from_dict(self.perfis, orient='index')
+        hist = patterns.set_index('orgao_id')
+        ids = perfil.index.append(hist.index.difference(perfil.index, sort=False))
+        perfil = perfil.reindex(ids)
+        tem_historico = ids.isin(hist.index)
+        hist = hist.reindex(ids)
+        orgaos = pd.Index(self.orgaos.names(ids), name='orgao')
+
+        # Roll-up do histórico na hierarquia, uma vez para todos os níveis
+        rollup = self.orgaos.rollup(patterns, ['total_contratos', 'valor_total'])
+        contratos_ministerio = self.orgaos.rollup_values(pd.Series(ids), rollup, 'total_contratos', MINISTERIO)
+        contratos_autarquia = self.orgaos.rollup_values(pd.Series(ids), rollup, 'total_contratos', AUTARQUIA)
+
+        total_contratos = hist['total_contratos'].fillna(0).to_numpy()
+        valor_medio = hist['valor_medio'].to_numpy(dtype=float)
+
+        modernizacao = perfil['modernizacao_digital'].fillna('baixa')
+        capacidade = perfil['capacidade_orcamentaria'].fillna('baixa')
+        necessidade = perfil['necessidade_idiomas'].fillna('baixa')
+        missao_internacional = perfil['missao_internacional'].fillna(False).astype(bool).to_numpy()
+
+        # Frequência de compras digitais
+        freq_historico = np.select([total_contratos >= 3, total_contratos == 2, total_contratos == 1],
+                                   [5.0, 4.0, 3.0], default=2.0)
+        freq_perfil = modernizacao.map(self.MODERNIZACAO_SCORES).fillna(2.0).to_numpy()
+        freq_score = np.where(tem_historico, freq_historico, freq_perfil)
+
+        # Capacidade orçamentária
+        budget_historico = np.select([valor_medio >= 2000000, valor_medio >= 1000000, valor_medio >= 500000],
+                                     [5.0, 4.0, 3.0], default=2.0)
+        budget_perfil = capacidade.map(self.CAPACIDADE_SCORES).fillna(2.0).to_numpy()
+        budget_score = np.where(tem_historico, budget_historico, budget_perfil)
+
+        # Presença de PCA
+        pca_score = np.select([ids.isin(self.pca_alta_ids), ids.isin(self.pca_media_ids)],
+                              [5.0, 3.5], default=2.5)
+
+        # Aderência a idiomas (bonus para missão internacional)
+        lang_score = necessidade.map(self.NECESSIDADE_SCORES).fillna(2.0).to_numpy()
+        lang_score = np.where(missao_internacional, np.minimum(5.0, lang_score + 0.5), lang_score)
+
+        weighted_score = (
+            freq_score * self.scoring_weights['freq_compras_digitais'] +
+            budget_score * self.scoring_weights['valor_medio_contratos'] +
+            pca_score * self.scoring_weights['presenca_pca'] +
+            lang_score * self.scoring_weights['aderencia_idiomas']
+        )
+        score = (weighted_score / 5.0) * 100
 
-        prospects = []
+        valor_perfil = capacidade.map(self.VALOR_ESTIMADO_PERFIL).fillna(500000).to_numpy(dtype=float)
+        probabilidade = np.minimum(
+            85, (score / 100) * 70 + np.where(tem_historico, 15, 0) + np.where(necessidade == 'critica', 10, 0)
+        )
+        timeline = np.where(
+            tem_historico, "Q1-Q2 2025",
+            np.where(modernizacao.isin(['muito_alta', 'alta']), "Q2-Q3 2025", "Q3-Q4 2025")
+        )
 
-        for orgao in self.estrutura_gov.keys():
-            score = self.calculate_final_score(orgao, patterns)
-            estimated_value = self.estimate_contract_value(orgao, patterns)
-            conversion_prob = self.calculate_conversion_probability(score, orgao, patterns)
-            timeline = self.determine_timeline(orgao, patterns)
-            justification = self.generate_justification(orgao, score, patterns)
+        return pd.DataFrame({
+            'freq_score': freq_score,
+            'budget_score': budget_score,
+            'pca_score': pca_score,
+            'lang_score': lang_score,
+            'score_propensao': score,
+            'valor_estimado': np.where(tem_historico, valor_medio * 1.25, valor_perfil),
+            'probabilidade_conversao': probabilidade,
+            'timeline_oportunidade': timeline,
+            'tem_historico': tem_historico,
+            'contratos_ministerio': contratos_ministerio.to_numpy(dtype=int),
+            'contratos_autarquia': contratos_autarquia.to_numpy(dtype=int)
+        }, index=orgaos)
+
+    def generate_top20_prospects(self, store: Optional[ContractStore] = None) -> List[Dict]:
+        """Gera ranking Top 20 prospects"""
+        df = self.load_historical_data(store)
+        aggregated = self.aggregate_historical_patterns(df)
 
-            prospects.append({
-                'rank': 0,  # Será preenchido após ordenação
-                'orgao': orgao,
-                'score_propensao': score,
-                'valor_estimado': estimated_value,
-                'probabilidade_conversao': conversion_prob,
-                'timeline_oportunidade': timeline,
-                'justificativa': justification,
-                'tem_historico': orgao in patterns
-            })
+        top = self.score_all_orgaos(aggregated).nlargest(20, 'score_propensao', keep='first')
 
-        # Ordenar por score decrescente e atribuir ranks
-        prospects.sort(key=lambda x: x['score_propensao'], reverse=True)
-        for i, prospect in enumerate(prospects[:20], 1):
-            prospect['rank'] = i
+        # Justificativa apenas para os órgãos ranqueados
+        patterns = {orgao: aggregated.loc[orgao].to_dict() for orgao in top.index if orgao in aggregated.index}
 
-        return prospects[:20]
+        return [
+            {
+                'rank': rank,
+                'orgao': orgao,
+                'score_propensao': float(row.score_propensao),
+                'valor_estimado': float(row.valor_estimado),
+                'probabilidade_conversao': float(row.probabilidade_conversao),
+                'timeline_oportunidade': row.timeline_oportunidade,
+                'justificativa': self.generate_justification(orgao, row.score_propensao, patterns,
+                                                             int(row.contratos_ministerio)),
+                'tem_historico': bool(row.tem_historico),
+                'contratos_ministerio': int(row.contratos_ministerio)
+            }
+            for rank, (orgao, row) in enumerate(top.iterrows(), 1)
+        ]
 
 def main():
     """Função principal"""
     scoring = ProspectScoringIdiomas()
 
-    # Carregar dados
-    file_path = "/home/danielfugisawa/pesquisa_prospect_gov/outputs/radar_idiomas.csv"
-
-    # Gerar ranking
-    top20 = scoring.generate_top20_prospects(file_path)
+    # Gerar ranking (contratos históricos do contract store)
+    top20 = scoring.generate_top20_prospects()
 
     # Exibir resultados
     print("=" * 80)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+RECORD LINKAGE - Contratos quase duplicados entre coletores
+Agrupa registros do mesmo contrato vindos de fontes diferentes.
+
+A deduplicação por chave exata (cnpj|objeto|data) não pega o mesmo contrato
+com o objeto redigido de outra forma ou o valor formatado diferente. Aqui:
+
+1. Blocking: só são comparados registros com mesma raiz de CNPJ (8 dígitos),
+   mesmo órgão (ID canônico do orgao_index) e mesmo mês.
+2. Assinaturas MinHash dos tokens do objeto e LSH por bandas geram os pares
+   candidatos dentro de cada bloco, sem comparar todos contra todos.
+3. Pares com similaridade de tokens acima do limiar e valores compatíveis
+   são ligados; componentes conexos viram clusters com um representante
+   canônico (o registro mais completo).
+"""
+
+import re
+import zlib
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from orgao_index import get_orgao_index, normalize_name
+from parsers_br import cnpj_digitos, mascara_sentinela, parse_brl_centavos, parse_datas
+
+# Palavras sem valor discriminante nos objetos de contratos
+STOPWORDS = frozenset({
+    'a', 'o', 'as', 'os', 'e', 'de', 'da', 'do', 'das', 'dos', 'em', 'na', 'no', 'nas', 'nos',
+    'para', 'por', 'com', 'sem', 'ao', 'aos', 'um', 'uma', 'que', 'se',
+    'contratacao', 'empresa', 'servico', 'servicos', 'prestacao', 'fornecimento', 'aquisicao',
+})
+
+DEFAULT_THRESHOLD = 0.6
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+
+# Primo acima de 2^32 para o hash universal (a*x + b) mod p; a, x, b < 2^32 não estouram uint64
+_PRIMO = np.uint64(4294967311)
+_MAX_HASH = np.iinfo(np.uint64).max
+
+# Linhas por lote no cálculo das assinaturas (tokens × permutações em memória)
+_LOTE_ASSINATURAS = 20_000
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(texto: Optional[str]) -> frozenset:
+    """Tokens normalizados (sem acento/caixa) do texto, sem stopwords"""
+    if texto is None or pd.isna(texto):
+        return frozenset()
+    return frozenset(
+        token for token in _TOKEN.findall(normalize_name(texto))
+        if len(token) > 1 and token not in STOPWORDS
+    )
+
+
+class MinHasher:
+    """Assinaturas MinHash com ``num_perm`` funções de hash universais"""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 2 ** 32, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 2 ** 32, num_perm, dtype=np.uint64)
+
+    def signatures(self, token_sets: Sequence[frozenset]) -> np.ndarray:
+        """Matriz (registros × num_perm); conjuntos vazios ficam com o hash máximo"""
+        assinaturas = np.full((len(token_sets), self.num_perm), _MAX_HASH, dtype=np.uint64)
+        cache = {}
+
+        for inicio in range(0, len(token_sets), _LOTE_ASSINATURAS):
+            lote = token_sets[inicio:inicio + _LOTE_ASSINATURAS]
+            tamanhos = np.fromiter((len(tokens) for tokens in lote), dtype=np.int64, count=len(lote))
+            if not tamanhos.any():
+                continue
+
+            hashes = np.fromiter(
+                (cache.setdefault(token, zlib.crc32(token.encode())) for tokens in lote for token in tokens),
+                dtype=np.uint64, count=int(tamanhos.sum())
+            )
+            permutados = (hashes[:, None] * self.a + self.b) % _PRIMO
+
+            # Mínimo por registro: reduceat sobre os inícios de cada conjunto não vazio
+            com_tokens = np.flatnonzero(tamanhos)
+            inicios = np.concatenate([[0], np.cumsum(tamanhos)[:-1]])[com_tokens]
+            assinaturas[inicio + com_tokens] = np.minimum.reduceat(permutados, inicios, axis=0)
+
+        return assinaturas
+
+
+def lsh_candidate_pairs(signatures: np.ndarray, blocks: np.ndarray, bands: int = DEFAULT_BANDS,
+                        max_bucket: int = 50) -> np.ndarray:
+    """Pares (i, j), i < j, que coincidem em ao menos uma banda dentro do mesmo bloco
+
+    Buckets com mais de ``max_bucket`` registros ligam cada membro apenas ao
+    primeiro (estrela) para manter o número de pares linear.
+    """
+    n, num_perm = signatures.shape
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) deve ser múltiplo de bands ({bands})")
+    linhas = num_perm // bands
+
+    pares: List[np.ndarray] = []
+    for banda in range(bands):
+        chave_banda = pd.DataFrame(signatures[:, banda * linhas:(banda + 1) * linhas]).assign(bloco=blocks)
+        chaves = pd.util.hash_pandas_object(chave_banda, index=False).to_numpy()
+
+        ordem = np.argsort(chaves, kind='stable')
+        ordenadas = chaves[ordem]
+        inicios = np.flatnonzero(np.r_[True, ordenadas[1:] != ordenadas[:-1]])
+        tamanhos = np.diff(np.r_[inicios, n])
+
+        for inicio, tamanho in zip(inicios[tamanhos > 1], tamanhos[tamanhos > 1]):
+            membros = ordem[inicio:inicio + tamanho]
+            if tamanho <= max_bucket:
+                i, j = np.triu_indices(tamanho, k=1)
+                pares.append(np.column_stack([membros[i], membros[j]]))
+            else:
+                pares.append(np.column_stack([np.full(tamanho - 1, membros[0]), membros[1:]]))
+
+    if not pares:
+        return np.empty((0, 2), dtype=np.int64)
+    todos = np.sort(np.concatenate(pares), axis=1)
+    return np.unique(todos, axis=0)
+
+
+def connected_components(n: int, pairs: np.ndarray) -> np.ndarray:
+    """Rótulo do componente de cada nó (o menor índice do componente)"""
+    labels = np.arange(n)
+    if len(pairs) == 0:
+        return labels
+
+    i, j = pairs[:, 0], pairs[:, 1]
+    while True:
+        menor = np.minimum(labels[i], labels[j])
+        novos = labels.copy()
+        np.minimum.at(novos, i, menor)
+        np.minimum.at(novos, j, menor)
+        # Pointer jumping: cada nó aponta direto para o rótulo do seu rótulo
+        while True:
+            saltos = novos[novos]
+            if (saltos == novos).all():
+                break
+            novos = saltos
+        if (novos == labels).all():
+            return labels
+        labels = novos
+
+
+@dataclass
+class LinkageResult:
+    """Registros com cluster_id/is_canonical, representantes e pares ligados"""
+    records: pd.DataFrame
+    canonical: pd.DataFrame
+    pairs: pd.DataFrame
+    n_candidates: int
+
+    @property
+    def n_clusters(self) -> int:
+        return len(self.canonical)
+
+
+def blocking_keys(df: pd.DataFrame) -> np.ndarray:
+    """Código do bloco (raiz do CNPJ × órgão × mês) de cada registro"""
+    raiz_cnpj = cnpj_digitos(df['cnpj']).str[:8].fillna('')
+
+    uasgs = df['uasg'] if 'uasg' in df.columns else None
+    orgaos = get_orgao_index().keys(df['orgao'], uasgs).astype(object)
+    # Órgãos fora do catálogo: nome normalizado (uma vez por nome distinto)
+    orgaos = orgaos.map({nome: normalize_name(nome) for nome in pd.unique(orgaos.dropna())}).fillna('')
+
+    mes = parse_datas(df['data']).dt.to_period('M').astype(str)
+
+    chaves = pd.DataFrame({'cnpj': raiz_cnpj.to_numpy(), 'orgao': orgaos.to_numpy(), 'mes': mes.to_numpy()})
+    return chaves.groupby(['cnpj', 'orgao', 'mes'], sort=False, dropna=False).ngroup().to_numpy()
+
+
+def _values_compatible(valores: np.ndarray, i: np.ndarray, j: np.ndarray, tolerance: float) -> np.ndarray:
+    """Valores iguais dentro da tolerância relativa; ausentes são compatíveis com tudo"""
+    vi, vj = valores[i], valores[j]
+    ausente = np.isnan(vi) | np.isnan(vj)
+    with np.errstate(invalid='ignore'):
+        proximo = np.abs(vi - vj) <= tolerance * np.maximum(np.abs(vi), np.abs(vj))
+    return ausente | proximo
+
+
+def _completeness(df: pd.DataFrame) -> np.ndarray:
+    """Número de campos preenchidos (não sentinela) por registro"""
+    return sum((~mascara_sentinela(df[col])).to_numpy(dtype=int) for col in df.columns)
+
+
+def link_records(df: pd.DataFrame, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                 bands: int = DEFAULT_BANDS, valor_tolerance: float = 0.01, seed: int = 1) -> LinkageResult:
+    """Agrupa contratos quase duplicados (colunas cnpj, orgao, data, objeto, valor)
+
+    Dois registros são ligados quando estão no mesmo bloco, a similaridade de
+    Jaccard estimada dos tokens do objeto é >= ``threshold`` e os valores
+    diferem no máximo ``valor_tolerance`` (relativo). O representante de cada
+    cluster é o registro mais completo (empate: objeto mais longo, depois o
+    primeiro na ordem de entrada).
+    """
+    n = len(df)
+    posicional = df.reset_index(drop=True)
+
+    # Tokens e assinaturas uma vez por objeto distinto; objetos ausentes (código -1) ficam sem tokens
+    codigos, distintos = pd.factorize(posicional['objeto'])
+    tokens = [tokenize(objeto) for objeto in distintos] + [frozenset()]
+    assinaturas = MinHasher(num_perm, seed).signatures(tokens)[codigos]
+    com_tokens = np.fromiter((len(t) > 0 for t in tokens), dtype=bool, count=len(tokens))[codigos]
+
+    candidatos = lsh_candidate_pairs(assinaturas, blocking_keys(posicional), bands)
+
+    i, j = candidatos[:, 0], candidatos[:, 1]
+    similaridade = (assinaturas[i] == assinaturas[j]).mean(axis=1)
+    valores = parse_brl_centavos(posicional['valor']).astype(float).to_numpy()
+
+    ligados = (
+        (similaridade >= threshold)
+        & com_tokens[i] & com_tokens[j]
+        & _values_compatible(valores, i, j, valor_tolerance)
+    )
+    pares = candidatos[ligados]
+    cluster = connected_components(n, pares)
+
+    # Representante: mais completo, depois objeto mais longo, depois ordem de entrada
+    ranking = pd.DataFrame({
+        'cluster': cluster,
+        'completude': _completeness(posicional),
+        'tamanho_objeto': posicional['objeto'].astype('string').str.len().fillna(0).to_numpy(dtype=int),
+        'posicao': np.arange(n)
+    }).sort_values(['cluster', 'completude', 'tamanho_objeto', 'posicao'],
+                   ascending=[True, False, False, True], kind='stable')
+    canonico = np.zeros(n, dtype=bool)
+    canonico[ranking.drop_duplicates('cluster')['posicao'].to_numpy()] = True
+
+    # IDs de cluster densos, na ordem do primeiro registro de cada cluster
+    _, cluster_id = np.unique(cluster, return_inverse=True)
+    records = df.assign(
+        cluster_id=cluster_id,
+        cluster_size=np.bincount(cluster_id)[cluster_id],
+        is_canonical=canonico
+    )
+
+    return LinkageResult(
+        records=records,
+        canonical=df[canonico],
+        pairs=pd.DataFrame({'i': pares[:, 0], 'j': pares[:, 1], 'similaridade': similaridade[ligados]}),
+        n_candidates=len(candidatos)
+    )
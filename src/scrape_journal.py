@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+SCRAPE JOURNAL - Checkpoint em JSONL das varreduras do Portal
+Varreduras nacionais levam horas; uma falha no meio não pode perder o que já foi coletado.
+
+- Cada unidade concluída (palavra-chave, ano, página) é anexada ao diário
+  com os contratos extraídos, com flush + fsync antes de seguir;
+- buscas encerradas (última página ou parada antecipada) ganham um registro
+  próprio, e o reinício não as refaz;
+- ao reabrir, uma última linha truncada por queda do processo é descartada;
+- a saída final é montada do diário, na ordem das buscas e das páginas.
+
+A primeira linha guarda a configuração da varredura (ex.: tamanho da página);
+um diário de outra configuração não é reaproveitado.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+# Diário padrão do advanced_portal_scraper (relativo à raiz do projeto)
+DEFAULT_SCRAPE_JOURNAL = 'data/scrape_journal.jsonl'
+
+Query = Tuple[str, int]
+
+
+class ScrapeJournal:
+    """Diário append-only de páginas e buscas concluídas
+
+    Uso::
+
+        journal = ScrapeJournal(path, config={'page_size': 15})
+        if journal.page('EAD', 2024, 1) is None:
+            journal.record_page('EAD', 2024, 1, contratos, total=120)
+        journal.record_query('EAD', 2024, pages=[1, 2, 3])
+        contratos = journal.contracts([('EAD', 2024)])
+    """
+
+    def __init__(self, path: Union[str, Path], config: Optional[Mapping] = None):
+        self.path = Path(path)
+        self.config = dict(config or {})
+        self._pages: Dict[Query, Dict[int, Tuple[List[dict], Optional[int]]]] = {}
+        self._done: Dict[Query, List[int]] = {}
+        self._file = None
+
+        if self.path.exists():
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._append({'type': 'sweep', 'config': self.config,
+                          'started_at': datetime.now().isoformat(timespec='seconds')})
+
+    # --- Leitura ----------------------------------------------------------
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            conteudo = f.read()
+        # Linha final sem '\n': escrita interrompida, descartada
+        fim = conteudo.rfind(b'\n') + 1
+        if fim < len(conteudo):
+            with open(self.path, 'r+b') as f:
+                f.truncate(fim)
+
+        linhas = conteudo[:fim].decode('utf-8').splitlines()
+        if not linhas:
+            self._append({'type': 'sweep', 'config': self.config,
+                          'started_at': datetime.now().isoformat(timespec='seconds')})
+            return
+
+        cabecalho = json.loads(linhas[0])
+        if cabecalho.get('type') != 'sweep' or cabecalho.get('config') != self.config:
+            raise ValueError(
+                f"Diário {self.path} é de outra configuração ({cabecalho.get('config')}); "
+                f"remova-o para começar uma nova varredura"
+            )
+        for linha in linhas[1:]:
+            registro = json.loads(linha)
+            query = (registro['keyword'], registro['year'])
+            if registro['type'] == 'page':
+                self._pages.setdefault(query, {})[registro['page']] = (registro['contracts'], registro.get('total'))
+            elif registro['type'] == 'query':
+                self._done[query] = registro['pages']
+
+    def page(self, keyword: str, year: int, page: int) -> Optional[Tuple[List[dict], Optional[int]]]:
+        """(contratos, total de resultados) de uma página já concluída, ou None"""
+        return self._pages.get((keyword, year), {}).get(page)
+
+    def is_done(self, keyword: str, year: int) -> bool:
+        return (keyword, year) in self._done
+
+    def query_contracts(self, keyword: str, year: int) -> List[dict]:
+        """Contratos de uma busca em ordem de página
+
+        Busca encerrada: as páginas registradas no encerramento. Em andamento:
+        as páginas consecutivas a partir da primeira.
+        """
+        paginas = self._pages.get((keyword, year), {})
+        numeros = self._done.get((keyword, year))
+        if numeros is None:
+            numeros = []
+            while len(numeros) + 1 in paginas:
+                numeros.append(len(numeros) + 1)
+        return [contrato for numero in numeros for contrato in paginas[numero][0]]
+
+    def contracts(self, queries: Iterable[Query]) -> List[dict]:
+        """Saída da varredura montada do diário, na ordem das buscas"""
+        return [contrato for keyword, year in queries for contrato in self.query_contracts(keyword, year)]
+
+    @property
+    def pages_done(self) -> int:
+        return sum(len(paginas) for paginas in self._pages.values())
+
+    @property
+    def queries_done(self) -> int:
+        return len(self._done)
+
+    # --- Escrita ----------------------------------------------------------
+
+    def _append(self, registro: dict):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def record_page(self, keyword: str, year: int, page: int, contracts: List[dict],
+                    total: Optional[int] = None):
+        """Registra uma página concluída com os contratos extraídos"""
+        self._append({'type': 'page', 'keyword': keyword, 'year': year, 'page': page,
+                      'total': total, 'contracts': contracts})
+        self._pages.setdefault((keyword, year), {})[page] = (contracts, total)
+
+    def record_query(self, keyword: str, year: int, pages: List[int]):
+        """Registra o fim de uma busca e as páginas que entram na saída"""
+        self._append({'type': 'query', 'keyword': keyword, 'year': year, 'pages': list(pages)})
+        self._done[(keyword, year)] = list(pages)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """Remove o diário (varredura concluída e salva)"""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> 'ScrapeJournal':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
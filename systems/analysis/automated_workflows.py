@@ -8,6 +8,7 @@ Handles batch processing, scheduled analysis, and intelligent data pipelines.
 
 import asyncio
 import logging
+import numpy as np
 from typing import List, Dict, Any, Optional, Callable, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -21,6 +22,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from systems.models.edtech_schemas import CompanyProfile, MarketOpportunity, AnalysisScore
 from systems.data.data_manager import EdTechDataManager
 from systems.analysis.scoring_engine import EdTechScoringEngine
+from systems.analysis.ranking import TopKAccumulator, top_performer_summary
+from systems.logging_setup import BatchLogSummary
 from systems.visualization.dashboard_generator import EdTechDashboardGenerator
 from systems.exports.report_generator import EdTechReportGenerator
 
@@ -115,7 +118,7 @@ class EdTechAnalysisOrchestrator:
         self.running_workflows[workflow_id] = True
 
         try:
-            self.logger.info(f"Starting full portfolio analysis: {workflow_id}")
+            self.logger.info("Starting full portfolio analysis: %s", workflow_id)
 
             # Step 1: Load all companies and opportunities
             companies = self._load_all_companies()
@@ -125,7 +128,7 @@ class EdTechAnalysisOrchestrator:
                 raise ValueError("No companies found for analysis")
 
             # Step 2: Batch score all companies
-            self.logger.info(f"Scoring {len(companies)} companies...")
+            self.logger.info("Scoring %d companies...", len(companies))
             scored_companies = self.scoring_engine.batch_score_companies(companies)
             companies, scores = zip(*scored_companies) if scored_companies else ([], [])
 
@@ -195,11 +198,12 @@ class EdTechAnalysisOrchestrator:
                 'opportunities_analyzed': len(opportunities)
             }
             result.artifacts = artifacts
+            self._attach_instrumentation(result)
 
-            self.logger.info(f"Portfolio analysis completed: {workflow_id}")
+            self.logger.info("Portfolio analysis completed: %s", workflow_id)
 
         except Exception as e:
-            self.logger.error(f"Portfolio analysis failed: {e}")
+            self.logger.error("Portfolio analysis failed: %s", e)
             result.status = WorkflowStatus.FAILED
             result.end_time = datetime.now()
             result.error_message = str(e)
@@ -227,7 +231,7 @@ class EdTechAnalysisOrchestrator:
         self.running_workflows[workflow_id] = True
 
         try:
-            self.logger.info(f"Starting company batch scoring: {workflow_id}")
+            self.logger.info("Starting company batch scoring: %s", workflow_id)
 
             # Load companies
             if company_names:
@@ -244,64 +248,62 @@ class EdTechAnalysisOrchestrator:
 
             # Batch process companies
             batch_size = self.workflow_configs[AnalysisType.COMPANY_SCORING]['batch_size']
-            all_scores = []
-            processed_companies = []
+            top_performers = TopKAccumulator(10)
+            total_score = 0.0
 
-            for i in range(0, len(companies), batch_size):
-                batch = companies[i:i + batch_size]
-                self.logger.info(f"Processing batch {i//batch_size + 1}/{(len(companies)-1)//batch_size + 1}")
-
-                for company in batch:
-                    try:
-                        score = self.scoring_engine.score_company(company)
-                        all_scores.append(score)
-                        processed_companies.append(company)
-
-                        # Store score in database
-                        self.data_manager.add_analysis_score(company.name, score)
-
-                    except Exception as e:
-                        self.logger.error(f"Error scoring company {company.name}: {e}")
-                        continue
-
-            # Generate results
             scoring_summary = {
-                'total_companies_processed': len(processed_companies),
-                'average_score': sum(score.total_score for score in all_scores) / len(all_scores) if all_scores else 0,
+                'total_companies_processed': 0,
+                'average_score': 0,
                 'grade_distribution': {},
                 'recommendation_distribution': {},
                 'top_performers': []
             }
 
-            # Calculate distributions
-            for score in all_scores:
-                grade = score.investment_grade
-                rec = score.recommendation
-                scoring_summary['grade_distribution'][grade] = scoring_summary['grade_distribution'].get(grade, 0) + 1
-                scoring_summary['recommendation_distribution'][rec] = scoring_summary['recommendation_distribution'].get(rec, 0) + 1
-
-            # Top performers
-            scored_companies = list(zip(processed_companies, all_scores))
-            scored_companies.sort(key=lambda x: x[1].total_score, reverse=True)
+            batch_count = (len(companies) - 1) // batch_size + 1
+            for i in range(0, len(companies), batch_size):
+                batch = companies[i:i + batch_size]
+                batch_label = f"Batch {i // batch_size + 1}/{batch_count}"
+
+                with BatchLogSummary(self.logger, batch_label) as batch_summary:
+                    for company in batch:
+                        try:
+                            score = self.scoring_engine.score_company(company)
+
+                            # Store score in database
+                            self.data_manager.add_analysis_score(company.name, score)
+
+                        except Exception as e:
+                            batch_summary.failure()
+                            self.logger.error("Error scoring company %s: %s", company.name, e)
+                            continue
+
+                        # Update running totals and distributions
+                        batch_summary.success()
+                        total_score += score.total_score
+                        grade = score.investment_grade
+                        rec = score.recommendation
+                        scoring_summary['grade_distribution'][grade] = scoring_summary['grade_distribution'].get(grade, 0) + 1
+                        scoring_summary['recommendation_distribution'][rec] = scoring_summary['recommendation_distribution'].get(rec, 0) + 1
+                        top_performers.push(company, score)
 
+            # Generate results
+            processed_count = len(top_performers)
+            scoring_summary['total_companies_processed'] = processed_count
+            scoring_summary['average_score'] = total_score / processed_count if processed_count else 0
             scoring_summary['top_performers'] = [
-                {
-                    'name': company.name,
-                    'score': score.total_score,
-                    'grade': score.investment_grade,
-                    'recommendation': score.recommendation
-                }
-                for company, score in scored_companies[:10]
+                top_performer_summary(company, score, include_category=False)
+                for company, score in top_performers.top()
             ]
 
             result.status = WorkflowStatus.COMPLETED
             result.end_time = datetime.now()
             result.results = scoring_summary
+            self._attach_instrumentation(result)
 
-            self.logger.info(f"Company batch scoring completed: {workflow_id}")
+            self.logger.info("Company batch scoring completed: %s", workflow_id)
 
         except Exception as e:
-            self.logger.error(f"Company batch scoring failed: {e}")
+            self.logger.error("Company batch scoring failed: %s", e)
             result.status = WorkflowStatus.FAILED
             result.end_time = datetime.now()
             result.error_message = str(e)
@@ -328,7 +330,7 @@ class EdTechAnalysisOrchestrator:
         self.running_workflows[workflow_id] = True
 
         try:
-            self.logger.info(f"Starting market analysis: {workflow_id}")
+            self.logger.info("Starting market analysis: %s", workflow_id)
 
             # Load market opportunities
             opportunities = self._load_all_opportunities()
@@ -336,8 +338,26 @@ class EdTechAnalysisOrchestrator:
             if not opportunities:
                 raise ValueError("No market opportunities found for analysis")
 
+            # Score all opportunities in one vectorized pass
+            opportunity_scores, score_breakdown = self.scoring_engine.score_opportunities_batch(opportunities)
+
             # Generate market analysis report
             market_report = self.report_generator.generate_market_analysis_report(opportunities)
+            market_report['opportunity_scores'] = sorted(
+                [
+                    {
+                        'id': opp.id,
+                        'name': opp.name,
+                        'score': float(opportunity_scores[i]),
+                        'breakdown': {
+                            column: (None if np.isnan(value) else float(value))
+                            for column, value in score_breakdown.iloc[i].items()
+                        }
+                    }
+                    for i, opp in enumerate(opportunities)
+                ],
+                key=lambda x: x['score'], reverse=True
+            )
 
             # Create market visualizations
             market_matrix = self.dashboard_generator.create_market_opportunity_matrix(opportunities)
@@ -368,10 +388,10 @@ class EdTechAnalysisOrchestrator:
             result.results = market_report
             result.artifacts = artifacts
 
-            self.logger.info(f"Market analysis completed: {workflow_id}")
+            self.logger.info("Market analysis completed: %s", workflow_id)
 
         except Exception as e:
-            self.logger.error(f"Market analysis failed: {e}")
+            self.logger.error("Market analysis failed: %s", e)
             result.status = WorkflowStatus.FAILED
             result.end_time = datetime.now()
             result.error_message = str(e)
@@ -398,7 +418,7 @@ class EdTechAnalysisOrchestrator:
         self.running_workflows[workflow_id] = True
 
         try:
-            self.logger.info(f"Starting competitive intelligence analysis: {workflow_id}")
+            self.logger.info("Starting competitive intelligence analysis: %s", workflow_id)
 
             # Load all companies
             companies = self._load_all_companies()
@@ -441,10 +461,10 @@ class EdTechAnalysisOrchestrator:
             result.results = competitive_intel
             result.artifacts = artifacts
 
-            self.logger.info(f"Competitive intelligence analysis completed: {workflow_id}")
+            self.logger.info("Competitive intelligence analysis completed: %s", workflow_id)
 
         except Exception as e:
-            self.logger.error(f"Competitive intelligence analysis failed: {e}")
+            self.logger.error("Competitive intelligence analysis failed: %s", e)
             result.status = WorkflowStatus.FAILED
             result.end_time = datetime.now()
             result.error_message = str(e)
@@ -512,7 +532,7 @@ class EdTechAnalysisOrchestrator:
             if workflow_id in self.workflow_results:
                 self.workflow_results[workflow_id].status = WorkflowStatus.CANCELLED
                 self.workflow_results[workflow_id].end_time = datetime.now()
-            self.logger.info(f"Workflow cancelled: {workflow_id}")
+            self.logger.info("Workflow cancelled: %s", workflow_id)
             return True
         return False
 
@@ -530,7 +550,7 @@ class EdTechAnalysisOrchestrator:
             if workflow_id in self.running_workflows:
                 del self.running_workflows[workflow_id]
 
-        self.logger.info(f"Cleaned up {len(to_remove)} old workflow results")
+        self.logger.info("Cleaned up %d old workflow results", len(to_remove))
 
     # Private helper methods
 
@@ -542,7 +562,7 @@ class EdTechAnalysisOrchestrator:
             companies = self.data_manager.search_companies()
             return companies
         except Exception as e:
-            self.logger.error(f"Error loading companies: {e}")
+            self.logger.error("Error loading companies: %s", e)
             return []
 
     def _load_all_opportunities(self) -> List[MarketOpportunity]:
@@ -552,9 +572,15 @@ class EdTechAnalysisOrchestrator:
             # For now, returning an empty list as a placeholder
             return []
         except Exception as e:
-            self.logger.error(f"Error loading opportunities: {e}")
+            self.logger.error("Error loading opportunities: %s", e)
             return []
 
+    def _attach_instrumentation(self, result: WorkflowResult):
+        """Add scoring engine timings/counters to the workflow results when enabled"""
+        instrumentation = self.scoring_engine.instrumentation
+        if instrumentation is not None and result.results is not None:
+            result.results['instrumentation'] = instrumentation.snapshot()
+
     def _run_scheduled_workflow(self, analysis_type: AnalysisType, workflow_prefix: str):
         """Execute a scheduled workflow"""
         workflow_id = f"{workflow_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -570,7 +596,7 @@ class EdTechAnalysisOrchestrator:
                 self.execute_competitive_intelligence_workflow(workflow_id)
 
         except Exception as e:
-            self.logger.error(f"Scheduled workflow failed: {workflow_id}, Error: {e}")
+            self.logger.error("Scheduled workflow failed: %s, Error: %s", workflow_id, e)
 
     def _generate_competitive_intelligence_summary(self, companies: List[CompanyProfile]) -> Dict[str, Any]:
         """Generate competitive intelligence summary"""
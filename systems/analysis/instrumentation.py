@@ -0,0 +1,136 @@
+"""
+EdTech RADAR - Scoring Instrumentation
+=====================================
+
+Optional timing and counters for the scoring hot path.
+Methods are wrapped only when instrumentation is attached to an engine, so a
+disabled engine pays no per-call cost. Metrics export as a plain dict (for
+WorkflowResult.results) or Prometheus text exposition format.
+"""
+
+import math
+import time
+from bisect import bisect_left
+from typing import Dict, List, Any, Callable, Sequence
+
+
+# Histogram upper bounds in seconds (Prometheus "le" buckets, +Inf implied)
+DEFAULT_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0)
+
+
+class TimingStats:
+    """Cumulative time, call count and bucketed histogram for one method"""
+
+    __slots__ = ('buckets', 'bucket_counts', 'count', 'total_seconds', 'max_seconds')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def observe(self, seconds: float):
+        """Record one call duration"""
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        self.bucket_counts[bisect_left(self.buckets, seconds)] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative = 0
+        histogram = {}
+        for bound, count in zip(list(self.buckets) + [math.inf], self.bucket_counts):
+            cumulative += count
+            histogram['+Inf' if bound == math.inf else repr(bound)] = cumulative
+
+        return {
+            'calls': self.count,
+            'total_seconds': self.total_seconds,
+            'mean_seconds': self.total_seconds / self.count if self.count else 0.0,
+            'max_seconds': self.max_seconds,
+            'histogram': histogram
+        }
+
+
+class ScoringInstrumentation:
+    """Per-method timings and event counters for EdTechScoringEngine"""
+
+    def __init__(self, namespace: str = "edtech_scoring", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.bucket_bounds = tuple(buckets)
+        self.timings: Dict[str, TimingStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.started_at = time.time()
+
+    def timer(self, name: str) -> TimingStats:
+        """Get (or create) the timing series for ``name``"""
+        stats = self.timings.get(name)
+        if stats is None:
+            stats = self.timings[name] = TimingStats(self.bucket_bounds)
+        return stats
+
+    def timed(self, name: str, func: Callable) -> Callable:
+        """Wrap ``func`` so each call is recorded under ``name``"""
+        stats = self.timer(name)
+        perf_counter = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.observe(perf_counter() - start)
+
+        wrapper.__name__ = getattr(func, '__name__', name)
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def increment(self, counter: str, amount: int = 1):
+        """Increment an event counter"""
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def reset(self):
+        """Drop all recorded metrics (wrapped methods keep reporting)"""
+        for stats in self.timings.values():
+            stats.bucket_counts = [0] * (len(stats.buckets) + 1)
+            stats.count = 0
+            stats.total_seconds = 0.0
+            stats.max_seconds = 0.0
+        self.counters = {}
+        self.started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Metrics as a JSON-friendly dict, methods ordered by total time"""
+        ranked = sorted(self.timings.items(), key=lambda item: item[1].total_seconds, reverse=True)
+        return {
+            'collected_since': self.started_at,
+            'methods': {name: stats.to_dict() for name, stats in ranked},
+            'counters': dict(self.counters)
+        }
+
+    def to_prometheus(self) -> str:
+        """Metrics in Prometheus text exposition format"""
+        duration = f"{self.namespace}_duration_seconds"
+        events = f"{self.namespace}_events_total"
+
+        lines: List[str] = [
+            f"# HELP {duration} Time spent in scoring engine methods.",
+            f"# TYPE {duration} histogram"
+        ]
+        for name, stats in sorted(self.timings.items()):
+            cumulative = 0
+            for bound, count in zip(list(stats.buckets) + [math.inf], stats.bucket_counts):
+                cumulative += count
+                le = '+Inf' if bound == math.inf else repr(bound)
+                lines.append(f'{duration}_bucket{{method="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'{duration}_sum{{method="{name}"}} {stats.total_seconds!r}')
+            lines.append(f'{duration}_count{{method="{name}"}} {stats.count}')
+
+        lines.append(f"# HELP {events} Scoring engine event counters.")
+        lines.append(f"# TYPE {events} counter")
+        for counter, value in sorted(self.counters.items()):
+            lines.append(f'{events}{{event="{counter}"}} {value}')
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,99 @@
+"""
+EdTech RADAR - Streaming Ranking Utilities
+=========================================
+
+Bounded-heap top-K selection for scored companies.
+Ranking N companies keeps only K candidates in memory and costs O(N log K),
+so large portfolios can be ranked as they are scored instead of being
+collected and fully sorted.
+"""
+
+import heapq
+import itertools
+from typing import Dict, List, Optional, Tuple, Iterable, Any
+
+from systems.models.edtech_schemas import CompanyProfile, AnalysisScore
+
+
+ScoredCompany = Tuple[CompanyProfile, AnalysisScore]
+
+
+class TopKAccumulator:
+    """Keep the K highest-scoring (company, score) pairs from a stream
+
+    Ties keep the earlier pair, matching a stable descending sort. With
+    ``per_category_k`` a separate top list is kept for every EdTechCategory
+    a company belongs to.
+    """
+
+    def __init__(self, k: int, per_category_k: Optional[int] = None):
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        self.k = k
+        self.per_category_k = per_category_k
+        self.count = 0
+
+        # Min-heaps of (total_score, -sequence, company, score); the root is the first to evict
+        self._heap: List[Tuple[float, int, CompanyProfile, AnalysisScore]] = []
+        self._category_heaps: Dict[str, List[Tuple[float, int, CompanyProfile, AnalysisScore]]] = {}
+        self._sequence = itertools.count()
+
+    def push(self, company: CompanyProfile, score: AnalysisScore):
+        """Offer one scored company"""
+        entry = (score.total_score, -next(self._sequence), company, score)
+        self.count += 1
+        self._offer(self._heap, entry, self.k)
+
+        if self.per_category_k:
+            for category in dict.fromkeys(cat.value for cat in company.category):
+                heap = self._category_heaps.setdefault(category, [])
+                self._offer(heap, entry, self.per_category_k)
+
+    def extend(self, scored_companies: Iterable[ScoredCompany]) -> 'TopKAccumulator':
+        """Offer every pair from an iterable; returns self for chaining"""
+        for company, score in scored_companies:
+            self.push(company, score)
+        return self
+
+    def top(self, limit: Optional[int] = None) -> List[ScoredCompany]:
+        """Best pairs seen so far, highest score first"""
+        return self._sorted(self._heap, limit)
+
+    def top_by_category(self, limit: Optional[int] = None) -> Dict[str, List[ScoredCompany]]:
+        """Best pairs per category, highest score first"""
+        return {category: self._sorted(heap, limit) for category, heap in self._category_heaps.items()}
+
+    def __len__(self) -> int:
+        return self.count
+
+    @staticmethod
+    def _offer(heap: List[Tuple[float, int, CompanyProfile, AnalysisScore]],
+               entry: Tuple[float, int, CompanyProfile, AnalysisScore], k: int):
+        if k <= 0:
+            return
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    @staticmethod
+    def _sorted(heap: List[Tuple[float, int, CompanyProfile, AnalysisScore]],
+                limit: Optional[int]) -> List[ScoredCompany]:
+        ranked = sorted(heap, key=lambda entry: entry[:2], reverse=True)
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(company, score) for _, _, company, score in ranked]
+
+
+def top_performer_summary(company: CompanyProfile, score: AnalysisScore,
+                          include_category: bool = True) -> Dict[str, Any]:
+    """Serialize a ranked company the way portfolio reports list top performers"""
+    summary = {
+        'name': company.name,
+        'score': score.total_score,
+        'grade': score.investment_grade,
+        'recommendation': score.recommendation
+    }
+    if include_category:
+        summary['category'] = [cat.value for cat in company.category] if company.category else []
+    return summary
@@ -8,15 +8,20 @@ Implements multiple scoring methodologies with weighted criteria and automated a
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Iterable, Iterator, Union
+from bisect import bisect_left
 from datetime import datetime, timedelta
 import logging
 from dataclasses import dataclass, field
 
 from systems.models.edtech_schemas import (
     CompanyProfile, MarketOpportunity, AnalysisScore,
-    EdTechCategory, FundingStage, BusinessModel
+    EdTechCategory, FundingStage, BusinessModel, SUB_SCORE_FIELDS
 )
+from systems.analysis.ranking import TopKAccumulator
+from systems.analysis.streaming_stats import PortfolioReportAggregator
+from systems.analysis.instrumentation import ScoringInstrumentation
+from systems.logging_setup import SampledLogger, BatchLogSummary
 
 
 @dataclass
@@ -44,14 +49,73 @@ class ScoringWeights:
     company_category_weight: float = 0.4
     strategic_category_weight: float = 0.3
 
+    def to_vector(self) -> np.ndarray:
+        """Flatten into one effective weight per sub-score (SUB_SCORE_FIELDS order)
+
+        In-category weights are normalised by their sum and multiplied by the
+        category weight, so ``score_matrix @ to_vector()`` gives total scores.
+        """
+        groups = [
+            (self.market_category_weight,
+             [self.market_size_weight, self.growth_potential_weight, self.competitive_landscape_weight]),
+            (self.company_category_weight,
+             [self.financial_strength_weight, self.technology_weight, self.team_weight, self.product_weight]),
+            (self.strategic_category_weight,
+             [self.alignment_weight, self.synergy_potential_weight, self.risk_assessment_weight]),
+        ]
+
+        vector = []
+        for category_weight, in_category in groups:
+            in_category = np.asarray(in_category, dtype=float)
+            total = in_category.sum()
+            if total <= 0:
+                raise ValueError("In-category weights must sum to a positive value")
+            vector.extend(category_weight * in_category / total)
+
+        return np.asarray(vector, dtype=float)
+
+
+def score_matrix(scores: List[AnalysisScore]) -> np.ndarray:
+    """Stack sub-scores into an (N, len(SUB_SCORE_FIELDS)) matrix"""
+    if not scores:
+        return np.empty((0, len(SUB_SCORE_FIELDS)))
+    return np.array([score.sub_scores() for score in scores], dtype=float)
+
+
+# Market opportunity criteria shared by score_market_opportunity and score_opportunities_batch.
+# 'tiers' criteria award points by how many industry_benchmarks cutoffs the value strictly
+# exceeds; 'linear' criteria use intercept + slope * value clipped to [floor, cap].
+OPPORTUNITY_CRITERION_POINTS = 25
+OPPORTUNITY_CRITERIA = {
+    'market_size': {
+        'type': 'tiers', 'benchmark': 'market_sizes',
+        'cutoffs': ('small', 'medium', 'large', 'mega'), 'points': (5, 10, 15, 20, 25)
+    },
+    'growth_rate': {
+        'type': 'tiers', 'benchmark': 'growth_rates',
+        'cutoffs': ('average', 'good', 'very_good', 'excellent'), 'points': (5, 10, 15, 20, 25)
+    },
+    # Inverse relationship: more competition, fewer points
+    'competitive_intensity': {'type': 'linear', 'intercept': 25, 'slope': -2, 'floor': 5, 'cap': None},
+    # Scale 0-100% ROI to 0-25 points
+    'roi_potential': {'type': 'linear', 'intercept': 0, 'slope': 0.25, 'floor': None, 'cap': 25},
+}
+
 
 class EdTechScoringEngine:
     """Advanced scoring engine for EdTech market analysis"""
 
-    def __init__(self, weights: Optional[ScoringWeights] = None):
+    def __init__(self, weights: Optional[ScoringWeights] = None,
+                 instrumentation: Optional[ScoringInstrumentation] = None,
+                 log_sample_every: int = 1000):
         self.weights = weights or ScoringWeights()
         self.logger = logging.getLogger(__name__)
 
+        # Hot-path observability: optional timers and sampled per-company logging
+        self.instrumentation = instrumentation
+        self._item_log = SampledLogger(self.logger, every=log_sample_every)
+        self._bind_scorers()
+
         # Industry benchmarks and standards
         self.industry_benchmarks = {
             'funding_stages': {
@@ -84,81 +148,176 @@ class EdTechScoringEngine:
 
         score = AnalysisScore()
 
-        # Market Attractiveness Scoring
-        score.market_size_score = self._score_market_size(company)
-        score.growth_potential_score = self._score_growth_potential(company)
-        score.competitive_landscape_score = self._score_competitive_landscape(company)
+        # Market attractiveness, company strength and strategic fit sub-scores
+        for field_name, scorer in self._sub_scorers:
+            setattr(score, field_name, scorer(company))
 
-        # Company Strength Scoring
-        score.financial_strength_score = self._score_financial_strength(company)
-        score.technology_score = self._score_technology_stack(company)
-        score.team_score = self._score_team_strength(company)
-        score.product_score = self._score_product_quality(company)
+        # Calculate total score, recommendations and metadata
+        self._finalize(score)
 
-        # Strategic Fit Scoring
-        score.alignment_score = self._score_strategic_alignment(company)
-        score.synergy_potential_score = self._score_synergy_potential(company)
-        score.risk_assessment_score = self._score_risk_assessment(company)
+        self._log_scored_company(company, score)
 
-        # Calculate total score and recommendations
-        score.calculate_total_score()
+        return score
 
-        # Add metadata
+    @property
+    def weights(self) -> ScoringWeights:
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights: ScoringWeights):
+        self._weights = weights
+        self._weight_vector = None
+
+    @property
+    def weight_vector(self) -> np.ndarray:
+        """``weights.to_vector()``, computed once per assignment of ``weights``
+
+        Edit weights by assigning a new ScoringWeights (or reassigning the
+        edited one), which invalidates the cached vector.
+        """
+        if self._weight_vector is None:
+            self._weight_vector = self._weights.to_vector()
+        return self._weight_vector
+
+    def enable_instrumentation(self, instrumentation: Optional[ScoringInstrumentation] = None) -> ScoringInstrumentation:
+        """Start recording per-method timings and counters
+
+        Sub-scorers, total calculation and logging are wrapped with timers;
+        until this is called the hot path runs unwrapped.
+        """
+        self.instrumentation = instrumentation or ScoringInstrumentation()
+        self._bind_scorers()
+        return self.instrumentation
+
+    def disable_instrumentation(self):
+        """Stop recording and restore the unwrapped hot path"""
+        self.instrumentation = None
+        self._bind_scorers()
+
+    def _bind_scorers(self):
+        """Bind sub-scorer methods, wrapping them when instrumentation is enabled"""
+        scorers = [
+            ('market_size_score', self._score_market_size),
+            ('growth_potential_score', self._score_growth_potential),
+            ('competitive_landscape_score', self._score_competitive_landscape),
+            ('financial_strength_score', self._score_financial_strength),
+            ('technology_score', self._score_technology_stack),
+            ('team_score', self._score_team_strength),
+            ('product_score', self._score_product_quality),
+            ('alignment_score', self._score_strategic_alignment),
+            ('synergy_potential_score', self._score_synergy_potential),
+            ('risk_assessment_score', self._score_risk_assessment),
+        ]
+        finalize = self._finalize_score
+        log_scored = self._log_scored
+
+        if self.instrumentation is not None:
+            timed = self.instrumentation.timed
+            scorers = [(field_name, timed(method.__name__.lstrip('_'), method)) for field_name, method in scorers]
+            finalize = timed('finalize_score', finalize)
+            log_scored = timed('log_scored', log_scored)
+
+        self._sub_scorers = scorers
+        self._finalize = finalize
+        self._log_scored_company = log_scored
+
+    def _finalize_score(self, score: AnalysisScore):
+        """Compute total, grade and recommendation and stamp metadata"""
+        score.calculate_total_score(self.weight_vector)
         score.calculated_at = datetime.now()
         score.analyst = "EdTech Scoring Engine v1.0"
 
-        self.logger.info(f"Scored company {company.name}: {score.total_score:.1f} ({score.investment_grade})")
+    def _log_scored(self, company: CompanyProfile, score: AnalysisScore):
+        """Per-company detail at DEBUG; every Nth company is sampled at INFO"""
+        if self.instrumentation is not None:
+            self.instrumentation.increment('companies_scored')
 
-        return score
+        self._item_log.log("Scored company %s: %.1f (%s)",
+                           company.name, score.total_score, score.investment_grade)
 
     def score_market_opportunity(self, opportunity: MarketOpportunity) -> float:
         """Score a market opportunity (0-100 scale)"""
 
-        scores = []
-
-        # Market size scoring (0-25 points)
-        if opportunity.market_size:
-            if opportunity.market_size > self.industry_benchmarks['market_sizes']['mega']:
-                market_size_score = 25
-            elif opportunity.market_size > self.industry_benchmarks['market_sizes']['large']:
-                market_size_score = 20
-            elif opportunity.market_size > self.industry_benchmarks['market_sizes']['medium']:
-                market_size_score = 15
-            elif opportunity.market_size > self.industry_benchmarks['market_sizes']['small']:
-                market_size_score = 10
+        # Each available criterion is worth up to 25 points; missing ones are skipped
+        scores = [
+            self._score_opportunity_criterion(name, getattr(opportunity, name))
+            for name in OPPORTUNITY_CRITERIA
+            if getattr(opportunity, name)
+        ]
+
+        # Calculate weighted average
+        total_score = sum(scores) if scores else 0
+        max_possible = len(scores) * OPPORTUNITY_CRITERION_POINTS if scores else 100
+
+        return (total_score / max_possible) * 100 if max_possible > 0 else 0
+
+    def score_opportunities_batch(self, opportunities: Union[List[MarketOpportunity], pd.DataFrame]) -> Tuple[np.ndarray, pd.DataFrame]:
+        """Score many market opportunities at once (0-100 scale)
+
+        Accepts MarketOpportunity objects or a DataFrame with the
+        OPPORTUNITY_CRITERIA columns. Returns the score array and a breakdown
+        frame with one ``<criterion>_score`` column per criterion (NaN where the
+        criterion was skipped). Matches score_market_opportunity row by row.
+        """
+        if isinstance(opportunities, pd.DataFrame):
+            frame = opportunities
+        else:
+            frame = pd.DataFrame(
+                {name: [getattr(opp, name) for opp in opportunities] for name in OPPORTUNITY_CRITERIA}
+            )
+
+        count = len(frame)
+        breakdown = pd.DataFrame(index=frame.index)
+        points = np.zeros(count)
+        criteria_used = np.zeros(count)
+
+        for name, criterion in OPPORTUNITY_CRITERIA.items():
+            if name in frame:
+                values = pd.to_numeric(frame[name], errors='coerce').to_numpy(dtype=float)
             else:
-                market_size_score = 5
-            scores.append(market_size_score)
-
-        # Growth rate scoring (0-25 points)
-        if opportunity.growth_rate:
-            if opportunity.growth_rate > self.industry_benchmarks['growth_rates']['excellent']:
-                growth_score = 25
-            elif opportunity.growth_rate > self.industry_benchmarks['growth_rates']['very_good']:
-                growth_score = 20
-            elif opportunity.growth_rate > self.industry_benchmarks['growth_rates']['good']:
-                growth_score = 15
-            elif opportunity.growth_rate > self.industry_benchmarks['growth_rates']['average']:
-                growth_score = 10
+                values = np.full(count, np.nan)
+
+            # Same truthiness rule as the scalar path: None/NaN and 0 are skipped
+            present = ~np.isnan(values) & (values != 0)
+
+            if criterion['type'] == 'tiers':
+                tiers = np.digitize(values, self._opportunity_cutoffs(criterion), right=True)
+                criterion_points = np.asarray(criterion['points'], dtype=float)[tiers]
             else:
-                growth_score = 5
-            scores.append(growth_score)
+                criterion_points = criterion['intercept'] + criterion['slope'] * values
+                if criterion['floor'] is not None:
+                    criterion_points = np.maximum(criterion_points, criterion['floor'])
+                if criterion['cap'] is not None:
+                    criterion_points = np.minimum(criterion_points, criterion['cap'])
 
-        # Competitive intensity scoring (0-25 points, inverse relationship)
-        if opportunity.competitive_intensity:
-            competition_score = max(5, 25 - (opportunity.competitive_intensity * 2))
-            scores.append(competition_score)
+            breakdown[f"{name}_score"] = np.where(present, criterion_points, np.nan)
+            points += np.where(present, criterion_points, 0)
+            criteria_used += present
 
-        # ROI potential scoring (0-25 points)
-        if opportunity.roi_potential:
-            roi_score = min(25, opportunity.roi_potential / 4)  # Scale 0-100% to 0-25 points
-            scores.append(roi_score)
+        scores = np.divide(points * 100, criteria_used * OPPORTUNITY_CRITERION_POINTS,
+                           out=np.zeros(count), where=criteria_used > 0)
 
-        # Calculate weighted average
-        total_score = sum(scores) if scores else 0
-        max_possible = len(scores) * 25 if scores else 100
+        return scores, breakdown
 
-        return (total_score / max_possible) * 100 if max_possible > 0 else 0
+    def _opportunity_cutoffs(self, criterion: Dict[str, Any]) -> List[float]:
+        """Resolve a tiered criterion's cutoff names against industry benchmarks"""
+        benchmarks = self.industry_benchmarks[criterion['benchmark']]
+        return [benchmarks[tier] for tier in criterion['cutoffs']]
+
+    def _score_opportunity_criterion(self, name: str, value: float) -> float:
+        """Score a single opportunity criterion using OPPORTUNITY_CRITERIA"""
+        criterion = OPPORTUNITY_CRITERIA[name]
+
+        if criterion['type'] == 'tiers':
+            # Number of cutoffs strictly exceeded selects the tier
+            return criterion['points'][bisect_left(self._opportunity_cutoffs(criterion), value)]
+
+        points = criterion['intercept'] + criterion['slope'] * value
+        if criterion['floor'] is not None:
+            points = max(criterion['floor'], points)
+        if criterion['cap'] is not None:
+            points = min(criterion['cap'], points)
+        return points
 
     # Private scoring methods for individual criteria
 
@@ -508,89 +667,56 @@ class EdTechScoringEngine:
 
         return min(100, max(0, score))
 
-    def batch_score_companies(self, companies: List[CompanyProfile]) -> List[Tuple[CompanyProfile, AnalysisScore]]:
-        """Score multiple companies in batch"""
-        results = []
-
-        for company in companies:
-            try:
-                score = self.score_company(company)
-                results.append((company, score))
-            except Exception as e:
-                self.logger.error(f"Error scoring company {company.name}: {e}")
-                continue
+    def iter_scored_companies(self, companies: Iterable[CompanyProfile]) -> Iterator[Tuple[CompanyProfile, AnalysisScore]]:
+        """Score companies lazily, in input order, skipping failures
+
+        Logs one summary line at INFO when the input is exhausted.
+        """
+        with BatchLogSummary(self.logger, "Scored companies") as summary:
+            for company in companies:
+                try:
+                    score = self.score_company(company)
+                except Exception as e:
+                    summary.failure()
+                    if self.instrumentation is not None:
+                        self.instrumentation.increment('scoring_errors')
+                    self.logger.error("Error scoring company %s: %s", company.name, e)
+                    continue
+                summary.success()
+                yield company, score
+
+    def batch_score_companies(self, companies: Iterable[CompanyProfile],
+                              top_k: Optional[int] = None) -> List[Tuple[CompanyProfile, AnalysisScore]]:
+        """Score multiple companies in batch
+
+        Results are ordered by total score (descending). With ``top_k`` only the
+        best ``top_k`` results are kept, using a bounded heap instead of a full sort.
+        """
+        scored = self.iter_scored_companies(companies)
+
+        if top_k is not None:
+            return TopKAccumulator(top_k).extend(scored).top()
 
         # Sort by total score (descending)
+        results = list(scored)
         results.sort(key=lambda x: x[1].total_score, reverse=True)
 
         return results
 
-    def generate_portfolio_report(self, scored_companies: List[Tuple[CompanyProfile, AnalysisScore]]) -> Dict[str, Any]:
-        """Generate comprehensive portfolio analysis report"""
-
-        if not scored_companies:
-            return {}
+    def analyze_weight_sensitivity(self, scored_companies: List[Tuple[CompanyProfile, AnalysisScore]],
+                                   scenarios: List[ScoringWeights], top_k: int = 10) -> Dict[str, Any]:
+        """Rescore scored companies under alternative weights without re-running the scorers"""
+        from systems.analysis.weight_sensitivity import WeightSensitivityAnalyzer
 
-        companies, scores = zip(*scored_companies)
+        analyzer = WeightSensitivityAnalyzer.from_scored_companies(scored_companies, self.weights)
+        result = analyzer.evaluate(scenarios, top_k=top_k)
 
-        # Calculate aggregate statistics
-        total_scores = [score.total_score for score in scores]
+        return result.to_dict([company.name for company, _ in scored_companies])
 
-        report = {
-            'summary': {
-                'total_companies': len(companies),
-                'average_score': np.mean(total_scores),
-                'median_score': np.median(total_scores),
-                'std_score': np.std(total_scores),
-                'top_quartile_threshold': np.percentile(total_scores, 75),
-                'generated_at': datetime.now().isoformat()
-            },
-            'grade_distribution': {},
-            'recommendation_distribution': {},
-            'top_performers': [],
-            'category_analysis': {},
-            'risk_analysis': {}
-        }
-
-        # Grade distribution
-        grades = [score.investment_grade for score in scores]
-        for grade in set(grades):
-            report['grade_distribution'][grade] = grades.count(grade)
-
-        # Recommendation distribution
-        recommendations = [score.recommendation for score in scores]
-        for rec in set(recommendations):
-            report['recommendation_distribution'][rec] = recommendations.count(rec)
-
-        # Top performers (top 10 or 20% whichever is smaller)
-        top_count = min(10, max(1, len(scored_companies) // 5))
-        report['top_performers'] = [
-            {
-                'name': company.name,
-                'score': score.total_score,
-                'grade': score.investment_grade,
-                'recommendation': score.recommendation,
-                'category': [cat.value for cat in company.category] if company.category else []
-            }
-            for company, score in scored_companies[:top_count]
-        ]
-
-        # Category performance analysis
-        category_scores = {}
-        for company, score in scored_companies:
-            for category in company.category:
-                if category.value not in category_scores:
-                    category_scores[category.value] = []
-                category_scores[category.value].append(score.total_score)
-
-        report['category_analysis'] = {
-            cat: {
-                'average_score': np.mean(scores),
-                'count': len(scores),
-                'top_score': max(scores),
-                'min_score': min(scores)
-            }
-            for cat, scores in category_scores.items()
-        }
+    def generate_portfolio_report(self, scored_companies: Iterable[Tuple[CompanyProfile, AnalysisScore]]) -> Dict[str, Any]:
+        """Generate comprehensive portfolio analysis report
 
-        return report
\ No newline at end of file
+        Aggregates in a single pass with bounded memory, so ``scored_companies``
+        may be a generator such as ``iter_scored_companies(...)``.
+        """
+        return PortfolioReportAggregator().extend(scored_companies).report()
@@ -0,0 +1,213 @@
+"""
+EdTech RADAR - Streaming Portfolio Statistics
+============================================
+
+Single-pass, bounded-memory aggregation of scored companies.
+Provides Welford running moments, a KLL quantile sketch and an online
+portfolio report aggregator that yields the same report shape as
+EdTechScoringEngine.generate_portfolio_report without materializing the portfolio.
+"""
+
+import math
+import random
+import numpy as np
+from collections import Counter
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+from datetime import datetime
+
+from systems.models.edtech_schemas import CompanyProfile, AnalysisScore
+from systems.analysis.ranking import TopKAccumulator, top_performer_summary
+
+
+class RunningStats:
+    """Welford running count/mean/variance with min and max"""
+
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        """Add one observation"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """Combine with another accumulator (Chan et al. parallel update)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Population variance (matches np.var / np.std defaults)"""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """KLL quantile sketch (Karnin, Lang & Liberty, 2016)
+
+    Keeps O(k log(n / k)) items. Until the first compaction every item is
+    retained and quantiles are exact, using the same linear interpolation
+    as ``np.percentile``.
+    """
+
+    def __init__(self, k: int = 256, seed: Optional[int] = None):
+        self.k = k
+        self.count = 0
+        self._compactors: List[List[float]] = [[]]
+        self._size = 0
+        self._max_size = self._capacity(0)
+        self._random = random.Random(seed)
+
+    def add(self, value: float):
+        """Add one observation"""
+        self._compactors[0].append(value)
+        self._size += 1
+        self.count += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (0 <= q <= 1); NaN when empty"""
+        if self.count == 0:
+            return math.nan
+        if len(self._compactors) == 1:
+            return float(np.percentile(self._compactors[0], q * 100))
+
+        weighted = sorted(
+            (value, 1 << level)
+            for level, compactor in enumerate(self._compactors)
+            for value in compactor
+        )
+        total = sum(weight for _, weight in weighted)
+        target = q * total
+
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return float(value)
+        return float(weighted[-1][0])
+
+    def _capacity(self, level: int) -> int:
+        height = len(self._compactors) - level - 1
+        return int(math.ceil((2 / 3) ** height * self.k)) + 1
+
+    def _compress(self):
+        for level in range(len(self._compactors)):
+            if len(self._compactors[level]) >= self._capacity(level):
+                if level + 1 >= len(self._compactors):
+                    self._compactors.append([])
+
+                items = sorted(self._compactors[level])
+                # Odd item stays behind; every other survivor moves up with double weight
+                leftover = [items.pop()] if len(items) % 2 else []
+                offset = self._random.randint(0, 1)
+                self._compactors[level + 1].extend(items[offset::2])
+                self._compactors[level] = leftover
+                break
+
+        self._size = sum(len(compactor) for compactor in self._compactors)
+        self._max_size = sum(self._capacity(level) for level in range(len(self._compactors)))
+
+
+class PortfolioReportAggregator:
+    """Online equivalent of EdTechScoringEngine.generate_portfolio_report
+
+    Consumes (company, score) pairs one at a time; memory is bounded by the
+    sketch size, the top-performer heap and the number of categories.
+    """
+
+    TOP_PERFORMER_LIMIT = 10
+
+    def __init__(self, sketch_k: int = 256, seed: Optional[int] = None):
+        self.scores = RunningStats()
+        self.quantiles = QuantileSketch(sketch_k, seed)
+        self.grades = Counter()
+        self.recommendations = Counter()
+        self.categories: Dict[str, RunningStats] = {}
+        self.top_performers = TopKAccumulator(self.TOP_PERFORMER_LIMIT)
+
+    def add(self, company: CompanyProfile, score: AnalysisScore):
+        """Consume one scored company"""
+        total = score.total_score
+        self.scores.add(total)
+        self.quantiles.add(total)
+        self.grades[score.investment_grade] += 1
+        self.recommendations[score.recommendation] += 1
+        self.top_performers.push(company, score)
+
+        for category in company.category:
+            stats = self.categories.get(category.value)
+            if stats is None:
+                stats = self.categories[category.value] = RunningStats()
+            stats.add(total)
+
+    def extend(self, scored_companies: Iterable[Tuple[CompanyProfile, AnalysisScore]]) -> 'PortfolioReportAggregator':
+        """Consume every pair from an iterable; returns self for chaining"""
+        for company, score in scored_companies:
+            self.add(company, score)
+        return self
+
+    def report(self) -> Dict[str, Any]:
+        """Build the portfolio report ({} when nothing was consumed)"""
+        count = self.scores.count
+        if count == 0:
+            return {}
+
+        # Top performers (top 10 or 20% whichever is smaller)
+        top_count = min(self.TOP_PERFORMER_LIMIT, max(1, count // 5))
+
+        return {
+            'summary': {
+                'total_companies': count,
+                'average_score': self.scores.mean,
+                'median_score': self.quantiles.quantile(0.5),
+                'std_score': self.scores.std,
+                'top_quartile_threshold': self.quantiles.quantile(0.75),
+                'generated_at': datetime.now().isoformat()
+            },
+            'grade_distribution': dict(self.grades),
+            'recommendation_distribution': dict(self.recommendations),
+            'top_performers': [
+                top_performer_summary(company, score)
+                for company, score in self.top_performers.top(top_count)
+            ],
+            'category_analysis': {
+                cat: {
+                    'average_score': stats.mean,
+                    'count': stats.count,
+                    'top_score': stats.max,
+                    'min_score': stats.min
+                }
+                for cat, stats in self.categories.items()
+            },
+            'risk_analysis': {}
+        }
@@ -0,0 +1,223 @@
+"""
+EdTech RADAR - Scoring Weight Sensitivity Analysis
+=================================================
+
+Rescores a portfolio under many ScoringWeights scenarios at once.
+Total scores are linear in the stored sub-scores, so K weight vectors against
+N companies reduce to one (N x 10) @ (10 x K) matrix product instead of K full
+rescoring runs.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Tuple, Any, Sequence, Union
+from dataclasses import dataclass
+
+from systems.models.edtech_schemas import (
+    CompanyProfile, AnalysisScore, SUB_SCORE_FIELDS,
+    GRADE_THRESHOLDS, INVESTMENT_GRADES, RECOMMENDATION_THRESHOLDS, RECOMMENDATIONS
+)
+from systems.analysis.scoring_engine import ScoringWeights, score_matrix
+
+
+WeightScenarios = Union[Sequence[ScoringWeights], np.ndarray]
+
+
+def weights_matrix(scenarios: WeightScenarios) -> np.ndarray:
+    """Convert weight scenarios into a (K, len(SUB_SCORE_FIELDS)) matrix"""
+    if isinstance(scenarios, np.ndarray):
+        matrix = np.atleast_2d(scenarios).astype(float)
+    else:
+        matrix = np.array([weights.to_vector() for weights in scenarios], dtype=float)
+
+    if matrix.ndim != 2 or matrix.shape[1] != len(SUB_SCORE_FIELDS):
+        raise ValueError(f"Weight scenarios must have {len(SUB_SCORE_FIELDS)} columns, got shape {matrix.shape}")
+
+    return matrix
+
+
+def grade_indices(total_scores: np.ndarray) -> np.ndarray:
+    """Vectorized index into INVESTMENT_GRADES (same cutoffs as AnalysisScore)"""
+    return np.digitize(total_scores, GRADE_THRESHOLDS, right=False)
+
+
+def recommendation_indices(total_scores: np.ndarray) -> np.ndarray:
+    """Vectorized index into RECOMMENDATIONS (same cutoffs as AnalysisScore)"""
+    return np.digitize(total_scores, RECOMMENDATION_THRESHOLDS, right=False)
+
+
+def _ranks(total_scores: np.ndarray) -> np.ndarray:
+    """Rank (0 = best) of each row, per column"""
+    order = np.argsort(-total_scores, axis=0, kind='stable')
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(total_scores.shape[0])[:, None], axis=0)
+    return ranks
+
+
+@dataclass
+class SensitivityResult:
+    """Per-scenario and per-company stability metrics for a set of weight scenarios"""
+    baseline_scores: np.ndarray        # (N,)
+    rank_correlation: np.ndarray       # (K,) Spearman rho vs baseline ranking
+    mean_rank_shift: np.ndarray        # (K,) mean |rank - baseline rank|
+    max_rank_shift: np.ndarray         # (K,)
+    grade_flips: np.ndarray            # (K,) companies whose grade changes
+    recommendation_flips: np.ndarray   # (K,) companies whose recommendation changes
+    top_k_overlap: np.ndarray          # (K,) share of baseline top-K kept
+    best_rank: np.ndarray              # (N,) best rank reached across scenarios
+    worst_rank: np.ndarray             # (N,) worst rank reached across scenarios
+    grade_flip_rate: np.ndarray        # (N,) share of scenarios changing the company's grade
+    top_k: int
+    scenario_scores: Optional[np.ndarray] = None  # (N, K), only when requested
+
+    def to_dict(self, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Summarize for reports and JSON export"""
+        n = len(self.baseline_scores)
+        names = names if names is not None else [str(i) for i in range(n)]
+
+        return {
+            'scenarios_evaluated': int(len(self.rank_correlation)),
+            'companies_evaluated': n,
+            'top_k': self.top_k,
+            'rank_stability': {
+                'mean_spearman': float(np.mean(self.rank_correlation)) if len(self.rank_correlation) else 1.0,
+                'min_spearman': float(np.min(self.rank_correlation)) if len(self.rank_correlation) else 1.0,
+                'mean_rank_shift': float(np.mean(self.mean_rank_shift)) if len(self.mean_rank_shift) else 0.0,
+                'max_rank_shift': int(np.max(self.max_rank_shift)) if len(self.max_rank_shift) else 0
+            },
+            'grade_flips': {
+                'mean_per_scenario': float(np.mean(self.grade_flips)) if len(self.grade_flips) else 0.0,
+                'max_per_scenario': int(np.max(self.grade_flips)) if len(self.grade_flips) else 0,
+                'recommendation_mean_per_scenario': float(np.mean(self.recommendation_flips)) if len(self.recommendation_flips) else 0.0
+            },
+            'top_k_overlap': {
+                'mean': float(np.mean(self.top_k_overlap)) if len(self.top_k_overlap) else 1.0,
+                'min': float(np.min(self.top_k_overlap)) if len(self.top_k_overlap) else 1.0
+            },
+            'companies': [
+                {
+                    'name': names[i],
+                    'baseline_score': float(self.baseline_scores[i]),
+                    'best_rank': int(self.best_rank[i]) + 1,
+                    'worst_rank': int(self.worst_rank[i]) + 1,
+                    'grade_flip_rate': float(self.grade_flip_rate[i])
+                }
+                for i in np.argsort(-self.baseline_scores, kind='stable')
+            ]
+        }
+
+
+class WeightSensitivityAnalyzer:
+    """Evaluate many ScoringWeights scenarios against a fixed sub-score matrix"""
+
+    def __init__(self, scores: List[AnalysisScore], baseline_weights: Optional[ScoringWeights] = None):
+        self.sub_scores = score_matrix(scores)
+        self.baseline_weights = baseline_weights or ScoringWeights()
+
+        self.baseline_scores = self.sub_scores @ self.baseline_weights.to_vector()
+        self._baseline_ranks = _ranks(self.baseline_scores[:, None])[:, 0]
+        self._baseline_grades = grade_indices(self.baseline_scores)
+        self._baseline_recommendations = recommendation_indices(self.baseline_scores)
+
+    @classmethod
+    def from_scored_companies(cls, scored_companies: List[Tuple[CompanyProfile, AnalysisScore]],
+                              baseline_weights: Optional[ScoringWeights] = None) -> 'WeightSensitivityAnalyzer':
+        """Build from batch_score_companies output"""
+        return cls([score for _, score in scored_companies], baseline_weights)
+
+    def rescore(self, scenarios: WeightScenarios) -> np.ndarray:
+        """Total scores for every company under every scenario, shape (N, K)"""
+        return self.sub_scores @ weights_matrix(scenarios).T
+
+    def evaluate(self, scenarios: WeightScenarios, top_k: int = 10,
+                 chunk_size: int = 256, keep_scores: bool = False) -> SensitivityResult:
+        """Compare each scenario against the baseline weights
+
+        Scenarios are processed ``chunk_size`` at a time so memory stays at
+        O(N * chunk_size) regardless of how many scenarios are evaluated.
+        """
+        weights = weights_matrix(scenarios)
+        n = self.sub_scores.shape[0]
+        k_total = weights.shape[0]
+        top_k = max(1, min(top_k, n)) if n else 0
+
+        rank_correlation = np.ones(k_total)
+        mean_rank_shift = np.zeros(k_total)
+        max_rank_shift = np.zeros(k_total, dtype=int)
+        grade_flips = np.zeros(k_total, dtype=int)
+        recommendation_flips = np.zeros(k_total, dtype=int)
+        top_k_overlap = np.ones(k_total)
+        best_rank = self._baseline_ranks.copy()
+        worst_rank = self._baseline_ranks.copy()
+        company_grade_flips = np.zeros(n, dtype=int)
+        all_scores = np.empty((n, k_total)) if keep_scores else None
+
+        if n == 0 or k_total == 0:
+            return SensitivityResult(
+                self.baseline_scores, rank_correlation, mean_rank_shift, max_rank_shift,
+                grade_flips, recommendation_flips, top_k_overlap, best_rank, worst_rank,
+                np.zeros(n), top_k, all_scores
+            )
+
+        baseline_in_top = self._baseline_ranks < top_k
+
+        for start in range(0, k_total, chunk_size):
+            stop = min(start + chunk_size, k_total)
+            totals = self.sub_scores @ weights[start:stop].T
+            if keep_scores:
+                all_scores[:, start:stop] = totals
+
+            ranks = _ranks(totals)
+            shift = np.abs(ranks - self._baseline_ranks[:, None])
+
+            if n > 1:
+                rank_correlation[start:stop] = 1 - 6 * (shift.astype(float) ** 2).sum(axis=0) / (n * (n ** 2 - 1))
+            mean_rank_shift[start:stop] = shift.mean(axis=0)
+            max_rank_shift[start:stop] = shift.max(axis=0)
+
+            grade_changed = grade_indices(totals) != self._baseline_grades[:, None]
+            grade_flips[start:stop] = grade_changed.sum(axis=0)
+            company_grade_flips += grade_changed.sum(axis=1)
+            recommendation_flips[start:stop] = (
+                recommendation_indices(totals) != self._baseline_recommendations[:, None]
+            ).sum(axis=0)
+
+            top_k_overlap[start:stop] = ((ranks < top_k) & baseline_in_top[:, None]).sum(axis=0) / top_k
+
+            best_rank = np.minimum(best_rank, ranks.min(axis=1))
+            worst_rank = np.maximum(worst_rank, ranks.max(axis=1))
+
+        return SensitivityResult(
+            baseline_scores=self.baseline_scores,
+            rank_correlation=rank_correlation,
+            mean_rank_shift=mean_rank_shift,
+            max_rank_shift=max_rank_shift,
+            grade_flips=grade_flips,
+            recommendation_flips=recommendation_flips,
+            top_k_overlap=top_k_overlap,
+            best_rank=best_rank,
+            worst_rank=worst_rank,
+            grade_flip_rate=company_grade_flips / k_total,
+            top_k=top_k,
+            scenario_scores=all_scores
+        )
+
+    def grades(self, scenarios: WeightScenarios) -> np.ndarray:
+        """Investment grade labels per company and scenario, shape (N, K)"""
+        return np.asarray(INVESTMENT_GRADES)[grade_indices(self.rescore(scenarios))]
+
+    def recommendations(self, scenarios: WeightScenarios) -> np.ndarray:
+        """Recommendation labels per company and scenario, shape (N, K)"""
+        return np.asarray(RECOMMENDATIONS)[recommendation_indices(self.rescore(scenarios))]
+
+
+def random_weight_scenarios(count: int, base: Optional[ScoringWeights] = None,
+                            concentration: float = 50.0, seed: Optional[int] = None) -> np.ndarray:
+    """Sample weight vectors around ``base`` from a Dirichlet distribution
+
+    Higher ``concentration`` keeps scenarios closer to the base weights.
+    Rows sum to 1 like ``ScoringWeights.to_vector``.
+    """
+    base_vector = (base or ScoringWeights()).to_vector()
+    base_vector = base_vector / base_vector.sum()
+    rng = np.random.default_rng(seed)
+    return rng.dirichlet(np.maximum(base_vector * concentration, 1e-6), size=count)
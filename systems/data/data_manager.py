@@ -16,6 +16,7 @@ from datetime import datetime
 import logging
 from dataclasses import asdict
 
+from systems.logging_setup import SampledLogger
 from systems.models.edtech_schemas import (
     CompanyProfile, MarketOpportunity, AnalysisScore,
     EdTechCategory, TargetAudience, BusinessModel, FundingStage
@@ -38,9 +39,9 @@ class EdTechDataManager:
         self.opportunities_file = self.data_dir / "opportunities.json"
         self.scores_file = self.data_dir / "analysis_scores.json"
 
-        # Logging
-        logging.basicConfig(level=logging.INFO)
+        # Logging (handlers are configured by the application, see systems.logging_setup)
         self.logger = logging.getLogger(__name__)
+        self._item_log = SampledLogger(self.logger, every=1000)
 
     def init_database(self):
         """Initialize SQLite database with required tables"""
@@ -158,11 +159,11 @@ class EdTechDataManager:
                 ))
                 conn.commit()
 
-            self.logger.info(f"Added company: {company.name}")
+            self._item_log.log("Added company: %s", company.name)
             return True
 
         except Exception as e:
-            self.logger.error(f"Error adding company {company.name}: {e}")
+            self.logger.error("Error adding company %s: %s", company.name, e)
             return False
 
     def get_company(self, name: str) -> Optional[CompanyProfile]:
@@ -178,7 +179,7 @@ class EdTechDataManager:
                     return self._dict_to_company(company_dict)
 
         except Exception as e:
-            self.logger.error(f"Error retrieving company {name}: {e}")
+            self.logger.error("Error retrieving company %s: %s", name, e)
 
         return None
 
@@ -241,7 +242,7 @@ class EdTechDataManager:
                 return companies
 
         except Exception as e:
-            self.logger.error(f"Error searching companies: {e}")
+            self.logger.error("Error searching companies: %s", e)
             return []
 
     # Market Opportunity Management
@@ -276,11 +277,11 @@ class EdTechDataManager:
                 ))
                 conn.commit()
 
-            self.logger.info(f"Added opportunity: {opportunity.name}")
+            self._item_log.log("Added opportunity: %s", opportunity.name)
             return True
 
         except Exception as e:
-            self.logger.error(f"Error adding opportunity {opportunity.name}: {e}")
+            self.logger.error("Error adding opportunity %s: %s", opportunity.name, e)
             return False
 
     def get_opportunity(self, opportunity_id: str) -> Optional[MarketOpportunity]:
@@ -296,7 +297,7 @@ class EdTechDataManager:
                     return self._dict_to_opportunity(opportunity_dict)
 
         except Exception as e:
-            self.logger.error(f"Error retrieving opportunity {opportunity_id}: {e}")
+            self.logger.error("Error retrieving opportunity %s: %s", opportunity_id, e)
 
         return None
 
@@ -323,11 +324,11 @@ class EdTechDataManager:
                 ))
                 conn.commit()
 
-            self.logger.info(f"Added analysis score for: {company_name}")
+            self._item_log.log("Added analysis score for: %s", company_name)
             return True
 
         except Exception as e:
-            self.logger.error(f"Error adding analysis score for {company_name}: {e}")
+            self.logger.error("Error adding analysis score for %s: %s", company_name, e)
             return False
 
     # Data Export Functions
@@ -349,11 +350,11 @@ class EdTechDataManager:
                 df = pd.read_sql_query(query, conn)
                 df.to_csv(filepath, index=False)
 
-            self.logger.info(f"Exported companies to: {filepath}")
+            self.logger.info("Exported companies to: %s", filepath)
             return str(filepath)
 
         except Exception as e:
-            self.logger.error(f"Error exporting companies: {e}")
+            self.logger.error("Error exporting companies: %s", e)
             return ""
 
     def export_opportunities_csv(self, filename: Optional[str] = None) -> str:
@@ -374,11 +375,11 @@ class EdTechDataManager:
                 df = pd.read_sql_query(query, conn)
                 df.to_csv(filepath, index=False)
 
-            self.logger.info(f"Exported opportunities to: {filepath}")
+            self.logger.info("Exported opportunities to: %s", filepath)
             return str(filepath)
 
         except Exception as e:
-            self.logger.error(f"Error exporting opportunities: {e}")
+            self.logger.error("Error exporting opportunities: %s", e)
             return ""
 
     def get_portfolio_summary(self) -> Dict[str, Any]:
@@ -442,7 +443,7 @@ class EdTechDataManager:
                 }
 
         except Exception as e:
-            self.logger.error(f"Error generating portfolio summary: {e}")
+            self.logger.error("Error generating portfolio summary: %s", e)
             return {}
 
     # Helper methods
@@ -478,7 +479,7 @@ class EdTechDataManager:
             )
 
         except Exception as e:
-            self.logger.error(f"Error converting dict to CompanyProfile: {e}")
+            self.logger.error("Error converting dict to CompanyProfile: %s", e)
             return None
 
     def _dict_to_opportunity(self, data: Dict[str, Any]) -> Optional[MarketOpportunity]:
@@ -504,5 +505,5 @@ class EdTechDataManager:
             )
 
         except Exception as e:
-            self.logger.error(f"Error converting dict to MarketOpportunity: {e}")
+            self.logger.error("Error converting dict to MarketOpportunity: %s", e)
             return None
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+EdTech RADAR - Logging Pipeline
+==============================
+
+Non-blocking logging for batch workflows.
+Records are handed to a queue by the calling thread and written to the
+console/file by a background QueueListener, so hot loops never wait on
+terminal or disk I/O. Per-item logs go through SampledLogger and per-batch
+totals through BatchLogSummary instead of one INFO line per item.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import time
+from pathlib import Path
+from typing import Optional, List
+
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+def configure_logging(level: str = "INFO", log_file: Optional[str] = None,
+                      fmt: str = DEFAULT_FORMAT) -> logging.handlers.QueueListener:
+    """Route root logging through a queue drained by a background writer
+
+    Safe to call more than once: the previous listener is stopped and its
+    handlers replaced. The listener is flushed and stopped at interpreter exit.
+    """
+    global _listener, _queue_handler
+
+    shutdown_logging()
+
+    formatter = logging.Formatter(fmt)
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    if log_file:
+        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+        handlers.append(logging.FileHandler(log_file, mode='a'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(getattr(logging, level.upper()))
+
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the background writer"""
+    global _listener, _queue_handler
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
+
+atexit.register(shutdown_logging)
+
+
+class SampledLogger:
+    """Per-item logging that emits at most one record per ``every`` items or ``interval`` seconds
+
+    Unsampled items go to DEBUG, and only when DEBUG is enabled, so a filtered
+    call costs a counter increment and a level check. Messages use lazy
+    %-style arguments.
+    """
+
+    def __init__(self, logger: logging.Logger, every: int = 1000,
+                 interval: Optional[float] = None, level: int = logging.INFO):
+        self.logger = logger
+        self.every = every
+        self.interval = interval
+        self.level = level
+        self.count = 0
+        self._last_emit = time.monotonic()
+
+    def log(self, msg: str, *args):
+        """Count one item and log it if it is sampled"""
+        self.count += 1
+
+        sampled = bool(self.every) and self.count % self.every == 0
+        if not sampled and self.interval is not None:
+            sampled = time.monotonic() - self._last_emit >= self.interval
+
+        if sampled:
+            self._last_emit = time.monotonic()
+            if self.logger.isEnabledFor(self.level):
+                self.logger.log(self.level, msg + " [%d items so far]", *args, self.count)
+        elif self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(msg, *args)
+
+
+class BatchLogSummary:
+    """Context manager that logs one summary line for a batch of items"""
+
+    def __init__(self, logger: logging.Logger, label: str, level: int = logging.INFO):
+        self.logger = logger
+        self.label = label
+        self.level = level
+        self.succeeded = 0
+        self.failed = 0
+        self._start = 0.0
+
+    def success(self, count: int = 1):
+        self.succeeded += count
+
+    def failure(self, count: int = 1):
+        self.failed += count
+
+    def __enter__(self) -> 'BatchLogSummary':
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._start
+        rate = self.succeeded / elapsed if elapsed > 0 else 0.0
+        self.logger.log(self.level, "%s: %d succeeded, %d failed in %.2fs (%.0f/s)",
+                        self.label, self.succeeded, self.failed, elapsed, rate)
+        return False
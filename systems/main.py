@@ -8,7 +8,6 @@ Provides CLI interface and demonstrates core functionality.
 
 import argparse
 import sys
-import logging
 from pathlib import Path
 from typing import Optional
 
@@ -19,18 +18,12 @@ from systems import (
     EdTechDataManager, EdTechScoringEngine, EdTechDashboardGenerator,
     EdTechReportGenerator, EdTechAnalysisOrchestrator, EdTechSampleDataGenerator
 )
+from systems.logging_setup import configure_logging
 
 
 def setup_logging(level: str = "INFO"):
-    """Setup logging configuration"""
-    logging.basicConfig(
-        level=getattr(logging, level.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler('systems/logs/edtech_radar.log', mode='a')
-        ]
-    )
+    """Setup logging configuration (queued, written by a background thread)"""
+    configure_logging(level, log_file='systems/logs/edtech_radar.log')
 
 
 def create_core_services() -> tuple:
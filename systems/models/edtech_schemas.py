@@ -7,8 +7,9 @@ Includes company profiles, market opportunities, and classification systems.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Union, Any
+from typing import List, Dict, Optional, Union, Any, Sequence
 from enum import Enum
+from bisect import bisect_right
 from datetime import datetime
 import json
 
@@ -331,6 +332,24 @@ class MarketOpportunity:
         }
 
 
+# Sub-score fields in the column order used by score matrices and weight vectors
+SUB_SCORE_FIELDS = (
+    'market_size_score', 'growth_potential_score', 'competitive_landscape_score',
+    'financial_strength_score', 'technology_score', 'team_score', 'product_score',
+    'alignment_score', 'synergy_potential_score', 'risk_assessment_score',
+)
+
+# Legacy weighting: market 0.3 / 3, company 0.4 / 4, strategic 0.3 / 3
+DEFAULT_SUB_SCORE_WEIGHTS = (0.1,) * len(SUB_SCORE_FIELDS)
+
+# Grade and recommendation cutoffs (ascending, lower bound inclusive).
+# INVESTMENT_GRADES[i] applies to scores in [GRADE_THRESHOLDS[i-1], GRADE_THRESHOLDS[i]).
+GRADE_THRESHOLDS = (60, 70, 75, 80, 85, 90)
+INVESTMENT_GRADES = ("D", "C", "C+", "B", "B+", "A", "A+")
+RECOMMENDATION_THRESHOLDS = (60, 75, 85)
+RECOMMENDATIONS = ("SELL", "HOLD", "BUY", "STRONG_BUY")
+
+
 @dataclass
 class AnalysisScore:
     """Comprehensive scoring framework for prospects"""
@@ -361,46 +380,34 @@ class AnalysisScore:
     analyst: Optional[str] = None
     notes: str = ""
 
-    def calculate_total_score(self) -> float:
-        """Calculate weighted total score"""
-        weights = {
-            'market': 0.3,
-            'company': 0.4,
-            'strategic': 0.3
-        }
+    def sub_scores(self) -> List[float]:
+        """Return the sub-scores in SUB_SCORE_FIELDS order"""
+        return [getattr(self, name) for name in SUB_SCORE_FIELDS]
+
+    def calculate_total_score(self, weights: Optional[Sequence[float]] = None) -> float:
+        """Calculate weighted total score
+
+        ``weights`` is a flat vector aligned with SUB_SCORE_FIELDS (see
+        ``ScoringWeights.to_vector``). Without it the legacy weighting is used:
+        equal averages inside market/company/strategic, combined 0.3/0.4/0.3.
+        """
+        if weights is None:
+            weights = DEFAULT_SUB_SCORE_WEIGHTS
+        if len(weights) != len(SUB_SCORE_FIELDS):
+            raise ValueError(f"Expected {len(SUB_SCORE_FIELDS)} weights, got {len(weights)}")
+
+        self.total_score = float(sum(w * s for w, s in zip(weights, self.sub_scores())))
+        self.investment_grade = grade_for_score(self.total_score)
+        self.recommendation = recommendation_for_score(self.total_score)
+
+        return self.total_score
+
+
+def grade_for_score(total_score: float) -> str:
+    """Map a total score to its investment grade"""
+    return INVESTMENT_GRADES[bisect_right(GRADE_THRESHOLDS, total_score)]
+
 
-        market_avg = (self.market_size_score + self.growth_potential_score + self.competitive_landscape_score) / 3
-        company_avg = (self.financial_strength_score + self.technology_score + self.team_score + self.product_score) / 4
-        strategic_avg = (self.alignment_score + self.synergy_potential_score + self.risk_assessment_score) / 3
-
-        self.total_score = (market_avg * weights['market'] +
-                           company_avg * weights['company'] +
-                           strategic_avg * weights['strategic'])
-
-        # Determine grade
-        if self.total_score >= 90:
-            self.investment_grade = "A+"
-        elif self.total_score >= 85:
-            self.investment_grade = "A"
-        elif self.total_score >= 80:
-            self.investment_grade = "B+"
-        elif self.total_score >= 75:
-            self.investment_grade = "B"
-        elif self.total_score >= 70:
-            self.investment_grade = "C+"
-        elif self.total_score >= 60:
-            self.investment_grade = "C"
-        else:
-            self.investment_grade = "D"
-
-        # Determine recommendation
-        if self.total_score >= 85:
-            self.recommendation = "STRONG_BUY"
-        elif self.total_score >= 75:
-            self.recommendation = "BUY"
-        elif self.total_score >= 60:
-            self.recommendation = "HOLD"
-        else:
-            self.recommendation = "SELL"
-
-        return self.total_score
\ No newline at end of file
+def recommendation_for_score(total_score: float) -> str:
+    """Map a total score to its recommendation"""
+    return RECOMMENDATIONS[bisect_right(RECOMMENDATION_THRESHOLDS, total_score)]
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the async fetcher
+Checks the token bucket, Retry-After handling and retries against a local server
+"""
+
+import unittest
+import asyncio
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+
+from aiohttp import web
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from async_fetcher import AsyncFetcher, TokenBucket, backoff_delay, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_reservations_are_spaced_by_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, clock=clock)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.5, 1.0])
+
+    def test_burst_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=3, clock=clock)
+        self.assertEqual([bucket.reserve() for _ in range(4)], [0.0, 0.0, 0.0, 1.0])
+
+        clock.now += 10
+        self.assertEqual(bucket.reserve(), 0.0)
+
+    def test_pause_delays_next_reservation(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10.0, clock=clock)
+        bucket.reserve()
+        bucket.pause_until(clock.now + 5)
+        self.assertAlmostEqual(bucket.reserve(), 5.0)
+        self.assertAlmostEqual(bucket.reserve(), 5.1)
+
+
+class TestHelpers(unittest.TestCase):
+
+    def test_parse_retry_after(self):
+        agora = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.assertEqual(parse_retry_after('7'), 7.0)
+        self.assertEqual(parse_retry_after(format_datetime(agora + timedelta(seconds=30), usegmt=True), agora), 30.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('amanhã'))
+
+    def test_backoff_is_bounded(self):
+        rng = random.Random(0)
+        for tentativa in range(10):
+            atraso = backoff_delay(tentativa, base=0.5, maximo=4.0, rng=rng)
+            self.assertGreaterEqual(atraso, 0.0)
+            self.assertLessEqual(atraso, min(4.0, 0.5 * 2 ** tentativa))
+
+
+class TestAsyncFetcher(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.hits = {}
+        app = web.Application()
+        app.router.add_get('/ok', self.ok)
+        app.router.add_get('/limited', self.limited)
+        app.router.add_get('/broken', self.broken)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base = f"http://127.0.0.1:{port}"
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+
+    def count(self, request):
+        self.hits[request.path] = self.hits.get(request.path, 0) + 1
+        return self.hits[request.path]
+
+    async def ok(self, request):
+        self.count(request)
+        await asyncio.sleep(0.05)
+        return web.Response(text=f"pagina {request.query.get('q')}")
+
+    async def limited(self, request):
+        if self.count(request) == 1:
+            return web.Response(status=429, headers={'Retry-After': '0'})
+        return web.Response(text='liberado')
+
+    async def broken(self, request):
+        self.count(request)
+        return web.Response(status=503)
+
+    async def test_fetch_all_keeps_request_order(self):
+        async with AsyncFetcher(rate_per_host=1000, max_concurrency=4) as fetcher:
+            results = await fetcher.fetch_all([(f"{self.base}/ok", {'q': i}) for i in range(6)])
+
+        self.assertEqual([r.text for r in results], [f"pagina {i}" for i in range(6)])
+        self.assertTrue(all(r.ok for r in results))
+
+    async def test_requests_overlap_latency(self):
+        loop = asyncio.get_running_loop()
+        inicio = loop.time()
+        async with AsyncFetcher(rate_per_host=1000, max_concurrency=8) as fetcher:
+            await fetcher.fetch_all([(f"{self.base}/ok", {'q': i}) for i in range(8)])
+        # 8 sequential requests would take at least 8 × 50 ms
+        self.assertLess(loop.time() - inicio, 0.3)
+
+    async def test_retry_after_is_honored(self):
+        async with AsyncFetcher(rate_per_host=1000, backoff_base=10.0) as fetcher:
+            result = await fetcher.fetch(f"{self.base}/limited")
+
+        self.assertTrue(result.ok)
+        self.assertEqual(result.attempts, 2)
+
+    async def test_retries_are_bounded(self):
+        async with AsyncFetcher(rate_per_host=1000, max_retries=2, backoff_base=0.01) as fetcher:
+            result = await fetcher.fetch(f"{self.base}/broken")
+
+        self.assertEqual(result.status, 503)
+        self.assertEqual(result.attempts, 3)
+        self.assertEqual(self.hits['/broken'], 3)
+
+    async def test_connection_errors_become_results(self):
+        async with AsyncFetcher(max_retries=1, backoff_base=0.01, timeout=2) as fetcher:
+            result = await fetcher.fetch("http://127.0.0.1:9/nada")
+
+        self.assertIsNone(result.status)
+        self.assertIsNotNone(result.error)
+        self.assertFalse(result.ok)
+
+
+if __name__ == '__main__':
+    unittest.main()
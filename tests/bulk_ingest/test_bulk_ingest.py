@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test Suite for bulk archive ingestion
+Checks streaming ZIP reading, keyword classification and contract store writes
+"""
+
+import unittest
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from bulk_ingest import KeywordClassifier, find_archives, ingest_archive, iter_archive_chunks
+from contract_store import ContractStore
+
+EDTECH = ['software educacional', 'plataforma ensino', 'e-learning', 'EAD', 'AVA']
+IDIOMAS = ['idiomas', 'inglês', 'ingles', 'língua estrangeira']
+
+HEADER = ('"Número do Contrato";"Objeto";"Modalidade Compra";"Código Órgão";"Nome Órgão";"Código UG";'
+          '"Data Assinatura Contrato";"Código Contratado";"Nome Contratado";"Valor Final Compra"')
+
+ROWS = [
+    ('00012024', 'Curso de língua estrangeira - INGLÊS para servidores', 'Pregão', '26000', 'Ministério da Educação',
+     '150002', '15/03/2024', '12345678000190', 'Escola de Idiomas Ltda', '150000,00'),
+    ('00022024', 'Aquisição de licenças de software educacional', 'Dispensa', '26000', 'Ministério da Educação',
+     '150002', '02/04/2024', '98765432000110', 'EduTech S.A.', '89900,50'),
+    ('00032024', 'Serviço de avaliação de imóveis', 'Pregão', '39000', 'Ministério da Infraestrutura',
+     '390001', '10/04/2024', '11111111000111', 'Avaliadora Ltda', '5000,00'),
+    ('00042024', 'Cursos em EAD para capacitação', 'Pregão', '36000', 'Ministério da Saúde',
+     '250005', '20/05/2024', '22222222000122', 'Capacita Ltda', '1234,56'),
+]
+
+
+def write_archive(path, rows=ROWS):
+    csv = '\r\n'.join([HEADER] + [';'.join(f'"{v}"' for v in row) for row in rows]) + '\r\n'
+    itens = '"Número do Contrato";"Descrição Item"\r\n"00012024";"Material de inglês"\r\n'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as arquivo:
+        arquivo.writestr('202403_Compras.csv', csv.encode('latin-1'))
+        arquivo.writestr('202403_ItemCompra.csv', itens.encode('latin-1'))
+    return path
+
+
+class TestKeywordClassifier(unittest.TestCase):
+
+    def test_classification(self):
+        classifier = KeywordClassifier(EDTECH, IDIOMAS)
+        result = classifier.classify(pd.Series([
+            'Curso de INGLÊS em EAD',
+            'Plataforma de e-learning',
+            'Avaliação de leads',
+            None,
+        ]))
+
+        self.assertEqual(result['categoria'].tolist()[:2], ['Idiomas', 'EdTech geral'])
+        self.assertEqual(result['keyword_found'].tolist(), ['inglês', 'e-learning', None, None])
+        self.assertTrue(result['categoria'].iloc[2:].isna().all())
+
+    def test_requires_both_keyword_lists(self):
+        with self.assertRaises(ValueError):
+            KeywordClassifier(EDTECH, [])
+
+
+class TestIngestArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.archive = write_archive(self.dir / '202403_Compras.zip')
+        self.store = ContractStore(self.dir / 'contratos.sqlite')
+        self.classifier = KeywordClassifier(EDTECH, IDIOMAS)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_chunks_come_from_contract_members_only(self):
+        chunks = list(iter_archive_chunks(self.archive, chunksize=3))
+
+        self.assertEqual([membro for membro, _ in chunks], ['202403_Compras.csv'] * 2)
+        self.assertEqual(sum(len(lote) for _, lote in chunks), len(ROWS))
+        self.assertEqual(chunks[0][1]['orgao'].iloc[0], 'Ministério da Educação')
+
+    def test_matches_are_written_to_store(self):
+        stats = {}
+        rows = ingest_archive(self.store, self.archive, self.classifier, chunksize=2, stats=stats)
+
+        self.assertEqual(rows, 3)
+        self.assertEqual(stats, {'lidos': 4, 'classificados': 3})
+        df = self.store.load(categorical=False)
+        self.assertEqual(df['categoria'].tolist(), ['Idiomas', 'EdTech geral', 'EdTech geral'])
+        self.assertEqual(df['valor_centavos'].tolist(), [15_000_000, 8_990_050, 123_456])
+        self.assertEqual(df['ano'].tolist(), [2024] * 3)
+        self.assertEqual(df['fornecedor'].iloc[0], 'Escola de Idiomas Ltda')
+
+    def test_unchanged_archive_is_skipped_and_changed_one_replaced(self):
+        ingest_archive(self.store, self.archive, self.classifier)
+        self.assertIsNone(ingest_archive(self.store, self.archive, self.classifier))
+
+        write_archive(self.archive, ROWS[:2])
+        self.assertEqual(ingest_archive(self.store, self.archive, self.classifier), 2)
+        self.assertEqual(len(self.store), 2)
+
+    def test_find_archives(self):
+        write_archive(self.dir / '202401_Compras.zip')
+        self.assertEqual([p.name for p in find_archives([self.dir])], ['202401_Compras.zip', '202403_Compras.zip'])
+
+
+if __name__ == '__main__':
+    unittest.main()
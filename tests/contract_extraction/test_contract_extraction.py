@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the lxml contract extraction engine
+Checks candidate selection, header skipping and field extraction
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from contract_extraction import candidate_texts, extract_fields
+
+PAGE = """
+<html><head><script>var x = "R$ 9.999,99";</script></head><body>
+<div class="menu">Início</div>
+<div id="resultadoBusca">
+  <table>
+    <tr><th>CNPJ</th><th>Fornecedor</th><th>Valor</th><th>Objeto</th></tr>
+    <tr class="linha"><td>12.345.678/0001-90</td><td>Alfa Ensino LTDA</td><td>R$ 1.500,00</td><td>Plataforma</td></tr>
+    <tr><td>98.765.432/0001-10</td><td>Beta Idiomas S.A.</td><td>R$ 20.000,00</td><td>Curso de inglês</td></tr>
+    <tr><td>só</td><td>três</td><td>células</td></tr>
+  </table>
+</div>
+<article>Contrato em destaque <!-- comentário --></article>
+</body></html>
+"""
+
+
+class TestCandidates(unittest.TestCase):
+
+    def test_single_pass_candidates_in_document_order(self):
+        texts = candidate_texts(PAGE)
+
+        self.assertEqual(len(texts), 4)
+        self.assertTrue(texts[0].startswith('CNPJFornecedor'))  # div#resultadoBusca
+        self.assertEqual(texts[1], '12.345.678/0001-90Alfa Ensino LTDAR$ 1.500,00Plataforma')
+        self.assertTrue(texts[2].startswith('98.765.432/0001-10'))
+        self.assertEqual(texts[3], 'Contrato em destaque')
+
+    def test_header_row_and_short_rows_are_skipped(self):
+        texts = candidate_texts("<table><tr><td>a</td><td>b</td><td>c</td><td>d</td></tr>"
+                                "<tr><td>e</td><td>f</td><td>g</td><td>h</td></tr></table>")
+        self.assertEqual(texts, ['efgh'])
+
+    def test_empty_page(self):
+        self.assertEqual(candidate_texts(''), [])
+        self.assertEqual(candidate_texts('<html></html>'), [])
+
+
+class TestExtractFields(unittest.TestCase):
+
+    def test_fields(self):
+        campos = extract_fields('98.765.432/0001-10Beta Idiomas LTDAR$ 20.000,00Curso de inglês para servidores')
+
+        self.assertEqual(campos['cnpj'], '98.765.432/0001-10')
+        self.assertEqual(campos['valor'], 'R$ 20.000,00')
+        self.assertEqual(campos['fornecedor'], '10Beta Idiomas LTDA')
+        self.assertTrue(campos['objeto'].startswith('98.765.432'))
+
+    def test_missing_fields(self):
+        campos = extract_fields('sem dados')
+
+        self.assertEqual(campos['cnpj'], 'CNPJ não informado')
+        self.assertEqual(campos['valor'], 'Valor não informado')
+        self.assertEqual(campos['fornecedor'], 'Fornecedor não identificado')
+        self.assertIsNone(campos['objeto'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the typed contract store
+Checks ingestion, typed columns, projection and predicate filters
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from contract_store import ContractStore, reais
+
+
+class TestContractStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.csv = self.dir / 'radar.csv'
+        pd.DataFrame({
+            'orgao': ['Ministério da Educação', 'ENAP', 'Ministério da Defesa'],
+            'uasg': ['153001', '389001', '160001'],
+            'modalidade': ['Pregão Eletrônico', 'Concorrência', 'Pregão Eletrônico'],
+            'objeto': ['Plataforma EAD', 'Curso de inglês', 'Curso de espanhol'],
+            'data': ['2023-04-11', '2024-03-09', '2024-01-05'],
+            'valor': ['R$ 4.100.000,00', 'R$ 1.200.000,50', 'Valor não informado'],
+            'fornecedor': ['Eleva', 'Cultura Inglesa', 'Wizard'],
+            'cnpj': ['12.345.678/0001-90', '11.987.654/0001-23', 'CNPJ não informado'],
+            'categoria': ['EdTech geral', 'Idiomas', 'Idiomas'],
+            'potential_substitute': ['True', 'False', 'False'],
+        }).to_csv(self.csv, index=False)
+        self.store = ContractStore(self.dir / 'contratos.sqlite')
+        self.store.ingest_csv(self.csv)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_typed_columns(self):
+        df = self.store.load()
+
+        self.assertEqual(df['valor_centavos'].dtype, 'Int64')
+        self.assertEqual(df['valor_centavos'].tolist()[:2], [410000000, 120000050])
+        self.assertTrue(pd.isna(df['valor_centavos'].iloc[2]))
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['data']))
+        self.assertEqual(df['ano'].tolist(), [2023, 2024, 2024])
+        for coluna in ('orgao', 'modalidade', 'fornecedor', 'categoria'):
+            self.assertIsInstance(df[coluna].dtype, pd.CategoricalDtype, coluna)
+        self.assertEqual(df['potential_substitute'].tolist(), [True, False, False])
+        self.assertEqual(reais(df).iloc[1], 1200000.5)
+
+    def test_projection_and_partitions(self):
+        df = self.store.load(columns=['orgao', 'valor_centavos'], categorias=['Idiomas'], anos=[2024])
+
+        self.assertEqual(list(df.columns), ['orgao', 'valor_centavos'])
+        self.assertEqual(df['orgao'].tolist(), ['ENAP', 'Ministério da Defesa'])
+        self.assertEqual(self.store.partitions()['contratos'].tolist(), [1, 2])
+
+    def test_predicate_filters(self):
+        df = self.store.load(filters=[('data', '>=', pd.Timestamp('2024-02-01')), ('uasg', '!=', 153001)])
+        self.assertEqual(df['orgao'].tolist(), ['ENAP'])
+
+        df = self.store.load(filters=[('modalidade', 'in', ['Concorrência', 'Inexigibilidade'])])
+        self.assertEqual(len(df), 1)
+        self.assertTrue(self.store.load(filters=[('orgao', 'in', [])]).empty)
+
+        with self.assertRaises(ValueError):
+            self.store.load(columns=['valor; DROP TABLE contratos'])
+        with self.assertRaises(ValueError):
+            self.store.load(filters=[('ano', 'like', 2024)])
+
+    def test_reingest_replaces_source(self):
+        self.assertIsNone(self.store.ingest_csv(self.csv))
+
+        df = pd.read_csv(self.csv).iloc[:1]
+        df.to_csv(self.csv, index=False)
+        self.assertEqual(self.store.sync([self.csv]), {str(self.csv): 1})
+        self.assertEqual(len(self.store), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
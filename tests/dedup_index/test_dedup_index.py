@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the persistent SQLite/Bloom dedup index
+"""
+
+import unittest
+import tempfile
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from dedup_index import BloomFilter, DedupIndex, key_hashes
+
+
+def _batch(*objetos, data='2023-03-01'):
+    return pd.DataFrame({
+        'cnpj': ['14.200.166/0001-05'] * len(objetos),
+        'objeto': list(objetos),
+        'data': [data] * len(objetos)
+    })
+
+
+class TestKeyHashes(unittest.TestCase):
+
+    def test_formatting_differences_share_a_key(self):
+        df = pd.DataFrame({
+            'cnpj': ['14.200.166/0001-05', '14200166000105', '14200166000105'],
+            'objeto': ['Curso de Inglês', ' curso de ingles ', 'Curso de Espanhol'],
+            'data': ['2023-03-01', '01/03/2023', '2023-03-01']
+        })
+        hashes = key_hashes(df)
+        self.assertEqual(hashes.dtype, np.int64)
+        self.assertEqual(hashes[0], hashes[1])
+        self.assertNotEqual(hashes[0], hashes[2])
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        rng = np.random.default_rng(0)
+        present = rng.integers(np.iinfo(np.int64).min, np.iinfo(np.int64).max, 10_000, dtype=np.int64)
+        absent = rng.integers(np.iinfo(np.int64).min, np.iinfo(np.int64).max, 10_000, dtype=np.int64)
+
+        bloom = BloomFilter(10_000, false_positive_rate=0.01)
+        bloom.add(present)
+
+        self.assertTrue(bloom.might_contain(present).all())
+        self.assertLess(bloom.might_contain(absent).mean(), 0.03)
+
+
+class TestDedupIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.path = Path(tempfile.mkdtemp()) / "index" / "contracts.sqlite"
+
+    def test_register_and_reopen(self):
+        first_seen = datetime(2024, 5, 1, 10, 0, 0)
+        with DedupIndex(self.path) as index:
+            new = index.register(_batch('Curso de inglês', 'Curso de inglês', 'Plataforma EAD'), 'lote1', first_seen)
+            np.testing.assert_array_equal(new, [True, False, True])
+            self.assertEqual(len(index), 2)
+
+        with DedupIndex(self.path) as index:
+            batch = _batch('CURSO DE INGLÊS', 'Licença de software')
+            np.testing.assert_array_equal(index.contains(batch), [True, False])
+            new = index.filter_new(batch)
+            self.assertEqual(len(new), 1)
+            # Read-only until the new rows are registered
+            np.testing.assert_array_equal(index.unknown_mask(batch), [False, True])
+            index.register(new, 'lote2')
+
+            provenance = index.provenance(batch)
+            self.assertEqual(provenance['source'].tolist(), ['lote1', 'lote2'])
+            self.assertEqual(provenance['first_seen'].iloc[0], '2024-05-01T10:00:00')
+
+    def test_unseen_rows_have_no_provenance(self):
+        with DedupIndex(self.path) as index:
+            self.assertTrue(index.provenance(_batch('Curso novo'))['source'].isna().all())
+
+    def test_without_bloom_filter(self):
+        with DedupIndex(self.path, bloom=False) as index:
+            index.register(_batch('Curso de inglês'), 'lote1')
+            np.testing.assert_array_equal(index.contains(_batch('Curso de inglês', 'Outro')), [True, False])
+        self.assertFalse(self.path.with_name(self.path.name + '.bloom.npy').exists())
+
+    def test_stale_bloom_is_rebuilt(self):
+        with DedupIndex(self.path) as index:
+            index.register(_batch('Curso de inglês'), 'lote1')
+        # Another process adds keys without the Bloom filter
+        with DedupIndex(self.path, bloom=False) as index:
+            index.register(_batch('Plataforma EAD'), 'lote2')
+
+        with DedupIndex(self.path) as index:
+            np.testing.assert_array_equal(index.contains(_batch('Plataforma EAD')), [True])
+
+    def test_key_columns_are_fixed_per_file(self):
+        DedupIndex(self.path).close()
+        with self.assertRaises(ValueError):
+            DedupIndex(self.path, key_columns=('cnpj', 'objeto'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the contract deduplication pipeline
+"""
+
+import unittest
+import tempfile
+import io
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from data_deduplication import (SeenKeys, dedup_hashes, deduplicate_data,
+                                process_contracts_data, process_contracts_streaming,
+                                process_contracts_incremental,
+                                normalize_cnpj, normalize_date, normalize_currency,
+                                trim_description, is_potential_substitute)
+
+
+def _contract(i, categoria='Idiomas', objeto=None, **extra):
+    row = {
+        'orgao': f'Órgão {i % 3}', 'uasg': 150000 + i, 'modalidade': 'Pregão Eletrônico',
+        'objeto': objeto or f'Curso de idiomas lote {i}', 'data': f'2023-0{1 + i % 9}-1{i % 10}',
+        'valor': f'R$ {i}.000,00', 'fornecedor': f'Fornecedor {i}', 'cnpj': f'{i:02d}.345.678/0001-{i % 100:02d}',
+        'categoria': categoria, 'keyword_found': 'idiomas', 'link': f'https://exemplo.gov.br/{i}',
+        'status': 'Contrato identificado'
+    }
+    row.update(extra)
+    return row
+
+
+class TestNormalizers(unittest.TestCase):
+    """Whole-column normalizers keep the per-value rules"""
+
+    def test_normalize_cnpj(self):
+        cnpj = pd.Series(['14200166000105', '14.200.166/0001-05', '123', 'CNPJ não informado', None])
+        self.assertEqual(normalize_cnpj(cnpj).tolist()[:4],
+                         ['14.200.166/0001-05', '14.200.166/0001-05', '123', 'CNPJ não informado'])
+        self.assertTrue(pd.isna(normalize_cnpj(cnpj).iloc[4]))
+
+    def test_normalize_date(self):
+        datas = pd.Series(['2023-01-05', '2023-1-5', '2023-02-01 10:30:00', 'N/A', 'sem data', None])
+        result = normalize_date(datas).tolist()
+        self.assertEqual(result[:5], ['2023-01-05', '2023-01-05', '2023-02-01', 'N/A', 'sem data'])
+        self.assertTrue(pd.isna(result[5]))
+
+    def test_normalize_currency(self):
+        valores = pd.Series(['R$   1.000,00 ', ' 2.500,50', 'Valor não informado', None], dtype=object)
+        result = normalize_currency(valores).tolist()
+        self.assertEqual(result[:3], ['R$ 1.000,00', 'R$ 2.500,50', 'Valor não informado'])
+        self.assertTrue(pd.isna(result[3]))
+
+    def test_trim_description(self):
+        textos = pd.Series(['  curto  ', 'x' * 240, 'y' * 241, None])
+        result = trim_description(textos, 240).tolist()
+        self.assertEqual(result[0], 'curto')
+        self.assertEqual(result[1], 'x' * 240)
+        self.assertEqual(result[2], 'y' * 237 + '...')
+        self.assertTrue(pd.isna(result[3]))
+
+    def test_is_potential_substitute(self):
+        df = pd.DataFrame({
+            'objeto': ['Plataforma de Ensino com treinamento', 'Plataforma educacional', None,
+                       'Sistema integrado internacional'],
+            'categoria': ['EdTech geral', 'EdTech geral', 'EdTech geral', 'Idiomas']
+        })
+        self.assertEqual(is_potential_substitute(df).tolist(), [True, False, False, False])
+
+
+class TestSeenKeys(unittest.TestCase):
+
+    def test_filter_new_across_batches(self):
+        seen = SeenKeys()
+        np.testing.assert_array_equal(seen.filter_new([5, 3, 5, 9]), [True, True, False, True])
+        np.testing.assert_array_equal(seen.filter_new([9, 1, 1, 3]), [False, True, False, False])
+        self.assertEqual(len(seen), 4)
+        self.assertIn(1, seen)
+        self.assertNotIn(2, seen)
+
+    def test_runs_stay_logarithmic(self):
+        rng = np.random.default_rng(0)
+        chunks = [rng.integers(0, 2 ** 40, 100, dtype=np.uint64) for _ in range(64)]
+        seen = SeenKeys()
+        for chunk in chunks:
+            seen.filter_new(chunk)
+            self.assertLessEqual(len(seen.runs), 2 * int(np.log2(len(seen))) + 1)
+
+        everything = np.unique(np.concatenate(chunks))
+        self.assertEqual(len(seen), len(everything))
+        np.testing.assert_array_equal(seen.hashes, everything)
+        self.assertEqual(len(seen.runs), 1)
+
+    def test_save_and_load(self):
+        path = Path(tempfile.mkdtemp()) / "seen.npy"
+        seen = SeenKeys()
+        seen.filter_new(np.array([2 ** 63 + 1, 7], dtype=np.uint64))
+        seen.save(path)
+
+        reloaded = SeenKeys.load(path)
+        self.assertIn(2 ** 63 + 1, reloaded)
+        self.assertEqual(len(SeenKeys.load(path.with_name("missing.npy"))), 0)
+
+    def test_hash_dedup_matches_string_key(self):
+        df = pd.DataFrame([_contract(i % 7) for i in range(30)])
+        key = df['cnpj'].astype(str) + '|' + df['objeto'].astype(str) + '|' + df['data'].astype(str)
+
+        with redirect_stdout(io.StringIO()):
+            deduped = deduplicate_data(df)
+        pd.testing.assert_frame_equal(deduped, df[~key.duplicated(keep='first')])
+        self.assertEqual(len(set(dedup_hashes(df))), 7)
+
+
+class TestStreamingMode(unittest.TestCase):
+
+    def setUp(self):
+        rows = [_contract(i) for i in range(12)]
+        rows += [_contract(i, categoria='EdTech geral', objeto=f'Plataforma de ensino adaptativo {i}') for i in range(12, 20)]
+        rows += [_contract(3), _contract(15, categoria='EdTech geral', objeto='Plataforma de ensino adaptativo 15')]
+        rows += [_contract(30, fornecedor='Fornecedor não identificado'), _contract(31, valor='Valor não informado')]
+        self.tmp = Path(tempfile.mkdtemp())
+        self.input = self.tmp / "contratos.csv"
+        pd.DataFrame(rows).to_csv(self.input, index=False)
+
+    def _read_sorted(self, path):
+        df = pd.read_csv(path, dtype=str)
+        return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+    def test_streaming_matches_whole_file(self):
+        with redirect_stdout(io.StringIO()):
+            (self.tmp / "whole").mkdir()
+            (self.tmp / "stream").mkdir()
+            self.assertTrue(process_contracts_data(str(self.input), str(self.tmp / "whole")))
+            self.assertTrue(process_contracts_streaming(str(self.input), str(self.tmp / "stream"), chunksize=5))
+
+        for name in ('radar_edtech.csv', 'radar_idiomas.csv'):
+            whole = self._read_sorted(self.tmp / "whole" / name)
+            stream = self._read_sorted(self.tmp / "stream" / name)
+            pd.testing.assert_frame_equal(whole, stream)
+
+        self.assertEqual(len(pd.read_csv(self.tmp / "stream" / "radar_idiomas.csv")), 12)
+        self.assertEqual(len(pd.read_csv(self.tmp / "stream" / "radar_edtech.csv")), 8)
+
+    def test_seen_keys_persist_between_runs(self):
+        seen_path = self.tmp / "seen.npy"
+        (self.tmp / "first").mkdir()
+        (self.tmp / "second").mkdir()
+        with redirect_stdout(io.StringIO()):
+            process_contracts_streaming(str(self.input), str(self.tmp / "first"), chunksize=7, seen_path=str(seen_path))
+            process_contracts_streaming(str(self.input), str(self.tmp / "second"), chunksize=7, seen_path=str(seen_path))
+
+        self.assertEqual(len(SeenKeys.load(seen_path)), 20)
+        self.assertEqual(len(pd.read_csv(self.tmp / "second" / "radar_idiomas.csv")), 0)
+
+    def test_seen_keys_rerun_appends_to_same_outputs(self):
+        seen_path = self.tmp / "seen.npy"
+        second = self.tmp / "lote2.csv"
+        pd.DataFrame([_contract(i) for i in range(10, 14)]).to_csv(second, index=False)
+        (self.tmp / "out").mkdir()
+
+        with redirect_stdout(io.StringIO()):
+            process_contracts_streaming(str(self.input), str(self.tmp / "out"), chunksize=7, seen_path=str(seen_path))
+            process_contracts_streaming(str(second), str(self.tmp / "out"), chunksize=7, seen_path=str(seen_path))
+
+        idiomas = pd.read_csv(self.tmp / "out" / "radar_idiomas.csv")
+        self.assertEqual(len(idiomas), 14)
+        self.assertFalse(idiomas.duplicated(['cnpj', 'objeto', 'data']).any())
+        self.assertEqual(len(pd.read_csv(self.tmp / "out" / "radar_edtech.csv")), 8)
+
+    def test_incremental_batches_append_only_new_contracts(self):
+        index_path = self.tmp / "index.sqlite"
+        second = self.tmp / "lote2.csv"
+        pd.DataFrame([_contract(i) for i in range(10, 14)]).to_csv(second, index=False)
+        (self.tmp / "out").mkdir()
+
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(process_contracts_incremental(str(self.input), str(self.tmp / "out"), str(index_path)))
+            self.assertTrue(process_contracts_incremental(str(second), str(self.tmp / "out"), str(index_path)))
+
+        idiomas = pd.read_csv(self.tmp / "out" / "radar_idiomas.csv")
+        self.assertEqual(len(idiomas), 14)
+        self.assertFalse(idiomas.duplicated(['cnpj', 'objeto', 'data']).any())
+
+
+if __name__ == '__main__':
+    unittest.main()
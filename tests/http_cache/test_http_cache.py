@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the scraper HTTP cache
+Checks URL normalization, ETag revalidation, offline replay and the HTML archive
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+from aiohttp import web
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from async_fetcher import AsyncFetcher
+from http_cache import CacheMiss, HttpCache, cached_get, normalize_url
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None, encoding='utf-8'):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.encoding = encoding
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding)
+
+
+class FakeSession:
+    """requests.Session stand-in that replays queued responses"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append(headers or {})
+        return self.responses.pop(0)
+
+
+class TestNormalizeUrl(unittest.TestCase):
+
+    def test_param_order_and_case_do_not_matter(self):
+        a = normalize_url('HTTPS://Portal.gov.br/contratos/consulta', {'buscar': 'EAD', 'pagina': 1})
+        b = normalize_url('https://portal.gov.br/contratos/consulta?pagina=1#topo', {'buscar': 'EAD'})
+        self.assertEqual(a, b)
+        self.assertEqual(a, 'https://portal.gov.br/contratos/consulta?buscar=EAD&pagina=1')
+
+
+class TestHttpCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name) / 'cache'
+        self.url = 'https://portal.gov.br/contratos/consulta'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_store_and_revalidate_with_etag(self):
+        session = FakeSession(
+            FakeResponse(200, 'ônibus'.encode('latin-1'), {'ETag': '"v1"'}, encoding='latin-1'),
+            FakeResponse(304),
+        )
+        with HttpCache(self.dir) as cache:
+            self.assertEqual(cached_get(session, cache, self.url, {'buscar': 'EAD'}), (200, 'ônibus'))
+            self.assertEqual(cached_get(session, cache, self.url, {'buscar': 'EAD'}), (200, 'ônibus'))
+
+        self.assertEqual(session.calls[0], {})
+        self.assertEqual(session.calls[1], {'If-None-Match': '"v1"'})
+
+    def test_offline_mode(self):
+        with HttpCache(self.dir) as cache:
+            cached_get(FakeSession(FakeResponse(200, b'<html>1</html>')), cache, self.url, {'buscar': 'EAD'})
+
+        with HttpCache(self.dir, mode='offline') as cache:
+            session = FakeSession()
+            self.assertEqual(cached_get(session, cache, self.url, {'buscar': 'EAD'}), (200, '<html>1</html>'))
+            with self.assertRaises(CacheMiss):
+                cached_get(session, cache, self.url, {'buscar': 'idiomas'})
+        self.assertEqual(session.calls, [])
+
+    def test_archive_keeps_each_version_once(self):
+        session = FakeSession(*(FakeResponse(200, body) for body in (b'v1', b'v1', b'v2')))
+        with HttpCache(self.dir) as cache:
+            for _ in range(3):
+                cached_get(session, cache, self.url, {'buscar': 'EAD'})
+            cached_get(FakeSession(FakeResponse(200, b'outra')), cache, 'https://portal.gov.br/licitacoes')
+
+            arquivo = [html for _, _, html in cache.iter_archive(self.url)]
+            self.assertEqual(arquivo, ['v1', 'v2'])
+            self.assertEqual(len(cache), 2)
+            # Identical bodies share a single object
+            self.assertEqual(len(list((self.dir / 'objects').rglob('*.gz'))), 3)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            HttpCache(self.dir, mode='sempre')
+
+
+class TestAsyncFetcherCache(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.hits = 0
+        app = web.Application()
+        app.router.add_get('/pagina', self.pagina)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/pagina"
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+        self.tmp.cleanup()
+
+    async def pagina(self, request):
+        self.hits += 1
+        if request.headers.get('If-None-Match') == '"abc"':
+            return web.Response(status=304)
+        return web.Response(text=f"contratos {request.query['q']}", headers={'ETag': '"abc"'})
+
+    async def fetch(self, mode='default'):
+        with HttpCache(Path(self.tmp.name), mode=mode) as cache:
+            async with AsyncFetcher(rate_per_host=1000, cache=cache) as fetcher:
+                return await fetcher.fetch(self.url, {'q': 'EAD'})
+
+    async def test_revalidation_and_offline_replay(self):
+        primeira = await self.fetch()
+        self.assertEqual((primeira.status, primeira.text, primeira.from_cache), (200, 'contratos EAD', False))
+
+        segunda = await self.fetch()
+        self.assertEqual((segunda.status, segunda.text, segunda.from_cache), (200, 'contratos EAD', True))
+        self.assertEqual(self.hits, 2)
+
+        offline = await self.fetch('offline')
+        self.assertEqual(offline.text, 'contratos EAD')
+        self.assertEqual(self.hits, 2)
+
+    async def test_offline_miss_is_an_error_result(self):
+        result = await self.fetch('offline')
+        self.assertFalse(result.ok)
+        self.assertIn('CacheMiss', result.error)
+        self.assertEqual(self.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
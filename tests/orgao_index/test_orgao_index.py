@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the canonical órgão/UASG index
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from orgao_index import OrgaoIndex, Orgao, MINISTERIO, AUTARQUIA, get_orgao_index
+from prospect_scoring_idiomas import ProspectScoringIdiomas
+
+
+class TestResolution(unittest.TestCase):
+
+    def setUp(self):
+        self.index = get_orgao_index()
+
+    def test_uasg_wins_over_name(self):
+        self.assertEqual(self.index.resolve('Nome divergente do coletor', uasg=210001), 'mre')
+        self.assertEqual(self.index.resolve('Ministério da Educação', uasg='UASG não informada'), 'mec')
+
+    def test_aliases_and_normalized_names(self):
+        self.assertEqual(self.index.resolve('MINISTERIO DAS RELACOES EXTERIORES'), 'mre')
+        self.assertEqual(self.index.resolve('Itamaraty'), 'mre')
+        self.assertEqual(self.index.resolve('CAPES'), 'capes')
+        self.assertEqual(self.index.resolve('Ministério da Educação - MEC'), 'mec')
+        self.assertIsNone(self.index.resolve('Órgão Federal (extrair do contexto)'))
+
+    def test_series_resolution_keeps_unknown_names(self):
+        nomes = pd.Series(['Ministerio da Defesa', 'Órgão Desconhecido', 'Qualquer nome'])
+        uasgs = pd.Series(['', 'UASG não informada', 153005])
+        self.assertEqual(self.index.keys(nomes, uasgs).tolist(), ['md', 'Órgão Desconhecido', 'fnde'])
+        self.assertEqual(self.index.resolve_series(nomes, uasgs).isna().tolist(), [False, True, False])
+
+    def test_profile_names_are_canonical(self):
+        scoring = ProspectScoringIdiomas()
+        for nome, perfil in scoring.estrutura_gov.items():
+            orgao_id = self.index.resolve(nome, perfil['uasg'])
+            self.assertIsNotNone(orgao_id, nome)
+            self.assertEqual(self.index.orgaos[orgao_id].nome, nome)
+
+
+class TestHierarchy(unittest.TestCase):
+
+    def setUp(self):
+        self.index = OrgaoIndex([
+            Orgao('min', 'Ministério Teste', MINISTERIO, uasgs=(1,)),
+            Orgao('aut', 'Autarquia Teste', AUTARQUIA, 'min', uasgs=(2,)),
+            Orgao('und', 'Unidade Teste', 'unidade', 'aut', uasgs=(3,)),
+        ])
+
+    def test_ancestors(self):
+        self.assertEqual(self.index.ancestors('und'), ('und', 'aut', 'min'))
+        self.assertEqual(self.index.ministry('und'), 'min')
+
+    def test_rollup_counts_each_level(self):
+        contratos = pd.DataFrame({'orgao_id': ['und', 'aut', 'min', 'fora'], 'valor': [10, 20, 30, 99]})
+        rollup = self.index.rollup(contratos, ['valor'])
+        self.assertEqual(rollup.loc['min', 'valor'], 60)
+        self.assertEqual(rollup.loc['aut', 'valor'], 30)
+        self.assertEqual(rollup.loc['und', 'valor'], 10)
+        self.assertEqual(rollup.loc['min', 'nivel'], MINISTERIO)
+        self.assertNotIn('fora', rollup.index)
+
+        ministerios = self.index.rollup(contratos, ['valor'], nivel=MINISTERIO)
+        self.assertEqual(ministerios.index.tolist(), ['min'])
+
+    def test_rollup_values_per_orgao(self):
+        contratos = pd.DataFrame({'orgao_id': ['und', 'aut', 'min', 'fora'], 'valor': [10, 20, 30, 99]})
+        rollup = self.index.rollup(contratos, ['valor'])
+        ids = pd.Series(['und', 'min', 'fora'])
+
+        self.assertEqual(self.index.ancestor_ids(ids, AUTARQUIA).tolist()[0], 'aut')
+        self.assertTrue(pd.isna(self.index.ancestor_ids(ids, AUTARQUIA).iloc[1]))
+        self.assertEqual(self.index.rollup_values(ids, rollup, 'valor', MINISTERIO).tolist(), [60, 60, 0])
+        self.assertEqual(self.index.rollup_values(ids, rollup, 'valor', AUTARQUIA).tolist(), [30, 0, 0])
+
+    def test_unknown_parent_rejected(self):
+        with self.assertRaises(ValueError):
+            OrgaoIndex([Orgao('x', 'X', AUTARQUIA, 'inexistente')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the shared BRL / date / CNPJ parsers
+"""
+
+import unittest
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from parsers_br import parse_brl_centavos, parse_brl, parse_datas, format_cnpj, validate_cnpj
+
+
+class TestCurrencyParsing(unittest.TestCase):
+    """Valores em Reais → centavos inteiros"""
+
+    def test_brl_strings_to_centavos(self):
+        valores = pd.Series(['R$ 1.234,56', 'R$ 650.000,00', '1234,5', '-R$ 10,00', 'R$\xa02.800.000,00', 'R$ 7'])
+        self.assertEqual(parse_brl_centavos(valores).tolist(), [123456, 65000000, 123450, -1000, 280000000, 700])
+
+    def test_sentinels_become_missing(self):
+        valores = pd.Series(['Valor não informado', None, 'N/A', 'R$ 1,00'])
+        centavos = parse_brl_centavos(valores)
+        self.assertEqual(centavos.isna().tolist(), [True, True, True, False])
+        self.assertEqual(parse_brl(valores, fill_value=0).tolist(), [0.0, 0.0, 0.0, 1.0])
+
+    def test_mixed_object_column_and_duplicate_index(self):
+        valores = pd.Series(['R$ 1.000,00', 12.5, 'R$ 1.000,00'], index=[3, 3, 1], dtype=object)
+        centavos = parse_brl_centavos(valores)
+        self.assertEqual(centavos.tolist(), [100000, 1250, 100000])
+        self.assertEqual(centavos.index.tolist(), [3, 3, 1])
+
+    def test_object_column_with_only_numbers(self):
+        valores = pd.Series([10, 2.5, None], dtype=object)
+        self.assertEqual(parse_brl_centavos(valores).tolist()[:2], [1000, 250])
+        self.assertTrue(pd.isna(parse_brl_centavos(valores).iloc[2]))
+
+    def test_matches_reference_regex(self):
+        padrao = re.compile(r'\s*(-)?\s*(?:R\$)?\s*(-)?(\d{1,3}(?:\.\d{3})+|\d+)(?:,(\d{1,2}))?\s*')
+
+        def referencia(texto):
+            partes = padrao.fullmatch(texto)
+            if partes is None:
+                return None
+            sinal, sinal_valor, inteiro, fracao = partes.groups()
+            centavos = int(inteiro.replace('.', '')) * 100 + (int(fracao.ljust(2, '0')) if fracao else 0)
+            return -centavos if sinal or sinal_valor else centavos
+
+        rng = np.random.default_rng(0)
+        alfabeto = np.array(list('0123456789.,-R$ \xa0x'))
+        textos = [''.join(rng.choice(alfabeto, size=rng.integers(0, 12))) for _ in range(20_000)]
+        textos += ['R$ 1.234,5', '-R$-1.000', '1.2345', '12.345.678,90 ', '1234.567', ' - R$ 0,07', '1,', 'R$']
+
+        centavos = parse_brl_centavos(pd.Series(textos))
+        esperado = [referencia(texto) for texto in textos]
+        self.assertEqual([None if pd.isna(v) else v for v in centavos], esperado)
+
+    def test_matches_float_parsing_on_radar_file(self):
+        radar = Path(__file__).parent.parent.parent / "outputs" / "radar_idiomas.csv"
+        if not radar.exists():
+            self.skipTest("radar_idiomas.csv não disponível")
+        df = pd.read_csv(radar)
+        esperado = pd.to_numeric(
+            df['valor'].str.replace(r'[R$\.\s]', '', regex=True).str.replace(',', '.'), errors='coerce'
+        )
+        pd.testing.assert_series_equal(parse_brl(df['valor']), esperado, check_names=False)
+
+
+class TestDateParsing(unittest.TestCase):
+
+    def test_formats_and_fallback(self):
+        datas = parse_datas(pd.Series(['2023-04-12', '12/04/2023', 'Data não informada', 'April 3 2023', 'xx']))
+        self.assertEqual(datas.dt.strftime('%Y-%m-%d').tolist()[:2], ['2023-04-12', '2023-04-12'])
+        self.assertTrue(pd.isna(datas.iloc[2]))
+        self.assertEqual(datas.iloc[3], pd.Timestamp('2023-04-03'))
+        self.assertTrue(pd.isna(datas.iloc[4]))
+
+
+class TestCnpj(unittest.TestCase):
+
+    def test_format_keeps_invalid_values(self):
+        cnpjs = pd.Series(['11222333000181', '11.222.333/0001-81', 'CNPJ não informado', '123'])
+        self.assertEqual(format_cnpj(cnpjs).tolist(),
+                         ['11.222.333/0001-81', '11.222.333/0001-81', 'CNPJ não informado', '123'])
+
+    def test_check_digits(self):
+        cnpjs = pd.Series(['11.222.333/0001-81', '11.222.333/0001-82', '00.000.000/0000-00', None])
+        self.assertEqual(validate_cnpj(cnpjs).tolist(), [True, False, False, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
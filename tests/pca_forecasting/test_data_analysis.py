@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test Suite for PCA propensity metrics
+Checks the grouped aggregation and the incremental mode
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add pca_forecasting directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "analysis" / "pca_forecasting"))
+
+from data_analysis import PCARaderAnalyzer
+
+
+class TestPropensityMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.analyzer = PCARaderAnalyzer()
+        self.df = self.analyzer.load_radar_data()
+
+    def test_matches_per_orgao_formula(self):
+        scores = self.analyzer.calculate_propensity_metrics(self.df)
+
+        self.assertEqual(list(scores), list(self.df['orgao'].unique()))
+        for orgao, metrics in scores.items():
+            rows = self.df[self.df['orgao'] == orgao]
+            freq = min(len(rows) * 25, 100)
+            valor = min(rows['valor'].mean() / 50_000, 100)
+            volume = min(rows['valor'].sum() / 100_000, 100)
+            div = rows['categoria'].nunique() * 50
+
+            self.assertEqual(metrics['contratos_count'], len(rows))
+            self.assertEqual(metrics['freq_score'], freq)
+            self.assertAlmostEqual(metrics['valor_score'], valor)
+            self.assertAlmostEqual(metrics['score_final'], round(freq * 0.4 + valor * 0.3 + volume * 0.2 + div * 0.1, 1))
+            self.assertEqual(metrics['categorias'], rows['categoria'].unique().tolist())
+
+    def test_incremental_matches_full_recompute(self):
+        self.df['data'] = pd.to_datetime(self.df['data'])
+        full = self.analyzer.calculate_propensity_metrics(self.df)
+
+        incremental = PCARaderAnalyzer()
+        for lote in (self.df.iloc[:5], self.df.iloc[5:9], self.df.iloc[9:]):
+            refreshed = incremental.append_contracts(lote)
+
+        self.assertEqual(list(refreshed), list(full))
+        for orgao, metrics in full.items():
+            for key, value in metrics.items():
+                self.assertEqual(refreshed[orgao][key], value, (orgao, key))
+
+    def test_append_after_batch_matches_full_batch(self):
+        history, new = self.df.iloc[:8], self.df.iloc[8:]
+        full = PCARaderAnalyzer()
+        expected = full.calculate_propensity_metrics(self.df)
+        expected_orgaos = full.project_orgaos_12_months(self.df)
+        expected_pca = full.project_pca_12_months(full.analyze_temporal_patterns(self.df))
+
+        self.analyzer.calculate_propensity_metrics(history)
+        refreshed = self.analyzer.append_contracts(new)
+
+        self.assertEqual(refreshed, expected)
+        self.assertEqual(self.analyzer.pca_projections, expected_pca)
+        for name, frame in expected_orgaos.items():
+            pd.testing.assert_frame_equal(self.analyzer.orgao_projections[name].loc[frame.index], frame)
+
+    def test_top20_from_aggregates(self):
+        scores = self.analyzer.append_contracts(self.df)
+        top20 = self.analyzer.generate_top20_prospects(scores)
+
+        self.assertEqual([p['ranking'] for p in top20], list(range(1, len(top20) + 1)))
+        mre = next(p for p in top20 if p['orgao'] == 'Ministério das Relações Exteriores')
+        self.assertEqual(mre['ultima_contratacao'], pd.Timestamp('2023-04-10'))
+        self.assertEqual(mre['categorias'], ['Idiomas'])
+
+
+if __name__ == '__main__':
+    unittest.main()
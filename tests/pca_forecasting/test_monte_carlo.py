@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the Monte Carlo prediction bands
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add pca_forecasting directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "analysis" / "pca_forecasting"))
+
+from monte_carlo import _partition_quantiles, simulate_procurement
+from data_analysis import PCARaderAnalyzer
+
+
+class TestSimulateProcurement(unittest.TestCase):
+
+    def setUp(self):
+        orgaos = ['A', 'B', 'C']
+        self.mean = pd.DataFrame(
+            [[1e6, 2e6, 1e6, 3e6], [5e5, 0.0, 5e5, 5e5], [2e6, 2e6, 2e6, 2e6]],
+            index=orgaos, columns=['Q1', 'Q2', 'Q3', 'Q4']
+        )
+        self.std = pd.DataFrame(
+            [[3e5, 5e5, 3e5, 8e5], [4e5, 9e5, 4e5, 4e5], [1e5, 1e5, 1e5, 1e5]],
+            index=orgaos, columns=['Q1', 'Q2', 'Q3', 'Q4']
+        )
+
+    def test_seed_is_deterministic(self):
+        a = simulate_procurement(self.mean, self.std, n_simulations=2_000, seed=7)
+        b = simulate_procurement(self.mean, self.std, n_simulations=2_000, seed=7)
+        pd.testing.assert_frame_equal(a.por_trimestre, b.por_trimestre)
+        pd.testing.assert_frame_equal(a.por_orgao, b.por_orgao)
+
+    def test_mean_matches_forecast(self):
+        result = simulate_procurement(self.mean, self.std, n_simulations=50_000, seed=1)
+        np.testing.assert_allclose(result.por_trimestre['media'], self.mean.sum(), rtol=0.02)
+        np.testing.assert_allclose(result.por_orgao['media'], self.mean.sum(axis=1), rtol=0.02)
+        np.testing.assert_allclose(result.por_trimestre['previsao'], self.mean.sum())
+
+    def test_bands_match_forecast_interval(self):
+        result = simulate_procurement(self.mean, self.std, n_simulations=50_000, seed=2)
+        z = 1.2815515655446004
+        total_std = np.sqrt((self.std ** 2).sum())
+        np.testing.assert_allclose(result.por_trimestre['p90'], self.mean.sum() + z * total_std, rtol=0.01)
+        # Média zero e desvio alto: truncado em zero, como o limite inferior da previsão
+        b = simulate_procurement(self.mean.loc[['B']], self.std.loc[['B']], n_simulations=50_000, seed=2)
+        self.assertEqual(b.por_trimestre.loc['Q2', 'p10'], 0.0)
+        self.assertAlmostEqual(b.por_trimestre.loc['Q2', 'p90'] / (z * 9e5), 1.0, delta=0.02)
+
+    def test_bands_contain_point_projection(self):
+        result = simulate_procurement(self.mean, self.std, n_simulations=5_000, seed=3)
+        for frame in (result.por_trimestre, result.por_orgao):
+            self.assertTrue((frame['p10'] <= frame['p50']).all())
+            self.assertTrue((frame['p50'] <= frame['p90']).all())
+            self.assertTrue((frame['p10'] <= frame['previsao']).all())
+            self.assertTrue((frame['previsao'] <= frame['p90']).all())
+
+    def test_block_size_keeps_shapes(self):
+        inteiro = simulate_procurement(self.mean, self.std, n_simulations=1_000, seed=5)
+        blocos = simulate_procurement(self.mean, self.std, n_simulations=1_000, seed=5, block_size=1)
+        self.assertEqual(inteiro.por_trimestre.shape, blocos.por_trimestre.shape)
+        self.assertEqual(list(inteiro.por_orgao.index), list(blocos.por_orgao.index))
+
+    def test_partition_quantiles_match_numpy(self):
+        values = np.random.default_rng(0).lognormal(size=(3, 1_001)).astype(np.float32)
+        expected = np.quantile(values, [0.1, 0.5, 0.9, 0.33], axis=1).T
+        np.testing.assert_allclose(_partition_quantiles(values, [0.1, 0.5, 0.9, 0.33]), expected, rtol=1e-6)
+
+    def test_missing_std_is_exact(self):
+        result = simulate_procurement(self.mean, self.std.drop('C'), n_simulations=1_000, seed=5)
+        self.assertEqual(list(result.por_orgao.index), ['A', 'B', 'C'])
+        self.assertAlmostEqual(result.por_orgao.loc['C', 'p10'], 8e6, delta=1.0)
+
+
+class TestPredictionBands(unittest.TestCase):
+
+    def test_analyzer_bands(self):
+        df = pd.DataFrame({
+            'orgao': ['Órgão A'] * 4 + ['Órgão B'] * 2,
+            'categoria': ['Idiomas'] * 6,
+            'valor': [1e5, 2e5, 1.5e5, 3e5, 5e5, 4e5],
+            'data': pd.to_datetime(['2024-01-10', '2024-02-15', '2024-04-20',
+                                    '2024-05-30', '2024-03-01', '2024-06-10'])
+        })
+        analyzer = PCARaderAnalyzer()
+        result = analyzer.simulate_prediction_bands(df, n_simulations=20_000, seed=42)
+
+        self.assertEqual(set(result.por_orgao.index), {'Órgão A', 'Órgão B'})
+        self.assertEqual(len(result.por_trimestre), 4)
+        self.assertTrue((result.por_trimestre['p90'] >= result.por_trimestre['p10']).all())
+
+        # Mesma previsão que o relatório imprime: projeção pontual e intervalo de cada trimestre
+        projecoes = analyzer.project_pca_12_months(analyzer.analyze_temporal_patterns(df.copy()))
+        for trimestre, projecao in projecoes['projections_quarterly'].items():
+            banda = result.por_trimestre.loc[trimestre]
+            self.assertAlmostEqual(banda['previsao'], projecao['total'], delta=1)
+            self.assertLessEqual(banda['p10'], projecao['total'])
+            self.assertGreaterEqual(banda['p90'], projecao['total'])
+            self.assertAlmostEqual(banda['p90'], projecao['intervalo']['total'][1],
+                                   delta=0.02 * projecao['intervalo']['total'][1] + 1)
+
+        orgaos = analyzer.project_orgaos_12_months(df)['mean'].sum(axis=1)
+        pd.testing.assert_series_equal(result.por_orgao['previsao'], orgaos, check_names=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the batched seasonal forecasting engine
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add pca_forecasting directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "analysis" / "pca_forecasting"))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from seasonal_forecast import SeasonalForecaster, quarterly_panel, forecast_panel
+from data_analysis import PCARaderAnalyzer
+from contract_store import ContractStore
+
+
+class TestSeasonalForecaster(unittest.TestCase):
+
+    def setUp(self):
+        t = np.arange(16)
+        sazonal = np.array([30.0, -10.0, -25.0, 5.0])
+        self.panel = np.vstack([
+            1000 + 10 * t + sazonal[t % 4],
+            500 + 2 * sazonal[t % 4],
+            np.full(16, 250.0)
+        ])
+
+    def test_holt_winters_tracks_trend_and_season(self):
+        result = SeasonalForecaster(alpha=0.5, beta=0.2, gamma=0.3).fit(self.panel).forecast(4)
+        esperado = 1000 + 10 * np.arange(16, 20) + np.array([30.0, -10.0, -25.0, 5.0])
+
+        np.testing.assert_allclose(result.mean[0], esperado, rtol=0.02)
+        np.testing.assert_allclose(result.mean[2], 250.0)
+        self.assertTrue(np.all(result.lower <= result.mean) and np.all(result.mean <= result.upper))
+        # Incerteza cresce com o horizonte
+        self.assertTrue(np.all(np.diff(result.std[0]) >= 0))
+
+    def test_batch_equals_series_by_series(self):
+        batch = SeasonalForecaster().fit(self.panel).forecast(6)
+        for i, serie in enumerate(self.panel):
+            single = SeasonalForecaster().fit(serie[None, :]).forecast(6)
+            np.testing.assert_allclose(batch.mean[i], single.mean[0])
+            np.testing.assert_allclose(batch.std[i], single.std[0])
+
+    def test_seasonal_naive_repeats_last_year(self):
+        result = SeasonalForecaster(method='seasonal_naive').fit(self.panel).forecast(8)
+        np.testing.assert_allclose(result.mean[1], np.tile(self.panel[1, -4:], 2))
+
+    def test_panel_fills_missing_quarters(self):
+        df = pd.DataFrame({
+            'categoria': ['A', 'A', 'B'],
+            'data': ['2023-01-10', '2023-09-01', '2023-02-01'],
+            'valor': [100.0, 50.0, 10.0]
+        })
+        panel = quarterly_panel(df, 'categoria')
+        self.assertEqual([str(q) for q in panel.columns], ['2023Q1', '2023Q2', '2023Q3'])
+        self.assertEqual(panel.loc['A'].tolist(), [100.0, 0.0, 50.0])
+
+        forecast = forecast_panel(panel, '2024Q1')
+        self.assertEqual(forecast['mean'].shape, (2, 4))
+
+    def test_short_series_uses_mean_level(self):
+        serie = np.array([[100.0, 300.0]])
+        result = SeasonalForecaster().fit(serie).forecast(4)
+
+        np.testing.assert_allclose(result.mean[0], 200.0)
+        np.testing.assert_allclose(SeasonalForecaster().fit(serie).sigma, [100.0])
+
+
+class TestPcaProjection(unittest.TestCase):
+
+    def test_projection_dict_shape(self):
+        analyzer = PCARaderAnalyzer()
+        df = analyzer.load_radar_data()
+        projections = analyzer.project_pca_12_months(analyzer.analyze_temporal_patterns(df))
+
+        quarterly = projections['projections_quarterly']
+        self.assertEqual(list(quarterly), ['Q3_2024', 'Q4_2024', 'Q1_2025', 'Q2_2025'])
+        for values in quarterly.values():
+            self.assertEqual(values['total'], values['edtech'] + values['idiomas'])
+            low, high = values['intervalo']['total']
+            self.assertLessEqual(low, values['total'])
+            self.assertGreaterEqual(high, values['total'])
+        self.assertEqual(projections['total_anual_projetado'], sum(q['total'] for q in quarterly.values()))
+
+    def test_orgao_projection_single_batch(self):
+        analyzer = PCARaderAnalyzer()
+        df = analyzer.load_radar_data()
+        forecast = analyzer.project_orgaos_12_months(df)
+
+        self.assertEqual(list(forecast['mean'].index), list(df['orgao'].unique()))
+        self.assertEqual(list(forecast['mean'].columns), ['Q3_2024', 'Q4_2024', 'Q1_2025', 'Q2_2025'])
+
+    def test_quarters_without_contracts_count_as_zero(self):
+        analyzer = PCARaderAnalyzer()
+        df = analyzer.load_radar_data()
+        temporal = analyzer.analyze_temporal_patterns(df)
+        panel = temporal['quarterly_panel']
+
+        # O painel vai até o trimestre anterior à projeção, com zeros após o último contrato
+        self.assertEqual(str(panel.columns[-1]), '2024Q2')
+        self.assertEqual(panel.iloc[:, -4:].to_numpy().sum(), 0.0)
+
+        projections = analyzer.project_pca_12_months(temporal)
+        self.assertLess(projections['total_anual_projetado'], df['valor'].sum())
+        self.assertNotEqual(projections['crescimento_edtech'], '0.0%')
+
+    def test_history_past_default_start(self):
+        with tempfile.TemporaryDirectory() as tmp, ContractStore(Path(tmp) / 'contratos.sqlite') as store:
+            store.write(pd.DataFrame({
+                'orgao': ['Ministério da Educação', 'Ministério da Educação', 'Ministério da Saúde'],
+                'uasg': ['150002', '150002', '250005'],
+                'valor': [100000.0, 50000.0, 80000.0],
+                'data': ['2024-02-10', '2024-10-05', '2024-05-20'],
+                'categoria': ['EdTech geral', 'EdTech geral', 'Idiomas'],
+                'fornecedor': ['EduTech S.A.', 'EduTech S.A.', 'Escola de Idiomas Ltda'],
+                'objeto': ['Plataforma de ensino'] * 2 + ['Curso de inglês'],
+            }), fonte='teste')
+
+            analyzer = PCARaderAnalyzer()
+            df = analyzer.load_radar_data(store)
+
+        temporal = analyzer.analyze_temporal_patterns(df)
+        self.assertEqual(str(temporal['projection_start']), '2025Q1')
+        projections = analyzer.project_pca_12_months(temporal)
+        self.assertEqual(list(projections['projections_quarterly']), ['Q1_2025', 'Q2_2025', 'Q3_2025', 'Q4_2025'])
+
+        forecast = analyzer.project_orgaos_12_months(df)
+        self.assertEqual(list(forecast['mean'].columns), ['Q1_2025', 'Q2_2025', 'Q3_2025', 'Q4_2025'])
+
+
+if __name__ == '__main__':
+    unittest.main()
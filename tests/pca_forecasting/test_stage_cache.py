@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the content-hash stage cache of the PCA report pipeline
+"""
+
+import unittest
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+# Add pca_forecasting directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "analysis" / "pca_forecasting"))
+
+from stage_cache import StageCache, CachedAnalysis, fingerprint
+from data_analysis import PCARaderAnalyzer
+
+
+class TestFingerprint(unittest.TestCase):
+
+    def test_frame_content_and_dtypes(self):
+        df = pd.DataFrame({'orgao': ['A', 'B'], 'valor': [1.0, 2.0]})
+        self.assertEqual(fingerprint(df), fingerprint(df.copy()))
+        self.assertNotEqual(fingerprint(df), fingerprint(df.assign(valor=[1.0, 3.0])))
+        self.assertNotEqual(fingerprint(df), fingerprint(df.astype({'valor': 'float32'})))
+        self.assertNotEqual(fingerprint(df, {'seed': 1}), fingerprint(df, {'seed': 2}))
+
+
+class TestStageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = Path(tempfile.mkdtemp())
+
+    def test_second_run_loads_from_disk(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return pd.DataFrame({'mes': pd.period_range('2024-01', periods=3, freq='M'),
+                                 'valor': pd.array([1, None, 3], dtype='Int64')})
+
+        first = StageCache(self.cache_dir).get_or_compute('stage', 'abc', compute)
+        cache = StageCache(self.cache_dir)
+        second = cache.get_or_compute('stage', 'abc', compute)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.hits, 1)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_corrupted_file_is_recomputed(self):
+        cache = StageCache(self.cache_dir)
+        cache.get_or_compute('stage', 'abc', lambda: 1)
+        cache.path('stage', 'abc').write_bytes(b'not a pickle')
+
+        self.assertEqual(cache.get_or_compute('stage', 'abc', lambda: 2), 2)
+        self.assertEqual(StageCache(self.cache_dir).get_or_compute('stage', 'abc', lambda: 3), 2)
+
+    def test_disabled_cache_writes_nothing(self):
+        cache = StageCache(self.cache_dir, enabled=False)
+        self.assertEqual(cache.get_or_compute('stage', 'abc', lambda: 1), 1)
+        self.assertEqual(list(self.cache_dir.iterdir()), [])
+
+
+class TestCachedAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = Path(tempfile.mkdtemp())
+
+    def _analysis(self, df=None):
+        return CachedAnalysis(cache=StageCache(self.cache_dir), df=df)
+
+    def test_matches_direct_computation(self):
+        analyzer = PCARaderAnalyzer()
+        df = analyzer.load_radar_data()
+        propensity = analyzer.calculate_propensity_metrics(df.assign(data=pd.to_datetime(df['data'])))
+        projections = analyzer.project_pca_12_months(analyzer.analyze_temporal_patterns(df))
+
+        analysis = self._analysis()
+        self.assertEqual(analysis.propensity_scores(), propensity)
+        self.assertEqual(analysis.pca_projections(), projections)
+
+    def test_reuses_stages_across_instances(self):
+        self._analysis().pca_projections()
+
+        with patch.object(PCARaderAnalyzer, 'project_pca_12_months') as project:
+            analysis = self._analysis()
+            analysis.pca_projections()
+            project.assert_not_called()
+        self.assertEqual(analysis.cache.misses, 0)
+
+    def test_all_hit_run_does_not_load_store(self):
+        self._analysis().pca_projections()
+
+        with patch.object(PCARaderAnalyzer, 'load_radar_data') as load:
+            analysis = self._analysis()
+            analysis.pca_projections()
+            load.assert_not_called()
+
+    def test_prediction_bands_reuse_orgao_projections(self):
+        analysis = self._analysis()
+        expected = analysis.orgao_projections()['mean']
+
+        with patch.object(PCARaderAnalyzer, 'project_orgaos_12_months') as project:
+            bands = analysis.prediction_bands(n_simulations=1_000)
+            project.assert_not_called()
+        self.assertEqual(list(bands.por_orgao.index), list(expected.index))
+
+    def test_input_or_parameter_change_recomputes(self):
+        df = PCARaderAnalyzer().load_radar_data()
+        self._analysis(df).propensity_table()
+
+        changed = df.copy()
+        changed.loc[0, 'valor'] += 1
+        analysis = self._analysis(changed)
+        analysis.propensity_table()
+        analysis.pca_projections(coverage=0.8)
+        analysis.pca_projections(coverage=0.95)
+        self.assertEqual(analysis.cache.hits, 0)
+        self.assertEqual(analysis.cache.misses, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the incremental pipeline runner
+Checks content-hash skipping, early cutoff and failure propagation
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from pipeline_dag import BLOCKED, FAILED, RAN, SKIPPED, Pipeline, Stage
+
+SPLIT_SCRIPT = """
+import sys
+linhas = open('contratos.csv', encoding='utf-8').read().splitlines()
+for categoria, destino in (('edtech', 'edtech.csv'), ('idiomas', 'idiomas.csv')):
+    with open(destino, 'w', encoding='utf-8') as f:
+        f.write('\\n'.join(l for l in linhas if l.endswith(categoria)))
+"""
+
+REPORT_SCRIPT = """
+import sys
+origem, destino = sys.argv[1], sys.argv[2]
+with open(destino, 'w', encoding='utf-8') as f:
+    f.write(str(len(open(origem, encoding='utf-8').read().splitlines())))
+"""
+
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / 'split.py').write_text(SPLIT_SCRIPT)
+        (self.root / 'report.py').write_text(REPORT_SCRIPT)
+        (self.root / 'contratos.csv').write_text("a,edtech\nb,idiomas\nc,edtech\n")
+        self.stages = [
+            Stage('split', 'split.py', inputs=('contratos.csv',), outputs=('edtech.csv', 'idiomas.csv')),
+            Stage('report_edtech', 'report.py', args=('edtech.csv', 'edtech.txt'),
+                  inputs=('edtech.csv',), outputs=('edtech.txt',)),
+            Stage('report_idiomas', 'report.py', args=('idiomas.csv', 'idiomas.txt'),
+                  inputs=('idiomas.csv',), outputs=('idiomas.txt',)),
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def statuses(self, module_dirs=(), **kwargs):
+        results = Pipeline(self.stages, self.root, module_dirs=module_dirs).run(**kwargs)
+        return {name: result.status for name, result in results.items()}
+
+    def test_second_run_skips_everything(self):
+        self.assertEqual(set(self.statuses().values()), {RAN})
+        self.assertEqual((self.root / 'edtech.txt').read_text(), '2')
+        self.assertEqual(set(self.statuses().values()), {SKIPPED})
+
+    def test_row_change_only_reruns_affected_branch(self):
+        self.statuses()
+        (self.root / 'contratos.csv').write_text("a,edtech\nb,idiomas\nc,edtech\nd,edtech\n")
+
+        self.assertEqual(self.statuses(), {'split': RAN, 'report_edtech': RAN, 'report_idiomas': SKIPPED})
+        self.assertEqual((self.root / 'edtech.txt').read_text(), '3')
+
+    def test_deleted_output_reruns_stage(self):
+        self.statuses()
+        (self.root / 'idiomas.txt').unlink()
+        self.assertEqual(self.statuses()['report_idiomas'], RAN)
+
+    def test_failure_blocks_downstream(self):
+        (self.root / 'split.py').write_text("raise SystemExit(3)")
+        statuses = self.statuses()
+
+        self.assertEqual(statuses['split'], FAILED)
+        self.assertEqual(statuses['report_edtech'], BLOCKED)
+        self.assertEqual(statuses['report_idiomas'], BLOCKED)
+
+    def test_targets_include_upstream(self):
+        pipeline = Pipeline(self.stages, self.root)
+        self.assertEqual(pipeline.select(['report_idiomas']), ['split', 'report_idiomas'])
+        self.assertEqual(set(pipeline.plan(['report_idiomas'])), {'split', 'report_idiomas'})
+
+    def test_on_demand_stages_are_not_selected_by_default(self):
+        stages = [Stage('scrape', 'scrape.py', outputs=('contratos.csv',), on_demand=True)] + self.stages
+        pipeline = Pipeline(stages, self.root)
+
+        self.assertNotIn('scrape', pipeline.select())
+        self.assertEqual(pipeline.select(['scrape', 'split'])[:2], ['scrape', 'split'])
+
+    def test_imported_module_change_reruns_stage(self):
+        (self.root / 'lib').mkdir()
+        (self.root / 'lib' / 'contagem.py').write_text("from formato import rotulo\n")
+        (self.root / 'lib' / 'formato.py').write_text("rotulo = 'n'\n")
+        (self.root / 'report.py').write_text(
+            "import json, sys\nsys.path.insert(0, 'lib')\nfrom contagem import rotulo\n" + REPORT_SCRIPT)
+        pipeline = Pipeline(self.stages, self.root, module_dirs=('lib',))
+        self.assertEqual(pipeline.module_dependencies('report.py'), ('lib/contagem.py', 'lib/formato.py'))
+        self.assertEqual(pipeline.module_dependencies('split.py'), ())
+
+        self.assertEqual(set(self.statuses(module_dirs=('lib',)).values()), {RAN})
+        (self.root / 'lib' / 'formato.py').write_text("rotulo = 'contratos'\n")
+        self.assertEqual(self.statuses(module_dirs=('lib',)),
+                         {'split': SKIPPED, 'report_edtech': RAN, 'report_idiomas': RAN})
+
+    def test_invalid_graphs(self):
+        with self.assertRaises(ValueError):
+            Pipeline([Stage('a', 'a.py', inputs=('y',), outputs=('x',)),
+                      Stage('b', 'b.py', inputs=('x',), outputs=('y',))], self.root)
+        with self.assertRaises(ValueError):
+            Pipeline([Stage('a', 'a.py', outputs=('x',)), Stage('b', 'b.py', outputs=('x',))], self.root)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the Idiomas prospect scoring
+Checks the vectorized ranking against the per-órgão scoring methods
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from contract_store import ContractStore
+from prospect_scoring_idiomas import ProspectScoringIdiomas
+
+RADAR_IDIOMAS = Path(__file__).parent.parent.parent / "outputs" / "radar_idiomas.csv"
+
+
+class TestVectorizedProspectScoring(unittest.TestCase):
+    """Vectorized columns must match the scalar calculate_* methods"""
+
+    def setUp(self):
+        self.scoring = ProspectScoringIdiomas()
+        self.df = pd.read_csv(RADAR_IDIOMAS)
+        # Extra órgão only known from history, plus an unparseable value
+        extra = self.df.iloc[[0, 0]].copy()
+        extra['orgao'] = 'Órgão Sem Perfil'
+        extra['uasg'] = 999001
+        extra['valor'] = ['R$ 3.100.000,00', 'Valor não informado']
+        self.df = pd.concat([self.df, extra], ignore_index=True)
+
+    def test_groupby_matches_per_orgao_filtering(self):
+        patterns = self.scoring.analyze_historical_patterns(self.df)
+        idiomas = self.df[self.df['categoria'] == 'Idiomas']
+
+        self.assertEqual(list(patterns), list(idiomas['orgao'].unique()))
+        for orgao, pattern in patterns.items():
+            rows = idiomas[idiomas['orgao'] == orgao]
+            self.assertEqual(pattern['total_contratos'], len(rows))
+            self.assertEqual(pattern['ultimo_contrato'], rows['data'].max())
+            self.assertEqual(pattern['modalidades'], rows['modalidade'].unique().tolist())
+        self.assertEqual(patterns['Órgão Sem Perfil']['valor_medio'], 3100000.0)
+
+    def test_vectorized_scores_match_scalar(self):
+        patterns = self.scoring.analyze_historical_patterns(self.df)
+        scores = self.scoring.score_all_orgaos(self.scoring.aggregate_historical_patterns(self.df))
+
+        self.assertIn('Órgão Sem Perfil', scores.index)
+        for orgao, row in scores.iterrows():
+            score = self.scoring.calculate_final_score(orgao, patterns)
+            self.assertAlmostEqual(row['score_propensao'], score)
+            self.assertAlmostEqual(row['valor_estimado'], self.scoring.estimate_contract_value(orgao, patterns))
+            self.assertAlmostEqual(row['probabilidade_conversao'],
+                                   self.scoring.calculate_conversion_probability(score, orgao, patterns))
+            self.assertEqual(row['timeline_oportunidade'], self.scoring.determine_timeline(orgao, patterns))
+
+    def test_name_variants_join_by_uasg(self):
+        variante = self.df[self.df['orgao'] == 'Ministério da Defesa'].copy()
+        variante['orgao'] = 'MINISTERIO DA DEFESA - COMANDO'
+        patterns = self.scoring.analyze_historical_patterns(pd.concat([self.df, variante], ignore_index=True))
+
+        self.assertNotIn('MINISTERIO DA DEFESA - COMANDO', patterns)
+        self.assertEqual(patterns['Ministério da Defesa']['total_contratos'], 2 * len(variante))
+        self.assertEqual(patterns['Ministério da Defesa']['orgao_id'], 'md')
+
+    def test_ministry_rollup_columns(self):
+        pf = self.df[self.df['orgao'] == 'Ministério da Justiça e Segurança Pública'].iloc[[0]].copy()
+        pf['orgao'] = 'Polícia Federal'
+        pf['uasg'] = 130002
+        df = pd.concat([self.df, pf], ignore_index=True)
+        scores = self.scoring.score_all_orgaos(self.scoring.aggregate_historical_patterns(df))
+
+        mjsp = (df['orgao'] == 'Ministério da Justiça e Segurança Pública').sum()
+        enap = (df['orgao'] == 'ENAP - Escola Nacional de Administração Pública').sum()
+        self.assertEqual(scores.loc['Ministério da Justiça e Segurança Pública', 'contratos_ministerio'], mjsp + 1)
+        self.assertEqual(scores.loc['Polícia Federal', 'contratos_ministerio'], mjsp + 1)
+        self.assertEqual(scores.loc['ENAP - Escola Nacional de Administração Pública', 'contratos_autarquia'], enap)
+        self.assertEqual(scores.loc['Órgão Sem Perfil', 'contratos_ministerio'], 0)
+
+    def test_store_matches_csv_aggregation(self):
+        with tempfile.TemporaryDirectory() as tmp, ContractStore(Path(tmp) / 'contratos.sqlite') as store:
+            store.ingest_csv(RADAR_IDIOMAS)
+            from_store = self.scoring.aggregate_historical_patterns(self.scoring.load_historical_data(store))
+
+        from_csv = self.scoring.aggregate_historical_patterns(pd.read_csv(RADAR_IDIOMAS))
+        pd.testing.assert_series_equal(from_store['valor_total'], from_csv['valor_total'])
+        pd.testing.assert_series_equal(from_store['total_contratos'], from_csv['total_contratos'])
+
+    def test_top20_ranking(self):
+        with tempfile.TemporaryDirectory() as tmp, ContractStore(Path(tmp) / 'contratos.sqlite') as store:
+            store.ingest_csv(RADAR_IDIOMAS)
+            top20 = self.scoring.generate_top20_prospects(store)
+
+        self.assertEqual([p['rank'] for p in top20], list(range(1, 21)))
+        scores = [p['score_propensao'] for p in top20]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test Suite for blocking + MinHash/LSH contract record linkage
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from record_linkage import (MinHasher, tokenize, lsh_candidate_pairs, connected_components,
+                            blocking_keys, link_records)
+
+
+OBJETO = 'Fornecimento de plataforma digital de ensino personalizado com inteligência artificial'
+
+
+def _contract(**overrides):
+    row = {
+        'orgao': 'Ministério da Educação', 'uasg': '153001', 'cnpj': '14.200.166/0001-05',
+        'data': '2023-01-10', 'objeto': OBJETO, 'valor': 'R$ 2.300.000,00', 'fornecedor': 'Geekie Educação LTDA'
+    }
+    row.update(overrides)
+    return row
+
+
+class TestMinHash(unittest.TestCase):
+
+    def test_tokenize_normalizes_and_drops_stopwords(self):
+        self.assertEqual(tokenize('Curso de Língua Inglesa para servidores'),
+                         frozenset({'curso', 'lingua', 'inglesa', 'servidores'}))
+        self.assertEqual(tokenize(None), frozenset())
+
+    def test_signature_similarity_estimates_jaccard(self):
+        a = frozenset(f't{i}' for i in range(100))
+        b = frozenset(f't{i}' for i in range(25, 125))  # Jaccard 75/125 = 0.6
+        sig = MinHasher(num_perm=256).signatures([a, b, a, frozenset()])
+
+        self.assertAlmostEqual((sig[0] == sig[1]).mean(), 0.6, delta=0.1)
+        np.testing.assert_array_equal(sig[0], sig[2])
+        self.assertTrue((sig[3] == np.iinfo(np.uint64).max).all())
+
+    def test_lsh_only_pairs_within_block(self):
+        sig = MinHasher().signatures([tokenize(OBJETO)] * 3)
+        pairs = lsh_candidate_pairs(sig, np.array([0, 0, 1]))
+        np.testing.assert_array_equal(pairs, [[0, 1]])
+
+    def test_connected_components(self):
+        labels = connected_components(6, np.array([[4, 5], [1, 2], [2, 5]]))
+        np.testing.assert_array_equal(labels, [0, 1, 1, 3, 1, 1])
+
+
+class TestLinkRecords(unittest.TestCase):
+
+    def test_links_reworded_and_reformatted_duplicates(self):
+        df = pd.DataFrame([
+            _contract(fornecedor='Fornecedor não identificado'),
+            _contract(orgao='MEC', cnpj='14200166000105', data='2023-01-25', valor='2300000,00',
+                      objeto='Plataforma digital de ensino personalizado com inteligencia artificial'),
+            _contract(objeto='Licença de software de gestão escolar'),
+            _contract(data='2023-02-10'),
+            _contract(cnpj='99.888.777/0001-66'),
+            _contract(valor='R$ 900.000,00'),
+        ], index=[10, 10, 11, 12, 13, 14])
+
+        result = link_records(df)
+
+        self.assertEqual(result.records['cluster_id'].tolist(), [0, 0, 1, 2, 3, 4])
+        self.assertEqual(result.n_clusters, 5)
+        # Canonical: the more complete record of the pair
+        self.assertEqual(result.records['is_canonical'].tolist(), [False, True, True, True, True, True])
+        self.assertEqual(result.canonical.iloc[0]['orgao'], 'MEC')
+
+    def test_blocking_uses_canonical_orgao(self):
+        df = pd.DataFrame([_contract(), _contract(orgao='MEC - Ministério da Educação', uasg=None),
+                           _contract(orgao='ENAP', uasg=None)])
+        keys = blocking_keys(df)
+        self.assertEqual(keys[0], keys[1])
+        self.assertNotEqual(keys[0], keys[2])
+
+    def test_missing_objeto_is_never_linked(self):
+        df = pd.DataFrame([_contract(objeto=None), _contract(objeto=None)])
+        self.assertEqual(link_records(df).n_clusters, 2)
+
+    def test_empty_frame(self):
+        result = link_records(pd.DataFrame([_contract()]).iloc[:0])
+        self.assertEqual(result.n_clusters, 0)
+        self.assertEqual(len(result.pairs), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
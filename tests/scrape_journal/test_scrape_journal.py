@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the scraper checkpoint journal
+Checks reloading, torn last lines, configuration checks and output assembly
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from scrape_journal import ScrapeJournal
+
+
+def contracts(*ids):
+    return [{'cnpj': str(i), 'objeto': f'contrato {i}'} for i in ids]
+
+
+class TestScrapeJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'sweep' / 'journal.jsonl'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_units_survive_reopen(self):
+        with ScrapeJournal(self.path, config={'page_size': 15}) as journal:
+            journal.record_page('EAD', 2024, 1, contracts(1, 2), total=40)
+            journal.record_page('EAD', 2024, 2, contracts(3))
+            journal.record_query('EAD', 2024, pages=[1, 2])
+            journal.record_page('idiomas', 2024, 1, contracts(4), total=3)
+
+        with ScrapeJournal(self.path, config={'page_size': 15}) as journal:
+            self.assertEqual(journal.page('EAD', 2024, 1), (contracts(1, 2), 40))
+            self.assertIsNone(journal.page('EAD', 2024, 3))
+            self.assertTrue(journal.is_done('EAD', 2024))
+            self.assertFalse(journal.is_done('idiomas', 2024))
+            self.assertEqual((journal.pages_done, journal.queries_done), (3, 1))
+
+    def test_torn_last_line_is_dropped(self):
+        with ScrapeJournal(self.path) as journal:
+            journal.record_page('EAD', 2024, 1, contracts(1))
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "page", "keyword": "EAD", "ye')
+
+        with ScrapeJournal(self.path) as journal:
+            self.assertEqual(journal.pages_done, 1)
+            journal.record_page('EAD', 2024, 2, contracts(2))
+        with ScrapeJournal(self.path) as journal:
+            self.assertEqual(journal.pages_done, 2)
+
+    def test_other_configuration_is_rejected(self):
+        ScrapeJournal(self.path, config={'page_size': 15}).close()
+        with self.assertRaises(ValueError):
+            ScrapeJournal(self.path, config={'page_size': 50})
+
+    def test_contracts_in_query_and_page_order(self):
+        with ScrapeJournal(self.path) as journal:
+            journal.record_page('b', 2024, 2, contracts(4))
+            journal.record_page('a', 2024, 1, contracts(1))
+            journal.record_page('b', 2024, 1, contracts(3))
+            journal.record_page('a', 2024, 2, contracts(2))
+            journal.record_page('a', 2024, 3, contracts(99))  # fetched past the early stop
+            journal.record_query('a', 2024, pages=[1, 2])
+            journal.record_page('c', 2024, 2, contracts(5))  # page 1 missing: nothing yet
+
+            result = journal.contracts([('a', 2024), ('b', 2024), ('c', 2024)])
+        self.assertEqual([c['cnpj'] for c in result], ['1', '2', '3', '4'])
+
+    def test_discard(self):
+        journal = ScrapeJournal(self.path)
+        journal.discard()
+        self.assertFalse(self.path.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
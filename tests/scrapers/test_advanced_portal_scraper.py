@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the advanced Portal scraper pagination
+Checks result-count parsing, page fan-out, early stop and journal resume against a local server
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+from aiohttp import web
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from advanced_portal_scraper import MAX_CONCURRENCY, MAX_PAGES, PAGE_SIZE, RealPortalTransparenciaExtractor
+from async_fetcher import AsyncFetcher
+from dedup_index import DedupIndex, SCRAPER_KEY_COLUMNS
+from scrape_journal import ScrapeJournal
+
+
+def contract_row(n):
+    return (f"<tr><td>12.345.678/0001-{n % 100:02d}</td><td>Empresa Numero {n} LTDA</td>"
+            f"<td>R$ {n}.000,00</td><td>Plataforma de ensino a distancia, contrato {n}</td></tr>")
+
+
+class TestResultCount(unittest.TestCase):
+
+    def test_parse_result_count(self):
+        extractor = RealPortalTransparenciaExtractor()
+        self.assertEqual(extractor.parse_result_count("<p>Exibindo 1 a 15 de <b>1.234</b> registros</p>"), 1234)
+        self.assertEqual(extractor.parse_result_count("<span>87 resultados encontrados</span>"), 87)
+        self.assertIsNone(extractor.parse_result_count("<p>Nenhum filtro aplicado</p>"))
+
+        self.assertEqual(extractor.page_count(PAGE_SIZE * 2 + 1), 3)
+        self.assertEqual(extractor.page_count(None), MAX_PAGES)
+
+
+class TestDedupRegistration(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.index_path = self.dir / 'index.sqlite'
+        self.extractor = RealPortalTransparenciaExtractor(dedup_index_path=self.index_path)
+        self.contracts = [{'cnpj': f'12.345.678/0001-{n:02d}', 'objeto': f'Curso de inglês, contrato {n}',
+                           'valor': f'R$ {n}.000,00', 'categoria': 'Idiomas'} for n in range(3)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def known(self):
+        with DedupIndex(self.index_path, key_columns=SCRAPER_KEY_COLUMNS) as index:
+            return index.contains(pd.DataFrame(self.contracts)).tolist()
+
+    def test_contracts_are_registered_only_after_saving(self):
+        self.extractor.results = self.extractor.drop_known_contracts(self.contracts)
+        self.assertEqual(self.known(), [False] * 3)
+
+        # The save fails: the contracts stay unknown for the next run
+        (self.dir / 'blocked').write_text('')
+        with self.assertRaises(OSError):
+            self.extractor.save_results(str(self.dir / 'blocked' / 'contratos.csv'))
+        self.assertEqual(self.known(), [False] * 3)
+
+        self.extractor.save_results(str(self.dir / 'results' / 'contratos.csv'))
+        self.assertEqual(self.known(), [True] * 3)
+        self.assertEqual(self.extractor.drop_known_contracts(self.contracts), [])
+
+
+class TestPagination(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.total = 40
+        self.paginate = True
+        self.failing = set()
+        self.pages = []
+        app = web.Application()
+        app.router.add_get('/contratos/consulta', self.consulta)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        self.extractor = RealPortalTransparenciaExtractor()
+        self.extractor.base_url = f"http://127.0.0.1:{port}"
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+        self.tmp.cleanup()
+
+    async def consulta(self, request):
+        page = int(request.query['pagina']) if self.paginate else 1
+        self.pages.append(page)
+        if page in self.failing:
+            return web.Response(status=404)
+        size = int(request.query['tamanhoPagina'])
+        rows = ''.join(contract_row(n) for n in range((page - 1) * size, min(page * size, self.total)))
+        count = f"<p>Exibindo de {self.total} registros</p>" if self.paginate else ''
+        return web.Response(text=f"<html>{count}<table><tr><th>cabeçalho</th></tr>{rows}</table></html>",
+                            content_type='text/html')
+
+    async def search(self, index=None):
+        async with AsyncFetcher(rate_per_host=1000, max_concurrency=MAX_CONCURRENCY) as fetcher:
+            return await self.extractor.search_keyword_pages(fetcher, 'plataforma ensino', 2024, index)
+
+    async def test_fetches_every_page(self):
+        contracts = await self.search()
+
+        self.assertEqual(len(contracts), self.total)
+        self.assertEqual(sorted(self.pages), [1, 2, 3])
+        self.assertIn(f"contrato {self.total - 1}", contracts[-1]['objeto'])
+
+    async def test_stops_at_page_of_known_contracts(self):
+        self.total = 200
+        known = pd.DataFrame(await self.search()).iloc[PAGE_SIZE:]
+        with DedupIndex(Path(self.tmp.name) / 'index.sqlite', key_columns=SCRAPER_KEY_COLUMNS) as index:
+            index.register(known, source='teste')
+            self.pages.clear()
+            contracts = await self.search(index)
+
+        self.assertEqual(len(contracts), PAGE_SIZE)
+        self.assertEqual(max(self.pages), 1 + MAX_CONCURRENCY)
+
+    async def test_unknown_count_stops_when_pages_repeat(self):
+        self.paginate = False
+        contracts = await self.search()
+
+        self.assertEqual(len(contracts), PAGE_SIZE)
+        self.assertLessEqual(len(self.pages), 1 + MAX_CONCURRENCY)
+
+    async def test_restart_resumes_from_journal(self):
+        journal_path = Path(self.tmp.name) / 'journal.jsonl'
+        self.extractor.journal = ScrapeJournal(journal_path, config={'page_size': PAGE_SIZE})
+        self.failing = {3}
+        partial = await self.search()
+        self.extractor.journal.close()
+        self.assertEqual(len(partial), 2 * PAGE_SIZE)
+
+        # Restart: only the failed page goes to the network
+        self.failing.clear()
+        self.pages.clear()
+        restarted = RealPortalTransparenciaExtractor(journal_path=journal_path)
+        restarted.base_url = self.extractor.base_url
+        restarted.journal = ScrapeJournal(journal_path, config={'page_size': PAGE_SIZE})
+        self.extractor = restarted
+        contracts = await self.search()
+
+        self.assertEqual(self.pages, [3])
+        self.assertEqual(len(contracts), self.total)
+        self.assertEqual(restarted.journal.contracts([('plataforma ensino', 2024)]), contracts)
+
+        # A finished search is not searched again
+        self.pages.clear()
+        self.assertEqual(await self.search(), contracts)
+        self.assertEqual(self.pages, [])
+        restarted.journal.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
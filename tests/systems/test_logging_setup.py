@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the systems logging pipeline
+"""
+
+import unittest
+import logging
+import logging.handlers
+import tempfile
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from systems.logging_setup import configure_logging, shutdown_logging, SampledLogger, BatchLogSummary
+
+
+class TestQueuedLogging(unittest.TestCase):
+    """Test the QueueHandler/QueueListener writer"""
+
+    def setUp(self):
+        root = logging.getLogger()
+        self.saved_handlers = list(root.handlers)
+        self.saved_level = root.level
+
+    def tearDown(self):
+        shutdown_logging()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in self.saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(self.saved_level)
+
+    def test_records_reach_file_after_shutdown(self):
+        """Queued records are flushed to the file when the listener stops"""
+        log_file = Path(tempfile.mkdtemp()) / "logs" / "radar.log"
+        configure_logging("INFO", log_file=str(log_file))
+
+        root = logging.getLogger()
+        self.assertEqual(len(root.handlers), 1)
+        self.assertIsInstance(root.handlers[0], logging.handlers.QueueHandler)
+
+        logging.getLogger("systems.test").info("processed %d items", 42)
+        logging.getLogger("systems.test").debug("filtered %s", "out")
+        shutdown_logging()
+
+        content = log_file.read_text()
+        self.assertIn("processed 42 items", content)
+        self.assertNotIn("filtered", content)
+
+    def test_reconfigure_replaces_handlers(self):
+        """Calling configure_logging twice keeps a single queue handler"""
+        configure_logging("INFO")
+        configure_logging("WARNING")
+        self.assertEqual(len(logging.getLogger().handlers), 1)
+        self.assertEqual(logging.getLogger().level, logging.WARNING)
+
+
+class TestSampledLogging(unittest.TestCase):
+    """Test per-item sampling and batch summaries"""
+
+    def test_sampled_logger_emits_every_n(self):
+        logger = logging.getLogger("systems.test.sampled")
+        sampled = SampledLogger(logger, every=10)
+
+        with self.assertLogs(logger, level="INFO") as logs:
+            for i in range(35):
+                sampled.log("item %d", i)
+
+        self.assertEqual(len(logs.records), 3)
+        self.assertIn("item 9 [10 items so far]", logs.output[0])
+
+    def test_batch_summary(self):
+        logger = logging.getLogger("systems.test.batch")
+
+        with self.assertLogs(logger, level="INFO") as logs:
+            with BatchLogSummary(logger, "Batch 1/1") as summary:
+                summary.success(5)
+                summary.failure()
+
+        self.assertIn("Batch 1/1: 5 succeeded, 1 failed", logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the EdTech Scoring Engine
+Covers weighted totals, sensitivity analysis and portfolio reporting
+"""
+
+import unittest
+import random
+import tempfile
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from systems.models.edtech_schemas import AnalysisScore, MarketOpportunity, EdTechCategory, SUB_SCORE_FIELDS
+from systems.data.data_manager import EdTechDataManager
+from systems.data.sample_data_generator import EdTechSampleDataGenerator
+from systems.analysis.scoring_engine import EdTechScoringEngine, ScoringWeights, score_matrix
+from systems.analysis.weight_sensitivity import WeightSensitivityAnalyzer, random_weight_scenarios
+from systems.analysis.ranking import TopKAccumulator
+from systems.analysis.streaming_stats import RunningStats, QuantileSketch
+from systems.analysis.instrumentation import ScoringInstrumentation
+from systems.analysis.automated_workflows import EdTechAnalysisOrchestrator, WorkflowStatus
+
+
+def make_sample_companies(count: int = 40, seed: int = 7):
+    """Generate a reproducible sample portfolio"""
+    random.seed(seed)
+    data_manager = EdTechDataManager(tempfile.mkdtemp())
+    return EdTechSampleDataGenerator(data_manager).generate_sample_companies(count)
+
+
+class TestWeightedTotalScore(unittest.TestCase):
+    """Test the linear total score wired to ScoringWeights"""
+
+    def test_default_weights_match_legacy_average(self):
+        """Without weights, total is the 0.3/0.4/0.3 average of category means"""
+        score = AnalysisScore(market_size_score=80, growth_potential_score=70, competitive_landscape_score=60,
+                              financial_strength_score=90, technology_score=50, team_score=70, product_score=60,
+                              alignment_score=40, synergy_potential_score=80, risk_assessment_score=60)
+        expected = 0.3 * (80 + 70 + 60) / 3 + 0.4 * (90 + 50 + 70 + 60) / 4 + 0.3 * (40 + 80 + 60) / 3
+
+        self.assertAlmostEqual(score.calculate_total_score(), expected)
+        self.assertEqual(score.investment_grade, "C")
+        self.assertEqual(score.recommendation, "HOLD")
+
+    def test_grade_boundaries(self):
+        """Cutoffs are inclusive lower bounds"""
+        score = AnalysisScore(**{name: 85.0 for name in SUB_SCORE_FIELDS})
+        score.calculate_total_score()
+        self.assertEqual(score.investment_grade, "A")
+        self.assertEqual(score.recommendation, "STRONG_BUY")
+
+    def test_engine_uses_configured_weights(self):
+        """Changing ScoringWeights changes totals without code edits"""
+        companies = make_sample_companies(10)
+        weights = ScoringWeights(market_category_weight=1.0, company_category_weight=0.0,
+                                 strategic_category_weight=0.0)
+        engine = EdTechScoringEngine(weights)
+
+        for company in companies:
+            score = engine.score_company(company)
+            expected = float(np.dot(score.sub_scores(), weights.to_vector()))
+            self.assertAlmostEqual(score.total_score, expected)
+
+    def test_weight_vector_is_cached_until_weights_change(self):
+        """The vector is built once per weights assignment"""
+        engine = EdTechScoringEngine()
+        self.assertIs(engine.weight_vector, engine.weight_vector)
+
+        engine.weights = ScoringWeights(market_category_weight=1.0, company_category_weight=0.0,
+                                        strategic_category_weight=0.0)
+        np.testing.assert_allclose(engine.weight_vector, engine.weights.to_vector())
+
+    def test_weight_vector_sums_to_category_total(self):
+        """In-category weights are normalised"""
+        self.assertAlmostEqual(ScoringWeights(technology_weight=5.0).to_vector().sum(), 1.0)
+
+
+class TestWeightSensitivity(unittest.TestCase):
+    """Test matrix rescoring and stability metrics"""
+
+    def setUp(self):
+        self.engine = EdTechScoringEngine()
+        self.scored = self.engine.batch_score_companies(make_sample_companies(40))
+        self.analyzer = WeightSensitivityAnalyzer.from_scored_companies(self.scored)
+
+    def test_rescore_matches_scalar_path(self):
+        """Matrix product equals per-company calculate_total_score"""
+        scenarios = [ScoringWeights(), ScoringWeights(team_weight=0.8, alignment_weight=0.1)]
+        totals = self.analyzer.rescore(scenarios)
+
+        self.assertEqual(totals.shape, (40, 2))
+        for column, weights in enumerate(scenarios):
+            for row, (_, score) in enumerate(self.scored):
+                rescored = AnalysisScore(**{name: getattr(score, name) for name in SUB_SCORE_FIELDS})
+                self.assertAlmostEqual(totals[row, column], rescored.calculate_total_score(weights.to_vector()))
+
+    def test_baseline_scenario_is_stable(self):
+        """Re-evaluating the baseline gives perfect stability"""
+        result = self.analyzer.evaluate([ScoringWeights()], top_k=5)
+
+        self.assertAlmostEqual(result.rank_correlation[0], 1.0)
+        self.assertEqual(result.grade_flips[0], 0)
+        self.assertEqual(result.top_k_overlap[0], 1.0)
+
+    def test_chunked_evaluation_matches_single_pass(self):
+        """Chunk size does not change results"""
+        scenarios = random_weight_scenarios(300, seed=1)
+        chunked = self.analyzer.evaluate(scenarios, chunk_size=16, keep_scores=True)
+        single = self.analyzer.evaluate(scenarios, chunk_size=1000, keep_scores=True)
+
+        np.testing.assert_allclose(chunked.scenario_scores, single.scenario_scores)
+        np.testing.assert_array_equal(chunked.grade_flips, single.grade_flips)
+        np.testing.assert_array_equal(chunked.worst_rank, single.worst_rank)
+
+    def test_grade_flips_match_labels(self):
+        """Vectorized grades agree with the scalar grade table"""
+        scenarios = random_weight_scenarios(20, seed=3)
+        grades = self.analyzer.grades(scenarios)
+        baseline = np.array([score.investment_grade for _, score in self.scored])
+        result = self.analyzer.evaluate(scenarios)
+
+        np.testing.assert_array_equal(result.grade_flips, (grades != baseline[:, None]).sum(axis=0))
+
+    def test_engine_report_shape(self):
+        """Engine wrapper returns a JSON-friendly summary"""
+        report = self.engine.analyze_weight_sensitivity(self.scored, [ScoringWeights(team_weight=1.0)])
+
+        self.assertEqual(report['scenarios_evaluated'], 1)
+        self.assertEqual(len(report['companies']), 40)
+        self.assertEqual(score_matrix([]).shape, (0, len(SUB_SCORE_FIELDS)))
+
+
+class TestTopKRanking(unittest.TestCase):
+    """Test bounded-heap ranking against a full sort"""
+
+    def setUp(self):
+        self.engine = EdTechScoringEngine()
+        self.scored = list(self.engine.iter_scored_companies(make_sample_companies(50)))
+        self.full_sort = sorted(self.scored, key=lambda x: x[1].total_score, reverse=True)
+
+    def test_top_k_matches_stable_sort(self):
+        """Heap selection keeps the same pairs and tie order as sorted()"""
+        top = TopKAccumulator(7).extend(self.scored).top()
+        self.assertEqual([c.name for c, _ in top], [c.name for c, _ in self.full_sort[:7]])
+
+    def test_per_category_top_k(self):
+        """Each category keeps its own best companies"""
+        accumulator = TopKAccumulator(3, per_category_k=2).extend(self.scored)
+
+        for category, ranked in accumulator.top_by_category().items():
+            expected = [c.name for c, _ in self.full_sort if category in [cat.value for cat in c.category]][:2]
+            self.assertEqual([c.name for c, _ in ranked], expected)
+
+    def test_batch_scoring_top_k(self):
+        """batch_score_companies(top_k=...) returns the head of the full ranking"""
+        companies = [company for company, _ in self.scored]
+        top = self.engine.batch_score_companies(companies, top_k=5)
+        self.assertEqual([c.name for c, _ in top], [c.name for c, _ in self.full_sort[:5]])
+
+    def test_report_ranks_unsorted_input(self):
+        """Portfolio report no longer depends on pre-sorted input"""
+        report = self.engine.generate_portfolio_report(list(reversed(self.full_sort)))
+        self.assertEqual([p['name'] for p in report['top_performers']],
+                         [c.name for c, _ in self.full_sort[:10]])
+
+
+class TestStreamingPortfolioReport(unittest.TestCase):
+    """Test single-pass report aggregation"""
+
+    def test_report_matches_materialized_statistics(self):
+        """Small portfolios reproduce the numpy statistics exactly"""
+        engine = EdTechScoringEngine()
+        scored = engine.batch_score_companies(make_sample_companies(60))
+        totals = [score.total_score for _, score in scored]
+
+        report = engine.generate_portfolio_report(iter(scored))
+        summary = report['summary']
+
+        self.assertEqual(summary['total_companies'], 60)
+        self.assertAlmostEqual(summary['average_score'], np.mean(totals))
+        self.assertAlmostEqual(summary['median_score'], np.median(totals))
+        self.assertAlmostEqual(summary['std_score'], np.std(totals))
+        self.assertAlmostEqual(summary['top_quartile_threshold'], np.percentile(totals, 75))
+        self.assertEqual(sum(report['grade_distribution'].values()), 60)
+        self.assertEqual(len(report['top_performers']), 10)
+
+        category_totals = {}
+        for company, score in scored:
+            for category in company.category:
+                category_totals.setdefault(category.value, []).append(score.total_score)
+        for category, values in category_totals.items():
+            self.assertAlmostEqual(report['category_analysis'][category]['average_score'], np.mean(values))
+            self.assertEqual(report['category_analysis'][category]['count'], len(values))
+
+    def test_empty_portfolio(self):
+        """Empty input keeps returning an empty report"""
+        self.assertEqual(EdTechScoringEngine().generate_portfolio_report(iter([])), {})
+
+    def test_running_stats_merge(self):
+        """Merged Welford accumulators equal a single pass"""
+        values = np.random.default_rng(0).normal(70, 12, 1000)
+        left, right, whole = RunningStats(), RunningStats(), RunningStats()
+        for value in values[:400]:
+            left.add(value)
+        for value in values[400:]:
+            right.add(value)
+        for value in values:
+            whole.add(value)
+
+        left.merge(right)
+        self.assertAlmostEqual(left.mean, whole.mean)
+        self.assertAlmostEqual(left.std, np.std(values))
+
+    def test_quantile_sketch_accuracy(self):
+        """Sketch rank error stays small on a large stream"""
+        values = np.random.default_rng(1).uniform(0, 100, 100000)
+        sketch = QuantileSketch(k=256, seed=1)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.75):
+            estimate = sketch.quantile(q)
+            self.assertLess(abs(np.mean(values <= estimate) - q), 0.02)
+
+
+class TestOpportunityBatchScoring(unittest.TestCase):
+    """Test vectorized market opportunity scoring against the scalar path"""
+
+    def setUp(self):
+        self.engine = EdTechScoringEngine()
+        rng = random.Random(11)
+        choices = {
+            'market_size': [None, 0, 5e6, 1e7, 5e7, 1e8, 2e9, 1e10, 3e10],
+            'growth_rate': [None, 0, 5, 10, 24.9, 25, 60, 100, 150],
+            'competitive_intensity': [None, 0, 1, 5.5, 10],
+            'roi_potential': [None, 0, -20, 40, 100, 180]
+        }
+        self.opportunities = [
+            MarketOpportunity(id=str(i), name=f"opp{i}", description="", category=EdTechCategory.K12_EDUCATION,
+                              **{field: rng.choice(values) for field, values in choices.items()})
+            for i in range(200)
+        ]
+
+    def test_batch_matches_scalar(self):
+        """Every batch score equals score_market_opportunity"""
+        scores, breakdown = self.engine.score_opportunities_batch(self.opportunities)
+        expected = [self.engine.score_market_opportunity(opp) for opp in self.opportunities]
+
+        np.testing.assert_allclose(scores, expected)
+        self.assertEqual(list(breakdown.columns), ['market_size_score', 'growth_rate_score',
+                                                   'competitive_intensity_score', 'roi_potential_score'])
+
+    def test_missing_criteria_are_masked(self):
+        """Skipped criteria show as NaN and do not dilute the score"""
+        opp = MarketOpportunity(id="x", name="x", description="", category=EdTechCategory.K12_EDUCATION,
+                                market_size=2e10, growth_rate=None, roi_potential=0)
+        scores, breakdown = self.engine.score_opportunities_batch([opp])
+
+        self.assertEqual(scores[0], 100)
+        self.assertTrue(np.isnan(breakdown['growth_rate_score'][0]))
+
+    def test_dataframe_input(self):
+        """DataFrames with partial columns are accepted"""
+        frame = pd.DataFrame({'market_size': [2e10, None], 'growth_rate': [60, 0]})
+        scores, _ = self.engine.score_opportunities_batch(frame)
+        np.testing.assert_allclose(scores, [90, 0])
+
+
+class TestScoringInstrumentation(unittest.TestCase):
+    """Test hot-path timers, counters and sampled logging"""
+
+    def test_disabled_engine_is_unwrapped(self):
+        """Without instrumentation sub-scorers are plain bound methods"""
+        engine = EdTechScoringEngine()
+        self.assertIsNone(engine.instrumentation)
+        self.assertFalse(any(hasattr(scorer, '__wrapped__') for _, scorer in engine._sub_scorers))
+
+    def test_per_method_counts_and_exports(self):
+        """Every sub-scorer is timed once per company"""
+        engine = EdTechScoringEngine()
+        instrumentation = engine.enable_instrumentation()
+        list(engine.iter_scored_companies(make_sample_companies(25)))
+
+        snapshot = instrumentation.snapshot()
+        self.assertEqual(snapshot['methods']['score_technology_stack']['calls'], 25)
+        self.assertEqual(snapshot['methods']['finalize_score']['histogram']['+Inf'], 25)
+        self.assertEqual(snapshot['counters']['companies_scored'], 25)
+
+        text = instrumentation.to_prometheus()
+        self.assertIn('edtech_scoring_duration_seconds_count{method="score_technology_stack"} 25', text)
+        self.assertIn('edtech_scoring_events_total{event="companies_scored"} 25', text)
+
+        engine.disable_instrumentation()
+        engine.score_company(make_sample_companies(1)[0])
+        self.assertEqual(instrumentation.counters['companies_scored'], 25)
+
+    def test_batch_logs_summary_not_per_company(self):
+        """A batch below the sampling interval logs one INFO summary"""
+        engine = EdTechScoringEngine(log_sample_every=1000)
+        with self.assertLogs('systems.analysis.scoring_engine', level='INFO') as logs:
+            engine.batch_score_companies(make_sample_companies(30))
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("Scored companies: 30 succeeded", logs.output[0])
+
+    def test_workflow_results_include_instrumentation(self):
+        """Batch scoring workflow attaches the metrics snapshot"""
+        data_manager = EdTechDataManager(tempfile.mkdtemp())
+        for company in make_sample_companies(12):
+            data_manager.add_company(company)
+
+        engine = EdTechScoringEngine(instrumentation=ScoringInstrumentation())
+        orchestrator = EdTechAnalysisOrchestrator(data_manager, engine, None, None)
+        result = orchestrator.execute_company_batch_scoring()
+
+        self.assertEqual(result.status, WorkflowStatus.COMPLETED)
+        self.assertEqual(result.results['instrumentation']['counters']['companies_scored'],
+                         result.results['total_companies_processed'])
+
+
+if __name__ == '__main__':
+    unittest.main()